@@ -0,0 +1,112 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helper script measuring the throughput of the coalescing main thread invoker
+against posting one event per call, with a headless QCoreApplication.
+
+Calls are invoked from a worker thread and the time it takes for all of
+them to execute in the main thread is reported for both invokers.
+"""
+
+# system imports
+from __future__ import print_function
+import optparse
+import os
+import sys
+import threading
+import time
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "python"))
+sys.path.append(python_folder)
+
+# sgtk imports
+from tank.authentication.ui.qt_abstraction import QtCore
+from tank.platform.invoker import CoalescingCallQueue, create_coalescing_invoker
+
+
+class SignalPerCallInvoker(QtCore.QObject):
+    """
+    Invoker emitting one queued signal per call.
+    """
+
+    signal = QtCore.Signal(object)
+
+    def __init__(self):
+        QtCore.QObject.__init__(self)
+        self.signal.connect(lambda fn: fn(), QtCore.Qt.QueuedConnection)
+
+    def invoke(self, fn):
+        self.signal.emit(fn)
+
+
+def run(app, invoke, num_calls):
+    """
+    Invokes calls from a worker thread and runs the event loop until all of
+    them have executed in the main thread.
+
+    :param app: The QCoreApplication.
+    :param invoke: Callable invoking a function in the main thread.
+    :param int num_calls: Number of calls to invoke.
+
+    :returns: Elapsed time in seconds.
+    """
+    counter = []
+
+    def count():
+        counter.append(None)
+        if len(counter) == num_calls:
+            app.quit()
+
+    def produce():
+        for i in range(num_calls):
+            invoke(count)
+
+    start = time.time()
+    worker = threading.Thread(target=produce)
+    worker.start()
+    app.exec_()
+    worker.join()
+    return time.time() - start
+
+
+def main():
+    """
+    Main entry point for script.
+    """
+    parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option(
+        "--calls",
+        type="int",
+        default=20000,
+        help="Number of calls to invoke, defaults to %default.",
+    )
+    (options, _) = parser.parse_args()
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    call_queue = CoalescingCallQueue(maximum_size=options.calls)
+    coalescing_time = run(
+        app, create_coalescing_invoker(QtCore, call_queue).invoke, options.calls
+    )
+    signal_time = run(app, SignalPerCallInvoker().invoke, options.calls)
+
+    print("Calls invoked:        %d" % options.calls)
+    print(
+        "Coalescing invoker:   %.3fs (%d batches)"
+        % (coalescing_time, call_queue.batch_count)
+    )
+    print("One signal per call:  %.3fs" % signal_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helper script measuring how fast each template key type validates and
+parses typical values.
+"""
+
+# system imports
+from __future__ import print_function
+import optparse
+import os
+import sys
+import timeit
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "python"))
+sys.path.append(python_folder)
+
+# sgtk imports
+from tank.templatekey import IntegerKey, SequenceKey, StringKey, TimestampKey
+
+BENCHMARKS = [
+    (StringKey("name"), "main"),
+    (StringKey("name", filter_by="alphanumeric"), "main"),
+    (StringKey("name", choices=["ma", "mb", "nk", "hip"]), "hip"),
+    (StringKey("name", exclusions=["Seq", "Shot"]), "shot_010"),
+    (StringKey("name", subset="([A-Z])[a-z]* ([A-Z])[a-z]*"), "John Smith"),
+    (IntegerKey("version", format_spec="03"), "012"),
+    (IntegerKey("version"), "12"),
+    (SequenceKey("frame", format_spec="04"), "0101"),
+    (SequenceKey("frame", format_spec="04"), "%04d"),
+    (SequenceKey("frame", format_spec="04"), "[1001-1100]"),
+    (TimestampKey("time"), "2015-06-24-21-20-30"),
+]
+
+
+def main():
+    """
+    Main entry point for script.
+    """
+    parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option(
+        "--iterations",
+        type="int",
+        default=20000,
+        help="Number of times each value is validated and parsed, "
+        "defaults to %default.",
+    )
+    (options, _) = parser.parse_args()
+
+    print("%d iterations" % options.iterations)
+    for key, value in BENCHMARKS:
+        validate_time = timeit.timeit(
+            lambda: key.validate(value), number=options.iterations
+        )
+        parse_time = timeit.timeit(
+            lambda: key.value_from_str(value), number=options.iterations
+        )
+        print(
+            "%-24s %-22r validate %.3fs, value_from_str %.3fs"
+            % (key, value, validate_time, parse_time)
+        )
+
+
+if __name__ == "__main__":
+    main()
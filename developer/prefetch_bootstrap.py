@@ -0,0 +1,170 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helper script to prepare a shared bundle cache so that render farm or CI
+jobs can bootstrap into an engine without downloading anything.
+
+This resolves the configuration for a project, caches it along with all the
+bundles used by the given engines and copies everything into a shared
+bundle cache, where a ready marker is written once done.
+"""
+
+# system imports
+from __future__ import with_statement
+import os
+
+import sys
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "python"))
+sys.path.append(python_folder)
+
+# sgtk imports
+from sgtk import LogManager
+from sgtk.bootstrap import ToolkitManager
+
+from utils import (
+    authenticate,
+    add_authentication_options,
+    OptionParserLineBreakingEpilog,
+    automated_setup_documentation,
+)
+
+# set up logging
+logger = LogManager.get_logger("prefetch_bootstrap")
+
+
+def main():
+    """
+    Main entry point for script.
+
+    Handles argument parsing and validation and then calls the script payload.
+    """
+
+    usage = "%prog [options] plugin_id target_path"
+
+    desc = "Prefetches a configuration and its bundles into a shared bundle cache."
+
+    epilog = """
+
+Details and Examples
+--------------------
+
+Provide the plugin id used by the jobs and the shared bundle cache they
+use as a fallback, i.e. a path listed in their SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS
+environment variable.
+
+> python prefetch_bootstrap.py
+            --project-id=123
+            --engine=tk-nuke --engine=tk-maya
+            basic.farm /mnt/shared/bundle_cache
+
+When done, a marker named after the plugin id and the project is written to
+the prefetch folder of the bundle cache. It holds the uri of the prefetched
+configuration.
+
+{automated_setup_documentation}
+
+""".format(
+        automated_setup_documentation=automated_setup_documentation
+    )
+    parser = OptionParserLineBreakingEpilog(
+        usage=usage, description=desc, epilog=epilog
+    )
+
+    parser.add_option(
+        "-d", "--debug", default=False, action="store_true", help="Enable debug logging"
+    )
+
+    parser.add_option(
+        "-p",
+        "--project-id",
+        default=None,
+        type="int",
+        help="Id of the project to prefetch the configuration of. Defaults to the site configuration.",
+    )
+
+    parser.add_option(
+        "-e",
+        "--engine",
+        default=None,
+        action="append",
+        dest="engines",
+        help="Engine instance to prefetch the bundles of. Can be repeated. Defaults to all engines.",
+    )
+
+    parser.add_option(
+        "-c",
+        "--base-configuration",
+        default=None,
+        help="Descriptor of the configuration to use when none is set up in Shotgun.",
+    )
+
+    add_authentication_options(parser)
+
+    # parse cmd line
+    (options, remaining_args) = parser.parse_args()
+
+    logger.info("Welcome to the Toolkit bootstrap prefetcher.")
+    logger.info("")
+
+    if options.debug:
+        LogManager().global_debug = True
+
+    if len(remaining_args) != 2:
+        parser.print_help()
+        return 2
+
+    plugin_id = remaining_args[0]
+    # convert any env vars and tildes
+    target_path = os.path.expanduser(os.path.expandvars(remaining_args[1]))
+
+    sg_user = authenticate(options)
+
+    manager = ToolkitManager(sg_user)
+    manager.plugin_id = plugin_id
+    manager.bundle_cache_fallback_paths = [target_path]
+    if options.base_configuration:
+        manager.base_configuration = options.base_configuration
+
+    entity = None
+    if options.project_id is not None:
+        entity = {"type": "Project", "id": options.project_id}
+
+    marker_path = manager.prefetch(entity, engines=options.engines)
+
+    logger.info("")
+    logger.info("Prefetch complete!")
+    logger.info("")
+    logger.info("- The bundle cache is ready in '%s'" % target_path)
+    logger.info("- The ready marker was written to '%s'" % marker_path)
+    logger.info("")
+
+    # all good!
+    return 0
+
+
+if __name__ == "__main__":
+
+    # set up std toolkit logging to file
+    LogManager().initialize_base_file_handler("prefetch_bootstrap")
+
+    # set up output of all sgtk log messages to stdout
+    LogManager().initialize_custom_handler()
+
+    exit_code = 1
+    try:
+        exit_code = main()
+    except Exception as e:
+        logger.exception("An exception was raised: %s" % e)
+
+    sys.exit(exit_code)
@@ -14,11 +14,7 @@ called.
 """
 
 from tank import Hook
-import os
-import sys
-import shutil
-from tank_vendor import six
-from tank.util import is_windows
+from tank.folder import FolderIOExecutor
 
 
 class ProcessFolderCreation(Hook):
@@ -103,95 +99,8 @@ class ProcessFolderCreation(Hook):
         :rtype: list(str)
         """
 
-        # set the umask so that we get true permissions
-        old_umask = os.umask(0)
-        locations = []
-        try:
-
-            # loop through our list of items
-            for i in items:
-
-                action = i.get("action")
-
-                if action in ["entity_folder", "folder"]:
-                    # folder creation
-                    path = i.get("path")
-                    if not os.path.exists(path):
-                        if not preview_mode:
-                            # create the folder using open permissions
-                            os.makedirs(path, 0o777)
-                        locations.append(path)
-
-                elif action == "remote_entity_folder":
-                    # Remote folder creation
-                    #
-                    # NOTE! This action happens when another user has created
-                    # a folder on their machine and we are syncing our local path
-                    # cache to be aware of this folder's existance.
-                    #
-                    # For a traditional setup, where the project storage is shared,
-                    # there is no need to do I/O for remote folders - these folders
-                    # have already been created on the remote storage so you have access
-                    # to them already.
-                    #
-                    # On a setup where each user or group of users is attached to
-                    # different, independendent file storages, which are synced,
-                    # it may be meaningful to "replay" the remote folder creation
-                    # on the local system. This would result in the same folder
-                    # scaffold on each disk which is storing project data.
-                    #
-                    # path = i.get("path")
-                    # if not os.path.exists(path):
-                    #     if not preview_mode:
-                    #         # create the folder using open permissions
-                    #         os.makedirs(path, 0777)
-                    #     locations.append(path)
-                    pass
-
-                elif action == "symlink":
-                    # symbolic link
-                    if is_windows():
-                        # no windows support
-                        continue
-                    path = i.get("path")
-                    target = i.get("target")
-                    # note use of lexists to check existance of symlink
-                    # rather than what symlink is pointing at
-                    if not os.path.lexists(path):
-                        if not preview_mode:
-                            os.symlink(target, path)
-                        locations.append(path)
-
-                elif action == "copy":
-                    # a file copy
-                    source_path = i.get("source_path")
-                    target_path = i.get("target_path")
-                    if not os.path.exists(target_path):
-                        if not preview_mode:
-                            # do a standard file copy
-                            shutil.copy(source_path, target_path)
-                            # set permissions to open
-                            os.chmod(target_path, 0o666)
-                        locations.append(target_path)
-
-                elif action == "create_file":
-                    # create a new file based on content
-                    path = i.get("path")
-                    parent_folder = os.path.dirname(path)
-                    content = i.get("content")
-                    if not os.path.exists(parent_folder) and not preview_mode:
-                        os.makedirs(parent_folder, 0o777)
-                    if not os.path.exists(path):
-                        if not preview_mode:
-                            # create the file
-                            fp = open(path, "wb")
-                            fp.write(six.ensure_binary(content))
-                            fp.close()
-                            # and set permissions to open
-                            os.chmod(path, 0o666)
-                        locations.append(path)
-        finally:
-            # reset umask
-            os.umask(old_umask)
-
-        return locations
+        # The core executor processes the items of independent directories in
+        # parallel, creating parent directories before their contents. To
+        # customize how a particular action is carried out, derive from
+        # FolderIOExecutor and reimplement its _process_item() method.
+        return FolderIOExecutor(preview_mode).execute(items)
@@ -916,6 +916,36 @@ class Sgtk(object):
         )
         return folders
 
+    def plan_filesystem_structure(
+        self, entity_type, entity_id, engine=None, existing_paths=None
+    ):
+        """
+        Computes the folder creation plan for an entity without accessing the disk.
+
+        Unlike :meth:`preview_filesystem_structure`, no check is made to see
+        which paths already exist and the folder creation hook is not run.
+        This is useful when previewing folder creation for large amounts of
+        entities, for example a whole project, where checking every path on
+        disk would be slow. The folder schema is only read from disk if this
+        pipeline configuration has not read it before.
+
+        Each returned item is a dictionary describing an action, with the same
+        keys as the items passed to the ``process_folder_creation`` core hook,
+        e.g. ``action``, ``path`` or ``target_path``, ``entity`` and ``metadata``.
+
+        :param entity_type: Shotgun entity type
+        :param entity_id: Shotgun id or list of ids
+        :param engine: Optional engine name to indicate that a second, engine specific
+                       folder creation pass should be executed for a particular engine.
+        :type engine: String.
+        :param existing_paths: Optional collection of paths known to exist. Items
+            which would create one of these paths are left out of the plan.
+        :returns: List of folder creation items
+        """
+        return folder.plan_filesystem_structure(
+            self, entity_type, entity_id, engine, existing_paths
+        )
+
 
 ##########################################################################################
 # module methods
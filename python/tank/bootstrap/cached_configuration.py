@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import threading
 import traceback
 import pprint
 
@@ -19,7 +20,7 @@ from .errors import TankBootstrapError, TankMissingTankNameError
 
 from ..util import filesystem
 
-from tank_vendor import yaml
+from tank_vendor import six, yaml
 from .configuration import Configuration
 from .configuration_writer import ConfigurationWriter
 from .. import LogManager
@@ -468,17 +469,22 @@ class CachedConfiguration(Configuration):
                 ex,
             )
 
-    def cache_bundles(self, pipeline_configuration, engine_constraint, progress_cb):
+    def cache_bundles(
+        self, pipeline_configuration, engine_constraint, progress_cb, num_workers=1
+    ):
         """
         Caches bundles from the configuration.
 
         If ``engine_constraint`` is set, only the bundles for that engine instance will be cached.
 
         :param pipeline_configuration: PipelineConfiguration we're bootstrapping into.
-        :param engine_constraint: Name of the engine to constrain the caching to.
+        :param engine_constraint: Name of the engine to constrain the caching to, or list of
+            names of engines.
         :param progress_cb: Callback to invoke to report progress on bundle caching. The expected
             signature is: ``def progress_cb(message, current_bundle_idx, nb_total_bundles)``
+        :param int num_workers: Number of bundles downloaded in parallel.
 
+        :returns: List of the descriptors of the bundles cached.
         """
         log.debug("Checking that all bundles are cached locally...")
 
@@ -488,6 +494,8 @@ class CachedConfiguration(Configuration):
                 "caching_policy is CACHE_SPARSE - only check items associated with %s"
                 % engine_constraint
             )
+            if isinstance(engine_constraint, six.string_types):
+                engine_constraint = [engine_constraint]
         else:
             # download and cache the entire config
             log.debug(
@@ -502,7 +510,7 @@ class CachedConfiguration(Configuration):
         for env_name in pipeline_configuration.get_environments():
             env_obj = pipeline_configuration.get_environment(env_name)
             for engine in env_obj.get_engines():
-                if engine_constraint is None or engine == engine_constraint:
+                if not engine_constraint or engine in engine_constraint:
                     descriptor = env_obj.get_engine_descriptor(engine)
                     descriptors[descriptor.get_uri()] = descriptor
                     for app in env_obj.get_apps(engine):
@@ -514,32 +522,104 @@ class CachedConfiguration(Configuration):
                 descriptors[descriptor.get_uri()] = descriptor
 
         # pass 2 - download all apps
+        missing = []
         for idx, descriptor in enumerate(descriptors.values()):
             if not descriptor.exists_local():
-                message = "Downloading %s (%s of %s)..." % (
+                missing.append((idx, descriptor))
+            else:
+                message = "Checking %s (%s of %s)." % (
                     descriptor,
                     idx + 1,
                     len(descriptors),
                 )
+                log.debug(
+                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
+                )
                 progress_cb(message, idx, len(descriptors))
+
+        if num_workers > 1 and len(missing) > 1:
+            failed = self._download_bundles_in_threads(
+                missing, len(descriptors), num_workers, progress_cb
+            )
+            # give failed downloads a second chance one at a time, which
+            # also reports their errors as sequential downloads do.
+            missing = [x for x in missing if x[1] in failed]
+
+        for idx, descriptor in missing:
+            message = "Downloading %s (%s of %s)..." % (
+                descriptor,
+                idx + 1,
+                len(descriptors),
+            )
+            progress_cb(message, idx, len(descriptors))
+            try:
+                self._download_bundle(descriptor)
+            except Exception as e:
+                log.error(
+                    "Downloading %r failed to complete successfully. This bundle will be skipped.",
+                    e,
+                )
+                log.exception(e)
+
+        return list(descriptors.values())
+
+    def _download_bundles_in_threads(
+        self, items, nb_descriptors, num_workers, progress_cb
+    ):
+        """
+        Downloads bundles on worker threads. Progress is reported on the
+        calling thread as downloads complete.
+
+        :param list items: List of ``(index, descriptor)`` tuples of the bundles
+            to download.
+        :param int nb_descriptors: Total number of bundles of the configuration.
+        :param int num_workers: Number of worker threads.
+        :param progress_cb: Callback to invoke to report progress on bundle caching.
+
+        :returns: List of the descriptors whose download failed.
+        """
+        todo = six.moves.queue.Queue()
+        done = six.moves.queue.Queue()
+        for item in items:
+            todo.put(item)
+
+        def download():
+            while True:
+                try:
+                    idx, descriptor = todo.get_nowait()
+                except six.moves.queue.Empty:
+                    return
                 try:
                     self._download_bundle(descriptor)
+                    done.put((idx, descriptor, None))
                 except Exception as e:
-                    log.error(
-                        "Downloading %r failed to complete successfully. This bundle will be skipped.",
-                        e,
-                    )
-                    log.exception(e)
-            else:
-                message = "Checking %s (%s of %s)." % (
+                    done.put((idx, descriptor, e))
+
+        threads = [
+            threading.Thread(target=download)
+            for _ in range(min(num_workers, len(items)))
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        failed = []
+        for _ in range(len(items)):
+            idx, descriptor, error = done.get()
+            if error is None:
+                message = "Downloaded %s (%s of %s)." % (
                     descriptor,
                     idx + 1,
-                    len(descriptors),
-                )
-                log.debug(
-                    "%s exists locally at '%s'.", descriptor, descriptor.get_path()
+                    nb_descriptors,
                 )
-                progress_cb(message, idx, len(descriptors))
+                progress_cb(message, idx, nb_descriptors)
+            else:
+                log.debug("Downloading %r failed: %s", descriptor, error)
+                failed.append(descriptor)
+
+        for thread in threads:
+            thread.join()
+        return failed
 
     def _cleanup_backup_folders(
         self, config_backup_folder_path, core_backup_folder_path
@@ -160,14 +160,19 @@ class Configuration(object):
 
         return self._tank_from_path(path), sg_user
 
-    def cache_bundles(self, pipeline_configuration, engine_constraint, progress_cb):
+    def cache_bundles(
+        self, pipeline_configuration, engine_constraint, progress_cb, num_workers=1
+    ):
         """
         Caches bundles for the configuration.
 
         Default implementation is valid for a configuration which has an already pre-populated
         local bundle cache.
+
+        :returns: List of the descriptors of the bundles cached.
         """
         log.debug("Configuration has local bundle cache, skipping bundle caching.")
+        return []
 
     def _tank_from_path(self, path):
         """
@@ -76,5 +76,12 @@ BUNDLE_CACHE_FALLBACK_PATHS_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS"
 # the name of the folder within the config where bundles are cached.
 BUNDLE_CACHE_FOLDER_NAME = "bundle_cache"
 
+# environment variable setting for how many seconds the pipeline configuration
+# resolved from Shotgun is cached. Unset to disable.
+CONFIG_RESOLUTION_CACHE_TTL_ENV_VAR = "SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL"
+
+# the name of the folder within the site cache where resolutions are cached.
+CONFIG_RESOLUTION_CACHE_FOLDER_NAME = "config_resolution"
+
 # the shotgun engine always has this name
 SHOTGUN_ENGINE_NAME = "tk-shotgun"
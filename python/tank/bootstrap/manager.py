@@ -10,16 +10,20 @@
 
 import os
 import inspect
+import json
+import threading
+import time
 
 from . import constants
 from .errors import TankBootstrapError
 from .configuration import Configuration
 from .resolver import ConfigurationResolver
 from ..authentication import ShotgunAuthenticator
+from ..descriptor import constants as descriptor_constants
 from ..pipelineconfig import PipelineConfiguration
 from .. import LogManager
 from ..errors import TankError
-from ..util import ShotgunPath
+from ..util import ShotgunPath, filesystem, pickle, yaml_cache
 
 log = LogManager.get_logger(__name__)
 
@@ -52,6 +56,9 @@ class ToolkitManager(object):
     _LAUNCHING_ENGINE_RATE = 0.97
     _BOOTSTRAP_COMPLETED = 1
 
+    # Number of bundles downloaded in parallel by prefetch.
+    _PREFETCH_NUM_WORKERS = 8
+
     def __init__(self, sg_user=None):
         """
         :param sg_user: Authenticated Shotgun User object. If you pass in None,
@@ -84,6 +91,10 @@ class ToolkitManager(object):
         self._plugin_id = None
         self._allow_config_overrides = True
 
+        # resolver and arguments of a resolution made from the cache, which
+        # is refreshed once the engine is started.
+        self._resolution_to_refresh = None
+
         # look for the standard env var SHOTGUN_PIPELINE_CONFIGURATION_ID
         # and in case this is set, use it as a default
         if constants.PIPELINE_CONFIG_ID_ENV_VAR in os.environ:
@@ -665,6 +676,179 @@ class ToolkitManager(object):
 
         return path, config.descriptor
 
+    def prefetch(self, entity, engines=None):
+        """
+        Prepares everything needed to bootstrap into the given engines ahead
+        of time, typically before a large number of render farm or CI jobs
+        bootstrap at the same moment.
+
+        The configuration is resolved and cached like :meth:`prepare_engine`
+        does and the bundles used by the engines are downloaded in parallel.
+        The configuration, its core and the bundles are then copied to the
+        first bundle cache fallback path, which should be a bundle cache
+        shared with the machines running the jobs. A YAML cache of the files
+        of the configuration and of the manifests of the bundles, as found in
+        that bundle cache, and a ready marker are written to its ``prefetch``
+        folder. The marker is a json file holding the uri of the configuration
+        descriptor, so the jobs can bootstrap with :meth:`base_configuration`
+        set to it and :meth:`do_shotgun_config_lookup` set to ``False``,
+        without accessing the network.
+
+        :param entity: An entity link. If the entity is not a project, the project for that entity
+            will be resolved.
+        :type entity: Dictionary with keys ``type`` and ``id``, or ``None`` for the site
+        :param list engines: Names of the engine instances to prefetch bundles for. If ``None``,
+            the bundles of all engine instances are prefetched.
+
+        :returns: Path to the ready marker.
+        :raises TankBootstrapError: If no bundle cache fallback path is set.
+        """
+        fallback_paths = [x for x in self._get_bundle_cache_fallback_paths() if x]
+        if not fallback_paths:
+            raise TankBootstrapError(
+                "A bundle cache fallback path is needed to prefetch a configuration."
+            )
+        bundle_cache_root = fallback_paths[0]
+
+        config = self._get_updated_configuration(entity, self.progress_callback)
+        path = config.path.current_os
+
+        try:
+            pc = PipelineConfiguration(path)
+        except TankError as e:
+            raise TankBootstrapError(
+                "Unexpected error while caching configuration: %s" % str(e)
+            )
+
+        self._report_progress(
+            self.progress_callback,
+            self._START_DOWNLOADING_APPS_RATE,
+            "Downloading bundles...",
+        )
+        descriptors = config.cache_bundles(
+            pc,
+            engines,
+            lambda message, idx, nb_descriptors: log.debug(message),
+            num_workers=self._PREFETCH_NUM_WORKERS,
+        )
+
+        self._report_progress(
+            self.progress_callback,
+            self._POST_INSTALL_APPS_RATE,
+            "Copying bundles to %s..." % bundle_cache_root,
+        )
+        if config.descriptor.associated_core_descriptor:
+            descriptors.append(config.descriptor.resolve_core_descriptor())
+        else:
+            log.warning(
+                "%s does not define a core, the latest core will have to be "
+                "downloaded when bootstrapping." % config.descriptor
+            )
+        for descriptor in [config.descriptor] + descriptors:
+            descriptor.clone_cache(bundle_cache_root)
+
+        self._report_progress(
+            self.progress_callback,
+            self._RESOLVING_CONTEXT_RATE,
+            "Writing YAML cache...",
+        )
+        if entity is None:
+            entity_name = "site"
+        else:
+            entity_name = "%s_%s" % (entity["type"], entity["id"])
+        prefetch_path = os.path.join(
+            bundle_cache_root,
+            descriptor_constants.PREFETCH_FOLDER,
+            filesystem.create_valid_filename(
+                "%s_%s" % (self._plugin_id or "no_plugin", entity_name)
+            ),
+        )
+        filesystem.ensure_folder_exists(os.path.dirname(prefetch_path))
+        yaml_cache_path = "%s.pickle" % prefetch_path
+        self._write_yaml_cache(
+            yaml_cache_path, bundle_cache_root, config.descriptor, descriptors
+        )
+
+        marker_path = "%s.json" % prefetch_path
+        with filesystem.atomic_write(marker_path) as fh:
+            json.dump(
+                {
+                    "time": time.time(),
+                    "entity": entity and {"type": entity["type"], "id": entity["id"]},
+                    "plugin_id": self._plugin_id,
+                    "engines": engines,
+                    "configuration": config.descriptor.get_uri(),
+                    "bundles": sorted(x.get_uri() for x in descriptors),
+                    "yaml_cache": os.path.basename(yaml_cache_path),
+                },
+                fh,
+                indent=2,
+            )
+        log.debug("Wrote prefetch marker %s" % marker_path)
+
+        self._report_progress(
+            self.progress_callback, self._BOOTSTRAP_COMPLETED, "Prefetch complete."
+        )
+        return marker_path
+
+    def _write_yaml_cache(
+        self, path, bundle_cache_root, config_descriptor, descriptors
+    ):
+        """
+        Writes the YAML cache of a prefetched configuration, like the
+        ``cache_yaml`` tank command does.
+
+        The cache holds the files of the configuration and the manifests of
+        its bundles as copied to the given bundle cache, so that the machines
+        bootstrapping from that bundle cache find them under the same paths.
+        Pipeline configurations merge the YAML caches found in their bundle
+        cache fallback paths when they are loaded.
+
+        :param str path: Path to write the cache to.
+        :param str bundle_cache_root: Bundle cache the configuration was copied to.
+        :param config_descriptor: Descriptor of the configuration.
+        :param descriptors: Descriptors of the bundles used by the configuration.
+        """
+        cache = yaml_cache.YamlCache()
+
+        config_path = self._get_prefetched_path(bundle_cache_root, config_descriptor)
+        if config_path:
+            for root_dir, dir_names, file_names in os.walk(config_path):
+                for file_name in file_names:
+                    if file_name.endswith(".yml"):
+                        cache.get(
+                            os.path.join(root_dir, file_name), deepcopy_data=False
+                        )
+
+        for descriptor in descriptors:
+            bundle_path = self._get_prefetched_path(bundle_cache_root, descriptor)
+            if bundle_path is None:
+                # the bundle couldn't be downloaded.
+                continue
+            manifest_path = os.path.join(
+                bundle_path, descriptor_constants.BUNDLE_METADATA_FILE
+            )
+            if os.path.exists(manifest_path):
+                cache.get(manifest_path, deepcopy_data=False)
+
+        log.debug("Writing YAML cache to %s" % path)
+        with filesystem.atomic_write(path, "wb") as fh:
+            pickle.dump(cache.get_cached_items(), fh)
+
+    def _get_prefetched_path(self, bundle_cache_root, descriptor):
+        """
+        Returns where a descriptor was copied to in a bundle cache.
+
+        :param str bundle_cache_root: Bundle cache the descriptor was copied to.
+        :param descriptor: Descriptor to look up.
+
+        :returns: Path to the copy, or None if there is none.
+        """
+        path = descriptor._io_descriptor._get_bundle_cache_path(bundle_cache_root)
+        if path and os.path.isdir(path):
+            return path
+        return None
+
     def _cache_bundles(self, config, pc, engine_name, progress_callback):
         """
         Caches the bundles required by the configuration.
@@ -1010,6 +1194,12 @@ class ToolkitManager(object):
                 self._sg_connection,
                 self._sg_user.login,
             )
+            if resolver.resolved_from_cache:
+                self._resolution_to_refresh = (
+                    resolver,
+                    self._pipeline_configuration_identifier,
+                    self._sg_user.login,
+                )
 
         else:
             # fixed resolve based on the base config alone
@@ -1202,12 +1392,50 @@ class ToolkitManager(object):
 
         log.debug("Launched engine %r" % engine)
 
+        self._refresh_resolution_cache_in_background()
+
         self._report_progress(
             progress_callback, self._BOOTSTRAP_COMPLETED, "Engine launched."
         )
 
         return engine
 
+    def _refresh_resolution_cache_in_background(self):
+        """
+        Resolves the pipeline configuration from Shotgun in a background
+        thread if it was resolved from the configuration resolution cache, so
+        the cache is up to date for the next bootstrap.
+
+        :returns: The thread started or None if nothing needs refreshing.
+        """
+        if self._resolution_to_refresh is None:
+            return None
+
+        resolver, pipeline_config_identifier, login = self._resolution_to_refresh
+        self._resolution_to_refresh = None
+        sg_user = self._sg_user
+
+        def refresh():
+            try:
+                # Shotgun connections can't be shared between threads.
+                sg_connection = sg_user.create_sg_connection()
+                if resolver.refresh_shotgun_configuration(
+                    pipeline_config_identifier, sg_connection, login
+                ):
+                    log.info(
+                        "The pipeline configuration resolved from Shotgun changed "
+                        "and will be used the next time the engine is launched."
+                    )
+            except Exception as e:
+                log.debug(
+                    "Could not refresh the configuration resolution cache: %s" % e
+                )
+
+        thread = threading.Thread(target=refresh, name="ConfigurationResolutionRefresh")
+        thread.daemon = True
+        thread.start()
+        return thread
+
     def _legacy_start_shotgun_engine(self, tk, engine_name, entity, ctx):
         """
         Starts the tk-shotgun engine by way of the legacy "start_shotgun_engine"
@@ -0,0 +1,160 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+On disk cache of the pipeline configuration resolved from Shotgun.
+"""
+
+import hashlib
+import os
+
+from . import constants
+from .. import LogManager
+from ..util import filesystem
+from ..util import LocalFileStorageManager
+from tank_vendor import six
+
+log = LogManager.get_logger(__name__)
+
+
+class ConfigurationResolutionCache(object):
+    """
+    Caches the outcome of resolving a pipeline configuration from Shotgun
+    for a limited amount of time.
+
+    Resolving which pipeline configuration to use requires querying Shotgun
+    for all the pipeline configurations of a project and sometimes resolving
+    the latest version of a descriptor remotely, which happens on every
+    bootstrap. With this cache, the id of the pipeline configuration picked
+    and the fully resolved descriptor of its configuration are stored on disk
+    per site, project, plugin id, user and pipeline configuration identifier,
+    and reused until they expire.
+
+    The cache is disabled unless the ``SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL``
+    environment variable is set to the number of seconds resolutions should
+    be reused for.
+    """
+
+    def __init__(
+        self,
+        site_url,
+        project_id,
+        plugin_id,
+        login,
+        pipeline_config_identifier,
+        ttl=None,
+    ):
+        """
+        :param str site_url: Url of the Shotgun site.
+        :param int project_id: Id of the project, ``None`` for the site configuration.
+        :param str plugin_id: Plugin id of the system being bootstrapped.
+        :param str login: Login of the current user.
+        :param pipeline_config_identifier: Name or id of the pipeline configuration
+            requested, ``None`` if it is picked automatically.
+        :param float ttl: Number of seconds resolutions are reused for. Defaults
+            to the value of the ``SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL``
+            environment variable. If None, the cache is disabled.
+        """
+        self._ttl = ttl if ttl is not None else self.get_ttl()
+
+        if not self.enabled:
+            self._path = None
+            return
+
+        key = "%s_%s_%s_%s" % (
+            "site" if project_id is None else "project_%s" % project_id,
+            plugin_id,
+            login,
+            pipeline_config_identifier,
+        )
+        # keep the file name readable, but use a hash to make it unique.
+        digest = hashlib.md5(six.ensure_binary(key)).hexdigest()[:8]
+        self._path = os.path.join(
+            LocalFileStorageManager.get_site_root(
+                site_url, LocalFileStorageManager.CACHE
+            ),
+            constants.CONFIG_RESOLUTION_CACHE_FOLDER_NAME,
+            "%s-%s.json" % (filesystem.create_valid_filename(key)[-80:], digest),
+        )
+
+    @staticmethod
+    def get_ttl():
+        """
+        Returns how long resolutions are reused for, as set by the
+        ``SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL`` environment variable.
+
+        :returns: Number of seconds or None if resolutions shouldn't be cached.
+        """
+        return filesystem.get_cache_ttl(constants.CONFIG_RESOLUTION_CACHE_TTL_ENV_VAR)
+
+    @property
+    def enabled(self):
+        """
+        True if resolutions are cached.
+        """
+        return self._ttl is not None
+
+    @property
+    def path(self):
+        """
+        Path to the file caching the resolution, None if the cache is disabled.
+        """
+        return self._path
+
+    def get(self, include_expired=False):
+        """
+        Reads the cached resolution.
+
+        :param bool include_expired: If True, return the resolution even if
+            it has expired.
+
+        :returns: Dictionary with keys ``pc_id``, ``descriptor`` and
+            ``installed``, as passed to :meth:`set`, or None if nothing
+            is cached or the resolution expired.
+        """
+        if not self.enabled:
+            return None
+
+        return filesystem.read_json_cache(
+            self._path, None if include_expired else self._ttl
+        )
+
+    def set(self, pc_id, descriptor, installed):
+        """
+        Caches a resolution. Failures are logged and ignored.
+
+        :param int pc_id: Id of the pipeline configuration resolved, ``None``
+            if no pipeline configuration was found and the fallback
+            configuration should be used.
+        :param dict descriptor: Descriptor dictionary of the configuration,
+            with any latest version resolved, ``None`` if ``pc_id`` is ``None``.
+        :param bool installed: True if the descriptor is an installed
+            configuration descriptor.
+
+        :returns: The resolution cached.
+        """
+        resolution = {"pc_id": pc_id, "descriptor": descriptor, "installed": installed}
+        if not self.enabled:
+            return resolution
+
+        try:
+            filesystem.write_json_cache(self._path, resolution)
+        except Exception as e:
+            log.debug(
+                "Could not cache configuration resolution in %s: %s", self._path, e
+            )
+        return resolution
+
+    def clear(self):
+        """
+        Removes the cached resolution.
+        """
+        if self._path and os.path.exists(self._path):
+            filesystem.safe_delete_file(self._path)
@@ -28,6 +28,7 @@ from .errors import TankBootstrapError, TankBootstrapInvalidPipelineConfiguratio
 from .baked_configuration import BakedConfiguration
 from .cached_configuration import CachedConfiguration
 from .installed_configuration import InstalledConfiguration
+from .resolution_cache import ConfigurationResolutionCache
 from ..descriptor.descriptor_installed_config import InstalledConfigDescriptor
 from ..util import filesystem
 from ..util import ShotgunPath
@@ -73,6 +74,7 @@ class ConfigurationResolver(object):
         )
         self._plugin_id = plugin_id
         self._bundle_cache_fallback_paths = bundle_cache_fallback_paths or []
+        self._resolved_from_cache = False
 
     def __repr__(self):
         return "<Resolver: proj id %s, plugin id %s>" % (
@@ -753,6 +755,10 @@ class ConfigurationResolver(object):
         in Shotgun. If no suitable configuration is found, return a configuration
         for the given fallback config.
 
+        If the configuration resolution cache is enabled and holds a resolution
+        which hasn't expired, Shotgun isn't queried and the cached resolution
+        is used instead. See :meth:`refresh_shotgun_configuration`.
+
         :param pipeline_config_identifier: Name or id of configuration branch (e.g Primary).
                                            If None, the method will automatically attempt
                                            to resolve the right configuration based on the
@@ -769,6 +775,83 @@ class ConfigurationResolver(object):
             % (self, pipeline_config_identifier)
         )
 
+        self._resolved_from_cache = False
+        cache = self._get_resolution_cache(
+            pipeline_config_identifier, sg_connection, current_login
+        )
+        resolution = cache.get()
+        if resolution is not None:
+            config = self._create_configuration_from_resolution(
+                resolution, fallback_config_descriptor, sg_connection
+            )
+            if config is not None:
+                log.debug("Using the configuration resolution cached in %s", cache.path)
+                self._resolved_from_cache = True
+                return config
+
+        pipeline_config = self._find_shotgun_pipeline_configuration(
+            pipeline_config_identifier, sg_connection, current_login
+        )
+        self._cache_resolution(cache, pipeline_config)
+
+        # now resolve the descriptor to use based on the pipeline config record
+        # default to the fallback descriptor
+        # If no pipeline configuration was found in Shotgun, we will use the fallback descriptor.
+        if pipeline_config is None:
+            log.debug("No pipeline configuration found. Using fallback descriptor")
+
+            # We couldn't resolve anything from Shotgun, so we'll resolve the configuration using
+            # an offline resolve.
+            return self.resolve_configuration(fallback_config_descriptor, sg_connection)
+
+        else:
+            # Something was found in Shotgun, which means we've also potentially resolved its
+            # descriptor!
+            log.debug(
+                "The following pipeline configuration will be used: %s"
+                % pprint.pformat(pipeline_config)
+            )
+
+            pc_id = pipeline_config["id"]
+
+            # If the selected pipeline configuration has no associated configuration descriptor, we
+            # can't do anything about that.
+            if pipeline_config["config_descriptor"] is None:
+                log.debug(
+                    'No source set for %s on the Pipeline Configuration "%s" (id %d).',
+                    sys.platform,
+                    pipeline_config["code"],
+                    pipeline_config["id"],
+                )
+                raise TankBootstrapError(
+                    "The Shotgun pipeline configuration with id %s has no source location specified for "
+                    "your operating system." % pipeline_config["id"]
+                )
+            config_descriptor = pipeline_config["config_descriptor"]
+
+            log.debug(
+                "The descriptor representing the config is %r" % config_descriptor
+            )
+
+            return self._create_configuration_from_descriptor(
+                config_descriptor, sg_connection, pc_id
+            )
+
+    def _find_shotgun_pipeline_configuration(
+        self, pipeline_config_identifier, sg_connection, current_login
+    ):
+        """
+        Finds the pipeline configuration to use in Shotgun.
+
+        :param pipeline_config_identifier: Name or id of configuration branch (e.g Primary).
+            If None, the pipeline configuration is picked automatically.
+        :param sg_connection: Shotgun API instance
+        :param current_login: The login of the currently logged in user.
+
+        :returns: Pipeline configuration entity dictionary with an extra key
+            ``config_descriptor`` holding the resolved descriptor of its
+            configuration, or ``None`` if no pipeline configuration was found.
+        """
         pipeline_config = None
 
         if not isinstance(pipeline_config_identifier, int):
@@ -834,48 +917,131 @@ class ConfigurationResolver(object):
                 sg_connection, pipeline_config
             )
 
-        # now resolve the descriptor to use based on the pipeline config record
-        # default to the fallback descriptor
-        # If no pipeline configuration was found in Shotgun, we will use the fallback descriptor.
+        return pipeline_config
+
+    def refresh_shotgun_configuration(
+        self, pipeline_config_identifier, sg_connection, current_login
+    ):
+        """
+        Resolves the pipeline configuration from Shotgun, ignoring the
+        configuration resolution cache, and updates the cache.
+
+        This is typically called in the background once an engine has been
+        started with a cached resolution, so changes made in Shotgun are
+        picked up by the next bootstrap.
+
+        :param pipeline_config_identifier: Name or id of configuration branch (e.g Primary).
+            If None, the pipeline configuration is picked automatically.
+        :param sg_connection: Shotgun API instance
+        :param current_login: The login of the currently logged in user.
+
+        :returns: True if the resolution differs from the cached one.
+        """
+        cache = self._get_resolution_cache(
+            pipeline_config_identifier, sg_connection, current_login
+        )
+        previous_resolution = cache.get(include_expired=True)
+        pipeline_config = self._find_shotgun_pipeline_configuration(
+            pipeline_config_identifier, sg_connection, current_login
+        )
+        return self._cache_resolution(cache, pipeline_config) != previous_resolution
+
+    @property
+    def resolved_from_cache(self):
+        """
+        True if the last call to :meth:`resolve_shotgun_configuration` used
+        the configuration resolution cache.
+        """
+        return self._resolved_from_cache
+
+    def _get_resolution_cache(
+        self, pipeline_config_identifier, sg_connection, current_login
+    ):
+        """
+        Returns the cache of the resolutions made by this resolver.
+
+        :param pipeline_config_identifier: Name or id of configuration branch.
+        :param sg_connection: Shotgun API instance
+        :param current_login: The login of the currently logged in user.
+
+        :returns: :class:`ConfigurationResolutionCache` instance.
+        """
+        return ConfigurationResolutionCache(
+            sg_connection.base_url,
+            self._project_id,
+            self._plugin_id,
+            current_login,
+            pipeline_config_identifier,
+        )
+
+    def _cache_resolution(self, cache, pipeline_config):
+        """
+        Caches the pipeline configuration resolved from Shotgun.
+
+        :param cache: :class:`ConfigurationResolutionCache` instance.
+        :param dict pipeline_config: Pipeline configuration entity dictionary
+            as returned by :meth:`_find_shotgun_pipeline_configuration`.
+
+        :returns: The resolution cached, or None if the pipeline configuration
+            can't be used on this platform.
+        """
         if pipeline_config is None:
-            log.debug("No pipeline configuration found. Using fallback descriptor")
+            return cache.set(None, None, False)
 
-            # We couldn't resolve anything from Shotgun, so we'll resolve the configuration using
-            # an offline resolve.
-            return self.resolve_configuration(fallback_config_descriptor, sg_connection)
+        cfg_descriptor = pipeline_config["config_descriptor"]
+        if cfg_descriptor is None:
+            # resolving will fail, don't cache anything.
+            cache.clear()
+            return None
+
+        return cache.set(
+            pipeline_config["id"],
+            cfg_descriptor.get_dict(),
+            isinstance(cfg_descriptor, InstalledConfigDescriptor),
+        )
 
-        else:
-            # Something was found in Shotgun, which means we've also potentially resolved its
-            # descriptor!
-            log.debug(
-                "The following pipeline configuration will be used: %s"
-                % pprint.pformat(pipeline_config)
-            )
+    def _create_configuration_from_resolution(
+        self, resolution, fallback_config_descriptor, sg_connection
+    ):
+        """
+        Creates a configuration from a cached resolution.
 
-            pc_id = pipeline_config["id"]
+        :param dict resolution: Resolution as returned by
+            :meth:`ConfigurationResolutionCache.get`.
+        :param fallback_config_descriptor: descriptor dict or string for fallback config.
+        :param sg_connection: Shotgun API instance
 
-            # If the selected pipeline configuration has no associated configuration descriptor, we
-            # can't do anything about that.
-            if pipeline_config["config_descriptor"] is None:
+        :returns: :class:`Configuration` instance or None if the resolution
+            can't be used, e.g. because an installed configuration was removed.
+        """
+        try:
+            if resolution["pc_id"] is None:
                 log.debug(
-                    'No source set for %s on the Pipeline Configuration "%s" (id %d).',
-                    sys.platform,
-                    pipeline_config["code"],
-                    pipeline_config["id"],
+                    "No pipeline configuration found according to the cache. "
+                    "Using fallback descriptor"
                 )
-                raise TankBootstrapError(
-                    "The Shotgun pipeline configuration with id %s has no source location specified for "
-                    "your operating system." % pipeline_config["id"]
+                return self.resolve_configuration(
+                    fallback_config_descriptor, sg_connection
                 )
-            config_descriptor = pipeline_config["config_descriptor"]
 
-            log.debug(
-                "The descriptor representing the config is %r" % config_descriptor
+            cfg_descriptor = create_descriptor(
+                sg_connection,
+                Descriptor.INSTALLED_CONFIG
+                if resolution["installed"]
+                else Descriptor.CONFIG,
+                resolution["descriptor"],
+                fallback_roots=self._bundle_cache_fallback_paths,
+                resolve_latest=False,
             )
-
             return self._create_configuration_from_descriptor(
-                config_descriptor, sg_connection, pc_id
+                cfg_descriptor, sg_connection, resolution["pc_id"]
+            )
+        except Exception as e:
+            log.debug(
+                "Cached configuration resolution %s can't be used, "
+                "resolving from Shotgun instead: %s" % (resolution, e)
             )
+            return None
 
     def _is_centralized_pc_for_current_project(self, shotgun_pc_data):
         """
@@ -0,0 +1,243 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import optparse
+import os
+
+from .action_base import Action
+from .core_upgrade import TkOptParse
+from ..errors import TankError
+from ..descriptor.descriptor import _get_bundle_cache_root
+from ..descriptor.io_descriptor.bundle_cache_gc import BundleCacheGarbageCollector
+from ..descriptor.io_descriptor.content_store import ContentStore
+
+
+class ContentStoreGCAction(Action):
+    """
+    Action that removes the files of the content store of a bundle cache
+    which are no longer used by any bundle.
+    """
+
+    def __init__(self):
+        Action.__init__(
+            self,
+            "content_store_gc",
+            Action.GLOBAL,
+            (
+                "When the SHOTGUN_BUNDLE_CACHE_CONTENT_STORE environment variable is set, "
+                "the files of the bundle cache are deduplicated in a content store. This "
+                "command removes the files of the store which are no longer used by any "
+                "bundle, for example after bundles were deleted from the bundle cache. "
+                "It runs on the default bundle cache unless a path is given."
+            ),
+            "Admin",
+        )
+
+        # this method can be executed via the API
+        self.supports_api = True
+
+        self.parameters = {}
+
+        self.parameters["bundle_cache_root"] = {
+            "description": "Path to the bundle cache. Defaults to the default bundle cache.",
+            "default": None,
+            "type": "str",
+        }
+
+        self.parameters["return_value"] = {
+            "description": "Number of files removed from the content store.",
+            "type": "int",
+        }
+
+    def run_noninteractive(self, log, parameters):
+        """
+        Tank command API accessor.
+        Called when someone runs a tank command through the core API.
+
+        :param log: std python logger
+        :param parameters: dictionary with tank command parameters
+        """
+        # validate params and seed default values
+        computed_params = self._validate_parameters(parameters)
+        return self._run(log, computed_params["bundle_cache_root"])
+
+    def run_interactive(self, log, args):
+        """
+        Tank command accessor
+
+        :param log: std python logger
+        :param args: command line args
+        """
+        if len(args) > 1:
+            raise TankError("Syntax: content_store_gc [bundle_cache_root]")
+        return self._run(log, args[0] if args else None)
+
+    def _run(self, log, bundle_cache_root):
+        """
+        Actual execution payload
+
+        :param log: std python logger
+        :param str bundle_cache_root: Path to the bundle cache or None for the
+            default bundle cache.
+        :returns: Number of files removed from the content store.
+        """
+        bundle_cache_root = bundle_cache_root or _get_bundle_cache_root()
+        if not os.path.isdir(bundle_cache_root):
+            raise TankError("The bundle cache '%s' does not exist!" % bundle_cache_root)
+
+        log.info(
+            "Collecting unused files of the content store of %s..." % bundle_cache_root
+        )
+        num_objects, num_bytes = ContentStore(bundle_cache_root).collect_garbage()
+        log.info(
+            "Removed %d files, freeing %.1f MB." % (num_objects, num_bytes / 1048576.0)
+        )
+        return num_objects
+
+
+class CacheGCAction(Action):
+    """
+    Action that evicts the bundles of a bundle cache which haven't been used
+    for a while.
+    """
+
+    def __init__(self):
+        Action.__init__(
+            self,
+            "cache_gc",
+            Action.GLOBAL,
+            (
+                "Removes the versions of apps, engines, frameworks and configurations "
+                "from the bundle cache which haven't been used for a while. The most "
+                "recently used versions of each bundle are always kept. It runs on the "
+                "default bundle cache unless a path is given. "
+                "Syntax: cache_gc [--max-age=DAYS] [--keep=N] [--dry-run] [bundle_cache_root]"
+            ),
+            "Admin",
+        )
+
+        # this method can be executed via the API
+        self.supports_api = True
+
+        self.parameters = {}
+
+        self.parameters["bundle_cache_root"] = {
+            "description": "Path to the bundle cache. Defaults to the default bundle cache.",
+            "default": None,
+            "type": "str",
+        }
+
+        self.parameters["max_age"] = {
+            "description": "Number of days after which unused bundles are evicted.",
+            "default": BundleCacheGarbageCollector.DEFAULT_MAX_AGE // (24 * 3600),
+            "type": "int",
+        }
+
+        self.parameters["keep"] = {
+            "description": "Number of most recently used versions of each bundle to keep.",
+            "default": BundleCacheGarbageCollector.DEFAULT_KEEP,
+            "type": "int",
+        }
+
+        self.parameters["dry_run"] = {
+            "description": "Only report the bundles which would be evicted.",
+            "default": False,
+            "type": "bool",
+        }
+
+        self.parameters["return_value"] = {
+            "description": "List of paths to the bundles evicted.",
+            "type": "list",
+        }
+
+    def run_noninteractive(self, log, parameters):
+        """
+        Tank command API accessor.
+        Called when someone runs a tank command through the core API.
+
+        :param log: std python logger
+        :param parameters: dictionary with tank command parameters
+        """
+        # validate params and seed default values
+        computed_params = self._validate_parameters(parameters)
+        return self._run(
+            log,
+            computed_params["bundle_cache_root"],
+            computed_params["max_age"],
+            computed_params["keep"],
+            computed_params["dry_run"],
+        )
+
+    def run_interactive(self, log, args):
+        """
+        Tank command accessor
+
+        :param log: std python logger
+        :param args: command line args
+        """
+        parser = TkOptParse()
+        parser.set_usage(optparse.SUPPRESS_USAGE)
+        parser.add_option(
+            "--max-age", type="int", default=self.parameters["max_age"]["default"],
+        )
+        parser.add_option(
+            "--keep", type="int", default=self.parameters["keep"]["default"]
+        )
+        parser.add_option("--dry-run", action="store_true", default=False)
+        options, args = parser.parse_args(args)
+        if len(args) > 1:
+            raise TankError(
+                "Syntax: cache_gc [--max-age=DAYS] [--keep=N] [--dry-run] [bundle_cache_root]"
+            )
+        return self._run(
+            log,
+            args[0] if args else None,
+            options.max_age,
+            options.keep,
+            options.dry_run,
+        )
+
+    def _run(self, log, bundle_cache_root, max_age, keep, dry_run):
+        """
+        Actual execution payload
+
+        :param log: std python logger
+        :param str bundle_cache_root: Path to the bundle cache or None for the
+            default bundle cache.
+        :param int max_age: Number of days after which unused bundles are evicted.
+        :param int keep: Number of most recently used versions of each bundle
+            to keep.
+        :param bool dry_run: If True, only report the bundles which would be
+            evicted.
+        :returns: List of paths to the bundles evicted.
+        """
+        bundle_cache_root = bundle_cache_root or _get_bundle_cache_root()
+        if not os.path.isdir(bundle_cache_root):
+            raise TankError("The bundle cache '%s' does not exist!" % bundle_cache_root)
+        if max_age < 0 or keep < 0:
+            raise TankError(
+                "The maximum age and number of versions to keep can't be negative!"
+            )
+
+        log.info(
+            "Looking for bundles not used in the last %d days in %s..."
+            % (max_age, bundle_cache_root)
+        )
+        collector = BundleCacheGarbageCollector(
+            bundle_cache_root, max_age=max_age * 24 * 3600, keep=keep
+        )
+        evicted = collector.collect(dry_run=dry_run)
+        for path in evicted:
+            log.info("%s %s" % ("Would evict" if dry_run else "Evicted", path))
+        log.info(
+            "%d bundles %s."
+            % (len(evicted), "would be evicted" if dry_run else "evicted")
+        )
+        return evicted
@@ -15,12 +15,14 @@ import fnmatch
 from .action_base import Action
 from ..errors import TankError
 from ..util import yaml_cache, pickle
+from .. import folder
 
 
 class CacheYamlAction(Action):
     """
     Action that ensures that crawls a config, caching all YAML data found
-    to disk as pickled data.
+    to disk as pickled data. The folder schema of the config is precompiled
+    as well.
     """
 
     def __init__(self):
@@ -67,7 +69,7 @@ class CacheYamlAction(Action):
         """
         log.info(
             "This command will traverse the entire configuration and build a "
-            "cache of all YAML data found."
+            "cache of all YAML data found, along with a precompiled folder schema."
         )
 
         root_dir = self.tk.pipeline_configuration.get_path()
@@ -94,5 +96,31 @@ class CacheYamlAction(Action):
         except Exception as e:
             raise TankError("Unable to dump pickled cache data: %s" % e)
 
+        self._precompile_folder_schema(log)
+
         log.info("")
         log.info("Cache yaml completed!")
+
+    def _precompile_folder_schema(self, log):
+        """
+        Writes a precompiled copy of the folder schema next to it, which is
+        used by folder creation instead of scanning the schema, as long as
+        the schema is unchanged.
+        """
+        schema_config_path = self.tk.pipeline_configuration.get_schema_config_location()
+        if not os.path.isdir(schema_config_path):
+            log.debug("No folder schema found in %s" % schema_config_path)
+            return
+
+        precompiled_path = os.path.join(
+            os.path.dirname(schema_config_path),
+            folder.constants.PRECOMPILED_SCHEMA_FILE,
+        )
+        log.debug("Writing precompiled folder schema to %s" % precompiled_path)
+        try:
+            folder.configuration.FolderSchema(schema_config_path).save(precompiled_path)
+        except Exception as e:
+            raise TankError(
+                "Unable to precompile the folder schema to '%s': %s"
+                % (precompiled_path, e)
+            )
@@ -71,14 +71,46 @@ class SynchronizePathCache(Action):
         if len(args) == 1 and args[0] == "--full":
             full_sync = True
 
+        elif len(args) == 1 and args[0].startswith("--poll="):
+            try:
+                interval = float(args[0][len("--poll=") :])
+            except ValueError:
+                interval = 0
+            if interval <= 0:
+                raise TankError(
+                    "The polling interval must be a positive number of seconds."
+                )
+            return self._run_polling(log, interval)
+
         elif len(args) == 0:
             full_sync = False
 
         else:
-            raise TankError("Syntax: synchronize_folders [--full]")
+            raise TankError("Syntax: synchronize_folders [--full] [--poll=<seconds>]")
 
         return self._run(log, full_sync)
 
+    def _run_polling(self, log, interval):
+        """
+        Synchronizes the path cache at a regular interval until interrupted.
+
+        :param log: logger
+        :param interval: Number of seconds between two synchronizations.
+        """
+        if not self.tk.pipeline_configuration.get_shotgun_path_cache_enabled():
+            # same error as a single sync would report
+            return self._run(log, False)
+
+        log.info(
+            "Synchronizing the local folder representation every %s seconds. "
+            "Press ctrl-c to stop." % interval
+        )
+        service = folder.PathCacheSyncService(self.tk, interval)
+        try:
+            service.run()
+        except KeyboardInterrupt:
+            log.info("Stopped after %d synchronizations." % service.sync_count)
+
     def _run(self, log, full_sync):
         """
         Actual business logic for command
@@ -39,6 +39,7 @@ from . import copy_apps
 from . import unregister_folders
 from . import desktop_migration
 from . import cache_yaml
+from . import bundle_cache
 from . import get_entity_commands
 from . import constants
 
@@ -83,6 +84,8 @@ BUILT_IN_ACTIONS = [
     copy_apps.CopyAppsAction,
     desktop_migration.DesktopMigration,
     cache_yaml.CacheYamlAction,
+    bundle_cache.CacheGCAction,
+    bundle_cache.ContentStoreGCAction,
     get_entity_commands.GetEntityCommandsAction,
 ]
 
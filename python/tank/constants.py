@@ -79,8 +79,16 @@ PROFILING_LOG_CHANNEL = "sgtk.stopwatch"
 # environment variable that if set, enables debug logging in the engine
 DEBUG_LOGGING_ENV_VAR = "TK_DEBUG"
 
-# cache data for toolkit init
-TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
+# environment variable that if set, makes the standard log file be
+# written on a background thread
+ASYNC_FILE_LOGGING_ENV_VAR = "TK_ASYNC_LOGGING"
+
+# folder holding the cache data for toolkit init, one file per cached key
+TOOLKIT_INIT_CACHE_FOLDER = "toolkit_init"
+
+# environment variable holding the number of seconds during which a path cache
+# synchronization is considered recent enough for folder creation to skip it.
+PATH_CACHE_SYNC_MAX_AGE_ENV_VAR = "TK_PATH_CACHE_SYNC_MAX_AGE"
 
 # Email address of Shotgun support
 SUPPORT_EMAIL = "support@shotgunsoftware.com"
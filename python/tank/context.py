@@ -16,6 +16,7 @@ Management of the current context, e.g. the current shotgun entity/step/task.
 import os
 import copy
 import json
+import threading
 
 from tank_vendor import yaml
 from . import authentication
@@ -87,6 +88,10 @@ class Context(object):
         self.__additional_entities = additional_entities or []
         self.__source_entity = source_entity
         self._entity_fields_cache = {}
+        self._template_fields_cache = {}
+        self._template_fields_cache_generation = None
+        self._template_fields_cache_lock = threading.Lock()
+        self._path_cache_location = None
 
     def __repr__(self):
         # multi line repr
@@ -251,6 +256,8 @@ class Context(object):
 
         # except:
         # ctx_copy._entity_fields_cache
+        # ctx_copy._template_fields_cache
+        # ctx_copy._path_cache_location
 
         return ctx_copy
 
@@ -591,6 +598,50 @@ class Context(object):
         :raises:            :class:`TankError` if the fields can't be resolved for some reason or if 'validate' is True
                             and any of the context fields for the template weren't found.
         """
+        # The fields only depend on this context, the template and the content
+        # of the path cache, so they are computed once per template until the
+        # path cache is modified, by this process or any other.
+        if self._path_cache_location is None:
+            self._path_cache_location = PathCache.get_location(self.__tk) or ""
+        if self._path_cache_location:
+            generation = PathCache.get_generation(self._path_cache_location)
+        else:
+            # no path cache, the fields can't change.
+            generation = 0
+        if generation is None:
+            return self._template_fields_from_context(template, validate)
+
+        # the template is stored along with the fields so that its id can't
+        # be reused by another template.
+        cache_key = (id(template), validate)
+        with self._template_fields_cache_lock:
+            if generation != self._template_fields_cache_generation:
+                self._template_fields_cache = {}
+                self._template_fields_cache_generation = generation
+            cached_template, cached_fields = self._template_fields_cache.get(
+                cache_key, (None, None)
+            )
+        if cached_template is template:
+            return dict(cached_fields)
+
+        fields = self._template_fields_from_context(template, validate)
+        with self._template_fields_cache_lock:
+            if generation == self._template_fields_cache_generation:
+                self._template_fields_cache[cache_key] = (template, dict(fields))
+        return fields
+
+    def _template_fields_from_context(self, template, validate):
+        """
+        Computes the context fields for a template.
+
+        See :meth:`as_template_fields` for details.
+
+        :param template: :class:`Template` for which the fields will be used.
+        :param validate: If True then the fields found will be checked to ensure
+            that all expected fields for the context were found.
+        :returns: A dictionary of template fields representing the context.
+        :raises: :class:`TankError` if the fields can't be resolved.
+        """
         # Get all entities into a dictionary
         entities = {}
 
@@ -85,6 +85,42 @@ BUNDLE_CACHE_PATH_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_PATH"
 # environment variable used to disable connection to the app store
 DISABLE_APPSTORE_ACCESS_ENV_VAR = "SHOTGUN_DISABLE_APPSTORE_ACCESS"
 
+# maximum number of io descriptors kept in the process wide descriptor cache
+IO_DESCRIPTOR_CACHE_MAX_SIZE = 1000
+
+# number of descriptor cache lookups between two reports of the cache hit rate
+IO_DESCRIPTOR_CACHE_STATS_INTERVAL = 200
+
+# environment variable setting for how many seconds the listings of remote
+# versions of descriptors are cached in the bundle cache. Unset to disable.
+REMOTE_VERSION_CACHE_TTL_ENV_VAR = "SHOTGUN_REMOTE_VERSION_CACHE_TTL"
+
+# folder in the bundle cache where listings of remote versions are cached
+REMOTE_VERSION_CACHE_FOLDER = "remote_versions"
+
+# folder in the bundle cache where mirrors of the repositories of git
+# descriptors are kept
+GIT_MIRROR_FOLDER = "git_mirrors"
+
+# folder in the bundle cache where the bootstrap writes the ready markers and
+# YAML caches of the configurations it prefetched
+PREFETCH_FOLDER = "prefetch"
+
+# environment variable enabling the content addressed store of the bundle
+# cache. Set to "hardlink" or "reflink" to pick how files are shared between
+# bundles. Unset to disable.
+BUNDLE_CACHE_CONTENT_STORE_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_CONTENT_STORE"
+
+# folder in the bundle cache holding the content addressed store
+CONTENT_STORE_FOLDER = "content_store"
+
+# folder inside a cached bundle holding the metadata of the bundle cache
+BUNDLE_CACHE_METADATA_FOLDER = "tk-metadata"
+
+# file inside the metadata folder of a cached bundle touched whenever the
+# bundle is used, so unused bundles can be evicted from the bundle cache.
+BUNDLE_CACHE_USAGE_FILE = "last_used"
+
 # the Descriptor types
 (
     DESCRIPTOR_APP,
@@ -79,19 +79,7 @@ def create_descriptor(
     :returns: :class:`Descriptor` object
     :raises: :class:`TankDescriptorError`
     """
-    # use the environment variable if set - if not, fall back on the override or default locations
-    if os.environ.get(constants.BUNDLE_CACHE_PATH_ENV_VAR):
-        bundle_cache_root_override = os.path.expanduser(
-            os.path.expandvars(os.environ.get(constants.BUNDLE_CACHE_PATH_ENV_VAR))
-        )
-    elif bundle_cache_root_override is None:
-        bundle_cache_root_override = _get_default_bundle_cache_root()
-        filesystem.ensure_folder_exists(bundle_cache_root_override)
-    else:
-        # expand environment variables
-        bundle_cache_root_override = os.path.expanduser(
-            os.path.expandvars(bundle_cache_root_override)
-        )
+    bundle_cache_root_override = _get_bundle_cache_root(bundle_cache_root_override)
 
     fallback_roots = fallback_roots or []
 
@@ -120,6 +108,30 @@ def create_descriptor(
     )
 
 
+def _get_bundle_cache_root(bundle_cache_root_override=None):
+    """
+    Returns the bundle cache descriptors download to.
+
+    :param bundle_cache_root_override: Optional override for the default
+        bundle cache.
+    :returns: The path set by the ``SHOTGUN_BUNDLE_CACHE_PATH`` environment
+        variable if any, otherwise the override, otherwise the default bundle
+        cache, which is created if needed.
+    """
+    # use the environment variable if set - if not, fall back on the override or default locations
+    if os.environ.get(constants.BUNDLE_CACHE_PATH_ENV_VAR):
+        return os.path.expanduser(
+            os.path.expandvars(os.environ.get(constants.BUNDLE_CACHE_PATH_ENV_VAR))
+        )
+    elif bundle_cache_root_override is None:
+        bundle_cache_root = _get_default_bundle_cache_root()
+        filesystem.ensure_folder_exists(bundle_cache_root)
+        return bundle_cache_root
+    else:
+        # expand environment variables
+        return os.path.expanduser(os.path.expandvars(bundle_cache_root_override))
+
+
 def _get_default_bundle_cache_root():
     """
     Returns the cache location for the default bundle cache.
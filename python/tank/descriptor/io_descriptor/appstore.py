@@ -13,6 +13,8 @@ Toolkit App Store Descriptor.
 """
 
 import os
+import functools
+import threading
 from tank_vendor.six.moves import urllib
 import fnmatch
 from tank_vendor.six.moves import http_client
@@ -31,6 +33,7 @@ from ..errors import InvalidAppStoreCredentialsError
 from ... import LogManager
 from .. import constants
 from .downloadable import IODescriptorDownloadable
+from .remote_versions import RemoteVersionCache
 
 from ...constants import SUPPORT_EMAIL
 
@@ -46,6 +49,24 @@ log = LogManager.get_logger(__name__)
 # file where we cache the app store metadata for an item
 METADATA_FILE = ".cached_metadata.pickle"
 
+# Shotgun connections aren't thread safe, so calls to Shotgun and to the app
+# store made by descriptors downloading bundles in parallel are serialized.
+_g_shotgun_lock = threading.RLock()
+
+
+def _serialized(func):
+    """
+    Decorator running a method while holding the lock serializing calls to
+    Shotgun and to the app store.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _g_shotgun_lock:
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
 class IODescriptorAppStore(IODescriptorDownloadable):
     """
@@ -193,6 +214,7 @@ class IODescriptorAppStore(IODescriptorDownloadable):
         return metadata
 
     @LogManager.log_timing
+    @_serialized
     def __refresh_metadata(self, path, sg_bundle_data=None, sg_version_data=None):
         """
         Refreshes the metadata cache on disk. The metadata cache contains
@@ -409,23 +431,28 @@ class IODescriptorAppStore(IODescriptorDownloadable):
         :param destination_path: The directory to which the app store descriptor
         is to be downloaded to.
         """
-        # connect to the app store
-        (sg, script_user) = self.__create_sg_app_store_connection()
+        with _g_shotgun_lock:
+            # connect to the app store
+            (sg, script_user) = self.__create_sg_app_store_connection()
 
-        # fetch metadata from sg...
-        metadata = self.__refresh_metadata(destination_path)
+            # fetch metadata from sg...
+            metadata = self.__refresh_metadata(destination_path)
+
+            # now get the attachment info
+            version = metadata.get("sg_version_data")
 
-        # now get the attachment info
-        version = metadata.get("sg_version_data")
+            # attachment field is on the following form in the case a file has been uploaded:
+            #  {'name': 'v1.2.3.zip',
+            #  'url': 'https://sg-media-usor-01.s3.amazonaws.com/...',
+            #  'content_type': 'application/zip',
+            #  'type': 'Attachment',
+            #  'id': 139,
+            #  'link_type': 'upload'}
+            attachment_id = version[constants.TANK_CODE_PAYLOAD_FIELD]["id"]
 
-        # attachment field is on the following form in the case a file has been uploaded:
-        #  {'name': 'v1.2.3.zip',
-        #  'url': 'https://sg-media-usor-01.s3.amazonaws.com/...',
-        #  'content_type': 'application/zip',
-        #  'type': 'Attachment',
-        #  'id': 139,
-        #  'link_type': 'upload'}
-        attachment_id = version[constants.TANK_CODE_PAYLOAD_FIELD]["id"]
+            # authenticate now, so that only the download itself runs outside
+            # of the lock, reusing the session token.
+            sg.get_session_token()
 
         # download and unzip
         try:
@@ -433,6 +460,7 @@ class IODescriptorAppStore(IODescriptorDownloadable):
         except ShotgunAttachmentDownloadError as e:
             raise TankAppStoreError("Failed to download %s. Error: %s" % (self, e))
 
+    @_serialized
     def _post_download(self, download_path):
         """
         Code run after the descriptor is successfully downloaded to disk
@@ -560,57 +588,34 @@ class IODescriptorAppStore(IODescriptorDownloadable):
             % (self, constraint_pattern)
         )
 
-        # connect to the app store
-        (sg, _) = self.__create_sg_app_store_connection()
-
-        # get latest get the filter logic for what to exclude
-        if constants.APP_STORE_QA_MODE_ENV_VAR in os.environ:
-            sg_filter = [["sg_status_list", "is_not", "bad"]]
-        else:
-            sg_filter = [
-                ["sg_status_list", "is_not", "rev"],
-                ["sg_status_list", "is_not", "bad"],
-            ]
-
-        if self._bundle_type != self.CORE:
-            # find the main entry
-            sg_bundle_data = sg.find_one(
-                self._APP_STORE_OBJECT[self._bundle_type],
-                [["sg_system_name", "is", self._name]],
-                self._BUNDLE_FIELDS_TO_CACHE,
+        # app store credentials are per site, so are the listings.
+        cache_namespace = ["app_store"]
+        if self._sg_connection:
+            cache_namespace.append(
+                urllib.parse.urlparse(self._sg_connection.base_url).netloc
             )
-
-            if sg_bundle_data is None:
-                raise TankDescriptorError(
-                    "App store does not contain an item named '%s'!" % self._name
-                )
-
-            # now get all versions
-            link_field = self._APP_STORE_LINK[self._bundle_type]
-            entity_type = self._APP_STORE_VERSION[self._bundle_type]
-            sg_filter += [[link_field, "is", sg_bundle_data]]
-
-        else:
-            # core doesn't have a parent entity for its versions
-            sg_bundle_data = None
-            entity_type = constants.TANK_CORE_VERSION_ENTITY_TYPE
+        version_cache = RemoteVersionCache(self._bundle_cache_root, cache_namespace)
 
         # optimization: if there is no constraint pattern and no label
-        # set, just download the latest record
-        if self._label is None and constraint_pattern is None:
+        # set, just download the latest record. When the listing is cached,
+        # get all records so that it can be used for any constraint.
+        if (
+            self._label is None
+            and constraint_pattern is None
+            and not version_cache.enabled
+        ):
             # only download one record
             limit = 1
         else:
             limit = 0  # all records
 
-        # now get all versions
-        sg_versions = sg.find(
-            entity_type,
-            filters=sg_filter,
-            fields=self._VERSION_FIELDS_TO_CACHE,
-            order=[{"field_name": "created_at", "direction": "desc"}],
-            limit=limit,
+        qa_mode = constants.APP_STORE_QA_MODE_ENV_VAR in os.environ
+        listing = version_cache.get(
+            "%s-%s%s" % (self._bundle_type, self._name, "-qa" if qa_mode else ""),
+            lambda: self.__find_versions(qa_mode, limit),
         )
+        sg_bundle_data = listing["bundle"]
+        sg_versions = listing["versions"]
 
         log.debug("Downloaded data for %d versions from Shotgun." % len(sg_versions))
 
@@ -682,6 +687,64 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         return desc
 
+    @_serialized
+    def __find_versions(self, qa_mode, limit):
+        """
+        Finds the versions of the bundle in the app store.
+
+        :param bool qa_mode: If True, versions pending review are included.
+        :param int limit: Maximum number of versions to return, 0 for all.
+
+        :returns: Dictionary with the app store data of the bundle under the
+            ``bundle`` key, or None for core, and the list of the app store
+            data of its versions, latest first, under the ``versions`` key.
+        :raises: :class:`TankDescriptorError` if the bundle doesn't exist.
+        """
+        # connect to the app store
+        (sg, _) = self.__create_sg_app_store_connection()
+
+        # get latest get the filter logic for what to exclude
+        if qa_mode:
+            sg_filter = [["sg_status_list", "is_not", "bad"]]
+        else:
+            sg_filter = [
+                ["sg_status_list", "is_not", "rev"],
+                ["sg_status_list", "is_not", "bad"],
+            ]
+
+        if self._bundle_type != self.CORE:
+            # find the main entry
+            sg_bundle_data = sg.find_one(
+                self._APP_STORE_OBJECT[self._bundle_type],
+                [["sg_system_name", "is", self._name]],
+                self._BUNDLE_FIELDS_TO_CACHE,
+            )
+
+            if sg_bundle_data is None:
+                raise TankDescriptorError(
+                    "App store does not contain an item named '%s'!" % self._name
+                )
+
+            # now get all versions
+            link_field = self._APP_STORE_LINK[self._bundle_type]
+            entity_type = self._APP_STORE_VERSION[self._bundle_type]
+            sg_filter += [[link_field, "is", sg_bundle_data]]
+
+        else:
+            # core doesn't have a parent entity for its versions
+            sg_bundle_data = None
+            entity_type = constants.TANK_CORE_VERSION_ENTITY_TYPE
+
+        # now get all versions
+        sg_versions = sg.find(
+            entity_type,
+            filters=sg_filter,
+            fields=self._VERSION_FIELDS_TO_CACHE,
+            order=[{"field_name": "created_at", "direction": "desc"}],
+            limit=limit,
+        )
+        return {"bundle": sg_bundle_data, "versions": sg_versions}
+
     def __match_label(self, tag_list):
         """
         Given a list of tags, see if it matches the given label
@@ -707,6 +770,7 @@ class IODescriptorAppStore(IODescriptorDownloadable):
         return False
 
     @LogManager.log_timing
+    @_serialized
     def __create_sg_app_store_connection(self):
         """
         Creates a shotgun connection that can be used to access the Toolkit app store.
@@ -854,15 +918,18 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         log.debug("Retrieving app store credentials from %s" % sg.base_url)
 
-        # handle proxy setup by pulling the proxy details from the main shotgun connection
+        # handle proxy setup by pulling the proxy details from the main shotgun
+        # connection. The opener isn't installed globally, so that it doesn't
+        # affect concurrent downloads.
         if sg.config.proxy_handler:
-            opener = urllib.request.build_opener(sg.config.proxy_handler)
-            urllib.request.install_opener(opener)
+            open_url = urllib.request.build_opener(sg.config.proxy_handler).open
+        else:
+            open_url = urllib.request.urlopen
 
         # now connect to our site and use a special url to retrieve the app store script key
         session_token = sg.get_session_token()
         post_data = {"session_token": session_token}
-        response = urllib.request.urlopen(
+        response = open_url(
             "%s/api3/sgtk_install_script" % sg.base_url,
             six.ensure_binary(urllib.parse.urlencode(post_data)),
         )
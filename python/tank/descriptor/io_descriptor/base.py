@@ -11,13 +11,13 @@
 import os
 import contextlib
 
+from .content_store import ContentStore
 from .. import constants
 from ... import LogManager
-from ...util import filesystem, sgre as re
+from ...util import filesystem, yaml_cache, sgre as re
 from ...util.version import is_version_newer
 from ..errors import TankDescriptorError, TankMissingManifestError
 
-from tank_vendor import yaml
 from tank_vendor.six.moves import map, urllib
 
 log = LogManager.get_logger(__name__)
@@ -86,6 +86,7 @@ class IODescriptorBase(object):
         self._fallback_roots = []
         self._descriptor_dict = descriptor_dict
         self.__manifest_data = None
+        self.__local_path = None
         self._is_copiable = True
 
     def set_cache_roots(self, primary_root, fallback_roots):
@@ -449,11 +450,9 @@ class IODescriptorBase(object):
                 )
 
             try:
-                file_data = open(file_path)
-                try:
-                    metadata = yaml.load(file_data)
-                finally:
-                    file_data.close()
+                # read through the yaml cache, which may have been populated
+                # from the pickled cache of the configuration.
+                metadata = yaml_cache.g_yaml_cache.get(file_path)
             except Exception as exp:
                 raise TankDescriptorError(
                     "Cannot load metadata file '%s'. Error: %s" % (file_path, exp)
@@ -692,11 +691,23 @@ class IODescriptorBase(object):
         """
         Returns the path to the folder where this item resides. If no
         cache exists for this path, None is returned.
+
+        Once an immutable item has been found locally, its path is
+        remembered and only checked for existence from then on, since it may
+        have been removed from the bundle cache, e.g. by its garbage
+        collector.
         """
+        if self.__local_path is not None:
+            if os.path.isdir(self.__local_path):
+                return self.__local_path
+            self.__local_path = None
+
         for path in self._get_cache_paths():
             # we determine local existence based on the existence of the
             # bundle's directory on disk.
             if self._exists_local(path):
+                if self.is_immutable():
+                    self.__local_path = path
                 return path
 
         return None
@@ -756,6 +767,24 @@ class IODescriptorBase(object):
         # and to the actual I/O
         # pass an empty skip list to ensure we copy things like the .git folder
         filesystem.ensure_folder_exists(new_cache_path, permissions=0o777)
+
+        # materialize the bundle from the content store of the new cache
+        # rather than copying it when the store is enabled.
+        store = ContentStore(cache_root)
+        if store.enabled:
+            try:
+                store.add_folder(new_cache_path, source_path=source_cache_path)
+                return True
+            except Exception as e:
+                log.warning(
+                    "Could not materialize %r from the content store, copying it "
+                    "instead: %s" % (self, e)
+                )
+                # start over, files in the new location may be linked to the
+                # store.
+                filesystem.safe_delete_folder(new_cache_path)
+                filesystem.ensure_folder_exists(new_cache_path, permissions=0o777)
+
         filesystem.copy_folder(source_cache_path, new_cache_path, skip_list=[])
         return True
 
@@ -0,0 +1,215 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Eviction of the bundles of the bundle cache which are no longer used.
+"""
+
+import os
+import time
+import uuid
+
+from .content_store import ContentStore
+from .downloadable import IODescriptorDownloadable
+from .. import constants
+from ... import LogManager
+from ...util import filesystem
+
+log = LogManager.get_logger(__name__)
+
+
+class BundleCacheGarbageCollector(object):
+    """
+    Evicts the bundles of a bundle cache which haven't been used for a while.
+
+    When a process finds a bundle in the bundle cache, it touches the usage
+    file in the metadata folder of the bundle, and touches it again
+    periodically while it keeps finding it. The collector reads these files
+    to find out when bundles were last used and evicts the versions of a
+    bundle which weren't used recently, always keeping the most recently
+    used versions of each bundle.
+
+    Only bundles whose download completed, as tracked by the download
+    transaction marker, are considered, so downloads in progress are never
+    evicted. Bundles downloaded by older cores, which don't have a metadata
+    folder, are never evicted either. Evicted bundles are first renamed
+    into the temporary folder of the bundle cache, so a process looking up a
+    bundle finds either the complete bundle or no bundle at all. Descriptors
+    check that the path they found earlier still exists, so they download
+    an evicted bundle again instead of using it.
+    """
+
+    # bundles not used for this number of seconds are evicted by default.
+    DEFAULT_MAX_AGE = 90 * 24 * 3600
+
+    # number of versions of each bundle always kept by default.
+    DEFAULT_KEEP = 1
+
+    # temporary folders of downloads modified less than this number of
+    # seconds ago are never removed, since they may be downloads in progress,
+    # possibly on other machines sharing the bundle cache.
+    STALE_DOWNLOAD_MIN_AGE = 24 * 3600
+
+    # folders of the bundle cache which don't hold bundles.
+    _SKIP_FOLDERS = [
+        "tmp",
+        constants.CONTENT_STORE_FOLDER,
+        constants.REMOTE_VERSION_CACHE_FOLDER,
+        constants.GIT_MIRROR_FOLDER,
+        constants.PREFETCH_FOLDER,
+    ]
+
+    def __init__(self, bundle_cache_root, max_age=None, keep=None):
+        """
+        :param str bundle_cache_root: Root of the bundle cache.
+        :param float max_age: Bundles not used for this number of seconds are
+            evicted. Defaults to :attr:`DEFAULT_MAX_AGE`. Values shorter than
+            the interval at which processes record the use of bundles are
+            raised to it, so bundles still in use are never evicted.
+        :param int keep: Number of most recently used versions of each bundle
+            which are always kept. Defaults to :attr:`DEFAULT_KEEP`.
+        """
+        self._bundle_cache_root = bundle_cache_root
+        self._max_age = self.DEFAULT_MAX_AGE if max_age is None else max_age
+        if self._max_age < IODescriptorDownloadable.USAGE_REFRESH_INTERVAL:
+            log.warning(
+                "Bundles used in the last %s seconds may still be in use, "
+                "only evicting bundles older than that."
+                % IODescriptorDownloadable.USAGE_REFRESH_INTERVAL
+            )
+            self._max_age = IODescriptorDownloadable.USAGE_REFRESH_INTERVAL
+        self._keep = self.DEFAULT_KEEP if keep is None else keep
+
+    def get_bundles(self):
+        """
+        Lists the bundles of the bundle cache which can be evicted.
+
+        :returns: Dictionary of lists of ``(last_used, path)`` tuples, keyed by
+            the folder holding the versions of a bundle. Lists are sorted from
+            the most recently used version to the least recently used one.
+        """
+        bundles = {}
+        for dir_path, dir_names, file_names in os.walk(self._bundle_cache_root):
+            if dir_path == self._bundle_cache_root:
+                dir_names[:] = [x for x in dir_names if x not in self._SKIP_FOLDERS]
+                continue
+
+            if constants.BUNDLE_CACHE_METADATA_FOLDER in dir_names:
+                dir_names[:] = []
+                last_used = self._get_last_used(dir_path)
+                if last_used is not None:
+                    bundles.setdefault(os.path.dirname(dir_path), []).append(
+                        (last_used, dir_path)
+                    )
+            elif constants.BUNDLE_METADATA_FILE in file_names:
+                # bundle downloaded by an older core, don't look inside.
+                dir_names[:] = []
+            else:
+                dir_names[:] = [x for x in dir_names if not x.startswith(".")]
+
+        for versions in bundles.values():
+            versions.sort(reverse=True)
+        return bundles
+
+    def collect(self, dry_run=False):
+        """
+        Evicts the bundles which haven't been used recently, then removes the
+        files of the content store which are no longer used.
+
+        :param bool dry_run: If True, only report what would be evicted.
+
+        :returns: List of paths to the bundles evicted.
+        """
+        now = time.time()
+        evicted = []
+        for versions in self.get_bundles().values():
+            for last_used, path in versions[self._keep :]:
+                if now - last_used <= self._max_age:
+                    continue
+                if dry_run or self._evict(path):
+                    evicted.append(path)
+
+        if not dry_run:
+            self._remove_stale_downloads(now)
+            ContentStore(self._bundle_cache_root).collect_garbage()
+
+        return sorted(evicted)
+
+    def _get_last_used(self, path):
+        """
+        Returns when a bundle was last used.
+
+        :param str path: Path to the bundle.
+
+        :returns: Time the bundle was last used, or downloaded if it wasn't
+            used since, or None if the bundle isn't completely downloaded.
+        """
+        metadata_folder = os.path.join(path, constants.BUNDLE_CACHE_METADATA_FOLDER)
+        try:
+            last_used = os.path.getmtime(
+                os.path.join(
+                    metadata_folder,
+                    IODescriptorDownloadable._DOWNLOAD_TRANSACTION_COMPLETE_FILE,
+                )
+            )
+        except OSError:
+            return None
+
+        try:
+            return max(
+                last_used,
+                os.path.getmtime(
+                    os.path.join(metadata_folder, constants.BUNDLE_CACHE_USAGE_FILE)
+                ),
+            )
+        except OSError:
+            return last_used
+
+    def _evict(self, path):
+        """
+        Removes a bundle from the bundle cache.
+
+        :param str path: Path to the bundle.
+
+        :returns: True if the bundle was evicted.
+        """
+        # move the bundle out of the way first, which is atomic, so other
+        # processes either find the complete bundle or no bundle at all.
+        trash_path = os.path.join(self._bundle_cache_root, "tmp", uuid.uuid4().hex)
+        try:
+            filesystem.ensure_folder_exists(os.path.dirname(trash_path))
+            os.rename(path, trash_path)
+        except Exception as e:
+            log.warning("Could not evict %s from the bundle cache: %s" % (path, e))
+            return False
+
+        log.debug("Evicting %s from the bundle cache." % path)
+        filesystem.safe_delete_folder(trash_path)
+        return True
+
+    def _remove_stale_downloads(self, now):
+        """
+        Removes the temporary folders left behind by downloads which failed a
+        long time ago, as told by :attr:`STALE_DOWNLOAD_MIN_AGE`.
+
+        :param float now: Current time.
+        """
+        tmp_folder = os.path.join(self._bundle_cache_root, "tmp")
+        if not os.path.isdir(tmp_folder):
+            return
+        for name in os.listdir(tmp_folder):
+            path = os.path.join(tmp_folder, name)
+            try:
+                is_stale = now - os.path.getmtime(path) > self.STALE_DOWNLOAD_MIN_AGE
+            except OSError:
+                continue
+            if is_stale:
+                log.debug("Removing stale download %s" % path)
+                filesystem.safe_delete_folder(path)
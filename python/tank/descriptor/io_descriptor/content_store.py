@@ -0,0 +1,399 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Content addressed store deduplicating the files of the bundle cache.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+
+from .. import constants
+from ... import LogManager
+from ...util import filesystem
+from ...util.platforms import is_linux
+from tank_vendor import six
+
+log = LogManager.get_logger(__name__)
+
+# ioctl request cloning a file on Linux file systems supporting reflinks,
+# e.g. btrfs or xfs.
+_FICLONE = 0x40049409
+
+# size of the chunks files are hashed by.
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentStore(object):
+    """
+    Stores each distinct file of the bundle cache once, keyed by its content.
+
+    Successive versions of a bundle usually only differ by a few files, yet
+    the bundle cache holds a full copy of every version, and cloning the
+    cache into another root copies every file again. When the store is
+    enabled, files of newly cached bundles are added to the store and the
+    bundle folders are materialized from it, either with hard links or with
+    reflinks on file systems supporting copy on write clones. Files which
+    can't be linked, e.g. because the store and the bundle are on different
+    devices, are copied.
+
+    Hard linked files share their content with every bundle using them, so
+    cached bundles must never be modified in place when the store is used in
+    ``hardlink`` mode.
+
+    The store lives in the ``content_store`` folder of the bundle cache and
+    keeps a manifest of the files of each bundle, which tells which objects
+    are in use. Objects no longer used by any bundle are removed by
+    :meth:`collect_garbage`.
+
+    The store is disabled unless the ``SHOTGUN_BUNDLE_CACHE_CONTENT_STORE``
+    environment variable is set to ``hardlink`` or ``reflink``.
+    """
+
+    HARDLINK, REFLINK = ("hardlink", "reflink")
+
+    # objects and manifests modified less than this number of seconds ago are
+    # never collected, so bundles being cached concurrently keep their files.
+    GC_MIN_AGE = 3600
+
+    def __init__(self, bundle_cache_root, mode=None):
+        """
+        :param str bundle_cache_root: Root of the bundle cache the store
+            belongs to.
+        :param str mode: How bundles are materialized from the store, either
+            :attr:`HARDLINK` or :attr:`REFLINK`. Defaults to the value of the
+            ``SHOTGUN_BUNDLE_CACHE_CONTENT_STORE`` environment variable. If
+            None, bundles are not added to the store.
+        """
+        self._bundle_cache_root = bundle_cache_root
+        self._mode = mode or self.get_mode()
+        self._folder = os.path.join(bundle_cache_root, constants.CONTENT_STORE_FOLDER)
+
+    @classmethod
+    def get_mode(cls):
+        """
+        Returns how bundles are materialized from the store, as set by the
+        ``SHOTGUN_BUNDLE_CACHE_CONTENT_STORE`` environment variable.
+
+        :returns: :attr:`HARDLINK`, :attr:`REFLINK` or None if the store is
+            disabled.
+        """
+        value = os.environ.get(constants.BUNDLE_CACHE_CONTENT_STORE_ENV_VAR)
+        if not value:
+            return None
+        value = value.lower()
+        if value not in (cls.HARDLINK, cls.REFLINK):
+            log.warning(
+                "Invalid value '%s' for %s, expected '%s' or '%s'.",
+                value,
+                constants.BUNDLE_CACHE_CONTENT_STORE_ENV_VAR,
+                cls.HARDLINK,
+                cls.REFLINK,
+            )
+            return None
+        return value
+
+    @property
+    def enabled(self):
+        """
+        True if bundles are added to the store.
+        """
+        return self._mode is not None
+
+    def add_folder(self, path, source_path=None, bundle_path=None):
+        """
+        Adds the files of a bundle to the store.
+
+        When a source is given, the bundle is materialized from the source,
+        which is typically a bundle in another bundle cache. Otherwise the
+        files of the bundle are replaced in place by files materialized from
+        the store.
+
+        The metadata folder of the bundle is never added to the store.
+
+        :param str path: Path to the bundle.
+        :param str source_path: Path to the bundle to materialize the bundle
+            from, or None to add the bundle in place.
+        :param str bundle_path: Final location of the bundle, if it is
+            currently written to a temporary location. Defaults to ``path``.
+        """
+        source_path = source_path or path
+        objects = {}
+
+        for dir_path, dir_names, file_names in os.walk(source_path):
+            relative_dir = os.path.relpath(dir_path, source_path)
+            if relative_dir == os.curdir:
+                relative_dir = ""
+            target_dir = os.path.join(path, relative_dir)
+            filesystem.ensure_folder_exists(target_dir)
+
+            metadata_folder = constants.BUNDLE_CACHE_METADATA_FOLDER
+            if not relative_dir and metadata_folder in dir_names:
+                dir_names.remove(metadata_folder)
+                if source_path != path:
+                    filesystem.copy_folder(
+                        os.path.join(source_path, metadata_folder),
+                        os.path.join(path, metadata_folder),
+                        skip_list=[],
+                    )
+
+            # symlinks are not followed by os.walk, recreate them as they are.
+            for name in list(dir_names):
+                if os.path.islink(os.path.join(dir_path, name)):
+                    dir_names.remove(name)
+                    self._copy_symlink(dir_path, target_dir, name, source_path != path)
+
+            for name in file_names:
+                if os.path.islink(os.path.join(dir_path, name)):
+                    self._copy_symlink(dir_path, target_dir, name, source_path != path)
+                    continue
+                relative_path = os.path.join(relative_dir, name).replace(os.sep, "/")
+                objects[relative_path] = self._add_file(
+                    os.path.join(dir_path, name), os.path.join(target_dir, name)
+                )
+
+        self._write_manifest(bundle_path or path, objects)
+        log.debug("Added %d files of %s to the content store.", len(objects), path)
+
+    def collect_garbage(self, min_age=None):
+        """
+        Removes the objects of the store which are no longer used by any
+        bundle, along with the manifests of bundles which were removed from
+        the bundle cache.
+
+        :param float min_age: Objects and manifests modified less than this
+            number of seconds ago are kept. Defaults to :attr:`GC_MIN_AGE`.
+
+        :returns: A tuple with the number of objects removed and the number
+            of bytes they used.
+        """
+        min_age = self.GC_MIN_AGE if min_age is None else min_age
+        now = time.time()
+
+        def is_old(file_path):
+            try:
+                return now - os.path.getmtime(file_path) > min_age
+            except OSError:
+                return False
+
+        used_objects = set()
+        manifest_folder = os.path.join(self._folder, "manifests")
+        for name in self._list_folder(manifest_folder):
+            manifest_path = os.path.join(manifest_folder, name)
+            try:
+                with open(manifest_path, "r") as fh:
+                    manifest = json.load(fh)
+                bundle_path = os.path.join(
+                    self._bundle_cache_root, *manifest["path"].split("/")
+                )
+                objects = manifest["objects"].values()
+            except (IOError, OSError, ValueError, TypeError, KeyError, AttributeError):
+                if is_old(manifest_path):
+                    filesystem.safe_delete_file(manifest_path)
+                continue
+
+            # bundles being cached have no folder yet, keep their manifests
+            # for a while.
+            if not os.path.isdir(bundle_path) and is_old(manifest_path):
+                log.debug("Removing manifest of deleted bundle %s", bundle_path)
+                filesystem.safe_delete_file(manifest_path)
+                continue
+            used_objects.update(objects)
+
+        num_objects = 0
+        num_bytes = 0
+        object_folder = os.path.join(self._folder, "objects")
+        for prefix in self._list_folder(object_folder):
+            for name in self._list_folder(os.path.join(object_folder, prefix)):
+                object_path = os.path.join(object_folder, prefix, name)
+                if name in used_objects or not is_old(object_path):
+                    continue
+                try:
+                    size = os.path.getsize(object_path)
+                    os.remove(object_path)
+                except OSError as e:
+                    log.debug("Could not remove %s: %s", object_path, e)
+                    continue
+                # temporary files left behind by interrupted processes are
+                # removed too, but they don't count as objects.
+                if not name.endswith(".tmp"):
+                    num_objects += 1
+                    num_bytes += size
+
+        log.debug(
+            "Removed %d unused objects (%d bytes) from %s.",
+            num_objects,
+            num_bytes,
+            self._folder,
+        )
+        return num_objects, num_bytes
+
+    def _add_file(self, source_path, path):
+        """
+        Adds a file to the store and materializes it.
+
+        :param str source_path: Path to the file to add.
+        :param str path: Path to materialize the file to. If it is the same as
+            the source, the file is replaced with the materialized object.
+
+        :returns: Name of the object holding the file.
+        """
+        name = "%s-%o" % (
+            self._hash_file(source_path),
+            stat.S_IMODE(os.stat(source_path).st_mode),
+        )
+        object_path = os.path.join(self._folder, "objects", name[:2], name)
+
+        try:
+            # refresh the object so it isn't collected while it's being used.
+            os.utime(object_path, None)
+        except OSError:
+            self._add_object(source_path, object_path)
+            if source_path == path:
+                # the file is the object or a copy of it already.
+                return name
+
+        if source_path == path:
+            # materialize next to the file first, so the file is left
+            # untouched if something goes wrong.
+            tmp_path = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+            self._materialize(object_path, tmp_path)
+            os.remove(path)
+            os.rename(tmp_path, path)
+        else:
+            self._materialize(object_path, path)
+        return name
+
+    def _add_object(self, source_path, object_path):
+        """
+        Adds a new object to the store.
+
+        :param str source_path: Path to the file holding the content.
+        :param str object_path: Path to the object.
+        """
+        filesystem.ensure_folder_exists(os.path.dirname(object_path))
+        # write to a temporary name first so partially written objects are
+        # never used.
+        tmp_path = "%s.%s.tmp" % (object_path, uuid.uuid4().hex)
+        self._materialize(source_path, tmp_path)
+        try:
+            os.rename(tmp_path, object_path)
+        except OSError:
+            # another process added the object in the meantime, which makes
+            # the rename fail on Windows.
+            filesystem.safe_delete_file(tmp_path)
+
+    def _materialize(self, object_path, path):
+        """
+        Materializes an object, falling back on a copy if it can't be linked.
+
+        :param str object_path: Path to the object.
+        :param str path: Path to materialize the object to.
+        """
+        try:
+            if self._mode == self.REFLINK:
+                _reflink(object_path, path)
+            else:
+                os.link(object_path, path)
+            return
+        except (IOError, OSError, AttributeError) as e:
+            # AttributeError is raised on platforms without os.link.
+            log.debug("Could not link %s to %s: %s", object_path, path, e)
+        filesystem.safe_delete_file(path)
+        shutil.copy2(object_path, path)
+
+    def _copy_symlink(self, source_dir, target_dir, name, copy):
+        """
+        Recreates a symlink of a bundle.
+
+        :param str source_dir: Folder holding the symlink.
+        :param str target_dir: Folder to recreate the symlink in.
+        :param str name: Name of the symlink.
+        :param bool copy: False if the bundle is added in place and the
+            symlink is already there.
+        """
+        if copy:
+            os.symlink(
+                os.readlink(os.path.join(source_dir, name)),
+                os.path.join(target_dir, name),
+            )
+
+    def _write_manifest(self, bundle_path, objects):
+        """
+        Writes the manifest of the objects used by a bundle.
+
+        :param str bundle_path: Path to the bundle in the bundle cache.
+        :param dict objects: Names of the objects used by the bundle, keyed by
+            the path to the files relative to the bundle.
+        """
+        relative_path = os.path.relpath(bundle_path, self._bundle_cache_root).replace(
+            os.sep, "/"
+        )
+        manifest_path = os.path.join(
+            self._folder,
+            "manifests",
+            "%s.json" % hashlib.md5(six.ensure_binary(relative_path)).hexdigest(),
+        )
+        filesystem.ensure_folder_exists(os.path.dirname(manifest_path))
+        with filesystem.atomic_write(manifest_path) as fh:
+            json.dump({"path": relative_path, "objects": objects}, fh)
+
+    def _hash_file(self, path):
+        """
+        Computes the digest of the content of a file.
+
+        :param str path: Path to the file.
+
+        :returns: The hexadecimal sha256 digest.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _list_folder(self, path):
+        """
+        Lists a folder of the store.
+
+        :param str path: Path to the folder.
+
+        :returns: List of names, empty if the folder doesn't exist.
+        """
+        try:
+            return os.listdir(path)
+        except OSError:
+            return []
+
+
+def _reflink(source_path, path):
+    """
+    Clones a file, sharing its content until either copy is modified.
+
+    :param str source_path: Path to the file to clone.
+    :param str path: Path to the clone.
+
+    :raises OSError: If the platform or file system doesn't support clones.
+    """
+    if not is_linux():
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are only supported on Linux.")
+
+    import fcntl
+
+    with open(source_path, "rb") as source_fh:
+        with open(path, "wb") as fh:
+            fcntl.ioctl(fh.fileno(), _FICLONE, source_fh.fileno())
+    shutil.copymode(source_path, path)
@@ -10,9 +10,12 @@
 
 import contextlib
 import os
+import time
 import uuid
 
 from .base import IODescriptorBase
+from .content_store import ContentStore
+from .. import constants
 from ..errors import TankDescriptorIOError
 from ...util import filesystem
 
@@ -46,6 +49,14 @@ class IODescriptorDownloadable(IODescriptorBase):
 
     _DOWNLOAD_TRANSACTION_COMPLETE_FILE = "install_complete"
 
+    # the use of a bundle is recorded again by a process which keeps using
+    # it after this number of seconds.
+    USAGE_REFRESH_INTERVAL = 3600
+
+    # time at which the use of bundles was last recorded by this process,
+    # keyed by path.
+    _recorded_usages = {}
+
     def download_local(self):
         """
         Downloads the data represented by the descriptor into the primary bundle
@@ -116,6 +127,8 @@ class IODescriptorDownloadable(IODescriptorBase):
                 "Failed to download into path %s: %s" % (temporary_path, e)
             )
 
+        self._add_to_content_store(temporary_path, target)
+
         log.debug(
             "Attempting to move descriptor %s from temporary path %s to target path %s."
             % (self, temporary_path, target)
@@ -219,6 +232,67 @@ class IODescriptorDownloadable(IODescriptorBase):
             # download completed ok! Run post processing
             self._post_download(target)
 
+    def _add_to_content_store(self, path, target):
+        """
+        Adds a downloaded bundle to the content store of the bundle cache, if
+        the store is enabled. Failures are logged and ignored, since the
+        bundle is complete without the store.
+
+        :param str path: Temporary location the bundle was downloaded to.
+        :param str target: Location the bundle is about to be moved to.
+        """
+        store = ContentStore(self._bundle_cache_root)
+        if not store.enabled:
+            return
+        try:
+            store.add_folder(path, bundle_path=target)
+        except Exception as e:
+            log.warning(
+                "Could not add %s to the content store of the bundle cache: %s"
+                % (self, e)
+            )
+
+    def get_path(self):
+        """
+        Returns the path to the folder where this item resides. If no
+        cache exists for this path, None is returned.
+
+        When a bundle is found in the bundle cache, its use is recorded so
+        bundles which are no longer used can be evicted from the cache. A
+        process records the use of a bundle at most once every
+        :attr:`USAGE_REFRESH_INTERVAL` seconds.
+        """
+        path = super(IODescriptorDownloadable, self).get_path()
+        if path is not None:
+            recorded = self._recorded_usages.get(path)
+            if recorded is None or time.time() - recorded > self.USAGE_REFRESH_INTERVAL:
+                self._record_usage(path)
+        return path
+
+    def _record_usage(self, path):
+        """
+        Records that a bundle is used by touching the usage file in its
+        metadata folder. Failures are logged and ignored, since the bundle
+        cache may be read only.
+
+        :param str path: Path to the bundle.
+        """
+        IODescriptorDownloadable._recorded_usages[path] = time.time()
+
+        metadata_folder = self._get_metadata_folder(path)
+        if not os.path.isdir(metadata_folder):
+            # bundles downloaded by older cores are never evicted.
+            return
+
+        usage_file = os.path.join(metadata_folder, constants.BUNDLE_CACHE_USAGE_FILE)
+        try:
+            if os.path.exists(usage_file):
+                os.utime(usage_file, None)
+            else:
+                filesystem.touch_file(usage_file)
+        except Exception as e:
+            log.debug("Could not record the use of %s: %s" % (path, e))
+
     def _get_temporary_cache_path(self):
         """
         Returns a temporary download cache path for this descriptor.
@@ -301,4 +375,4 @@ class IODescriptorDownloadable(IODescriptorBase):
         # Do not set this as a hidden folder (with a . in front) in case somebody does a
         # rm -rf * or a manual deletion of the files. This will ensure this is treated just like
         # any other file.
-        return os.path.join(path, "tk-metadata")
+        return os.path.join(path, constants.BUNDLE_CACHE_METADATA_FOLDER)
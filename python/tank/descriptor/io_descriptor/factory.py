@@ -8,8 +8,11 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import collections
 import copy
+import threading
 
+from .. import constants
 from ..errors import TankDescriptorError
 from .base import IODescriptorBase
 
@@ -19,6 +22,147 @@ from tank_vendor import six
 log = LogManager.get_logger(__name__)
 
 
+class IODescriptorCache(object):
+    """
+    Bounded, thread safe cache of io descriptor instances, shared by the
+    whole process.
+
+    Environments, bundle caching and updates keep creating descriptors for
+    the same bundles. Immutable descriptors always point at the same
+    content, so a single instance can be shared by all of them. This saves
+    parsing, path computations, disk checks and manifest reads, which are
+    all memoised by the instance.
+
+    When the cache is full, the least recently used descriptor is evicted.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: Maximum number of descriptors to keep.
+        """
+        self._max_size = max_size
+        self._descriptors = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        """
+        Number of lookups which found a descriptor.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        Number of lookups which didn't find a descriptor.
+        """
+        return self._misses
+
+    def __len__(self):
+        return len(self._descriptors)
+
+    def get(self, key):
+        """
+        Looks up a descriptor.
+
+        :param key: Key of the descriptor, see :meth:`get_key`.
+
+        :returns: The cached descriptor or None.
+        """
+        with self._lock:
+            descriptor = self._descriptors.pop(key, None)
+            if descriptor is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                # re-insert to mark the descriptor as the most recently used.
+                self._descriptors[key] = descriptor
+            hits = self._hits
+            lookups = self._hits + self._misses
+
+        if lookups % constants.IO_DESCRIPTOR_CACHE_STATS_INTERVAL == 0:
+            log.debug(
+                "Descriptor cache: %d hits out of %d lookups (%.1f%%), "
+                "%d descriptors cached.",
+                hits,
+                lookups,
+                100.0 * hits / lookups,
+                len(self._descriptors),
+            )
+        return descriptor
+
+    def add(self, key, descriptor):
+        """
+        Adds a descriptor to the cache.
+
+        If another thread cached a descriptor for the same key in the
+        meantime, that descriptor is kept so that all callers share the same
+        instance.
+
+        :param key: Key of the descriptor, see :meth:`get_key`.
+        :param descriptor: Descriptor to add.
+
+        :returns: The cached descriptor.
+        """
+        with self._lock:
+            cached_descriptor = self._descriptors.get(key)
+            if cached_descriptor is not None:
+                return cached_descriptor
+
+            self._descriptors[key] = descriptor
+            while len(self._descriptors) > self._max_size:
+                self._descriptors.popitem(last=False)
+        return descriptor
+
+    def clear(self):
+        """
+        Removes all descriptors from the cache and resets the statistics.
+        """
+        with self._lock:
+            self._descriptors.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def get_key(
+        sg, descriptor_type, descriptor_dict, bundle_cache_root, fallback_roots
+    ):
+        """
+        Computes the key of a descriptor.
+
+        :param sg: Shotgun connection the descriptor uses.
+        :param descriptor_type: Either AppDescriptor.APP, CORE, ENGINE or FRAMEWORK.
+        :param dict descriptor_dict: Descriptor dictionary.
+        :param str bundle_cache_root: Root path to where downloaded apps are cached.
+        :param list fallback_roots: List of fallback cache locations.
+
+        :returns: A hashable key.
+        """
+        return (
+            # the uri sorts the parameters, so equivalent dictionaries and
+            # uris get the same key.
+            IODescriptorBase.uri_from_dict(descriptor_dict),
+            descriptor_type,
+            bundle_cache_root,
+            tuple(fallback_roots or []),
+            # different connections may point at different sites or users.
+            sg,
+        )
+
+
+# Descriptors customized by the configuration descriptor classes are never
+# shared.
+_UNCACHED_DESCRIPTOR_TYPES = (
+    constants.DESCRIPTOR_CONFIG,
+    constants.DESCRIPTOR_INSTALLED_CONFIG,
+)
+
+# Process wide descriptor cache.
+g_io_descriptor_cache = IODescriptorCache(constants.IO_DESCRIPTOR_CACHE_MAX_SIZE)
+
+
 def create_io_descriptor(
     sg,
     descriptor_type,
@@ -35,7 +179,8 @@ def create_io_descriptor(
     A descriptor is immutable in the sense that it always points at the same code -
     this may be a particular frozen version out of that toolkit app store that
     will not change or it may be a dev area where the code can change. Given this,
-    descriptors are cached and only constructed once for a given descriptor URL.
+    immutable descriptors are cached and only constructed once for a given descriptor
+    URL, bundle type and set of cache roots, unless the latest version is requested.
 
     :param sg: Shotgun connection to associated site
     :param descriptor_type: Either AppDescriptor.APP, CORE, ENGINE or FRAMEWORK
@@ -79,8 +224,6 @@ def create_io_descriptor(
         # make a copy to make sure the original object is never altered
         descriptor_dict = copy.deepcopy(dict_or_uri)
 
-    # at this point we didn't have a cache hit,
-    # so construct the object manually
     if resolve_latest and is_descriptor_version_missing(descriptor_dict):
         # if someone is requesting a latest descriptor and not providing a version token
         # make sure to add an artificial one so that we can resolve it.
@@ -93,12 +236,31 @@ def create_io_descriptor(
         # bytes to a str.
         descriptor_dict["version"] = six.ensure_str(descriptor_dict["version"])
 
+    cache_key = None
+    if (
+        not resolve_latest
+        and descriptor_type not in _UNCACHED_DESCRIPTOR_TYPES
+        and "type" in descriptor_dict
+    ):
+        cache_key = IODescriptorCache.get_key(
+            sg, descriptor_type, descriptor_dict, bundle_cache_root, fallback_roots
+        )
+        descriptor = g_io_descriptor_cache.get(cache_key)
+        if descriptor is not None:
+            return descriptor
+
+    # at this point we didn't have a cache hit,
+    # so construct the object manually
+
     # instantiate the Descriptor
     descriptor = IODescriptorBase.create(descriptor_type, descriptor_dict, sg)
 
     # specify where to go look for caches
     descriptor.set_cache_roots(bundle_cache_root, fallback_roots)
 
+    if cache_key is not None and descriptor.is_immutable():
+        descriptor = g_io_descriptor_cache.add(cache_key, descriptor)
+
     if resolve_latest:
         # attempt to get "remote" latest first
         # and if that fails, fall back on the latest item
@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 import os
 import uuid
+import hashlib
 import shutil
 import tempfile
 import subprocess
@@ -17,12 +18,18 @@ from .downloadable import IODescriptorDownloadable
 from ... import LogManager
 from ...util.process import subprocess_check_output, SubprocessCalledProcessError
 
+from .. import constants
 from ..errors import TankError
 from ...util import filesystem
 from ...util import is_windows
 
+from tank_vendor import six
+
 log = LogManager.get_logger(__name__)
 
+# number of seconds to wait for another process updating a git mirror.
+_MIRROR_LOCK_TIMEOUT = 300
+
 
 def _can_hide_terminal():
     """
@@ -123,17 +130,7 @@ class IODescriptorGit(IODescriptorDownloadable):
 
         filesystem.ensure_folder_exists(parent_folder)
 
-        # first probe to check that git exists in our PATH
-        log.debug("Checking that git exists and can be executed...")
-        try:
-            output = _check_output(["git", "--version"])
-        except:
-            log.exception("Unexpected error:")
-            raise TankGitError(
-                "Cannot execute the 'git' command. Please make sure that git is "
-                "installed on your system and that the git executable has been added to the PATH."
-            )
-        log.debug("Git installed: %s" % output)
+        self._ensure_git_is_installed()
 
         # Note: git doesn't like paths in single quotes when running on
         # windows - it also prefers to use forward slashes
@@ -145,7 +142,42 @@ class IODescriptorGit(IODescriptorDownloadable):
         # each repo that we clone to be completely independent on a filesystem level.
         log.debug("Git Cloning %r into %s" % (self, target_path))
         cmd = 'git clone --no-hardlinks -q "%s" "%s"' % (self._path, target_path)
+        self._execute_remote_git_command(cmd)
+        log.debug("Git clone into '%s' successful." % target_path)
+
+        # clone worked ok! Now execute git commands on this repo
+        return self._execute_git_commands(target_path, commands)
 
+    def _ensure_git_is_installed(self):
+        """
+        Probes that git exists in our PATH.
+
+        :raises: TankGitError if git cannot be executed.
+        """
+        log.debug("Checking that git exists and can be executed...")
+        try:
+            output = _check_output(["git", "--version"])
+        except:
+            log.exception("Unexpected error:")
+            raise TankGitError(
+                "Cannot execute the 'git' command. Please make sure that git is "
+                "installed on your system and that the git executable has been added to the PATH."
+            )
+        log.debug("Git installed: %s" % output)
+
+    def _execute_remote_git_command(self, cmd):
+        """
+        Executes a git command which connects to the remote repository.
+
+        The command is executed via the subprocess module, ensuring there is
+        no terminal that will pop for credentials. If the operation failed,
+        it is executed a second time with os.system, ensuring that there is an
+        initialized shell environment, allowing git to potentially request
+        shell based authentication for repositories which require credentials.
+
+        :param str cmd: Full git command line, e.g. 'git clone -q "x" "y"'
+        :raises: TankGitError on git failure
+        """
         run_with_os_system = True
 
         # We used to call only os.system here. On macOS and Linux this behaved correctly,
@@ -195,10 +227,17 @@ class IODescriptorGit(IODescriptorDownloadable):
                 "Error executing git operation. The git command '%s' "
                 "returned error code %s." % (cmd, status)
             )
-        log.debug("Git clone into '%s' successful." % target_path)
 
-        # clone worked ok! Now execute git commands on this repo
+    def _execute_git_commands(self, target_path, commands):
+        """
+        Executes the given list of git commands in the directory scope of a
+        local repository.
 
+        :param target_path: path to the local repository
+        :param commands: list git commands to execute, e.g. ['checkout x']
+        :returns: stdout and stderr of the last command executed as a string
+        :raises: TankGitError on git failure
+        """
         output = None
 
         # note: for windows, we use git -C to point git to the right current
@@ -265,6 +304,216 @@ class IODescriptorGit(IODescriptorDownloadable):
             log.debug("Cleaning up temp location '%s'" % clone_tmp)
             shutil.rmtree(clone_tmp, ignore_errors=True)
 
+    def _get_remote_refs(self, ref_type):
+        """
+        Lists the tags or branches of the remote repository.
+
+        The refs are listed with ``git ls-remote``, which doesn't need to
+        clone the repository. If that fails, e.g. because git needs to
+        request credentials, they are listed from the mirror of the
+        repository instead, see :meth:`_update_mirror`.
+
+        :param str ref_type: Either "tags" or "heads".
+        :returns: Dictionary of commit hashes keyed by tag or branch name.
+        :raises: TankGitError on git failure
+        """
+        self._ensure_git_is_installed()
+
+        prefix = "refs/%s/" % ref_type
+        refs = {}
+
+        cmd = ["git", "ls-remote", "--%s" % ref_type, self._path]
+        log.debug("Executing '%s'" % " ".join(cmd))
+        try:
+            # make sure git fails rather than waiting for credentials to be
+            # entered on a terminal which may be hidden.
+            environ = {}
+            environ.update(os.environ)
+            environ["GIT_TERMINAL_PROMPT"] = "0"
+            output = _check_output(cmd, env=environ)
+        except SubprocessCalledProcessError as e:
+            log.debug(
+                "Could not list remote refs, using the mirror instead: %s" % e.output
+            )
+        else:
+            for line in output.splitlines():
+                # lines are on the form "<hash>\trefs/tags/<name>". Annotated
+                # tags are listed a second time with a ^{} suffix and the hash
+                # of the commit they point at.
+                fields = line.split("\t")
+                if len(fields) != 2 or not fields[1].startswith(prefix):
+                    # stderr is redirected to stdout, skip any message from git.
+                    continue
+                name = fields[1][len(prefix) :]
+                if name.endswith("^{}"):
+                    refs[name[:-3]] = fields[0]
+                else:
+                    refs.setdefault(name, fields[0])
+            return refs
+
+        output = self._execute_mirror_git_commands(
+            [
+                'for-each-ref --format="%%(objectname) %%(*objectname) %%(refname)" %s'
+                % prefix
+            ],
+        )
+        for line in output.splitlines():
+            # the second field is only set for annotated tags, it is the hash
+            # of the commit they point at.
+            fields = line.strip().strip("'").split()
+            if fields and fields[-1].startswith(prefix):
+                refs[fields[-1][len(prefix) :]] = fields[-2]
+        return refs
+
+    def _execute_mirror_git_commands(self, commands):
+        """
+        Updates the mirror of the remote repository and executes the given
+        list of git commands in it.
+
+        If the mirror can't be created, the commands are executed in a
+        temporary clone of the remote repository instead.
+
+        :param commands: list git commands to execute, e.g. ['tag']
+        :returns: stdout and stderr of the last command executed as a string
+        :raises: TankGitError on git failure
+        """
+        mirror_path = self._update_mirror()
+        if mirror_path is None:
+            return self._tmp_clone_then_execute_git_commands(commands)
+        return self._execute_git_commands(mirror_path, commands)
+
+    def _get_mirror_path(self):
+        """
+        Returns the path to the mirror of the remote repository in the bundle
+        cache.
+
+        :returns: Path to a bare repository.
+        """
+        # the repository name keeps the folder readable, the hash of its
+        # path makes it unique.
+        digest = hashlib.md5(six.ensure_binary(self._path)).hexdigest()[:8]
+        return os.path.join(
+            self._bundle_cache_root,
+            constants.GIT_MIRROR_FOLDER,
+            "%s-%s.git"
+            % (filesystem.create_valid_filename(self.get_system_name()), digest),
+        )
+
+    def _update_mirror(self, revision=None):
+        """
+        Ensures the mirror of the remote repository exists in the bundle cache
+        and is up to date.
+
+        The mirror is a bare repository holding all the refs of the remote
+        repository. It is shared by all the descriptors of the repository,
+        so only new objects are fetched from the remote when resolving or
+        downloading another version.
+
+        :param str revision: Tag or commit hash needed in the mirror. If the
+            mirror already contains it, it is not updated.
+        :returns: Path to the mirror, or None if it couldn't be created.
+        :raises: TankGitError on git failure
+        """
+        mirror_path = self._get_mirror_path()
+        self._ensure_git_is_installed()
+
+        # git doesn't support concurrent fetches into the same repository,
+        # so updates are serialized across threads and processes.
+        filesystem.ensure_folder_exists(os.path.dirname(mirror_path))
+        with filesystem.lock_file("%s.lock" % mirror_path, _MIRROR_LOCK_TIMEOUT):
+            if os.path.exists(mirror_path):
+                if revision and self._mirror_contains(mirror_path, revision):
+                    log.debug("Git mirror %s contains %s." % (mirror_path, revision))
+                    return mirror_path
+                log.debug("Updating git mirror %s" % mirror_path)
+                self._execute_remote_git_command(
+                    'git --git-dir "%s" fetch -q --prune origin' % mirror_path
+                )
+                return mirror_path
+
+            # clone into a temporary location first so that other processes
+            # never use a partial mirror.
+            tmp_path = "%s.%s.tmp" % (mirror_path, uuid.uuid4().hex)
+            log.debug("Creating git mirror %s" % mirror_path)
+            try:
+                self._execute_remote_git_command(
+                    'git clone --mirror --no-hardlinks -q "%s" "%s"'
+                    % (self._path, tmp_path)
+                )
+                try:
+                    os.rename(tmp_path, mirror_path)
+                except OSError as e:
+                    # the mirror may have been created by another process
+                    # which couldn't lock it, otherwise the repository is
+                    # used without it.
+                    if not os.path.exists(mirror_path):
+                        log.warning(
+                            "Could not create git mirror %s: %s" % (mirror_path, e)
+                        )
+                        return None
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        return mirror_path
+
+    def _mirror_contains(self, mirror_path, revision):
+        """
+        Checks if the mirror contains a given revision.
+
+        :param str mirror_path: Path to the mirror.
+        :param str revision: Tag or commit hash.
+        :returns: True if the revision is in the mirror, False otherwise.
+        """
+        try:
+            _check_output(
+                [
+                    "git",
+                    "--git-dir",
+                    mirror_path,
+                    "rev-parse",
+                    "-q",
+                    "--verify",
+                    "%s^{commit}" % revision,
+                ]
+            )
+        except SubprocessCalledProcessError:
+            return False
+        return True
+
+    def _mirror_then_execute_git_commands(self, target_path, commands, revision):
+        """
+        Clones the repository from its mirror into the given location and
+        executes the given list of git commands.
+
+        This behaves like :meth:`_clone_then_execute_git_commands`, except
+        that only the objects missing from the mirror are fetched from the
+        remote. The origin of the clone is the remote repository, not the
+        mirror.
+
+        :param target_path: path to clone into
+        :param commands: list git commands to execute, e.g. ['checkout x']
+        :param str revision: Tag or commit hash which is checked out.
+        :returns: stdout and stderr of the last command executed as a string
+        :raises: TankGitError on git failure
+        """
+        mirror_path = self._update_mirror(revision)
+        if mirror_path is None:
+            return self._clone_then_execute_git_commands(target_path, commands)
+
+        filesystem.ensure_folder_exists(os.path.dirname(target_path))
+        log.debug("Git Cloning %r into %s from %s" % (self, target_path, mirror_path))
+        try:
+            _check_output(
+                ["git", "clone", "--no-hardlinks", "-q", mirror_path, target_path]
+            )
+        except SubprocessCalledProcessError as e:
+            raise TankGitError(
+                "Error cloning git mirror %s: %s (Return code %s)"
+                % (mirror_path, e.output, e.returncode)
+            )
+
+        commands = ['remote set-url origin "%s"' % self._path] + commands
+        return self._execute_git_commands(target_path, commands)
+
     def get_system_name(self):
         """
         Returns a short name, suitable for use in configuration files
@@ -283,12 +532,11 @@ class IODescriptorGit(IODescriptorDownloadable):
 
         :return: True if a remote is accessible, false if not.
         """
-        # check if we can clone the repo
+        # check if we can list the branches of the repo
         can_connect = True
         try:
             log.debug("%r: Probing if a connection to git can be established..." % self)
-            # clone repo into temp folder
-            self._tmp_clone_then_execute_git_commands([])
+            self._get_remote_refs("heads")
             log.debug("...connection established")
         except Exception as e:
             log.debug("...could not establish connection: %s" % e)
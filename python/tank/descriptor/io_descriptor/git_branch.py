@@ -10,7 +10,7 @@
 import os
 import copy
 
-from .git import IODescriptorGit
+from .git import IODescriptorGit, TankGitError
 from ..errors import TankDescriptorError
 from ... import LogManager
 
@@ -117,20 +117,23 @@ class IODescriptorGitBranch(IODescriptorGit):
         requiring credentials may result in a shell opening up
         requesting username and password.
 
-        The git repo will be cloned into the local cache and
-        will then be adjusted to point at the relevant commit.
+        The missing objects are fetched into the mirror of the git repo, which
+        is then cloned into the local cache and adjusted to point at the
+        relevant commit.
 
         :param destination_path: The destination path on disk to which
         the git branch descriptor is to be downloaded to.
         """
         try:
-            # clone the repo, switch to the given branch
+            # clone the repo from its mirror, switch to the given branch
             # then reset to the given commit
             commands = [
                 'checkout -q "%s"' % self._branch,
                 'reset --hard -q "%s"' % self._version,
             ]
-            self._clone_then_execute_git_commands(destination_path, commands)
+            self._mirror_then_execute_git_commands(
+                destination_path, commands, self._version
+            )
         except Exception as e:
             raise TankDescriptorError(
                 "Could not download %s, branch %s, "
@@ -146,8 +149,7 @@ class IODescriptorGitBranch(IODescriptorGit):
         requiring credentials may result in a shell opening up
         requesting username and password.
 
-        This will clone the git repository into a temporary location in order to
-        introspect its properties.
+        The branches of the repository are listed with ``git ls-remote``.
 
         .. note:: The concept of constraint patterns doesn't apply to
                   git commit hashes and any data passed via the
@@ -170,13 +172,10 @@ class IODescriptorGitBranch(IODescriptorGit):
             )
 
         try:
-            # clone the repo, get the latest commit hash
-            # for the given branch
-            commands = [
-                'checkout -q "%s"' % self._branch,
-                "log -n 1 \"%s\" --pretty=format:'%%H'" % self._branch,
-            ]
-            git_hash = self._tmp_clone_then_execute_git_commands(commands)
+            # get the latest commit hash for the given branch
+            git_hash = self._get_remote_refs("heads").get(self._branch)
+            if git_hash is None:
+                raise TankGitError("Branch %s doesn't exist." % self._branch)
 
         except Exception as e:
             raise TankDescriptorError(
@@ -11,6 +11,7 @@ import os
 import copy
 
 from .git import IODescriptorGit
+from .remote_versions import RemoteVersionCache
 from ..errors import TankDescriptorError
 from ... import LogManager
 
@@ -133,16 +134,19 @@ class IODescriptorGitTag(IODescriptorGit):
         requiring credentials may result in a shell opening up
         requesting username and password.
 
-        The git repo will be cloned into the local cache and
-        will then be adjusted to point at the relevant tag.
+        The missing objects are fetched into the mirror of the git repo, which
+        is then cloned into the local cache and adjusted to point at the
+        relevant tag.
 
         :param destination_path: The destination path on disk to which
         the git tag descriptor is to be downloaded to.
         """
         try:
-            # clone the repo, checkout the given tag
+            # clone the repo from its mirror, checkout the given tag
             commands = ['checkout -q "%s"' % self._version]
-            self._clone_then_execute_git_commands(destination_path, commands)
+            self._mirror_then_execute_git_commands(
+                destination_path, commands, self._version
+            )
         except Exception as e:
             raise TankDescriptorError(
                 "Could not download %s, " "tag %s: %s" % (self._path, self._version, e)
@@ -157,8 +161,9 @@ class IODescriptorGitTag(IODescriptorGit):
         requiring credentials may result in a shell opening up
         requesting username and password.
 
-        This will clone the git repository into a temporary location in order to
-        introspect its properties.
+        Tags are listed with ``git ls-remote`` when a constraint pattern is
+        given. Otherwise, the mirror of the repository in the bundle cache is
+        updated in order to find the latest tag chronologically.
 
         :param constraint_pattern: If this is specified, the query will be constrained
                by the given pattern. Version patterns are on the following forms:
@@ -182,6 +187,14 @@ class IODescriptorGitTag(IODescriptorGit):
         desc.set_cache_roots(self._bundle_cache_root, self._fallback_roots)
         return desc
 
+    def _get_remote_version_cache(self):
+        """
+        Returns the cache of the tags of the remote repository.
+
+        :returns: :class:`RemoteVersionCache` instance.
+        """
+        return RemoteVersionCache(self._bundle_cache_root, ["git"])
+
     def _get_latest_by_pattern(self, pattern):
         """
         Returns a descriptor object that represents the latest
@@ -195,12 +208,10 @@ class IODescriptorGitTag(IODescriptorGit):
         :returns: IODescriptorGitTag object
         """
         try:
-            # clone the repo, list all tags
-            # for the repository, across all branches
-            commands = ["tag"]
-            git_tags = six.ensure_text(
-                self._tmp_clone_then_execute_git_commands(commands)
-            ).split("\n")
+            # list all tags for the repository, across all branches
+            git_tags = self._get_remote_version_cache().get(
+                "%s-tags" % self._path, lambda: sorted(self._get_remote_refs("tags")),
+            )
 
         except Exception as e:
             raise TankDescriptorError(
@@ -228,12 +239,15 @@ class IODescriptorGitTag(IODescriptorGit):
         :returns: IODescriptorGitTag object
         """
         try:
-            # clone the repo, find the latest tag (chronologically)
-            # for the repository, across all branches
+            # update the mirror of the repo, find the latest tag
+            # (chronologically) for the repository, across all branches
             commands = [
                 "for-each-ref refs/tags --sort=-creatordate --format='%(refname:short)' --count=1"
             ]
-            latest_tag = self._tmp_clone_then_execute_git_commands(commands)
+            latest_tag = self._get_remote_version_cache().get(
+                "%s-latest" % self._path,
+                lambda: six.ensure_text(self._execute_mirror_git_commands(commands)),
+            )
 
         except Exception as e:
             raise TankDescriptorError(
@@ -13,6 +13,7 @@ import os
 from tank_vendor.six.moves import urllib
 
 from .downloadable import IODescriptorDownloadable
+from .remote_versions import RemoteVersionCache
 from ..errors import TankError, TankDescriptorError
 from ... import LogManager
 from ...util import sgre as re
@@ -166,6 +167,18 @@ class IODescriptorGithubRelease(IODescriptorDownloadable):
             return ([response_data["tag_name"]], next_link)
         return ([release["tag_name"] for release in response_data], next_link)
 
+    def _get_all_github_releases(self):
+        """
+        Finds all the releases of the repo, following the pagination links.
+
+        :return: list of the tag names (versions) that were found.
+        """
+        versions, next_url = self._get_github_releases()
+        while next_url:
+            page_versions, next_url = self._get_github_releases(url=next_url)
+            versions.extend(page_versions)
+        return versions
+
     def get_latest_version(self, constraint_pattern=None):
         """
         Returns a descriptor object that represents the latest version.
@@ -179,7 +192,20 @@ class IODescriptorGithubRelease(IODescriptorDownloadable):
 
         :returns: IODescriptorGithubRelease object
         """
-        if constraint_pattern:
+        version_cache = RemoteVersionCache(self._bundle_cache_root, ["github_release"])
+        cache_key = "%s-%s" % (self._organization, self.get_system_name())
+        if constraint_pattern and version_cache.enabled:
+            # get the complete list of releases, so that it can be cached and
+            # used for any constraint.
+            log.debug(
+                "Querying Github for releases to find a match for %s..."
+                % constraint_pattern
+            )
+            versions = version_cache.get(
+                "%s-releases" % cache_key, self._get_all_github_releases
+            )
+            version = self._find_latest_tag_by_pattern(versions, constraint_pattern)
+        elif constraint_pattern:
             # get the list of releases from github API. If we don't find a match on
             # the first request, and there was an additional page linked, follow the link
             # and see if we find a match. Repeat until a match is found, or there are no
@@ -199,7 +225,10 @@ class IODescriptorGithubRelease(IODescriptorDownloadable):
             # Otherwise, we can ask for the latest version from the github api
             # directly.
             log.debug("Querying Github for the latest release...")
-            versions, _ = self._get_github_releases(latest_only=True)
+            versions = version_cache.get(
+                "%s-latest" % cache_key,
+                lambda: self._get_github_releases(latest_only=True)[0],
+            )
             version = versions[0] if versions else None
         if version is None or version == self.get_version():
             # There is no latest release, or the latest release is this one, so return this descriptor.
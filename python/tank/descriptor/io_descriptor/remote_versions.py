@@ -0,0 +1,121 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+On disk cache of the versions available remotely for a descriptor.
+"""
+
+import hashlib
+import os
+
+from .. import constants
+from ... import LogManager
+from ...util import filesystem
+from tank_vendor import six
+
+log = LogManager.get_logger(__name__)
+
+
+class RemoteVersionCache(object):
+    """
+    Caches listings of remote versions, e.g. the tags of a git repository or
+    the versions of an app in the app store, for a limited amount of time.
+
+    Resolving the latest version of a descriptor, with or without a version
+    constraint, requires listing the versions available remotely. When a
+    configuration tracks the latest version of many bundles, this means many
+    slow remote requests each time it is resolved. With this cache, listings
+    are stored as json files in the bundle cache and reused until they
+    expire, and constraints are matched against the cached listings.
+
+    The cache is disabled unless the ``SHOTGUN_REMOTE_VERSION_CACHE_TTL``
+    environment variable is set to the number of seconds listings should be
+    reused for.
+    """
+
+    def __init__(self, bundle_cache_root, namespace, ttl=None):
+        """
+        :param str bundle_cache_root: Root of the bundle cache to store
+            listings in.
+        :param list namespace: Names of the sub folders listings are stored
+            in, typically the descriptor type and the site.
+        :param float ttl: Number of seconds listings are reused for. Defaults
+            to the value of the ``SHOTGUN_REMOTE_VERSION_CACHE_TTL``
+            environment variable. If None, the cache is disabled.
+        """
+        self._ttl = ttl if ttl is not None else self.get_ttl()
+        if bundle_cache_root:
+            self._folder = os.path.join(
+                bundle_cache_root,
+                constants.REMOTE_VERSION_CACHE_FOLDER,
+                *[filesystem.create_valid_filename(x) for x in namespace]
+            )
+        else:
+            self._folder = None
+
+    @staticmethod
+    def get_ttl():
+        """
+        Returns how long remote version listings are reused for, as set by
+        the ``SHOTGUN_REMOTE_VERSION_CACHE_TTL`` environment variable.
+
+        :returns: Number of seconds or None if listings shouldn't be cached.
+        """
+        return filesystem.get_cache_ttl(constants.REMOTE_VERSION_CACHE_TTL_ENV_VAR)
+
+    @property
+    def enabled(self):
+        """
+        True if listings are cached.
+        """
+        return self._ttl is not None and self._folder is not None
+
+    def get(self, key, fetch):
+        """
+        Returns a listing, from the cache if it holds a listing which hasn't
+        expired yet, otherwise from the remote.
+
+        :param str key: Unique name of the listing, e.g. the name of the
+            bundle and the kind of listing.
+        :param fetch: Callable taking no parameters and returning the listing
+            from the remote. The listing must be serializable to json.
+
+        :returns: The listing.
+        """
+        if not self.enabled:
+            return fetch()
+
+        path = self._get_path(key)
+        listing = filesystem.read_json_cache(path, self._ttl)
+        if listing is not None:
+            log.debug("Using remote versions of %s cached in %s", key, path)
+            return listing
+
+        listing = fetch()
+        try:
+            filesystem.write_json_cache(path, listing)
+        except Exception as e:
+            # the bundle cache may be read only.
+            log.debug("Could not cache remote versions in %s: %s", path, e)
+        return listing
+
+    def _get_path(self, key):
+        """
+        Returns the path to the file caching a listing.
+
+        :param str key: Unique name of the listing.
+        """
+        # keep the file name readable, but use a hash to make it unique.
+        digest = hashlib.md5(six.ensure_binary(key)).hexdigest()[:8]
+        file_name = "%s-%s.json" % (
+            filesystem.create_valid_filename(six.ensure_text(key))[-80:],
+            digest,
+        )
+        return os.path.join(self._folder, file_name)
@@ -13,5 +13,11 @@ This module contains functionality relating to folder creation.
 
 """
 
-from .operations import process_filesystem_structure, synchronize_folders
+from .operations import (
+    process_filesystem_structure,
+    plan_filesystem_structure,
+    synchronize_folders,
+)
 from .configuration import read_ignore_files
+from .executor import FolderIOExecutor
+from .sync_service import PathCacheSyncService
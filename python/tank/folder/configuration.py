@@ -14,7 +14,9 @@ Handles the creation of a configuration object structure based on the folder con
 """
 
 import os
+import stat
 import fnmatch
+import hashlib
 
 from .folder_types import (
     Static,
@@ -26,8 +28,14 @@ from .folder_types import (
     ShotgunTask,
 )
 
+from . import constants
 from ..errors import TankError, TankUnreadableFileError
 from ..util import yaml_cache
+from ..util import pickle
+from .. import LogManager
+from tank_vendor import six
+
+log = LogManager.get_logger(__name__)
 
 
 def read_ignore_files(schema_config_path):
@@ -52,52 +60,234 @@ def read_ignore_files(schema_config_path):
     return ignore_files
 
 
-class FolderConfiguration(object):
+class _SchemaFolder(object):
     """
-    Class that loads the schema from disk and constructs folder objects.
+    A folder of the schema, as read from disk.
     """
 
-    def __init__(self, tk, schema_config_path):
+    __slots__ = ["name", "metadata", "children", "symlinks", "files"]
+
+    def __init__(self, name, metadata):
         """
-        Constructor
+        :param str name: Name of the folder.
+        :param dict metadata: Content of the folder's yml file or None.
         """
-        self._tk = tk
+        self.name = name
+        self.metadata = metadata
+        # list of _SchemaFolder objects
+        self.children = []
+        # list of (name, target_expression, full_metadata)
+        self.symlinks = []
+        # list of file names
+        self.files = []
 
-        # access shotgun nodes by their entity_type
-        self._entity_nodes_by_type = {}
+    def __getstate__(self):
+        return dict((slot, getattr(self, slot)) for slot in self.__slots__)
 
-        # maintain a list of all Step nodes for special introspection
-        self._step_fields = []
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+class FolderSchema(object):
+    """
+    The content of the folder schema on disk.
+
+    The schema is scanned once and only holds plain data, so it can be
+    shared by :class:`FolderConfiguration` objects and pickled. The
+    modification time and size of every folder and file that was read is
+    recorded so that :meth:`is_up_to_date` can tell if the schema has changed
+    on disk without scanning it again.
+    """
+
+    # bump when the pickled representation changes
+    FORMAT_VERSION = 2
+
+    def __init__(self, schema_config_path):
+        """
+        Scans the schema.
+
+        :param str schema_config_path: Path to the schema folder.
+        :raises: :class:`TankError` if a file of the schema can't be read.
+        """
+        self._schema_config_path = schema_config_path
+        # stat values keyed by path relative to the schema folder
+        self._stats = {}
 
         # read skip files config
+        self._record_stat("ignore_files")
         self._ignore_files = read_ignore_files(schema_config_path)
 
-        # load schema
-        self._load_schema(schema_config_path)
+        self._record_stat("")
+        self._project_folders = [
+            _SchemaFolder(name, self._read_metadata(name))
+            for name in self._get_sub_directories("")
+        ]
+        for project_folder in self._project_folders:
+            self._scan_r(project_folder, project_folder.name)
 
-    ##########################################################################################
-    # public methods
+    @classmethod
+    def load_precompiled(cls, schema_config_path, precompiled_path):
+        """
+        Loads a schema pickled by :meth:`save`.
 
-    def get_folder_objs_for_entity_type(self, entity_type):
+        The precompiled schema is only used if the content of the schema on
+        disk is the same as when it was precompiled. Modification times are
+        not compared, since they change whenever a configuration is copied.
+
+        :param str schema_config_path: Path to the schema folder.
+        :param str precompiled_path: Path to the pickle file.
+
+        :returns: :class:`FolderSchema` or None if the file can't be used.
         """
-        Returns all the nodes representing a particular sg entity type
+        try:
+            with open(precompiled_path, "rb") as fh:
+                data = pickle.load(fh)
+            format_version = data[0]
+        except Exception as e:
+            log.debug("Could not load precompiled schema %s: %s", precompiled_path, e)
+            return None
+
+        if format_version != cls.FORMAT_VERSION:
+            log.debug("Precompiled schema %s has an old format.", precompiled_path)
+            return None
+
+        _, fingerprint, schema = data
+        try:
+            up_to_date = fingerprint == cls._compute_fingerprint(schema_config_path)
+        except (IOError, OSError) as e:
+            log.debug("Could not read schema %s: %s", schema_config_path, e)
+            return None
+        if not up_to_date:
+            log.debug("Precompiled schema %s is out of date.", precompiled_path)
+            return None
+
+        # the schema may have been precompiled somewhere else, record the
+        # stats of the schema on disk so changes made from now on are picked
+        # up by is_up_to_date.
+        schema._schema_config_path = schema_config_path
+        for relative_path in schema._stats:
+            schema._record_stat(relative_path)
+
+        return schema
+
+    def save(self, path):
         """
-        return self._entity_nodes_by_type.get(entity_type, [])
+        Pickles the schema so it can be shipped with the configuration and
+        loaded with :meth:`load_precompiled`.
 
-    def get_task_step_nodes(self):
+        :param str path: Path of the file to write.
         """
-        Returns all step nodes in the configuration
+        fingerprint = self._compute_fingerprint(self._schema_config_path)
+        with open(path, "wb") as fh:
+            pickle.dump((self.FORMAT_VERSION, fingerprint, self), fh)
+
+    @classmethod
+    def _compute_fingerprint(cls, schema_config_path):
         """
-        return self._step_fields
+        Hashes the layout of the schema folder and the content of its files
+        which are read while scanning it.
+
+        Only relative paths are hashed, so the schema can be moved around.
+
+        :param str schema_config_path: Path to the schema folder.
+        :returns: Hex digest of the schema.
+        """
+        digest = hashlib.sha1()
+        for root, dir_names, file_names in os.walk(
+            schema_config_path, followlinks=True
+        ):
+            dir_names.sort()
+            relative_root = os.path.relpath(root, schema_config_path)
+            relative_root = relative_root.replace(os.sep, "/")
+            digest.update(six.ensure_binary("d:%s\n" % relative_root))
+            for file_name in sorted(file_names):
+                digest.update(six.ensure_binary("f:%s\n" % file_name))
+                # other files are copied when folders are created, only their
+                # names are part of the schema.
+                if file_name.endswith(".yml") or (
+                    relative_root == "." and file_name == "ignore_files"
+                ):
+                    with open(os.path.join(root, file_name), "rb") as fh:
+                        digest.update(fh.read())
+        return digest.hexdigest()
+
+    @property
+    def schema_config_path(self):
+        """
+        Path to the schema folder.
+        """
+        return self._schema_config_path
+
+    @property
+    def project_folders(self):
+        """
+        List of :class:`_SchemaFolder` at the root of the schema.
+        """
+        return self._project_folders
+
+    def is_up_to_date(self):
+        """
+        Checks if any folder or file read while scanning the schema has been
+        added, removed or modified since.
+
+        Adding or removing an item in a folder changes the folder's
+        modification time, so the schema doesn't need to be scanned again.
+
+        :returns: True if the schema is unchanged on disk, False otherwise.
+        """
+        for relative_path, recorded_stat in self._stats.items():
+            if self._get_stat(relative_path) != recorded_stat:
+                return False
+        return True
+
+    def _get_stat(self, relative_path):
+        """
+        :returns: Tuple of the modification time and size of an item of the
+            schema, or None if it doesn't exist.
+        """
+        try:
+            st = os.stat(os.path.join(self._schema_config_path, relative_path))
+        except OSError:
+            return None
+        if stat.S_ISDIR(st.st_mode):
+            # the size of a folder is meaningless.
+            return (st.st_mtime, None)
+        return (st.st_mtime, st.st_size)
+
+    def _record_stat(self, relative_path):
+        """
+        Records the modification time and size of an item of the schema.
+        """
+        self._stats[relative_path] = self._get_stat(relative_path)
+
+    def _scan_r(self, schema_folder, relative_path):
+        """
+        Recursively scans a folder of the schema.
+
+        :param schema_folder: :class:`_SchemaFolder` to populate.
+        :param str relative_path: Path of the folder relative to the schema.
+        """
+        self._record_stat(relative_path)
+
+        for name in self._get_sub_directories(relative_path):
+            child_path = os.path.join(relative_path, name)
+            child = _SchemaFolder(name, self._read_metadata(child_path))
+            schema_folder.children.append(child)
+            self._scan_r(child, child_path)
+
+        schema_folder.symlinks = self._get_symlinks_in_folder(relative_path)
+        schema_folder.files = self._get_files_in_folder(relative_path)
 
     ####################################################################################
     # utility methods
 
-    def _get_sub_directories(self, parent_path):
+    def _get_sub_directories(self, relative_path):
         """
-        Returns all the directories for a given path
+        Returns the names of all the directories for a given path
         """
-        directory_paths = []
+        parent_path = os.path.join(self._schema_config_path, relative_path)
+        directory_names = []
         for file_name in os.listdir(parent_path):
 
             # check our ignore list
@@ -106,16 +296,17 @@ class FolderConfiguration(object):
 
             full_path = os.path.join(parent_path, file_name)
             if os.path.isdir(full_path):
-                directory_paths.append(full_path)
+                directory_names.append(file_name)
 
-        return directory_paths
+        return directory_names
 
-    def _get_files_in_folder(self, parent_path):
+    def _get_files_in_folder(self, relative_path):
         """
-        Returns all the files for a given path except yml files
+        Returns the names of all the files for a given path except yml files
         Also ignores any files mentioned in the ignore files list
         """
-        file_paths = []
+        parent_path = os.path.join(self._schema_config_path, relative_path)
+        file_names = []
         items_in_folder = os.listdir(parent_path)
 
         folders = [
@@ -145,15 +336,15 @@ class FolderConfiguration(object):
                 continue
 
             # by now should be left with regular non-system files only
-            file_paths.append(full_path)
+            file_names.append(file_name)
 
-        return file_paths
+        return file_names
 
-    def _get_symlinks_in_folder(self, parent_path):
+    def _get_symlinks_in_folder(self, relative_path):
         """
         Returns all xxx.symlink.yml files in a location.
 
-        :param parent_path: file system folder to scan
+        :param relative_path: schema folder to scan
         :returns: list of (name, target_expression, full_metadata) where name is the name of the symlink
                   and target_expression is a target expression to be passed into the folder creation.
                   For example, if the file in the schema location is called "foo_bar.symlink.yml",
@@ -161,6 +352,7 @@ class FolderConfiguration(object):
         """
         SYMLINK_SUFFIX = ".symlink.yml"
 
+        parent_path = os.path.join(self._schema_config_path, relative_path)
         data = []
 
         items_in_folder = os.listdir(parent_path)
@@ -169,6 +361,7 @@ class FolderConfiguration(object):
         for file_name in symlinks:
 
             full_path = os.path.join(parent_path, file_name)
+            self._record_stat(os.path.join(relative_path, file_name))
 
             try:
                 metadata = (
@@ -194,16 +387,17 @@ class FolderConfiguration(object):
 
         return data
 
-    def _read_metadata(self, full_path):
+    def _read_metadata(self, relative_path):
         """
         Reads metadata file.
 
-        :param full_path: Absolute path without extension
+        :param relative_path: Path relative to the schema, without extension
         :returns: Dictionary of file contents or None
         """
         metadata = None
         # check if there is a yml file with the same name
-        yml_file = "%s.yml" % full_path
+        yml_file = "%s.yml" % os.path.join(self._schema_config_path, relative_path)
+        self._record_stat("%s.yml" % relative_path)
         try:
             metadata = yaml_cache.g_yaml_cache.get(yml_file, deepcopy_data=False)
         except TankUnreadableFileError:
@@ -215,26 +409,109 @@ class FolderConfiguration(object):
 
         return metadata
 
+
+def get_folder_schema(pipeline_configuration, check_up_to_date=True):
+    """
+    Returns the folder schema of a pipeline configuration.
+
+    The schema is only scanned again if it has changed on disk since the last
+    call. If a precompiled schema written by :meth:`FolderSchema.save` is
+    found next to the schema folder, it is used instead of scanning the
+    schema, as long as it is up to date.
+
+    :param pipeline_configuration: :class:`~sgtk.pipelineconfig.PipelineConfiguration`
+        the schema belongs to.
+    :param bool check_up_to_date: If False, a schema previously read by the
+        pipeline configuration is returned without checking the schema
+        files on disk.
+
+    :returns: :class:`FolderSchema`
+    """
+    schema = pipeline_configuration.get_cached_folder_schema()
+    if schema is not None and (not check_up_to_date or schema.is_up_to_date()):
+        return schema
+
+    schema_config_path = pipeline_configuration.get_schema_config_location()
+    precompiled_path = os.path.join(
+        os.path.dirname(schema_config_path), constants.PRECOMPILED_SCHEMA_FILE
+    )
+
+    schema = None
+    if os.path.exists(precompiled_path):
+        schema = FolderSchema.load_precompiled(schema_config_path, precompiled_path)
+
+    if schema is None:
+        log.debug("Scanning folder schema %s", schema_config_path)
+        schema = FolderSchema(schema_config_path)
+
+    pipeline_configuration.set_cached_folder_schema(schema)
+    return schema
+
+
+class FolderConfiguration(object):
+    """
+    Class that loads the schema from disk and constructs folder objects.
+    """
+
+    def __init__(self, tk, schema_config_path, schema=None):
+        """
+        Constructor
+
+        :param tk: Toolkit API instance.
+        :param str schema_config_path: Path to the schema folder.
+        :param schema: :class:`FolderSchema` previously read from the schema
+            folder. If not set, the schema is read from disk.
+        """
+        self._tk = tk
+
+        # access shotgun nodes by their entity_type
+        self._entity_nodes_by_type = {}
+
+        # maintain a list of all Step nodes for special introspection
+        self._step_fields = []
+
+        if schema is None:
+            schema = FolderSchema(schema_config_path)
+
+        # load schema
+        self._load_schema(schema)
+
     ##########################################################################################
-    # internal stuff
+    # public methods
 
-    def _load_schema(self, schema_config_path):
+    def get_folder_objs_for_entity_type(self, entity_type):
         """
-        Scan the config and build objects structure
+        Returns all the nodes representing a particular sg entity type
         """
+        return self._entity_nodes_by_type.get(entity_type, [])
 
-        project_folders = self._get_sub_directories(schema_config_path)
+    def get_task_step_nodes(self):
+        """
+        Returns all step nodes in the configuration
+        """
+        return self._step_fields
 
+    ##########################################################################################
+    # internal stuff
+
+    def _load_schema(self, schema):
+        """
+        Build objects structure from the scanned config
+        """
         # make some space in our obj/entity type mapping
         self._entity_nodes_by_type["Project"] = []
 
-        for project_folder in project_folders:
+        for project_schema_folder in schema.project_folders:
+
+            project_folder = os.path.join(
+                schema.schema_config_path, project_schema_folder.name
+            )
 
             # read metadata to determine root path
-            metadata = self._read_metadata(project_folder)
+            metadata = project_schema_folder.metadata
 
             if metadata is None:
-                if os.path.basename(project_folder) == "project":
+                if project_schema_folder.name == "project":
 
                     # get the default root name from the config
                     default_root = (
@@ -270,18 +547,19 @@ class FolderConfiguration(object):
             self._entity_nodes_by_type["Project"].append(project_obj)
 
             # recursively process the rest
-            self._process_config_r(project_obj, project_folder)
+            self._process_config_r(project_obj, project_folder, project_schema_folder)
 
-    def _process_config_r(self, parent_node, parent_path):
+    def _process_config_r(self, parent_node, parent_path, parent_schema_folder):
         """
-        Recursively scan the file system and construct an object
+        Recursively walk the scanned schema and construct an object
         hierarchy.
 
         Factory method for Folder objects.
         """
-        for full_path in self._get_sub_directories(parent_path):
+        for schema_folder in parent_schema_folder.children:
+            full_path = os.path.join(parent_path, schema_folder.name)
             # check for metadata (non-static folder)
-            metadata = self._read_metadata(full_path)
+            metadata = schema_folder.metadata
             if metadata:
                 node_type = metadata.get("type", "undefined")
 
@@ -333,12 +611,12 @@ class FolderConfiguration(object):
                 )
 
             # and process children
-            self._process_config_r(cur_node, full_path)
+            self._process_config_r(cur_node, full_path, schema_folder)
 
         # process symlinks
-        for (path, target, metadata) in self._get_symlinks_in_folder(parent_path):
+        for (path, target, metadata) in parent_schema_folder.symlinks:
             parent_node.add_symlink(path, target, metadata)
 
         # now process all files and add them to the parent_node token
-        for f in self._get_files_in_folder(parent_path):
-            parent_node.add_file(f)
+        for f in parent_schema_folder.files:
+            parent_node.add_file(os.path.join(parent_path, f))
@@ -14,3 +14,7 @@ PRIMARY_STORAGE_NAME = "primary"
 
 # hooks that are used during folder creation.
 PROCESS_FOLDER_CREATION_HOOK_NAME = "process_folder_creation"
+
+# name of the file, next to the schema folder, holding a precompiled copy
+# of the folder schema. See FolderSchema.save()
+PRECOMPILED_SCHEMA_FILE = "schema.pickle"
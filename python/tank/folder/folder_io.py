@@ -27,7 +27,7 @@ class FolderIOReceiver(object):
     Class that encapsulates all the IO operations from the various folder classes.
     """
 
-    def __init__(self, tk, preview, entity_type, entity_ids):
+    def __init__(self, tk, preview, entity_type, entity_ids, shotgun=None):
         """
         Constructor.
 
@@ -35,15 +35,35 @@ class FolderIOReceiver(object):
         :param preview: boolean set to true if run in preview mode
         :param entity_type: string with the sg entity type from the main folder creation request
         :param entity_ids: list of ids of the sg object for which folder creation was requested.
-
+        :param shotgun: Shotgun connection folder objects should query data with.
+            Defaults to the connection of the tk api instance.
         """
         self._tk = tk
+        self._shotgun = shotgun
         self._preview_mode = preview
         self._items = list()
         self._secondary_cache_entries = list()
         self._entity_type = entity_type
         self._entity_ids = entity_ids
 
+    @property
+    def shotgun(self):
+        """
+        Shotgun connection folder objects should query data with.
+        """
+        if self._shotgun is None:
+            return self._tk.shotgun
+        return self._shotgun
+
+    def get_items(self):
+        """
+        Returns the folder creation items computed so far, without
+        executing them.
+
+        :returns: List of items, as passed to the folder creation hook.
+        """
+        return [dict(item) for item in self._items]
+
     ####################################################################################
     # methods to call to actually execute the folder creation logic
 
@@ -128,7 +148,8 @@ class FolderIOReceiver(object):
                 # request that the path cache is synced against shotgun
                 # new items that were not locally available are returned
                 # as a list of dicts with keys id, type, name, configuration and path
-                rd = path_cache.synchronize()
+                # the sync is skipped if a background sync happened recently enough
+                rd = path_cache.synchronize(max_age=PathCache.get_sync_max_age())
 
                 # for each item we get back from the path cache synchronization,
                 # issue a remote entity folder request and pass that down to
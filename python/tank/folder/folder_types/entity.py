@@ -140,7 +140,7 @@ class Entity(Folder):
         """
         items_created = []
 
-        for entity in self.__get_entities(sg_data):
+        for entity in self.__get_entities(io_receiver.shotgun, sg_data):
 
             # generate the field name
             folder_name = self._entity_expression.generate_name(entity)
@@ -200,9 +200,12 @@ class Entity(Folder):
                 path, entity_link, self._config_metadata
             )
 
-    def __get_entities(self, sg_data):
+    def __get_entities(self, sg, sg_data):
         """
         Returns shotgun data for folder creation
+
+        :param sg: Shotgun API instance to query the data with.
+        :param sg_data: Shotgun data dictionary with the seed entities.
         """
         # first check the constraints: if tokens contains a type/id pair our our type,
         # we should only process this single entity. If not, then use the query filter
@@ -238,9 +241,7 @@ class Entity(Folder):
         fields_list = list(fields)
 
         # now find all the items (e.g. shots) matching this query
-        entities = self._tk.shotgun.find(
-            self._entity_type, resolved_filters, fields_list
-        )
+        entities = sg.find(self._entity_type, resolved_filters, fields_list)
 
         return entities
 
@@ -13,8 +13,11 @@ Main entry points for folder creation.
 
 """
 
-from .configuration import FolderConfiguration
+import os
+
+from .configuration import FolderConfiguration, get_folder_schema
 from .folder_io import FolderIOReceiver
+from .prefetch import ShotgunPrefetcher
 from .folder_types import EntityLinkTypeMismatch
 from ..errors import TankError
 from tank_vendor import six
@@ -55,7 +58,7 @@ def create_single_folder_item(
         # in order to create folders.
         try:
             shotgun_entity_data = folder_obj.extract_shotgun_data_upwards(
-                tk.shotgun, entity_id_seed
+                io_receiver.shotgun, entity_id_seed
             )
         except EntityLinkTypeMismatch:
             # the seed entity id object does not satisfy the link
@@ -125,6 +128,72 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
     :returns: list of items processed
 
     """
+    io_receiver = _compute_folder_items(tk, entity_type, entity_ids, preview, engine)
+    if io_receiver is None:
+        return
+
+    folders_created = io_receiver.execute_folder_creation()
+
+    return folders_created
+
+
+def plan_filesystem_structure(tk, entity_type, entity_ids, engine, existing_paths=None):
+    """
+    Computes the folder creation items for the given entities without
+    accessing the disk.
+
+    Unlike a preview, neither the paths to create nor the path cache are
+    checked and the folder creation hook is not executed. The folder schema
+    is only read from disk if it hasn't been read by this pipeline
+    configuration before. If it has, it is used without checking whether it
+    changed on disk.
+
+    :param tk: A tk instance
+    :param entity_type: A shotgun entity type to create folders for
+    :param entity_ids: list of entity ids to process or a single entity id
+    :param engine: Engine name for a second, deferred folder creation pass or None.
+        See :meth:`process_filesystem_structure`.
+    :param existing_paths: Optional collection of paths known to exist. Items
+        creating one of these paths are left out of the plan.
+
+    :returns: List of folder creation items, as passed to the folder creation hook.
+    """
+    io_receiver = _compute_folder_items(
+        tk, entity_type, entity_ids, True, engine, check_schema=False
+    )
+    if io_receiver is None:
+        return []
+
+    items = io_receiver.get_items()
+    if existing_paths is not None:
+        existing_paths = set(os.path.normpath(path) for path in existing_paths)
+        items = [
+            item
+            for item in items
+            if os.path.normpath(item.get("target_path") or item["path"])
+            not in existing_paths
+        ]
+    return items
+
+
+def _compute_folder_items(
+    tk, entity_type, entity_ids, preview, engine, check_schema=True
+):
+    """
+    Runs the folder configuration for the given entities and gathers the
+    folder creation items.
+
+    :param tk: A tk instance
+    :param entity_type: A shotgun entity type to create folders for
+    :param entity_ids: list of entity ids to process or a single entity id
+    :param preview: enable dry run mode?
+    :param engine: Engine name for a second, deferred folder creation pass or None.
+    :param bool check_schema: If False, a folder schema already read by the
+        pipeline configuration is used without checking it is up to date.
+
+    :returns: :class:`FolderIOReceiver` holding the items or None if there
+        are no entities to process.
+    """
 
     # check that engine is either a string or None
     if not (isinstance(engine, six.string_types) or engine is None):
@@ -143,11 +212,12 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
             )
 
     if len(entity_ids) == 0:
-        return
+        return None
 
-    # create schema builder
-    schema_cfg_folder = tk.pipeline_configuration.get_schema_config_location()
-    config = FolderConfiguration(tk, schema_cfg_folder)
+    # create schema builder. The schema is only read from disk again when it
+    # has changed since the previous call.
+    schema = get_folder_schema(tk.pipeline_configuration, check_schema)
+    config = FolderConfiguration(tk, schema.schema_config_path, schema)
 
     # all things to create
     items = []
@@ -207,8 +277,16 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
         for i in entity_ids:
             items.append({"type": entity_type, "id": i, "sg_task_data": None})
 
+    # when creating folders for several entities, the Shotgun data needed by
+    # each of them is retrieved with batched queries rather than once per entity.
+    sg = tk.shotgun
+    if len(items) > 1:
+        sg = ShotgunPrefetcher(tk.shotgun)
+        for i in items:
+            sg.add_candidates(i["type"], [i["id"]])
+
     # create an object to receive all IO requests
-    io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids)
+    io_receiver = FolderIOReceiver(tk, preview, entity_type, entity_ids, sg)
 
     # now loop over all individual objects and create folders
     for i in items:
@@ -216,6 +294,4 @@ def process_filesystem_structure(tk, entity_type, entity_ids, preview, engine):
             tk, config, io_receiver, i["type"], i["id"], i["sg_task_data"], engine
         )
 
-    folders_created = io_receiver.execute_folder_creation()
-
-    return folders_created
+    return io_receiver
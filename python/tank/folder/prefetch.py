@@ -0,0 +1,219 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Bulk prefetching of Shotgun data during folder creation.
+
+When folders are created for many entities at once, each folder object
+issues one query per entity: a ``find_one`` per entity when walking up the
+schema hierarchy and a ``find`` per entity when walking back down. These
+queries only differ by an ``id is X`` condition, so they can be answered by a
+single ``id in [...]`` query covering all the entities involved.
+"""
+
+import copy
+import json
+
+from ..log import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class ShotgunPrefetcher(object):
+    """
+    Wraps a Shotgun connection and answers ``find`` and ``find_one`` calls
+    constrained to a single entity id using batched queries.
+
+    Entity ids which are expected to be queried are registered as candidates,
+    either explicitly via :meth:`add_candidates` or automatically when an
+    entity link is found in a prefetched record. The first time an id
+    constrained query is made for a candidate, the same query is issued for
+    all the candidates of that entity type in chunks of ``id in [...]``
+    queries and the records are kept in memory for subsequent calls.
+
+    Any other call is forwarded to the wrapped connection as is.
+    """
+
+    # Maximum number of ids per batched query.
+    BATCH_SIZE = 500
+
+    def __init__(self, sg, batch_size=None):
+        """
+        :param sg: Shotgun API instance to wrap.
+        :param int batch_size: Maximum number of ids per batched query.
+            Defaults to :attr:`BATCH_SIZE`.
+        """
+        self._sg = sg
+        self._batch_size = batch_size or self.BATCH_SIZE
+        # candidate ids, keyed by entity type
+        self._candidates = {}
+        # records per query key, keyed by id. Ids which were queried but did
+        # not match the query filters are stored with a None record.
+        self._records = {}
+        self._query_count = 0
+
+    def __getattr__(self, name):
+        """
+        Forwards anything not handled by the prefetcher to the connection.
+        """
+        return getattr(self._sg, name)
+
+    @property
+    def query_count(self):
+        """
+        Number of batched queries issued so far.
+        """
+        return self._query_count
+
+    def add_candidates(self, entity_type, entity_ids):
+        """
+        Registers entity ids which are likely to be queried.
+
+        :param str entity_type: Shotgun entity type.
+        :param entity_ids: Iterable of entity ids.
+        """
+        self._candidates.setdefault(entity_type, set()).update(entity_ids)
+
+    def find_one(self, entity_type, filters, fields=None, *args, **kwargs):
+        """
+        Same as :meth:`shotgun_api3.Shotgun.find_one`.
+        """
+        records = self.find(entity_type, filters, fields, *args, **kwargs)
+        return records[0] if records else None
+
+    def find(self, entity_type, filters, fields=None, *args, **kwargs):
+        """
+        Same as :meth:`shotgun_api3.Shotgun.find`.
+
+        Queries constrained to a single candidate id are answered from the
+        prefetched records.
+        """
+        split_filters = None
+        if not args and not kwargs:
+            split_filters = self._split_id_condition(filters)
+
+        if split_filters is None:
+            return self._sg.find(entity_type, filters, fields, *args, **kwargs)
+
+        entity_id, conditions = split_filters
+        if entity_id not in self._candidates.get(entity_type, ()):
+            return self._sg.find(entity_type, filters, fields)
+
+        key = (
+            entity_type,
+            json.dumps(conditions, sort_keys=True, default=str),
+            tuple(sorted(fields or [])),
+        )
+        records = self._records.setdefault(key, {})
+        if entity_id not in records:
+            self._prefetch(entity_type, conditions, fields, records)
+
+        record = records.get(entity_id)
+        if record is None:
+            return []
+        return [copy.deepcopy(record)]
+
+    def _prefetch(self, entity_type, conditions, fields, records):
+        """
+        Queries all the candidates of an entity type not yet in the given
+        records.
+
+        :param str entity_type: Shotgun entity type.
+        :param list conditions: Filter conditions, without the id condition.
+        :param list fields: Fields to retrieve.
+        :param dict records: Records for this query, keyed by id. Updated in
+            place.
+        """
+        entity_ids = sorted(self._candidates[entity_type].difference(records))
+        log.debug(
+            "Prefetching %d %s records for folder creation.",
+            len(entity_ids),
+            entity_type,
+        )
+
+        for i in range(0, len(entity_ids), self._batch_size):
+            chunk = entity_ids[i : i + self._batch_size]
+            filters = {
+                "logical_operator": "and",
+                "conditions": conditions
+                + [{"path": "id", "relation": "in", "values": chunk}],
+            }
+            self._query_count += 1
+            for entity_id in chunk:
+                records[entity_id] = None
+            for record in self._sg.find(entity_type, filters, fields):
+                records[record["id"]] = record
+                self._add_linked_candidates(record)
+
+    def _add_linked_candidates(self, record):
+        """
+        Registers the entities linked from a record as candidates, since the
+        folder creation is likely to query them next.
+
+        :param dict record: Shotgun record.
+        """
+        for value in record.values():
+            if isinstance(value, dict) and "type" in value and "id" in value:
+                self._candidates.setdefault(value["type"], set()).add(value["id"])
+
+    @staticmethod
+    def _split_id_condition(filters):
+        """
+        Splits a filter on a single ``id is X`` condition from the rest of the
+        conditions.
+
+        Only filters combining their conditions with an ``and`` operator are
+        handled, in either the list or the dictionary syntax.
+
+        :param filters: Shotgun filters.
+
+        :returns: Tuple of the entity id and the remaining conditions in the
+            dictionary syntax, or None if the filters are not constrained by
+            a single id.
+        """
+        if isinstance(filters, dict):
+            if filters.get("logical_operator") != "and":
+                return None
+            conditions = filters.get("conditions", [])
+        elif isinstance(filters, list):
+            conditions = filters
+        else:
+            return None
+
+        entity_id = None
+        other_conditions = []
+        for condition in conditions:
+            if isinstance(condition, (list, tuple)) and len(condition) >= 3:
+                # same translation as the Shotgun API does for simple filters.
+                values = list(condition[2:])
+                if len(values) == 1 and isinstance(values[0], (list, tuple)):
+                    values = list(values[0])
+                condition = {
+                    "path": condition[0],
+                    "relation": condition[1],
+                    "values": values,
+                }
+            elif not isinstance(condition, dict) or "path" not in condition:
+                # nested filter groups and other syntaxes are not supported.
+                return None
+
+            if (
+                condition["path"] == "id"
+                and condition["relation"] == "is"
+                and len(condition["values"]) == 1
+                and entity_id is None
+            ):
+                entity_id = condition["values"][0]
+            else:
+                other_conditions.append(condition)
+
+        if entity_id is None:
+            return None
+        return entity_id, other_conditions
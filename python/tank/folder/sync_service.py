@@ -0,0 +1,130 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Background synchronization of the path cache.
+"""
+
+import threading
+
+from .folder_io import FolderIOReceiver
+from ..log import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class PathCacheSyncService(object):
+    """
+    Keeps the local path cache in sync with Shotgun by polling the folder
+    creation and deletion events at a regular interval.
+
+    Each poll carries out an incremental sync, exactly like the
+    ``synchronize_folders`` tank command does. Folder creation checks when
+    the path cache was last synchronized, so when the
+    ``TK_PATH_CACHE_SYNC_MAX_AGE`` environment variable is set to a value
+    larger than the polling interval, folder creation usually finds the path
+    cache up to date and skips its own round trip to Shotgun.
+
+    The service can either run on a daemon thread via :meth:`start`, for
+    example in a long running DCC session, or block the current thread via
+    :meth:`run`, for example on a farm node.
+    """
+
+    # Number of seconds between two synchronizations by default.
+    DEFAULT_INTERVAL = 60
+
+    def __init__(self, tk, interval=None):
+        """
+        :param tk: :class:`~sgtk.Sgtk` instance whose path cache to synchronize.
+        :param float interval: Number of seconds between two synchronizations.
+            Defaults to :attr:`DEFAULT_INTERVAL`.
+        """
+        self._tk = tk
+        self._interval = interval or self.DEFAULT_INTERVAL
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._sync_count = 0
+
+    @property
+    def interval(self):
+        """
+        Number of seconds between two synchronizations.
+        """
+        return self._interval
+
+    @property
+    def sync_count(self):
+        """
+        Number of synchronizations carried out so far.
+        """
+        return self._sync_count
+
+    @property
+    def is_running(self):
+        """
+        True if the service is running on its background thread.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Starts synchronizing on a daemon thread. The first synchronization
+        happens immediately.
+        """
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name="PathCacheSyncService")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops synchronizing and waits for the background thread to finish.
+
+        :param float timeout: Maximum number of seconds to wait for the
+            thread, or None to wait until it finishes.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        """
+        Synchronizes the path cache at a regular interval until :meth:`stop`
+        is called. The first synchronization happens immediately.
+
+        Errors are logged and do not stop the service.
+        """
+        log.debug("Synchronizing the path cache every %s seconds.", self._interval)
+        while not self._stop_event.is_set():
+            self.synchronize()
+            self._stop_event.wait(self._interval)
+
+    def synchronize(self):
+        """
+        Carries out a single incremental synchronization.
+
+        :returns: A list of the paths of the remote folders which were
+            synchronized, or None if the synchronization failed.
+        """
+        try:
+            # this runs the folder creation hook for the remote folders, the
+            # same way the synchronize_folders tank command does.
+            folders = FolderIOReceiver.sync_path_cache(self._tk, False)
+        except Exception:
+            log.exception("Path cache synchronization failed.")
+            return None
+
+        self._sync_count += 1
+        if folders:
+            log.debug("Synchronized %d remote folders.", len(folders))
+        return folders
@@ -276,7 +276,7 @@ class Hook(object):
         Returns several local paths on disk given a
         list of shotgun data dictionaries representing publishes.
 
-        Convenience method that calls :meth:`sgtk.util.resolve_publish_path`.
+        Convenience method that calls :meth:`sgtk.util.resolve_publish_paths`.
 
         .. deprecated:: 0.18.64
            Use :meth:`get_publish_path` instead.
@@ -292,12 +292,9 @@ class Hook(object):
         :raises: :class:`~sgtk.util.PublishPathNotSupported` if any of the paths cannot be resolved.
         """
         # avoid cyclic refs
-        from .util import resolve_publish_path
+        from .util import resolve_publish_paths
 
-        paths = []
-        for sg_publish_data in sg_publish_data_list:
-            paths.append(resolve_publish_path(self.sgtk, sg_publish_data))
-        return paths
+        return resolve_publish_paths(self.sgtk, sg_publish_data_list)
 
     @property
     def disk_location(self):
@@ -180,6 +180,12 @@ automatically enabled and end users do not need to worry about this.
 If you want debug logging to be written to these files, enable the
 global debug flag.
 
+By default, log records are written to disk by the thread emitting them.
+Setting the ``TK_ASYNC_LOGGING`` environment variable or the
+:meth:`LogManager.async_file_logging` property moves all file I/O to
+a background thread, so that logging never blocks, for example, the
+main thread of a DCC when the log folder lives on slow storage.
+
     .. note:: If you are writing a toolkit plugin, we recommend
               that you initialize logging early on in your code by
               calling :meth:`LogManager.initialize_base_file_handler`.
@@ -221,16 +227,19 @@ For more information, see https://docs.python.org/2/library/logging.handlers.htm
 """
 
 
+import copy
 import logging
 from logging.handlers import RotatingFileHandler
 import os
 import sys
+import threading
 import time
 import weakref
 import uuid
 from functools import wraps
 from . import constants
 from tank_vendor import six
+from tank_vendor.six.moves import queue
 
 
 class LogManager(object):
@@ -273,6 +282,32 @@ class LogManager(object):
                 self, filename, mode, maxBytes, backupCount, encoding
             )
             self._disable_rollover = False
+            self._batching = False
+
+        def flush(self):
+            """
+            Flushes the stream, unless records are being written by :meth:`emit_batch`.
+            """
+            if not self._batching:
+                RotatingFileHandler.flush(self)
+
+        def emit_batch(self, records):
+            """
+            Writes several records to the log file, flushing the stream only once
+            all of them have been written.
+
+            Rollover happens in between records exactly as it would if records
+            were emitted one by one.
+
+            :param records: List of :class:`logging.LogRecord` to write.
+            """
+            self._batching = True
+            try:
+                for record in records:
+                    self.handle(record)
+            finally:
+                self._batching = False
+            self.flush()
 
         def doRollover(self):
             """
@@ -388,6 +423,158 @@ class LogManager(object):
                 self, record
             )
 
+    class _AsyncFileHandler(logging.Handler):
+        """
+        Log handler which never writes to disk on the thread emitting a record.
+
+        Follows the semantics of Python 3's ``QueueHandler`` and ``QueueListener``:
+        records are prepared and pushed onto a bounded queue, and a background
+        thread pops them in batches and writes them through a wrapped
+        :class:`_SafeRotatingFileHandler`, which takes care of formatting and
+        rotation. If the queue is full, records are dropped rather than blocking
+        the caller and a warning reporting how many were dropped is logged once
+        the queue drains.
+        """
+
+        MAXIMUM_QUEUE_SIZE = 10000
+        """Maximum number of records waiting to be written."""
+
+        BATCH_SIZE = 500
+        """Maximum number of records written between two flushes."""
+
+        def __init__(self, target):
+            """
+            :param target: :class:`_SafeRotatingFileHandler` records are written to.
+            """
+            logging.Handler.__init__(self)
+            self._target = target
+            self._queue = queue.Queue(self.MAXIMUM_QUEUE_SIZE)
+            self._dropped_count = 0
+            # pushed onto the queue to stop the listener thread.
+            self._sentinel = object()
+
+            self._thread = threading.Thread(
+                target=self._monitor, name="sgtk-async-file-logging"
+            )
+            # the logging module flushes and closes handlers at exit, so there
+            # is no need to keep the process alive for this thread.
+            self._thread.daemon = True
+            self._thread.start()
+
+        @property
+        def target(self):
+            """
+            The :class:`_SafeRotatingFileHandler` records are written to.
+            """
+            return self._target
+
+        @property
+        def baseFilename(self):
+            """
+            Path to the log file, for parity with file handlers.
+            """
+            return self._target.baseFilename
+
+        def setFormatter(self, fmt):
+            """
+            Sets the formatter of this handler and of the wrapped file handler.
+
+            :param fmt: :class:`logging.Formatter` instance.
+            """
+            logging.Handler.setFormatter(self, fmt)
+            self._target.setFormatter(fmt)
+
+        def prepare(self, record):
+            """
+            Prepares a record for being handed over to another thread.
+
+            The message is merged with its arguments and exception information is
+            turned into text, so the queued record no longer references objects
+            which may change or be released before it is written. The record
+            is copied so other handlers still receive the original one.
+
+            :param record: :class:`logging.LogRecord` to prepare.
+            :returns: The prepared :class:`logging.LogRecord`.
+            """
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                formatter = self.formatter or logging.Formatter()
+                record.exc_text = formatter.formatException(record.exc_info)
+                record.exc_info = None
+            return record
+
+        def emit(self, record):
+            """
+            Queues the record for the background thread. Never blocks.
+
+            :param record: :class:`logging.LogRecord` to write.
+            """
+            try:
+                self._queue.put_nowait(self.prepare(record))
+            except queue.Full:
+                self._dropped_count += 1
+            except Exception:
+                self.handleError(record)
+
+        def flush(self):
+            """
+            Blocks until all records queued so far have been written to disk.
+            """
+            if self._thread.is_alive():
+                self._queue.join()
+            self._target.flush()
+
+        def close(self):
+            """
+            Writes pending records, stops the background thread and closes
+            the wrapped file handler.
+            """
+            if self._thread.is_alive():
+                self._queue.put(self._sentinel)
+                self._thread.join()
+            self._target.close()
+            logging.Handler.close(self)
+
+        def _monitor(self):
+            """
+            Writes queued records to the wrapped handler until the sentinel is found.
+            """
+            reported_drops = 0
+            done = False
+            while not done:
+                records = [self._queue.get()]
+                # grab whatever else is pending so it can be written in one go.
+                while len(records) < self.BATCH_SIZE:
+                    try:
+                        records.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                item_count = len(records)
+                if self._sentinel in records:
+                    records = [r for r in records if r is not self._sentinel]
+                    done = True
+
+                try:
+                    self._target.emit_batch(records)
+                except Exception:
+                    # emit_batch already reports individual errors, this is
+                    # only to make sure this thread never dies.
+                    pass
+                finally:
+                    for _ in range(item_count):
+                        self._queue.task_done()
+
+                if self._dropped_count != reported_drops and not done:
+                    log.warning(
+                        "%d log records were not written to '%s' because they "
+                        "were emitted faster than they could be written."
+                        % (self._dropped_count - reported_drops, self.baseFilename)
+                    )
+                    reported_drops = self._dropped_count
+
     def __new__(cls, *args, **kwargs):
         #
         # note - this init isn't currently threadsafe.
@@ -421,6 +608,13 @@ class LogManager(object):
             else:
                 instance._global_debug = False
 
+            # check the TK_ASYNC_LOGGING flag at startup. This controls
+            # whether the base file handler writes to disk on a
+            # background thread.
+            instance._async_file_logging = (
+                constants.ASYNC_FILE_LOGGING_ENV_VAR in os.environ
+            )
+
             cls.__instance = instance
 
         return cls.__instance
@@ -599,6 +793,31 @@ class LogManager(object):
 
     global_debug = property(_get_global_debug, _set_global_debug)
 
+    def _get_async_file_logging(self):
+        """
+        Controls whether the base file handler writes log records to disk on
+        a background thread. When enabled, emitting a record only queues it,
+        so that log I/O never blocks the thread doing the logging. Toggling
+        this flag reinitializes an active base file handler.
+
+        .. note:: Asynchronous file logging is off by default.
+                  If you want to permanently enable it,
+                  set the environment variable ``TK_ASYNC_LOGGING``.
+        """
+        return self._async_file_logging
+
+    def _set_async_file_logging(self, state):
+        """
+        Sets whether the base file handler writes to disk on a background thread.
+        """
+        if state == self._async_file_logging:
+            return
+        self._async_file_logging = state
+        if self._std_file_handler:
+            self.initialize_base_file_handler_from_path(self._std_file_handler_log_file)
+
+    async_file_logging = property(_get_async_file_logging, _set_async_file_logging)
+
     @property
     def log_file(self):
         """ Full path to the current log file or None if logging is not active. """
@@ -713,6 +932,9 @@ class LogManager(object):
             % (base_log_file, self._std_file_handler)
         )
         self._root_logger.removeHandler(self._std_file_handler)
+        if isinstance(self._std_file_handler, self._AsyncFileHandler):
+            # write pending records and stop the background thread.
+            self._std_file_handler.close()
         self._std_file_handler = None
         self._std_file_handler_log_file = None
 
@@ -801,6 +1023,10 @@ class LogManager(object):
             encoding="utf8" if six.PY3 else None,
         )
 
+        if self._async_file_logging:
+            # move all file I/O to a background thread.
+            self._std_file_handler = self._AsyncFileHandler(self._std_file_handler)
+
         # set the level based on global debug flag
         if self.global_debug:
             self._std_file_handler.setLevel(logging.DEBUG)
@@ -817,7 +1043,10 @@ class LogManager(object):
         self._root_logger.addHandler(self._std_file_handler)
 
         # log the fact that we set up the log file :)
-        log.debug("Writing to standard log file %s" % log_file)
+        log.debug(
+            "Writing to standard log file %s%s"
+            % (log_file, " asynchronously" if self._async_file_logging else "")
+        )
 
         # return previous log name
         return previous_log_file
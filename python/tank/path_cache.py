@@ -19,6 +19,8 @@ import sqlite3
 import sys
 import os
 import itertools
+import struct
+import time
 
 # use api json to cover py 2.5
 # todo - replace with proper external library
@@ -34,6 +36,7 @@ from . import constants
 from .errors import TankError
 from . import LogManager
 from .util.login import get_current_user
+from .util import filesystem
 
 # Shotgun field definitions to store the path cache data
 SHOTGUN_ENTITY = "FilesystemLocation"
@@ -70,6 +73,10 @@ class PathCache(object):
     # to do so.
     SHOTGUN_ENTITY_QUERY_BATCH_SIZE = 500
 
+    # Number of FilesystemLocation entities created per Shotgun batch call
+    # when uploading new path cache entries.
+    SHOTGUN_ENTITY_CREATE_BATCH_SIZE = 500
+
     def __init__(self, tk):
         """
         Constructor.
@@ -98,6 +105,12 @@ class PathCache(object):
         # disk, created with all the right permissions etc.
         path_cache_file = self._get_path_cache_location()
 
+        # the time of the last sync is recorded as the modification time of
+        # a file next to the database. Recording it in the database would
+        # modify it even when nothing was synchronized, which invalidates
+        # everything derived from the path cache.
+        self._sync_time_file = "%s.last_sync" % path_cache_file
+
         self._connection = sqlite3.connect(path_cache_file)
 
         # this is to handle unicode properly - make sure that sqlite returns
@@ -133,6 +146,8 @@ class PathCache(object):
 
                     CREATE INDEX path_cache_path ON path_cache(root, path, primary_entity);
 
+                    CREATE INDEX path_cache_path_nocase ON path_cache(root, path COLLATE NOCASE);
+
                     CREATE UNIQUE INDEX path_cache_all ON path_cache(entity_type, entity_id, root, path, primary_entity);
 
                     CREATE TABLE event_log_sync (last_id integer);
@@ -146,6 +161,10 @@ class PathCache(object):
                 )
                 self._connection.commit()
 
+                # a sync recorded for a previous database doesn't apply to
+                # this one.
+                filesystem.safe_delete_file(self._sync_time_file)
+
             else:
 
                 # we have an existing database! Ensure it is up to date
@@ -162,6 +181,18 @@ class PathCache(object):
                     )
                     self._connection.commit()
 
+                # the index used to look up the paths below a path, ignoring
+                # case, was added later on.
+                ret = c.execute(
+                    "SELECT name FROM main.sqlite_master WHERE type='index';"
+                )
+                index_names = [x[0] for x in ret.fetchall()]
+                if "path_cache_path_nocase" not in index_names:
+                    c.executescript(
+                        "CREATE INDEX path_cache_path_nocase ON path_cache(root, path COLLATE NOCASE);"
+                    )
+                    self._connection.commit()
+
                 # now ensure that some key fields that have been added during the dev cycle are there
                 ret = c.execute("PRAGMA table_info(path_cache)")
                 field_names = [x[1] for x in ret.fetchall()]
@@ -186,24 +217,59 @@ class PathCache(object):
         finally:
             c.close()
 
-    def _get_path_cache_location(self):
+    @staticmethod
+    def get_generation(path_cache_file):
         """
-        Creates the path cache file and returns its location on disk.
+        Returns a number that changes every time the given path cache database
+        is modified by any process, either by adding mappings or by
+        synchronizing it with Shotgun.
+
+        This reads the change counter SQLite keeps in the header of the
+        database file, which is much cheaper than opening the database, so it
+        can be used to find out if data previously derived from the path cache
+        is still up to date.
+
+        :param str path_cache_file: Path to a path cache database, as returned
+            by :meth:`get_location`.
+        :returns: Generation number of the path cache, ``None`` if it can't be
+            determined.
+        """
+        try:
+            with open(path_cache_file, "rb") as fh:
+                header = fh.read(100)
+        except (IOError, OSError):
+            return None
+        if len(header) < 100:
+            # an empty database which hasn't been initialized yet.
+            return 0
+        # the file change counter is a 4 byte big-endian integer at offset 24.
+        return struct.unpack(">I", header[24:28])[0]
 
-        :returns: The path to the path cache file
+    @classmethod
+    def get_location(cls, tk):
         """
-        if self._tk.pipeline_configuration.get_shotgun_path_cache_enabled():
+        Creates the path cache file of the given Toolkit instance and returns
+        its location on disk.
+
+        :param tk: Toolkit API instance
+        :returns: The path to the path cache file, ``None`` if the pipeline
+            configuration has no data roots and therefore no path cache.
+        """
+        if not tk.pipeline_configuration.has_associated_data_roots():
+            return None
+
+        if tk.pipeline_configuration.get_shotgun_path_cache_enabled():
 
             # 0.15+ path cache setup - call out to a core hook to determine
             # where the path cache should be located.
-            path = self._tk.execute_core_hook_method(
+            path = tk.execute_core_hook_method(
                 constants.CACHE_LOCATION_HOOK_NAME,
                 "get_path_cache_path",
-                project_id=self._tk.pipeline_configuration.get_project_id(),
+                project_id=tk.pipeline_configuration.get_project_id(),
                 # Do NOT use the plugin_id as a suffix for the path cache folder. This would
                 # prevent a path cache sync from an engine to be reused by another plugiin.
                 plugin_id=None,
-                pipeline_configuration_id=self._tk.pipeline_configuration.get_shotgun_id(),
+                pipeline_configuration_id=tk.pipeline_configuration.get_shotgun_id(),
             )
 
         else:
@@ -211,7 +277,7 @@ class PathCache(object):
             # fall back on the 0.14 setting, where the path cache
             # is located in a tank folder in the project root
             path = os.path.join(
-                self._tk.pipeline_configuration.get_primary_data_root(),
+                tk.pipeline_configuration.get_primary_data_root(),
                 "tank",
                 "cache",
                 "path_cache.db",
@@ -240,6 +306,14 @@ class PathCache(object):
 
         return path
 
+    def _get_path_cache_location(self):
+        """
+        Creates the path cache file and returns its location on disk.
+
+        :returns: The path to the path cache file
+        """
+        return self.get_location(self._tk)
+
     def _path_to_dbpath(self, relative_path):
         """
         converts a  relative path to a db path form
@@ -314,14 +388,69 @@ class PathCache(object):
     ############################################################################################
     # shotgun synchronization (SG data pushed into path cache database)
 
-    def synchronize(self, full_sync=False):
+    @staticmethod
+    def get_sync_max_age():
+        """
+        Returns how long a synchronization is considered recent enough for
+        folder creation to skip synchronizing again, as set by the
+        ``TK_PATH_CACHE_SYNC_MAX_AGE`` environment variable.
+
+        :returns: Number of seconds or None if folder creation should
+            always synchronize.
+        """
+        value = os.environ.get(constants.PATH_CACHE_SYNC_MAX_AGE_ENV_VAR)
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            log.warning(
+                "Invalid value '%s' for %s, expected a number of seconds.",
+                value,
+                constants.PATH_CACHE_SYNC_MAX_AGE_ENV_VAR,
+            )
+            return None
+
+    def get_last_sync_time(self):
+        """
+        Returns when the path cache was last synchronized with Shotgun, by
+        this process or any other using the same path cache.
+
+        :returns: Time in seconds since the epoch or None if unknown.
+        """
+        if self._path_cache_disabled:
+            return None
+
+        try:
+            return os.path.getmtime(self._sync_time_file)
+        except OSError:
+            return None
+
+    def _update_last_sync_time(self):
+        """
+        Records that the path cache was just synchronized with Shotgun.
+        """
+        try:
+            filesystem.touch_file(self._sync_time_file)
+            os.utime(self._sync_time_file, None)
+        except OSError as e:
+            log.debug("Could not record the path cache sync time: %s" % e)
+
+    def synchronize(self, full_sync=False, max_age=None):
         """
         Ensure the local path cache is in sync with Shotgun.
 
         If the method decides to do a full sync, it will attempt to
         launch the busy overlay window.
 
+        When a ``max_age`` is specified, an incremental sync is skipped if
+        the path cache was synchronized less than ``max_age`` seconds ago,
+        typically by a :class:`~tank.folder.PathCacheSyncService` running in
+        the background.
+
         :param full_sync: Boolean to indicate that a full sync should be carried out.
+        :param max_age: Number of seconds during which a previous sync is
+            considered recent enough. If None, the sync is always carried out.
 
         :returns: A list of remote items which were detected, created remotely
                   and not existing in this path cache. These are returned as a list of
@@ -339,6 +468,27 @@ class PathCache(object):
             log.debug("Folder synchronization is turned off for this project.")
             return []
 
+        if not full_sync and max_age is not None:
+            last_sync_time = self.get_last_sync_time()
+            if last_sync_time is not None and time.time() - last_sync_time < max_age:
+                log.debug(
+                    "Path cache was synchronized %.1f seconds ago, skipping sync.",
+                    time.time() - last_sync_time,
+                )
+                return []
+
+        remote_items = self._synchronize(full_sync)
+        self._update_last_sync_time()
+        return remote_items
+
+    def _synchronize(self, full_sync):
+        """
+        Runs the actual synchronization, see :meth:`synchronize`.
+
+        :param full_sync: Boolean to indicate that a full sync should be carried out.
+
+        :returns: A list of remote items which were detected.
+        """
         c = self._connection.cursor()
 
         try:
@@ -480,68 +630,77 @@ class PathCache(object):
                 "id": self._tk.pipeline_configuration.get_shotgun_id(),
             }
 
-        sg_batch_data = []
-        for d in data:
-
-            # get a name for the clickable url in the path field
-            # this will include the name of the storage
-            root_name, relative_path = self._separate_root(d["path"])
-            db_path = self._path_to_dbpath(relative_path)
-            path_display_name = "[%s] %s" % (root_name, db_path)
-
-            req = {
-                "request_type": "create",
-                "entity_type": SHOTGUN_ENTITY,
-                "data": {
-                    "project": self._get_project_link(),
-                    "created_by": get_current_user(self._tk),
-                    SG_ENTITY_FIELD: d["entity"],
-                    SG_IS_PRIMARY_FIELD: d["primary"],
-                    SG_PIPELINE_CONFIG_FIELD: pc_link,
-                    SG_METADATA_FIELD: json.dumps(d["metadata"]),
-                    SG_ENTITY_ID_FIELD: d["entity"]["id"],
-                    SG_ENTITY_TYPE_FIELD: d["entity"]["type"],
-                    SG_ENTITY_NAME_FIELD: d["entity"]["name"],
-                    SG_PATH_FIELD: {"local_path": d["path"], "name": path_display_name},
-                },
-            }
-
-            sg_batch_data.append(req)
-
-        # push to shotgun in a single xact
-        log.debug("Uploading %s path entries to Shotgun..." % len(sg_batch_data))
-
-        try:
-            response = self._tk.shotgun.batch(sg_batch_data)
-        except Exception as e:
-            raise TankError(
-                "Critical! Could not update Shotgun with folder "
-                "data. Please contact support. Error details: %s" % e
-            )
+        # push to shotgun in chunks, so that a large folder creation doesn't
+        # result in a single huge request.
+        log.debug("Uploading %s path entries to Shotgun..." % len(data))
+
+        response = []
+        for i in range(0, len(data), self.SHOTGUN_ENTITY_CREATE_BATCH_SIZE):
+            sg_batch_data = []
+            for d in data[i : i + self.SHOTGUN_ENTITY_CREATE_BATCH_SIZE]:
+
+                # get a name for the clickable url in the path field
+                # this will include the name of the storage
+                root_name, relative_path = self._separate_root(d["path"])
+                db_path = self._path_to_dbpath(relative_path)
+                path_display_name = "[%s] %s" % (root_name, db_path)
+
+                req = {
+                    "request_type": "create",
+                    "entity_type": SHOTGUN_ENTITY,
+                    "data": {
+                        "project": self._get_project_link(),
+                        "created_by": get_current_user(self._tk),
+                        SG_ENTITY_FIELD: d["entity"],
+                        SG_IS_PRIMARY_FIELD: d["primary"],
+                        SG_PIPELINE_CONFIG_FIELD: pc_link,
+                        SG_METADATA_FIELD: json.dumps(d["metadata"]),
+                        SG_ENTITY_ID_FIELD: d["entity"]["id"],
+                        SG_ENTITY_TYPE_FIELD: d["entity"]["type"],
+                        SG_ENTITY_NAME_FIELD: d["entity"]["name"],
+                        SG_PATH_FIELD: {
+                            "local_path": d["path"],
+                            "name": path_display_name,
+                        },
+                    },
+                }
+
+                sg_batch_data.append(req)
+
+            try:
+                response.extend(self._tk.shotgun.batch(sg_batch_data))
+            except Exception as e:
+                # the entities created by the previous chunks are not
+                # referenced by any event log entry and would never be
+                # synchronized, so attempt to remove them.
+                self._delete_uploaded_entities(response)
+                raise TankError(
+                    "Critical! Could not update Shotgun with folder "
+                    "data. Please contact support. Error details: %s" % e
+                )
 
         # now create a dictionary where input path cache rowid (path_cache_row_id)
         # is mapped to the shotgun ids that were just created
-        def _rowid_from_filesystem_entity(fsl_entity):
-            path = fsl_entity[SG_PATH_FIELD]["local_path"]
-            for d in data:
-                # We need to match not only the path but also the entity type when associating the FilesystemLocation
-                # entities with the local cache's row ids, because Task folders generate two entries with the same
-                # path, one for the Task and one for the Step.
-                if (
-                    d["path"] == path
-                    and d["entity"]["type"] == fsl_entity["linked_entity_type"]
-                ):
-                    return d["path_cache_row_id"]
-            raise TankError(
-                "Could not resolve row id for path! Please contact support! "
-                "trying to resolve path '%s'. Source data set: %s" % (path, data)
+        #
+        # We need to match not only the path but also the entity type when associating the FilesystemLocation
+        # entities with the local cache's row ids, because Task folders generate two entries with the same
+        # path, one for the Task and one for the Step.
+        rowid_lookup = {}
+        for d in data:
+            rowid_lookup.setdefault(
+                (d["path"], d["entity"]["type"]), d["path_cache_row_id"]
             )
 
         rowid_sgid_lookup = {}
         for sg_obj in response:
             sg_id = sg_obj["id"]
-            pc_row_id = _rowid_from_filesystem_entity(sg_obj)
-            rowid_sgid_lookup[pc_row_id] = sg_id
+            key = (sg_obj[SG_PATH_FIELD]["local_path"], sg_obj["linked_entity_type"])
+            if key not in rowid_lookup:
+                raise TankError(
+                    "Could not resolve row id for path! Please contact support! "
+                    "trying to resolve path '%s'. Source data set: %s" % (key[0], data)
+                )
+            rowid_sgid_lookup[rowid_lookup[key]] = sg_id
 
         # now register the created ids in the event log
         # this will later on be read by the synchronization
@@ -576,6 +735,33 @@ class PathCache(object):
         # return the event log id which represents this uploaded slab
         return (response["id"], rowid_sgid_lookup)
 
+    def _delete_uploaded_entities(self, sg_entities):
+        """
+        Attempts to delete FilesystemLocation entities which were created in
+        Shotgun before an upload failed. Errors are logged and ignored.
+
+        :param list sg_entities: Entities created by the upload.
+        """
+        if not sg_entities:
+            return
+
+        log.debug(
+            "Deleting %d FilesystemLocation entities created before the upload failed.",
+            len(sg_entities),
+        )
+        sg_batch_data = [
+            {
+                "request_type": "delete",
+                "entity_type": SHOTGUN_ENTITY,
+                "entity_id": x["id"],
+            }
+            for x in sg_entities
+        ]
+        try:
+            self._tk.shotgun.batch(sg_batch_data)
+        except Exception:
+            log.exception("Could not delete FilesystemLocation entities.")
+
     def _get_project_link(self):
         """
         Returns the project link dictionary.
@@ -1161,6 +1347,9 @@ class PathCache(object):
         Checks a series of path mappings to ensure that they don't conflict with
         existing path cache data.
 
+        The path cache data relevant to all the mappings is retrieved with a
+        couple of queries rather than once per mapping.
+
         :param data: list of dictionaries. Each dictionary should contain
                      the following keys:
                       - entity: a dictionary with keys name, id and type
@@ -1168,10 +1357,144 @@ class PathCache(object):
                       - primary: a boolean indicating if this is a primary entry
                       - metadata: configuration metadata
         """
-        for d in data:
-            self._validate_mapping(d["path"], d["entity"], d["primary"])
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return
+
+        c = self._connection.cursor()
+        try:
+            self._load_mappings_table(c, data)
 
-    def _validate_mapping(self, path, entity, is_primary):
+            # the primary entities already associated with the paths
+            entities_in_db = {}
+            res = c.execute(
+                """
+                SELECT m.idx, p.entity_type, p.entity_id, p.entity_name
+                FROM   mappings m
+                JOIN   path_cache p ON p.root = m.root AND p.path = m.path
+                WHERE  m.primary_entity = 1
+                AND    p.primary_entity = 1
+                """
+            )
+            for (idx, entity_type, entity_id, entity_name) in res:
+                if idx in entities_in_db:
+                    # never supposed to happen!
+                    raise TankError(
+                        "More than one entry in path database for %s!"
+                        % data[idx]["path"]
+                    )
+                entities_in_db[idx] = {
+                    "type": str(entity_type),
+                    "id": entity_id,
+                    "name": str(entity_name),
+                }
+
+            # the paths already associated with the entities
+            paths_in_db = {}
+            res = c.execute(
+                """
+                SELECT p.entity_type, p.entity_id, p.root, p.path
+                FROM   path_cache p
+                JOIN   (SELECT DISTINCT entity_type, entity_id
+                        FROM   mappings
+                        WHERE  primary_entity = 1) m
+                ON     p.entity_type = m.entity_type AND p.entity_id = m.entity_id
+                """
+            )
+            for (entity_type, entity_id, root_name, relative_path) in res:
+                root_path = self._roots.get(root_name)
+                if not root_path:
+                    # The root name doesn't match a recognized name, so skip this entry
+                    continue
+                paths_in_db.setdefault((entity_type, entity_id), []).append(
+                    self._dbpath_to_path(root_path, relative_path)
+                )
+        finally:
+            # nothing but the temporary table was written to, release the
+            # transaction and the locks it holds.
+            self._connection.rollback()
+            self._drop_mappings_table(c)
+            c.close()
+
+        for (idx, d) in enumerate(data):
+            entity = d["entity"]
+            self._validate_mapping(
+                d["path"],
+                entity,
+                d["primary"],
+                entities_in_db.get(idx),
+                paths_in_db.get((entity["type"], entity["id"]), []),
+            )
+
+    def _load_mappings_table(self, cursor, data):
+        """
+        Loads mappings into the temporary ``mappings`` table, so that they can
+        be checked against the path cache with set based queries.
+
+        Mappings with a path outside of the project roots are loaded with a
+        NULL root and path.
+
+        :param cursor: Database cursor to use.
+        :param data: list of mapping dictionaries, see :meth:`add_mappings`.
+
+        :returns: List with a ``(root_name, db_path)`` tuple for each mapping,
+            or None for mappings with a path outside of the project roots.
+        """
+        cursor.execute("DROP TABLE IF EXISTS temp.mappings")
+        cursor.execute(
+            """
+            CREATE TEMP TABLE mappings (idx integer primary key,
+                                        entity_type text,
+                                        entity_id integer,
+                                        root text,
+                                        path text,
+                                        primary_entity integer)
+            """
+        )
+
+        locations = []
+        rows = []
+        for (idx, d) in enumerate(data):
+            location = None
+            if d["path"] is not None:
+                try:
+                    root_name, relative_path = self._separate_root(d["path"])
+                    location = (root_name, self._path_to_dbpath(relative_path))
+                except TankError:
+                    # paths not belonging to the project are never in the db
+                    pass
+            locations.append(location)
+            rows.append(
+                (
+                    idx,
+                    d["entity"]["type"],
+                    d["entity"]["id"],
+                    location[0] if location else None,
+                    location[1] if location else None,
+                    1 if d["primary"] else 0,
+                )
+            )
+
+        cursor.executemany(
+            """INSERT INTO mappings(idx, entity_type, entity_id, root, path, primary_entity)
+                           VALUES(?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        return locations
+
+    def _drop_mappings_table(self, cursor):
+        """
+        Drops the temporary ``mappings`` table.
+
+        This needs to happen outside of a transaction, since older versions
+        of the sqlite3 module commit pending transactions when executing
+        schema statements.
+
+        :param cursor: Database cursor to use.
+        """
+        cursor.execute("DROP TABLE IF EXISTS temp.mappings")
+
+    def _validate_mapping(self, path, entity, is_primary, entity_in_db, paths_in_db):
         """
         Consistency checks happening prior to folder creation. May raise a TankError
         if an inconsistency is detected.
@@ -1181,14 +1504,15 @@ class PathCache(object):
         :param is_primary: indicates that this is a primary mapping - each folder may have
                            both primary and secondary entity associations - the secondary
                            being more loosely tied to the path.
+        :param entity_in_db: The primary entity associated with the path in the path cache
+                             or None.
+        :param paths_in_db: List of paths associated with the entity in the path cache.
         """
 
         # Make sure that there isn't already a record with the same
         # name in the database and file system, but with a different id.
         # We only do this for primary items - for secondary items, multiple items can exist
         if is_primary:
-            entity_in_db = self.get_entity(path)
-
             if entity_in_db is not None:
                 if (
                     entity_in_db["id"] != entity["id"]
@@ -1235,7 +1559,7 @@ class PathCache(object):
         # we only check for primary entities, doing the check for secondary
         # would only be to carry out the same check twice.
         if is_primary:
-            for p in self.get_paths(entity["type"], entity["id"], primary_only=False):
+            for p in paths_in_db:
                 # so we got a path that matches our entity
                 if p != path and os.path.dirname(p) == os.path.dirname(path):
                     # this path is identical to our path we are about to create except for the name.
@@ -1302,18 +1626,9 @@ class PathCache(object):
 
         c = self._connection.cursor()
         try:
-            data_for_sg = []
-
-            for d in data:
-                new_rowid = self._add_db_mapping(
-                    c, d["path"], d["entity"], d["primary"]
-                )
-                if new_rowid:
-                    # this entry wasn't already in the db. So add it to the list to
-                    # potentially upload to SG later on
-                    data_for_sg.append(d)
-                    # append path cache row id to data
-                    d["path_cache_row_id"] = new_rowid
+            # add all the entries which aren't already in the db, and
+            # potentially upload them to SG later on
+            data_for_sg = self._add_db_mappings(c, data)
 
             # now, if there were any FilesystemLocation records created,
             # create an event log entry that links back to those entries.
@@ -1333,12 +1648,11 @@ class PathCache(object):
                 )
                 self._update_last_event_log_synced(c, event_log_id)
                 # and indicate in the path cache that all these records have been pushed
-                for (pc_row_id, sg_id) in sg_id_lookup.items():
-                    c.execute(
-                        "INSERT INTO shotgun_status(path_cache_id, shotgun_id) "
-                        "VALUES(?, ?)",
-                        (pc_row_id, sg_id),
-                    )
+                c.executemany(
+                    "INSERT INTO shotgun_status(path_cache_id, shotgun_id) "
+                    "VALUES(?, ?)",
+                    list(sg_id_lookup.items()),
+                )
 
         except:
             # error processing shotgun. Make sure we roll back the sqlite path cache
@@ -1351,8 +1665,136 @@ class PathCache(object):
             self._connection.commit()
 
         finally:
+            self._drop_mappings_table(c)
             c.close()
 
+    def _add_db_mappings(self, cursor, data):
+        """
+        Adds a collection of associations to the database in a single pass.
+
+        This behaves like calling :meth:`_add_db_mapping` for each mapping in
+        turn, but the existing associations are retrieved with set based
+        queries, so only the new ones need a statement each.
+
+        :param cursor: database cursor to use
+        :param data: list of mapping dictionaries, see :meth:`add_mappings`.
+
+        :returns: List of the mappings which were added to the db. The ROWID
+            of each new row is stored in their ``path_cache_row_id`` key.
+        """
+        locations = self._load_mappings_table(cursor, data)
+
+        # the primary entities already registered for the paths of primary mappings
+        primary_entities = {}
+        res = cursor.execute(
+            """
+            SELECT DISTINCT p.root, p.path, p.entity_type, p.entity_id, p.entity_name
+            FROM   mappings m
+            JOIN   path_cache p ON p.root = m.root AND p.path = m.path
+            WHERE  m.primary_entity = 1
+            AND    p.primary_entity = 1
+            """
+        )
+        for (root_name, db_path, entity_type, entity_id, entity_name) in res:
+            if (root_name, db_path) in primary_entities:
+                # never supposed to happen!
+                raise TankError(
+                    "More than one entry in path database for %s!" % db_path
+                )
+            primary_entities[(root_name, db_path)] = {
+                "type": str(entity_type),
+                "id": entity_id,
+                "name": str(entity_name),
+            }
+
+        # the associations already registered for secondary mappings
+        associations = set(
+            cursor.execute(
+                """
+                SELECT DISTINCT p.entity_type, p.entity_id, p.root, p.path
+                FROM   mappings m
+                JOIN   path_cache p ON p.entity_type = m.entity_type
+                                   AND p.entity_id = m.entity_id
+                                   AND p.root = m.root
+                                   AND p.path = m.path
+                WHERE  m.primary_entity = 0
+                """
+            )
+        )
+
+        # now walk the mappings in order, keeping track of the ones added so
+        # far so that duplicates within the data are handled as if they were
+        # inserted one at a time.
+        new_rows = []
+        for (idx, d) in enumerate(data):
+            path = d["path"]
+            entity = d["entity"]
+
+            if locations[idx] is None:
+                # raises a TankError for paths outside of the project roots
+                self._separate_root(path)
+            (root_name, db_path) = locations[idx]
+            association = (entity["type"], entity["id"], root_name, db_path)
+
+            if d["primary"]:
+                # the primary entity must be unique: path/id/type
+                curr_entity = primary_entities.get((root_name, db_path))
+                if curr_entity is not None:
+                    # this path is already registered. Ensure it is connected to
+                    # our entity! See _add_db_mapping for details.
+                    if (
+                        curr_entity["type"] != entity["type"]
+                        or curr_entity["id"] != entity["id"]
+                    ):
+                        raise TankError(
+                            "Database concurrency problems: The path '%s' is "
+                            "already associated with Shotgun entity %s. Please re-run "
+                            "folder creation to try again." % (path, str(curr_entity))
+                        )
+                    # the entry that exists in the db matches what we are trying to insert so skip it
+                    continue
+                primary_entities[(root_name, db_path)] = entity
+
+            elif association in associations:
+                # we already have the association present in the db.
+                continue
+
+            associations.add(association)
+            new_rows.append(
+                (
+                    idx,
+                    (
+                        entity["type"],
+                        entity["id"],
+                        entity["name"],
+                        root_name,
+                        db_path,
+                        d["primary"],
+                    ),
+                )
+            )
+
+        added = []
+        for (idx, row) in new_rows:
+            # note: the INSERT OR IGNORE INTO checks if we already have a
+            # record in the db for this combination, e.g. inserted by another
+            # process since the queries above. See _add_db_mapping. Only the
+            # rows actually inserted are returned.
+            cursor.execute(
+                """INSERT OR IGNORE INTO path_cache(entity_type,
+                                                     entity_id,
+                                                     entity_name,
+                                                     root,
+                                                     path,
+                                                     primary_entity)
+                               VALUES(?, ?, ?, ?, ?, ?)""",
+                row,
+            )
+            if cursor.rowcount == 1:
+                data[idx]["path_cache_row_id"] = cursor.lastrowid
+                added.append(data[idx])
+        return added
+
     def _add_db_mapping(self, cursor, path, entity, primary):
         """
         Adds an association to the database. If the association already exists, it will
@@ -1563,13 +2005,14 @@ class PathCache(object):
         )
 
         # now get all paths that are child paths
-        like_path = "%s/%%" % path
+        (lower_bound, upper_bound) = self._get_subtree_bounds(path)
         res = c.execute(
             """SELECT pc.root, pc.path, ss.shotgun_id
                           FROM path_cache pc
                           INNER JOIN shotgun_status ss on pc.rowid = ss.path_cache_id
-                          WHERE root = ? and path like ?""",
-            (root_name, like_path),
+                          WHERE root = ?
+                          and path >= ? COLLATE NOCASE and path < ? COLLATE NOCASE""",
+            (root_name, lower_bound, upper_bound),
         )
 
         for x in list(res):
@@ -1584,6 +2027,89 @@ class PathCache(object):
 
         return matches
 
+    def _get_subtree_bounds(self, db_path):
+        """
+        Returns the range of db paths below a given db path.
+
+        All the paths below ``/foo/bar`` start with ``/foo/bar/`` and therefore
+        sort between ``/foo/bar/`` and ``/foo/bar0``, since ``0`` is the
+        character following ``/``. Querying this range lets sqlite use the
+        path index instead of scanning the whole table, which a ``LIKE``
+        condition would do.
+
+        Like ``LIKE``, the range should be compared with ``COLLATE NOCASE``
+        so that paths differing only by case are matched, which is served by
+        the ``path_cache_path_nocase`` index.
+
+        :param db_path: Path in the db form, e.g. ``/foo/bar``.
+        :returns: Tuple with the inclusive lower bound and exclusive upper bound.
+        """
+        return (db_path + "/", db_path + chr(ord("/") + 1))
+
+    def get_folder_tree_from_path(self, path):
+        """
+        Returns the entities associated with a path and all the paths below it.
+
+        :param path: a path on disk
+        :returns: A list of dictionaries with keys path, entity and primary,
+                  where entity is a Shotgun entity dict with keys type, id and
+                  name. Empty if the path isn't part of the project.
+        """
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return []
+
+        try:
+            root_name, relative_path = self._separate_root(path)
+        except TankError:
+            # fail gracefully if path is not a valid path
+            # eg. doesn't belong to the project
+            return []
+
+        root_path = self._roots.get(root_name)
+        db_path = self._path_to_dbpath(relative_path)
+        (lower_bound, upper_bound) = self._get_subtree_bounds(db_path)
+
+        c = self._connection.cursor()
+        try:
+            # the path and the paths below it are all in the range between
+            # the path and the upper bound, which is scanned with the index.
+            # Other paths in that range, like /foo/bar-baz, are then filtered
+            # out. An OR between the two conditions would prevent the range
+            # scan.
+            res = c.execute(
+                """SELECT path, entity_type, entity_id, entity_name, primary_entity
+                   FROM path_cache
+                   WHERE root = ?
+                   AND path >= ? COLLATE NOCASE AND path < ? COLLATE NOCASE
+                   AND (path = ? COLLATE NOCASE OR path >= ? COLLATE NOCASE)
+                   ORDER BY path COLLATE NOCASE""",
+                (root_name, db_path, upper_bound, db_path, lower_bound),
+            )
+            matches = []
+            for (
+                item_path,
+                entity_type,
+                entity_id,
+                entity_name,
+                primary_entity,
+            ) in res:
+                matches.append(
+                    {
+                        "path": self._dbpath_to_path(root_path, item_path),
+                        "entity": {
+                            "type": str(entity_type),
+                            "id": entity_id,
+                            "name": str(entity_name),
+                        },
+                        "primary": bool(primary_entity),
+                    }
+                )
+        finally:
+            c.close()
+
+        return matches
+
     def get_paths(self, entity_type, entity_id, primary_only, cursor=None):
         """
         Returns a path given a shotgun entity (type/id pair)
@@ -14,6 +14,7 @@ across storages, configurations etc.
 """
 import os
 import glob
+import json
 
 from tank_vendor import yaml
 import tank_vendor.six.moves.cPickle as pickle
@@ -32,6 +33,7 @@ from . import template_includes
 from . import LogManager
 
 from .descriptor import Descriptor, create_descriptor, descriptor_uri_to_dict
+from .descriptor import constants as descriptor_constants
 from tank_vendor import six
 
 log = LogManager.get_logger(__name__)
@@ -146,6 +148,9 @@ class PipelineConfiguration(object):
             else self._pc_id
         )
 
+        # folder schema, read on demand by the folder creation.
+        self._folder_schema = None
+
         self._use_shotgun_path_cache = pipeline_config_metadata.get(
             "use_shotgun_path_cache", False
         )
@@ -405,8 +410,61 @@ class PipelineConfiguration(object):
         """
         Loads pickled yaml_cache items if they are found and merges them into
         the global YamlCache.
+
+        This includes the caches written to the bundle cache fallback paths
+        by :meth:`~sgtk.bootstrap.ToolkitManager.prefetch` for this
+        configuration.
+        """
+        self._merge_yaml_cache(self.get_yaml_cache_location())
+        for cache_file in self._get_prefetched_yaml_caches():
+            self._merge_yaml_cache(cache_file)
+
+    def _get_prefetched_yaml_caches(self):
+        """
+        Returns the YAML caches prefetched for this configuration in the
+        bundle cache fallback paths.
+
+        Each prefetch writes a ready marker naming the uri of the
+        configuration and its YAML cache, only the caches of the markers
+        matching the descriptor of this configuration are returned.
+
+        :returns: List of paths to pickled yaml_cache items.
+        """
+        cache_files = []
+        config_uri = None
+        for fallback_path in self._bundle_cache_fallback_paths:
+            marker_paths = glob.glob(
+                os.path.join(
+                    fallback_path, descriptor_constants.PREFETCH_FOLDER, "*.json"
+                )
+            )
+            for marker_path in sorted(marker_paths):
+                try:
+                    with open(marker_path, "rt") as fh:
+                        marker = json.load(fh)
+                except Exception as e:
+                    log.warning(
+                        "Could not read prefetch marker %s: %s" % (marker_path, e)
+                    )
+                    continue
+
+                if config_uri is None:
+                    config_uri = self._descriptor.get_uri()
+                if marker.get("configuration") != config_uri or not marker.get(
+                    "yaml_cache"
+                ):
+                    continue
+                cache_files.append(
+                    os.path.join(os.path.dirname(marker_path), marker["yaml_cache"])
+                )
+        return cache_files
+
+    def _merge_yaml_cache(self, cache_file):
+        """
+        Merges the pickled yaml_cache items of a file into the global YamlCache.
+
+        :param str cache_file: Path to the pickled items.
         """
-        cache_file = self.get_yaml_cache_location()
         if not os.path.exists(cache_file):
             return
 
@@ -421,6 +479,7 @@ class PipelineConfiguration(object):
             yaml_cache.g_yaml_cache.merge_cache_items(cache_items)
         except Exception as e:
             log.warning("Could not merge yaml cache %s: %s" % (cache_file, e))
+            return
         finally:
             fh.close()
 
@@ -1091,6 +1150,23 @@ class PipelineConfiguration(object):
         """
         return os.path.join(os.path.join(self.get_config_location(), "core"), "schema")
 
+    def get_cached_folder_schema(self):
+        """
+        Returns the folder schema previously read for this configuration.
+
+        :returns: :class:`~tank.folder.configuration.FolderSchema` or None.
+        """
+        return self._folder_schema
+
+    def set_cached_folder_schema(self, schema):
+        """
+        Caches the folder schema read for this configuration, so it can be
+        reused by subsequent folder creation requests.
+
+        :param schema: :class:`~tank.folder.configuration.FolderSchema`
+        """
+        self._folder_schema = schema
+
     def get_config_location(self):
         """
         Returns the config folder location for the project
@@ -10,6 +10,8 @@
 
 import os
 import collections
+import contextlib
+import datetime
 import pprint
 
 
@@ -27,6 +29,14 @@ from tank_vendor import six
 
 log = LogManager.get_logger(__name__)
 
+# cache data chunk last looked up by path along with the index of its project
+# roots, see _get_project_path_index().
+_g_project_path_index = (None, None)
+
+# lookup cache data loaded from disk, keyed by path to the cache file. Each
+# value is a tuple of the stat signature of the file and of the data.
+_g_lookup_cache = {}
+
 
 def from_entity(entity_type, entity_id):
     """
@@ -498,10 +508,11 @@ def _get_pipeline_configs_for_path(path, data):
     Given a path on disk and a cache data structure, return a list of
     associated pipeline configurations.
 
-    Based on the Shotgun cache data, generates a list of project root locations.
-    These are then compared (case insensitively) against the given path and
-    if it is determined that the input path belongs to any of these project
-    roots, the list of pipeline configuration objects for that root is returned.
+    Based on the Shotgun cache data, generates an index of project root locations.
+    The given path and its parent folders are then looked up (case insensitively)
+    in this index and if it is determined that the input path belongs to any of
+    these project roots, the list of pipeline configuration objects for that root
+    is returned.
 
     the return data structure is a list of dicts, each dict containing the
     following fields:
@@ -549,6 +560,62 @@ def _get_pipeline_configs_for_path(path, data):
     :param data: Cache data chunk, obtained using _get_pipeline_configs()
     :returns: list of pipeline configurations matching the path, [] if no match.
     """
+    # the project roots are indexed by lower case path
+    # (like the SG API, this logic is case preserving, not case insensitive)
+    index = _get_project_path_index(data)
+
+    # check the path itself and each of its parent folders. Either
+    # direct match: path: /mnt/proj_x == project path: /mnt/proj_x
+    # child path: path: /mnt/proj_x/foo/bar starts with /mnt/proj_x/
+    path_lower = path.lower()
+    candidates = [path_lower] + [
+        path_lower[:idx] for idx, char in enumerate(path_lower) if char == os.path.sep
+    ]
+
+    matches = []
+    for candidate in candidates:
+        matches.extend(index.get(candidate, []))
+
+    # return the pipeline configurations in the order the project roots
+    # were found in the cache data.
+    all_matching_pcs = []
+    for _, associated_pcs in sorted(matches, key=lambda match: match[0]):
+        all_matching_pcs.extend(associated_pcs)
+
+    return all_matching_pcs
+
+
+def _get_project_path_index(data):
+    """
+    Returns the index of the project roots of the given cache data.
+
+    The index is built the first time it is requested for a given cache data
+    chunk and kept in memory along with it.
+
+    :param data: Cache data chunk, obtained using _get_pipeline_configs()
+    :returns: Dictionary of project roots, as returned by _build_project_path_index().
+    """
+    global _g_project_path_index
+
+    indexed_data, index = _g_project_path_index
+    if indexed_data is not data:
+        index = _build_project_path_index(data)
+        _g_project_path_index = (data, index)
+    return index
+
+
+def _build_project_path_index(data):
+    """
+    Builds an index of the project roots of the given cache data.
+
+    Based on the Shotgun cache data, generates a list of project root
+    locations and the pipeline configurations associated with each of them.
+
+    :param data: Cache data chunk, obtained using _get_pipeline_configs()
+    :returns: Dictionary keyed by lower case project root path, where each
+        value is a list of ``(order, pipeline_configs)`` tuples, ``order``
+        being the order in which the project root was found.
+    """
     # step 1 - extract all storages for the current os
     storages = []
     for s in data["local_storages"]:
@@ -590,27 +657,12 @@ def _get_pipeline_configs_for_path(path, data):
 
                 _add_to_project_paths(project_paths, project_name, storage, pc)
 
-    # step 3 - look at the path we passed in - see if any of the computed
-    # project folders are determined to be a parent path
-    all_matching_pcs = []
-
-    for project_path in project_paths:
-
-        # (like the SG API, this logic is case preserving, not case insensitive)
-        path_lower = path.lower()
-        proj_path_lower = project_path.lower()
-        # check if the path matches. Either
-        # direct match: path: /mnt/proj_x == project path: /mnt/proj_x
-        # child path: path: /mnt/proj_x/foo/bar starts with /mnt/proj_x/
+    # step 3 - index the project paths case insensitively
+    index = collections.defaultdict(list)
+    for order, project_path in enumerate(project_paths):
+        index[project_path.lower()].append((order, project_paths[project_path]))
 
-        if path_lower == proj_path_lower or path_lower.startswith(
-            "%s%s" % (proj_path_lower, os.path.sep)
-        ):
-            # found a match!
-            associated_pcs = project_paths[project_path]
-            all_matching_pcs.extend(associated_pcs)
-
-    return all_matching_pcs
+    return dict(index)
 
 
 def _add_to_project_paths(project_paths, project_name, storage, pipeline_config):
@@ -691,6 +743,32 @@ def _get_pipeline_configs_for_project(project_id, data):
 # methods relating to maintaining a small cache to speed up initialization
 
 
+# number of seconds to wait for another process updating the lookup cache.
+_LOOKUP_CACHE_LOCK_TIMEOUT = 60
+
+# filters for the pipeline configurations read into the lookup cache.
+#
+# To make sure we are not retrieving more and more projects over time, only
+# include pipeline configurations of non-archived projects. Note that the
+# filter_operator is "any", not the default "all".
+_PIPELINE_CONFIG_FILTERS = {
+    "filter_operator": "any",
+    "filters": [["project.Project.archived", "is", False], ["project", "is", None]],
+}
+
+_PIPELINE_CONFIG_FIELDS = [
+    "id",
+    "code",
+    "windows_path",
+    "linux_path",
+    "mac_path",
+    "project",
+    "updated_at",
+]
+
+_PROJECT_FIELDS = ["name", "tank_name", "updated_at"]
+
+
 def __get_project_id(entity_type, entity_id, force=False):
     """
     Connects to Shotgun and retrieves the project id for an entity.
@@ -711,10 +789,10 @@ def __get_project_id(entity_type, entity_id, force=False):
     if force is False:
         # try to load cache first
         # if that doesn't work, fall back on shotgun
-        cache = _load_lookup_cache()
-        if cache and cache.get(CACHE_KEY):
+        cache = _load_lookup_cache(CACHE_KEY)
+        if cache:
             # cache hit!
-            return cache.get(CACHE_KEY)
+            return cache
 
     # ok, so either we are force recomputing the cache or the cache wasn't there
     sg = shotgun.get_sg_connection()
@@ -737,7 +815,9 @@ def _get_pipeline_configs(force=False):
     and all pipeline configurations in Shotgun. Adds this to the disk cache.
     If a cache already exists, this is used instead of talking to Shotgun.
 
-    To force a re-cache, set the force flag to True.
+    To force a re-cache, set the force flag to True. If the cache holds the
+    time its entities were last updated, only the entities updated since are
+    then retrieved from Shotgun.
 
     Returns a complex data structure with the following fields
 
@@ -755,12 +835,15 @@ def _get_pipeline_configs(force=False):
         - linux_path
         - mac_path
         - project
-        - plugin_ids
 
     projects:
         - id
         - tank_name
 
+    updated_at:
+        most recent update time of the pipeline configurations and projects,
+        None if unknown.
+
     :param force: set this to true to force a cache refresh
     :returns: dictionary with keys local_storages and pipeline_configurations.
     """
@@ -772,71 +855,174 @@ def _get_pipeline_configs(force=False):
     if force is False:
         # try to load cache first
         # if that doesn't work, fall back on shotgun
-        cache = _load_lookup_cache()
-        if cache and cache.get(CACHE_KEY):
+        cache = _load_lookup_cache(CACHE_KEY)
+        if cache:
             # cache hit!
-            return cache.get(CACHE_KEY)
+            return cache
+
+    # only one process at a time reads from Shotgun, the others wait and use
+    # what it cached.
+    with _lock_lookup_cache(CACHE_KEY):
+        cache = _load_lookup_cache(CACHE_KEY)
+        if cache and not force:
+            # another process updated the cache while we were waiting.
+            return cache
+
+        # ok, so either we are force recomputing the cache or the cache wasn't there
+        sg = shotgun.get_sg_connection()
+
+        # get all local storages for this site
+        local_storages = sg.find(
+            "LocalStorage", [], ["id", "code", "windows_path", "mac_path", "linux_path"]
+        )
 
-    # ok, so either we are force recomputing the cache or the cache wasn't there
-    sg = shotgun.get_sg_connection()
+        if cache and cache.get("updated_at"):
+            pipeline_configs, projects = _get_updated_pipeline_configs(sg, cache)
+            updated_at = cache["updated_at"]
+        else:
+            pipeline_configs, projects = _get_all_pipeline_configs(sg)
+            updated_at = None
+
+        # cache this data
+        data = {
+            "local_storages": local_storages,
+            "pipeline_configurations": pipeline_configs,
+            "projects": projects,
+            "updated_at": _pop_updated_at(
+                updated_at, pipeline_configs, projects.values()
+            ),
+        }
+        _add_to_lookup_cache(CACHE_KEY, data)
 
-    # get all local storages for this site
-    local_storages = sg.find(
-        "LocalStorage", [], ["id", "code", "windows_path", "mac_path", "linux_path"]
-    )
+    return data
+
+
+def _get_all_pipeline_configs(sg):
+    """
+    Retrieves all pipeline configurations and projects from Shotgun.
 
+    :param sg: Shotgun API instance.
+    :returns: Tuple of the list of pipeline configurations and of the
+        dictionary of projects indexed by id.
+    """
     # get all pipeline configurations (and their associated projects) for this site.
-    #
-    # To make sure we are not retrieving more and more projects over time, only
-    # include non-archived projects.
-    #
-    # Note that we are using the filter_operator "any", not the default "all".
     pipeline_configs = sg.find(
-        "PipelineConfiguration",
-        [["project.Project.archived", "is", False], ["project", "is", None]],
-        ["id", "code", "windows_path", "linux_path", "mac_path", "project"],
-        filter_operator="any",
+        "PipelineConfiguration", [_PIPELINE_CONFIG_FILTERS], _PIPELINE_CONFIG_FIELDS
     )
 
-    projects = sg.find("Project", [["archived", "is", False]], ["name", "tank_name"])
+    projects = sg.find("Project", [["archived", "is", False]], _PROJECT_FIELDS)
 
     # Index the result by project id so look-ups are easier to do later on.
     projects = dict((project["id"], project) for project in projects)
 
-    # cache this data
-    data = {
-        "local_storages": local_storages,
-        "pipeline_configurations": pipeline_configs,
-        "projects": projects,
-    }
-    _add_to_lookup_cache(CACHE_KEY, data)
+    return pipeline_configs, projects
 
-    return data
 
+def _get_updated_pipeline_configs(sg, cache):
+    """
+    Updates the pipeline configurations and projects of the lookup cache
+    with the ones updated in Shotgun since the cache was written.
+
+    The ids of all the entities are also retrieved, in order to drop the
+    ones which were deleted or archived since.
 
-def _load_lookup_cache():
+    :param sg: Shotgun API instance.
+    :param cache: Lookup cache data, as returned by :meth:`_get_pipeline_configs`.
+    :returns: Tuple of the list of pipeline configurations and of the
+        dictionary of projects indexed by id.
     """
-    Load lookup cache file from disk.
+    # Shotgun update times have a one second resolution, so also retrieve
+    # entities updated during the last second known to the cache.
+    updated_since = [
+        "updated_at",
+        "greater_than",
+        cache["updated_at"] - datetime.timedelta(seconds=1),
+    ]
+    log.debug(
+        "Retrieving pipeline configurations and projects updated since %s."
+        % cache["updated_at"]
+    )
+
+    pipeline_configs = dict((pc["id"], pc) for pc in cache["pipeline_configurations"])
+    pc_ids = set(
+        pc["id"]
+        for pc in sg.find("PipelineConfiguration", [_PIPELINE_CONFIG_FILTERS], ["id"])
+    )
+    for pc in sg.find(
+        "PipelineConfiguration",
+        [_PIPELINE_CONFIG_FILTERS, updated_since],
+        _PIPELINE_CONFIG_FIELDS,
+    ):
+        pipeline_configs[pc["id"]] = pc
+
+    projects = dict(cache["projects"])
+    project_ids = set(
+        project["id"] for project in sg.find("Project", [["archived", "is", False]])
+    )
+    for project in sg.find(
+        "Project", [["archived", "is", False], updated_since], _PROJECT_FIELDS
+    ):
+        projects[project["id"]] = project
+
+    return (
+        [pipeline_configs[pc_id] for pc_id in sorted(pc_ids & set(pipeline_configs))],
+        dict((k, v) for k, v in projects.items() if k in project_ids),
+    )
+
 
-    :returns: cache cache, as constructed by the _add_to_lookup_cache method
+def _pop_updated_at(updated_at, *entity_lists):
     """
-    cache_file = _get_cache_location()
-    cache_data = {}
+    Removes the update time from the given entities, since it isn't cached
+    per entity, and returns the most recent one.
+
+    :param updated_at: Update time known so far, or None.
+    :param entity_lists: Lists of entity dictionaries, some of which have
+        an ``updated_at`` key.
+    :returns: Most recent update time or None if unknown.
+    """
+    for entities in entity_lists:
+        for entity in entities:
+            entity_updated_at = entity.pop("updated_at", None)
+            if entity_updated_at and (
+                updated_at is None or entity_updated_at > updated_at
+            ):
+                updated_at = entity_updated_at
+    return updated_at
+
+
+def _load_lookup_cache(key):
+    """
+    Load a key of the lookup cache from disk.
+
+    The data is kept in memory and only loaded again once the cache file
+    changes.
+
+    :param key: Dictionary key for the cache
+    :returns: Data associated with the key, as stored by the _add_to_lookup_cache
+        method, or None if it isn't cached.
+    """
+    cache_file = _get_cache_location(key)
 
     try:
-        fh = open(cache_file, "rb")
-        try:
-            cache_data = pickle.load(fh)
-        finally:
-            fh.close()
+        # cache files are replaced when written, which changes their inode
+        stat = os.stat(cache_file)
+        signature = (stat.st_mtime, stat.st_size, stat.st_ino)
+        cached = _g_lookup_cache.get(cache_file)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open(cache_file, "rb") as fh:
+            data = pickle.load(fh)
     except Exception as e:
         # failed to load cache from file. Continue silently.
         log.debug(
             "Failed to load lookup cache %s. Proceeding without cache. Error: %s"
             % (cache_file, e)
         )
+        return None
 
-    return cache_data
+    _g_lookup_cache[cache_file] = (signature, data)
+    return data
 
 
 @filesystem.with_cleared_umask
@@ -845,45 +1031,61 @@ def _add_to_lookup_cache(key, data):
     Add a key to the lookup cache. This method will silently
     fail if the cache cannot be operated on.
 
+    Each key is stored in its own file, which is written under a temporary
+    name and then renamed, so concurrent processes never read a partially
+    written cache.
+
     :param key: Dictionary key for the cache
     :param data: Data to associate with the dictionary key
     """
-
-    # first load the content
-    cache_data = _load_lookup_cache()
-    # update
-    cache_data[key] = data
-    # and write out the cache
-    cache_file = _get_cache_location()
+    cache_file = _get_cache_location(key)
 
     try:
         filesystem.ensure_folder_exists(os.path.dirname(cache_file))
 
-        # write cache file
-        fh = open(cache_file, "wb")
-        try:
-            pickle.dump(cache_data, fh)
-        finally:
-            fh.close()
-        # and ensure the cache file has got open permissions
-        os.chmod(cache_file, 0o666)
+        # write cache file and ensure it has got open permissions
+        with filesystem.atomic_write(cache_file, "wb", permissions=0o666) as fh:
+            pickle.dump(data, fh)
 
     except Exception as e:
         # silently continue in case exceptions are raised
         log.debug("Failed to add to lookup cache %s. Error: %s" % (cache_file, e))
 
 
-def _get_cache_location():
+@contextlib.contextmanager
+def _lock_lookup_cache(key):
+    """
+    Context manager locking a key of the lookup cache across processes.
+
+    Failing to lock, or waiting for more than _LOOKUP_CACHE_LOCK_TIMEOUT
+    seconds, is logged and the key is then used without the lock.
+
+    :param key: Dictionary key for the cache
+    """
+    with filesystem.lock_file(
+        "%s.lock" % _get_cache_location(key), _LOOKUP_CACHE_LOCK_TIMEOUT
+    ):
+        yield
+
+
+def _get_cache_location(key=None):
     """
     Get the location of the initializtion lookup cache.
     Just computes the path, no I/O.
 
+    :param key: Dictionary key for the cache. If None, the folder holding
+        the cache is returned.
     :returns: A path on disk to the cache file
     """
     # optimized version of creating an sg instance and then calling sg.base_url
     # this is to avoid connecting to shotgun if possible.
     sg_base_url = shotgun.get_associated_sg_base_url()
-    root_path = LocalFileStorageManager.get_site_root(
-        sg_base_url, LocalFileStorageManager.CACHE
+    root_path = os.path.join(
+        LocalFileStorageManager.get_site_root(
+            sg_base_url, LocalFileStorageManager.CACHE
+        ),
+        constants.TOOLKIT_INIT_CACHE_FOLDER,
     )
-    return os.path.join(root_path, constants.TOOLKIT_INIT_CACHE_FILE)
+    if key is None:
+        return root_path
+    return os.path.join(root_path, "%s.cache" % filesystem.create_valid_filename(key))
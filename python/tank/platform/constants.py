@@ -53,6 +53,10 @@ BUNDLE_PYTHON_FOLDER = "python"
 # force use old, non-structure preseving parser
 USE_LEGACY_YAML_ENV_VAR = "TK_USE_LEGACY_YAML"
 
+# number of worker threads used to validate apps in parallel when an engine
+# starts. Apps are validated one at a time when not set.
+PARALLEL_APP_VALIDATION_ENV_VAR = "TK_PARALLEL_APP_VALIDATION"
+
 # the file to look for that defines and bootstraps an engine
 ENGINE_FILE = "engine.py"
 
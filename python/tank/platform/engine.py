@@ -51,6 +51,7 @@ from . import qt5
 from .bundle import TankBundle
 from .framework import setup_frameworks
 from .engine_logging import ToolkitEngineHandler, ToolkitEngineLegacyHandler
+from .invoker import create_coalescing_invoker
 
 # std core level logger
 core_logger = LogManager.get_logger(__name__)
@@ -612,6 +613,26 @@ class Engine(TankBundle):
         # this is since most engines are supporting a graphical application
         return True
 
+    @property
+    def emit_log_messages_in_main_thread(self):
+        """
+        Indicates that :meth:`_emit_log_message` should always be executed in
+        the main thread.
+
+        Engines which display log messages in a UI typically need to do so
+        from the main thread. When this returns True, log records emitted
+        from worker threads are delivered to :meth:`_emit_log_message` through
+        the engine's asynchronous main thread invoker, which hands them over
+        in batches rather than posting one event per record. When many
+        records are pending, debug records may be dropped and consecutive
+        identical records are merged into one.
+
+        :returns: boolean value indicating if log messages are emitted in the
+            main thread.
+        """
+        # default implementation emits log messages in the calling thread.
+        return False
+
     @property
     def has_qt5(self):
         """
@@ -1203,23 +1224,48 @@ class Engine(TankBundle):
         invoker = (
             self._invoker if invoker_id == self._SYNC_INVOKER else self._async_invoker
         )
-        if invoker:
-            from .qt import QtGui, QtCore
-
-            if (
-                QtGui.QApplication.instance()
-                and QtCore.QThread.currentThread()
-                != QtGui.QApplication.instance().thread()
-            ):
-                # invoke the function on the thread that the QtGui.QApplication was created on.
-                return invoker.invoke(func, *args, **kwargs)
-            else:
-                # we're already on the main thread so lets just call our function:
-                return func(*args, **kwargs)
+        if invoker and not self.__is_main_thread():
+            # invoke the function on the thread that the QtGui.QApplication was created on.
+            return invoker.invoke(func, *args, **kwargs)
         else:
-            # we don't have an invoker so just call the function:
+            # we're already on the main thread or we don't have an invoker,
+            # so just call the function:
             return func(*args, **kwargs)
 
+    def _emit_log_message_in_main_thread(self, handler, record):
+        """
+        Executes :meth:`_emit_log_message` in the main thread, using the
+        asynchronous invoker's drop and merge policies for log records.
+
+        If the invoker is not ready or if the calling thread is the main thread,
+        the message is emitted immediately.
+
+        :param handler: Log handler that this message was dispatched from
+        :type handler: :class:`~python.logging.LogHandler`
+        :param record: Std python logging record
+        :type record: :class:`~python.logging.LogRecord`
+        """
+        invoker = self._async_invoker
+        if invoker and not self.__is_main_thread():
+            invoker.invoke_log_record(
+                lambda r: self._emit_log_message(handler, r), record
+            )
+        else:
+            self._emit_log_message(handler, record)
+
+    def __is_main_thread(self):
+        """
+        Checks if the calling thread is the thread that the QtGui.QApplication
+        was created on.
+
+        :returns: True if the calling thread is the main thread or if there
+            is no QtGui.QApplication, False otherwise.
+        """
+        from .qt import QtGui, QtCore
+
+        app = QtGui.QApplication.instance()
+        return not app or QtCore.QThread.currentThread() == app.thread()
+
     def get_matching_commands(self, command_selectors):
         """
         Finds all the commands that match the given selectors.
@@ -2578,39 +2624,12 @@ class Engine(TankBundle):
                         """
                         self._res = self._fn()
 
-                class AsyncInvoker(QtCore.QObject):
-                    """
-                    Invoker class - implements a mechanism to execute a function with arbitrary
-                    args in the main thread asynchronously.
-                    """
-
-                    __signal = QtCore.Signal(object)
-
-                    def __init__(self):
-                        """
-                        Construction
-                        """
-                        QtCore.QObject.__init__(self)
-                        self.__signal.connect(self.__execute_in_main_thread)
-
-                    def invoke(self, fn, *args, **kwargs):
-                        """
-                        Invoke the specified function with the specified args in the main thread
-
-                        :param fn:          The function to execute in the main thread
-                        :param *args:       Args for the function
-                        :param **kwargs:    Named arguments for the function
-                        :returns:           The result returned by the function
-                        """
-
-                        self.__signal.emit(lambda: fn(*args, **kwargs))
-
-                    def __execute_in_main_thread(self, fn):
-                        fn()
-
                 # Make sure that the invoker exists in the main thread:
                 invoker = Invoker()
-                async_invoker = AsyncInvoker()
+                # The async invoker batches the calls queued between two
+                # event loop ticks, so that bursts of calls from worker
+                # threads don't flood the event loop.
+                async_invoker = create_coalescing_invoker(QtCore)
                 if QtCore.QCoreApplication.instance():
                     invoker.moveToThread(QtCore.QCoreApplication.instance().thread())
                     async_invoker.moveToThread(
@@ -2622,6 +2641,119 @@ class Engine(TankBundle):
     ##########################################################################################
     # private
 
+    def __validate_app(self, app_instance_name, descriptor, app_settings=None):
+        """
+        Validates an app against the current engine, context and platform and
+        validates its settings.
+
+        :param str app_instance_name: Name of the app instance in the environment.
+        :param descriptor: Descriptor of the app.
+        :param dict app_settings: Settings of the app. If not set, they are
+            read from the environment.
+
+        :returns: The settings of the app.
+        :raises: TankError if the app can't be loaded.
+        """
+        # get the app settings data and validate it.
+        app_schema = descriptor.configuration_schema
+        if app_settings is None:
+            app_settings = self.__env.get_app_settings(
+                self.__engine_instance_name, app_instance_name
+            )
+
+        # check that the context contains all the info that the app needs
+        if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME:
+            # special case! The shotgun engine is special and does not have a
+            # context until you actually run a command, so disable the validation.
+            validation.validate_context(descriptor, self.context)
+
+        # make sure the current operating system platform is supported
+        validation.validate_platform(descriptor)
+
+        # for multi engine apps, make sure our engine is supported
+        supported_engines = descriptor.supported_engines
+        if supported_engines and self.name not in supported_engines:
+            raise TankError(
+                "The app could not be loaded since it only supports "
+                "the following engines: %s. Your current engine has been "
+                "identified as '%s'" % (supported_engines, self.name)
+            )
+
+        # now validate the configuration
+        validation.validate_settings(
+            app_instance_name, self.tank, self.context, app_schema, app_settings
+        )
+
+        return app_settings
+
+    def __validate_apps_in_parallel(self, app_instance_names):
+        """
+        Loads the manifest of the given apps and validates them on worker
+        threads, if enabled through the ``TK_PARALLEL_APP_VALIDATION``
+        environment variable.
+
+        Errors are not reported here. They are captured so that they can be
+        raised again by the caller, app by app, in the original order.
+
+        :param list app_instance_names: Names of the app instances to validate.
+
+        :returns: Dictionary keyed by app instance name, where each value is a
+            tuple of the app descriptor and of the validation result. The
+            validation result is None if the app does not exist on disk,
+            otherwise it is a tuple of the app settings and of the
+            ``sys.exc_info()`` of the validation error, if any. The dictionary
+            is empty when parallel validation is disabled.
+        """
+        num_workers = os.environ.get(constants.PARALLEL_APP_VALIDATION_ENV_VAR)
+        try:
+            num_workers = int(num_workers or 0)
+        except ValueError:
+            core_logger.warning(
+                "Invalid value '%s' for %s, expected a number of threads. "
+                "Apps will be validated one at a time.",
+                num_workers,
+                constants.PARALLEL_APP_VALIDATION_ENV_VAR,
+            )
+            return {}
+
+        if num_workers < 1:
+            return {}
+
+        # Descriptors and settings are read on this thread since the
+        # environment is not meant to be shared across threads. Workers only
+        # read the descriptors' manifests, the context and the templates and
+        # hooks location of the pipeline configuration.
+        descriptors = []
+        for app_instance_name in app_instance_names:
+            descriptor = self.__env.get_app_descriptor(
+                self.__engine_instance_name, app_instance_name
+            )
+            app_settings = self.__env.get_app_settings(
+                self.__engine_instance_name, app_instance_name
+            )
+            descriptors.append((app_instance_name, descriptor, app_settings))
+
+        def validate(item):
+            app_instance_name, descriptor, app_settings = item
+            if not descriptor.exists_local():
+                return None
+            try:
+                return (
+                    self.__validate_app(app_instance_name, descriptor, app_settings),
+                    None,
+                )
+            except Exception:
+                return (None, sys.exc_info())
+
+        core_logger.debug(
+            "Validating %d apps using %d threads.", len(descriptors), num_workers
+        )
+        results = _map_in_threads(validate, descriptors, num_workers)
+        return dict(
+            (app_instance_name, (descriptor, result))
+            for (app_instance_name, descriptor, _), result in zip(descriptors, results)
+        )
+
     def __load_apps(self, reuse_existing_apps=False, old_context=None):
         """
         Populate the __applications dictionary, skip over apps that fail to initialize.
@@ -2647,11 +2779,22 @@ class Engine(TankBundle):
         self.__commands = dict()
         self.__register_reload_command()
 
-        for app_instance_name in self.__env.get_apps(self.__engine_instance_name):
-            # Get a handle to the app bundle.
-            descriptor = self.__env.get_app_descriptor(
-                self.__engine_instance_name, app_instance_name
-            )
+        app_instance_names = list(self.__env.get_apps(self.__engine_instance_name))
+
+        # Validation has no side effects on the engine, so it can optionally
+        # happen for all apps at once on worker threads. The apps are still
+        # initialized one at a time, in order, on this thread.
+        validated_apps = self.__validate_apps_in_parallel(app_instance_names)
+
+        for app_instance_name in app_instance_names:
+            if app_instance_name in validated_apps:
+                descriptor, validation_result = validated_apps[app_instance_name]
+            else:
+                # Get a handle to the app bundle.
+                descriptor = self.__env.get_app_descriptor(
+                    self.__engine_instance_name, app_instance_name
+                )
+                validation_result = None
 
             if not descriptor.exists_local():
                 self.log_error(
@@ -2661,34 +2804,14 @@ class Engine(TankBundle):
 
             # Load settings for app - skip over the ones that don't validate
             try:
-                # get the app settings data and validate it.
-                app_schema = descriptor.configuration_schema
-                app_settings = self.__env.get_app_settings(
-                    self.__engine_instance_name, app_instance_name
-                )
-
-                # check that the context contains all the info that the app needs
-                if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME:
-                    # special case! The shotgun engine is special and does not have a
-                    # context until you actually run a command, so disable the validation.
-                    validation.validate_context(descriptor, self.context)
-
-                # make sure the current operating system platform is supported
-                validation.validate_platform(descriptor)
-
-                # for multi engine apps, make sure our engine is supported
-                supported_engines = descriptor.supported_engines
-                if supported_engines and self.name not in supported_engines:
-                    raise TankError(
-                        "The app could not be loaded since it only supports "
-                        "the following engines: %s. Your current engine has been "
-                        "identified as '%s'" % (supported_engines, self.name)
-                    )
-
-                # now validate the configuration
-                validation.validate_settings(
-                    app_instance_name, self.tank, self.context, app_schema, app_settings
-                )
+                if validation_result is None:
+                    app_settings = self.__validate_app(app_instance_name, descriptor)
+                else:
+                    app_settings, exc_info = validation_result
+                    if exc_info:
+                        # raise the validation error here so it is reported
+                        # exactly like when validating on this thread.
+                        six.reraise(*exc_info)
 
             except TankError as e:
                 # validation error - probably some issue with the settings!
@@ -3423,6 +3546,41 @@ def __pick_environment(engine_name, tk, context):
     return env_name
 
 
+def _map_in_threads(func, items, num_workers):
+    """
+    Calls a function for each item of a list using a pool of worker threads.
+
+    :param func: Function to call with each item. It should not raise.
+    :param list items: Items to process.
+    :param int num_workers: Maximum number of threads to use.
+
+    :returns: List of the values returned by the function, in the order of
+        the items.
+    """
+    results = [None] * len(items)
+    work_queue = six.moves.queue.Queue()
+    for index_and_item in enumerate(items):
+        work_queue.put(index_and_item)
+
+    def worker():
+        while True:
+            try:
+                index, item = work_queue.get_nowait()
+            except six.moves.queue.Empty:
+                return
+            results[index] = func(item)
+
+    threads = [
+        threading.Thread(target=worker) for _ in range(min(num_workers, len(items)))
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
 def _get_command_prefix(properties):
     """
     If multiple commands are registered with the same name, attempt to construct a unique
@@ -44,7 +44,10 @@ class ToolkitEngineHandler(logging.Handler):
         record.basename = record.name.rsplit(".", 1)[-1]
 
         # emit log message from log handler to display implementation.
-        self._engine._emit_log_message(self, record)
+        if self._engine.emit_log_messages_in_main_thread:
+            self._engine._emit_log_message_in_main_thread(self, record)
+        else:
+            self._engine._emit_log_message(self, record)
 
 
 class ToolkitEngineLegacyHandler(logging.Handler):
@@ -0,0 +1,268 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Coalescing delivery of function calls to the main thread.
+
+Posting one Qt event per function call works well for occasional requests,
+but bursts of calls from worker threads (typically debug logging) end up
+flooding the main thread's event loop. The :class:`CoalescingCallQueue`
+gathers pending calls from any number of threads and hands them over as a
+single batch, so that only one Qt event is posted per event loop tick no
+matter how many calls were queued in the meantime.
+
+The queue is bounded. Once it is full, calls flagged as droppable are
+discarded first. Log records additionally support merging: consecutive
+identical records are collapsed into one with a repeat count.
+"""
+
+import collections
+import logging
+import threading
+
+from ..log import LogManager
+
+logger = LogManager.get_logger(__name__)
+
+
+class _PendingCall(object):
+    """
+    A call waiting in a :class:`CoalescingCallQueue`.
+    """
+
+    __slots__ = ["fn", "droppable", "merge_key", "count"]
+
+    def __init__(self, fn, droppable, merge_key):
+        """
+        :param fn: Callable to execute.
+        :param bool droppable: True if the call can be discarded when the
+            queue is full.
+        :param merge_key: Key used to merge consecutive calls or None.
+        """
+        self.fn = fn
+        self.droppable = droppable
+        self.merge_key = merge_key
+        self.count = 1
+
+
+class CoalescingCallQueue(object):
+    """
+    Thread safe, bounded queue of calls to be executed in batches.
+
+    Producers call :meth:`put` from any thread. When :meth:`put` returns
+    True, a batch is not yet scheduled and the producer is responsible for
+    getting :meth:`drain` called on the consuming thread. Any further calls
+    queued before the drain happens are simply added to the same batch.
+    """
+
+    # Maximum number of calls waiting to be executed.
+    MAXIMUM_QUEUE_SIZE = 10000
+
+    def __init__(self, maximum_size=None):
+        """
+        :param int maximum_size: Maximum number of pending calls. Defaults to
+            :attr:`MAXIMUM_QUEUE_SIZE`.
+        """
+        self._maximum_size = maximum_size or self.MAXIMUM_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._drain_scheduled = False
+        self._dropped_count = 0
+        self._merged_count = 0
+        self._batch_count = 0
+
+    @property
+    def pending_count(self):
+        """
+        Number of calls waiting to be executed.
+        """
+        return len(self._pending)
+
+    @property
+    def dropped_count(self):
+        """
+        Number of calls that were discarded because the queue was full.
+        """
+        return self._dropped_count
+
+    @property
+    def merged_count(self):
+        """
+        Number of calls that were merged into a previously queued call.
+        """
+        return self._merged_count
+
+    @property
+    def batch_count(self):
+        """
+        Number of batches that have been drained so far.
+        """
+        return self._batch_count
+
+    def put(self, fn, droppable=False, merge_key=None):
+        """
+        Queues a call.
+
+        When a ``merge_key`` is provided and the most recently queued call
+        has the same key, the two are merged and ``fn`` is discarded. Calls
+        queued with a merge key are executed as ``fn(count)``, where ``count``
+        is the number of calls that were merged together, while other calls
+        are executed without arguments.
+
+        When the queue is full, a droppable call is discarded. A call which is
+        not droppable evicts the oldest droppable call instead, and is queued
+        regardless if there is none to evict, since its caller relies on it
+        being executed.
+
+        :param fn: Callable to execute.
+        :param bool droppable: True if the call can be discarded when the
+            queue is full.
+        :param merge_key: Hashable key used to merge consecutive calls.
+
+        :returns: True if the caller needs to schedule a :meth:`drain`,
+            False if one is already pending.
+        """
+        with self._lock:
+            if (
+                merge_key is not None
+                and self._pending
+                and self._pending[-1].merge_key == merge_key
+            ):
+                self._pending[-1].count += 1
+                self._merged_count += 1
+                return False
+
+            if len(self._pending) >= self._maximum_size:
+                if droppable:
+                    self._dropped_count += 1
+                    return False
+                for pending_call in self._pending:
+                    if pending_call.droppable:
+                        self._pending.remove(pending_call)
+                        self._dropped_count += 1
+                        break
+
+            self._pending.append(_PendingCall(fn, droppable, merge_key))
+
+            if self._drain_scheduled:
+                return False
+            self._drain_scheduled = True
+            return True
+
+    def put_log_record(self, fn, record):
+        """
+        Queues the delivery of a log record.
+
+        Records below the ``INFO`` level can be dropped when the queue is
+        full, and consecutive records with the same logger, level and message
+        are merged. When records are merged, the delivered record has the
+        number of repetitions appended to its message.
+
+        :param fn: Callable accepting the record as its only argument.
+        :param record: Std python logging record.
+        :type record: :class:`~python.logging.LogRecord`
+
+        :returns: True if the caller needs to schedule a :meth:`drain`,
+            False if one is already pending.
+        """
+        message = record.getMessage()
+
+        def deliver(count):
+            if count > 1:
+                record.msg = "%s (repeated %d times)" % (message, count)
+                record.args = None
+            fn(record)
+
+        return self.put(
+            deliver,
+            droppable=record.levelno < logging.INFO,
+            merge_key=(record.name, record.levelno, message),
+        )
+
+    def drain(self):
+        """
+        Executes all the calls queued so far, in the order they were queued.
+
+        Calls queued while the batch is executing are not part of it and
+        require another drain. An exception raised by a call is logged and
+        does not prevent the rest of the batch from executing.
+        """
+        with self._lock:
+            batch = self._pending
+            self._pending = collections.deque()
+            self._drain_scheduled = False
+            self._batch_count += 1
+
+        for pending_call in batch:
+            try:
+                if pending_call.merge_key is None:
+                    pending_call.fn()
+                else:
+                    pending_call.fn(pending_call.count)
+            except Exception:
+                logger.exception("Exception raised by a call in the main thread.")
+
+
+def create_coalescing_invoker(QtCore, call_queue=None):
+    """
+    Creates an object that executes function calls asynchronously in the
+    thread it lives in, coalescing them into one batch per event loop tick.
+
+    :param QtCore: The QtCore module to use.
+    :param call_queue: :class:`CoalescingCallQueue` to gather calls in. A new
+        one is created if not specified.
+
+    :returns: The invoker, a ``QtCore.QObject`` with ``invoke`` and
+        ``invoke_log_record`` methods.
+    """
+
+    # Class is defined locally since Qt might not be available.
+    class CoalescingInvoker(QtCore.QObject):
+        """
+        Invoker class - implements a mechanism to execute functions with
+        arbitrary args in the main thread asynchronously, in batches.
+        """
+
+        __signal = QtCore.Signal()
+
+        def __init__(self, call_queue):
+            """
+            :param call_queue: :class:`CoalescingCallQueue` to gather calls in.
+            """
+            QtCore.QObject.__init__(self)
+            self.call_queue = call_queue
+            self.__signal.connect(self.__drain, QtCore.Qt.QueuedConnection)
+
+        def invoke(self, fn, *args, **kwargs):
+            """
+            Invoke the specified function with the specified args in the main thread
+
+            :param fn:          The function to execute in the main thread
+            :param *args:       Args for the function
+            :param **kwargs:    Named arguments for the function
+            """
+            if self.call_queue.put(lambda: fn(*args, **kwargs)):
+                self.__signal.emit()
+
+        def invoke_log_record(self, fn, record):
+            """
+            Invoke the specified function with a log record in the main thread,
+            applying the drop and merge policies of log records.
+
+            :param fn:          The function to execute in the main thread
+            :param record:      Std python logging record to pass to the function
+            """
+            if self.call_queue.put_log_record(fn, record):
+                self.__signal.emit()
+
+        def __drain(self):
+            self.call_queue.drain()
+
+    return CoalescingInvoker(call_queue or CoalescingCallQueue())
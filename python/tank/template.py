@@ -25,6 +25,47 @@ from tank_vendor.six.moves import zip
 from tank.util import is_linux, is_macos, is_windows, sgre as re
 
 
+class _FormatPlan(object):
+    """
+    Precompiled formatting of a template definition variation.
+
+    The definition is turned into a positional format string and the list of
+    keys to format, so that applying fields only has to format each key once
+    and substitute the results in a single operation.
+    """
+
+    __slots__ = ["format_string", "formatters", "value_indices"]
+
+    def __init__(self, definition, keys):
+        """
+        :param str definition: Definition of the variation, with resolved key
+            aliases.
+        :param dict keys: Keys used by the variation, keyed by name.
+        """
+        regex = r"{(%s)}" % constants.TEMPLATE_KEY_NAME_REGEX
+        # tokens alternate between static text and key names
+        tokens = re.split(regex, definition)
+        key_names = tokens[1::2]
+
+        # static text is used as is, the same way the cleaned definition does
+        self.format_string = "%s".join(tokens[0::2])
+
+        # list of (key name, formatting function) tuples, one per key
+        self.formatters = []
+        indices = {}
+        for key_name in key_names:
+            if key_name not in indices:
+                indices[key_name] = len(self.formatters)
+                self.formatters.append((key_name, keys[key_name].str_from_value))
+
+        # keys used more than once are only formatted once, so map each
+        # occurrence to the formatted value.
+        if len(self.formatters) == len(key_names):
+            self.value_indices = None
+        else:
+            self.value_indices = tuple(indices[key_name] for key_name in key_names)
+
+
 class Template(object):
     """
     Represents an expression containing several dynamic tokens
@@ -101,9 +142,7 @@ class Template(object):
             self._definitions.append(self._fix_key_names(variation, keys))
 
         # get defintion ready for string substitution
-        self._cleaned_definitions = []
-        for definition in self._definitions:
-            self._cleaned_definitions.append(self._clean_definition(definition))
+        self._compile_definitions()
 
         # string which will be prefixed to definition
         self._prefix = ""
@@ -205,12 +244,14 @@ class Template(object):
         :returns: Fields needed by template which are not in inputs keys or which have
                   values of None.
         """
+        missing_keys = [x for x in keys if (x not in fields) or (fields[x] is None)]
+
         if skip_defaults:
-            required_keys = [key.name for key in keys.values() if key.default is None]
-        else:
-            required_keys = keys
+            # only evaluate the defaults of the missing keys, since they
+            # can be callables.
+            missing_keys = [x for x in missing_keys if keys[x].default is None]
 
-        return [x for x in required_keys if (x not in fields) or (fields[x] is None)]
+        return missing_keys
 
     def apply_fields(self, fields, platform=None):
         r"""
@@ -278,16 +319,14 @@ class Template(object):
         ignore_types = ignore_types or []
 
         # find largest key mapping without missing values
-        keys = None
-        # index of matching keys will be used to find cleaned_definition
-        index = -1
-        for index, cur_keys in enumerate(self._keys):
+        plan = None
+        for cur_keys, cur_plan in zip(self._keys, self._format_plans):
             missing_keys = self._missing_keys(fields, cur_keys, skip_defaults=True)
             if not missing_keys:
-                keys = cur_keys
+                plan = cur_plan
                 break
 
-        if keys is None:
+        if plan is None:
             raise TankError(
                 "Tried to resolve a path from the template %s and a set "
                 "of input fields '%s' but the following required fields were missing "
@@ -295,15 +334,14 @@ class Template(object):
             )
 
         # Process all field values through template keys
-        processed_fields = {}
-        for key_name, key in keys.items():
-            value = fields.get(key_name)
-            ignore_type = key_name in ignore_types
-            processed_fields[key_name] = key.str_from_value(
-                value, ignore_type=ignore_type
-            )
+        values = [
+            str_from_value(fields.get(key_name), ignore_type=key_name in ignore_types)
+            for key_name, str_from_value in plan.formatters
+        ]
+        if plan.value_indices is not None:
+            values = [values[i] for i in plan.value_indices]
 
-        return self._cleaned_definitions[index] % processed_fields
+        return plan.format_string % tuple(values)
 
     def _definition_variations(self, definition):
         """
@@ -368,11 +406,15 @@ class Template(object):
             definition = re.sub(old_def, new_def, definition)
         return definition
 
-    def _clean_definition(self, definition):
-        # Create definition with key names as strings with no format, enum or default values
-        regex = r"{(%s)}" % constants.TEMPLATE_KEY_NAME_REGEX
-        cleaned_definition = re.sub(regex, r"%(\g<1>)s", definition)
-        return cleaned_definition
+    def _compile_definitions(self):
+        """
+        Prepares the definitions for string substitution when applying
+        fields.
+        """
+        self._format_plans = [
+            _FormatPlan(definition, keys)
+            for definition, keys in zip(self._definitions, self._keys)
+        ]
 
     def _calc_static_tokens(self, definition):
         """
@@ -527,9 +569,7 @@ class TemplatePath(Template):
             self._definitions[index] = os.path.join(*split_path(rel_definition))
 
         # get definition ready for string substitution
-        self._cleaned_definitions = []
-        for definition in self._definitions:
-            self._cleaned_definitions.append(self._clean_definition(definition))
+        self._compile_definitions()
 
         # split by format strings the definition string into tokens
         self._static_tokens = []
@@ -96,6 +96,10 @@ class TemplateKey(object):
         self._length = length
         self._last_error = ""
 
+        # keys are validated for every candidate value when parsing paths, so
+        # prepare the checks carried out by validate once and for all.
+        self._validate_constraints = self._compile_validator()
+
         # check that the key name doesn't contain invalid characters
         if not re.match(r"^%s$" % constants.TEMPLATE_KEY_NAME_REGEX, name):
             raise TankError(
@@ -128,7 +132,7 @@ class TemplateKey(object):
 
         :returns: The default value.
         """
-        if isinstance(self._default, six.moves.collections_abc.Callable):
+        if callable(self._default):
             return self._default()
         else:
             return self._default
@@ -266,31 +270,68 @@ class TemplateKey(object):
 
         str_value = value if isinstance(value, six.string_types) else str(value)
 
-        # We are not case sensitive
-        if str_value.lower() in [str(x).lower() for x in self.exclusions]:
-            self._last_error = "%s Illegal value: %s is forbidden for this key." % (
-                self,
-                value,
-            )
+        error = self._validate_constraints(value, str_value)
+        if error is not None:
+            self._last_error = error
             return False
 
-        if value is not None and self.choices:
-            if str_value.lower() not in [str(x).lower() for x in self.choices]:
-                self._last_error = "%s Illegal value: '%s' not in choices: %s" % (
-                    self,
-                    value,
-                    str(self.choices),
+        return True
+
+    def _compile_validator(self):
+        """
+        Builds the function checking values against the exclusions, choices
+        and length of this key.
+
+        Exclusions and choices are lower cased once and stored in frozensets,
+        and the checks which don't apply to this key are left out of the
+        function entirely.
+
+        The function doesn't reference the key, so that copies of the key can
+        share it.
+
+        :returns: A function taking a value and its string representation and
+            returning an error message if the value is invalid, None otherwise.
+        """
+
+        def to_lower_str(x):
+            return (x if isinstance(x, six.string_types) else str(x)).lower()
+
+        # We are not case sensitive
+        exclusions = frozenset(to_lower_str(x) for x in self._exclusions)
+        choices = frozenset(to_lower_str(x) for x in self._choices)
+        length = self._length
+        key_repr = repr(self)
+        choices_repr = str(self.choices)
+
+        if not exclusions and not choices and length is None:
+            return lambda value, str_value: None
+
+        def validate_constraints(value, str_value):
+            if exclusions or choices:
+                lower_value = str_value.lower()
+
+                if lower_value in exclusions:
+                    return "%s Illegal value: %s is forbidden for this key." % (
+                        key_repr,
+                        value,
+                    )
+
+                if value is not None and choices and lower_value not in choices:
+                    return "%s Illegal value: '%s' not in choices: %s" % (
+                        key_repr,
+                        value,
+                        choices_repr,
+                    )
+
+            if length is not None and len(str_value) != length:
+                return (
+                    "%s Illegal value: '%s' does not have a length of "
+                    "%d characters." % (key_repr, value, length)
                 )
-                return False
 
-        if self.length is not None and len(str_value) != self.length:
-            self._last_error = (
-                "%s Illegal value: '%s' does not have a length of "
-                "%d characters." % (self, value, self.length)
-            )
-            return False
+            return None
 
-        return True
+        return validate_constraints
 
     def _as_string(self, value):
         raise NotImplementedError
@@ -789,6 +830,7 @@ class IntegerKey(TemplateKey):
         self._zero_padded = None
         self._minimum_width = None
         self._format_spec = None
+        self._format_string = "%d"
         self._strict_matching = None
         # Validate and set up formatting details
         self._init_format_spec(name, format_spec)
@@ -856,6 +898,8 @@ class IntegerKey(TemplateKey):
         # groups[1] is the minimum width of the number.
         self._minimum_width = int(groups[1])
         self._format_spec = format_spec
+        # insert format spec into string once and for all
+        self._format_string = "%%%sd" % format_spec
 
     def _init_strict_matching(self, name, strict_matching):
         """
@@ -904,9 +948,10 @@ class IntegerKey(TemplateKey):
         if value is not None:
             if isinstance(value, six.string_types):
                 # We have a string, make sure it loosely or strictly matches the format.
-                if self.strict_matching and not self._strictly_matches(value):
-                    return False
-                elif not self.strict_matching and not self._loosely_matches(value):
+                if self._strict_matching:
+                    if not self._strictly_matches(value):
+                        return False
+                elif not self._loosely_matches(value):
                     return False
             elif not isinstance(value, int):
                 self._last_error = "%s Illegal value '%s', expected an Integer" % (
@@ -955,31 +1000,27 @@ class IntegerKey(TemplateKey):
 
         :returns: True if the value strictly matches the format spec, False otherwise.
         """
-        error_msg = "%s Illegal value '%s', does not match format spec '%s'" % (
-            self,
-            value,
-            self.format_spec,
-        )
         # If there are more characters than the minimum size, we should have a non zero positive number
         if len(value) > self._minimum_width:
-            if not self._NON_ZERO_POSITIVE_INTEGER_RE.match(value):
-                self._last_error = error_msg
-                return False
-            return True
+            matches = self._NON_ZERO_POSITIVE_INTEGER_RE.match(value)
 
         # If there are less characters than the minimum size, then then there is no strict matching.
-        if len(value) < self._minimum_width:
-            self._last_error = error_msg
-            return False
+        elif len(value) < self._minimum_width:
+            matches = None
 
         # If there are many characters as the format_spec requires, we'll validate that things are
         # padded accordingly. Example of things that will fail are.
         # - '01a'
         # - '0 1'
         # - ' 01'
-        matches = self._strict_validation_re.match(value)
+        else:
+            matches = self._strict_validation_re.match(value)
+
         if not matches:
-            self._last_error = error_msg
+            self._last_error = (
+                "%s Illegal value '%s', does not match format spec '%s'"
+                % (self, value, self.format_spec)
+            )
             return False
         return True
 
@@ -989,10 +1030,7 @@ class IntegerKey(TemplateKey):
 
         :returns: String representation of the value according to the optional format_spec.
         """
-        if self.format_spec:
-            # insert format spec into string
-            return ("%%%sd" % self.format_spec) % value
-        return "%d" % value
+        return self._format_string % value
 
     def _as_value(self, str_value):
         """
@@ -1052,6 +1090,7 @@ class SequenceKey(IntegerKey):
     VALID_FORMAT_STRINGS = ["%d", "#", "@", "$F", "<UDIM>", "$UDIM"]
     # flame sequence pattern regex ('[1234-5434]')
     FLAME_PATTERN_REGEX = r"^\[[0-9]+-[0-9]+\]$"
+    _FLAME_PATTERN_RE = re.compile(FLAME_PATTERN_REGEX)
 
     def __init__(
         self,
@@ -1079,6 +1118,9 @@ class SequenceKey(IntegerKey):
         self._frame_specs = [
             self._resolve_frame_spec(x, format_spec) for x in self.VALID_FORMAT_STRINGS
         ]
+        # sets used when validating values
+        self._frame_specs_set = frozenset(self._frame_specs)
+        self._format_strings_set = frozenset(self.VALID_FORMAT_STRINGS)
 
         # all sequences are abstract by default and have a default value of %0Xd
         abstract = True
@@ -1100,31 +1142,19 @@ class SequenceKey(IntegerKey):
 
     def validate(self, value):
 
-        # use a std error message
-        full_format_strings = [
-            "%s %s" % (self.FRAMESPEC_FORMAT_INDICATOR, x)
-            for x in self.VALID_FORMAT_STRINGS
-        ]
-        error_msg = (
-            "%s Illegal value '%s', expected an Integer, a frame spec or format spec.\n"
-            % (self, value)
-        )
-        error_msg += "Valid frame specs: %s\n" % str(self._frame_specs)
-        error_msg += "Valid format strings: %s\n" % full_format_strings
-
         if isinstance(value, six.string_types) and value.startswith(
             self.FRAMESPEC_FORMAT_INDICATOR
         ):
             # FORMAT: YXZ string - check that XYZ is in VALID_FORMAT_STRINGS
             pattern = self._extract_format_string(value)
-            if pattern in self.VALID_FORMAT_STRINGS:
+            if pattern in self._format_strings_set:
                 return True
             else:
-                self._last_error = error_msg
+                self._last_error = self._get_error_message(value)
                 return False
 
-        elif isinstance(value, six.string_types) and re.match(
-            self.FLAME_PATTERN_REGEX, value
+        elif isinstance(value, six.string_types) and self._FLAME_PATTERN_RE.match(
+            value
         ):
             # value is matching the flame-style sequence pattern
             # [1234-5678]
@@ -1133,15 +1163,33 @@ class SequenceKey(IntegerKey):
         elif not (isinstance(value, int) or value.isdigit()):
             # not a digit - so it must be a frame spec! (like %05d)
             # make sure that it has the right length and formatting.
-            if value in self._frame_specs:
+            if value in self._frame_specs_set:
                 return True
             else:
-                self._last_error = error_msg
+                self._last_error = self._get_error_message(value)
                 return False
 
         else:
             return super(SequenceKey, self).validate(value)
 
+    def _get_error_message(self, value):
+        """
+        Returns the standard error message for an invalid value.
+
+        :param value: The invalid value.
+        """
+        full_format_strings = [
+            "%s %s" % (self.FRAMESPEC_FORMAT_INDICATOR, x)
+            for x in self.VALID_FORMAT_STRINGS
+        ]
+        error_msg = (
+            "%s Illegal value '%s', expected an Integer, a frame spec or format spec.\n"
+            % (self, value)
+        )
+        error_msg += "Valid frame specs: %s\n" % str(self._frame_specs)
+        error_msg += "Valid format strings: %s\n" % full_format_strings
+        return error_msg
+
     def _as_string(self, value):
 
         if isinstance(value, six.string_types) and value.startswith(
@@ -1151,13 +1199,11 @@ class SequenceKey(IntegerKey):
             pattern = self._extract_format_string(value)
             return self._resolve_frame_spec(pattern, self.format_spec)
 
-        if isinstance(value, six.string_types) and re.match(
-            self.FLAME_PATTERN_REGEX, value
-        ):
+        if isinstance(value, six.string_types) and self._FLAME_PATTERN_RE.match(value):
             # this is a flame style sequence token [1234-56773]
             return value
 
-        if value in self._frame_specs:
+        if value in self._frame_specs_set:
             # a frame spec like #### @@@@@ or %08d
             return value
 
@@ -1166,10 +1212,10 @@ class SequenceKey(IntegerKey):
 
     def _as_value(self, str_value):
 
-        if str_value in self._frame_specs:
+        if str_value in self._frame_specs_set:
             return str_value
 
-        if re.match(self.FLAME_PATTERN_REGEX, str_value):
+        if self._FLAME_PATTERN_RE.match(str_value):
             # this is a flame style sequence token [1234-56773]
             return str_value
 
@@ -11,6 +11,7 @@
 from .platforms import is_windows, is_linux, is_macos
 from .shotgun import register_publish
 from .shotgun import resolve_publish_path
+from .shotgun import resolve_publish_paths
 from .shotgun import find_publish
 from .shotgun import download_url
 from .shotgun import create_event_log_entry
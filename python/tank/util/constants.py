@@ -46,3 +46,14 @@ SHOTGUN_SCHEMA_CACHE_KEY = "shotgun_schema"
 
 # tk instance cache of sg local storages
 SHOTGUN_LOCAL_STORAGES_CACHE_KEY = "shotgun_local_storages"
+
+# environment variable used to set the number of metrics dispatch worker threads
+METRICS_DISPATCH_WORKERS_ENV_VAR = "SGTK_METRICS_DISPATCH_WORKERS"
+
+# environment variable that if set to 1, makes metrics dispatch workers
+# reuse a single keep-alive connection to the metrics endpoint
+METRICS_DISPATCH_KEEP_ALIVE_ENV_VAR = "SGTK_METRICS_DISPATCH_KEEP_ALIVE"
+
+# environment variable pointing at a folder where metrics which cannot be
+# queued or dispatched are spilled, to be dispatched at a later time
+METRICS_SPILL_FOLDER_ENV_VAR = "SGTK_METRICS_SPILL_FOLDER"
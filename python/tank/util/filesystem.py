@@ -11,11 +11,16 @@
 Utility methods for manipulating files and folders
 """
 
+from __future__ import absolute_import
+
 import os
 import re
 import sys
+import json
+import uuid
 import errno
 import stat
+import time
 import shutil
 import datetime
 import functools
@@ -521,6 +526,208 @@ def auto_created_yml(path):
         fh.write("# End of file.\n")
 
 
+@contextmanager
+def atomic_write(path, mode="w", permissions=None):
+    """
+    A context manager writing a file atomically.
+
+    The content is written to a uniquely named temporary file next to the
+    given path, which then replaces the file with a single rename. Other
+    processes never read a partially written file, and if an error is
+    raised while writing, the temporary file is removed and the file is
+    left untouched.
+
+    Usage example::
+
+        with filesystem.atomic_write("/path/to/data.json") as fh:
+            json.dump(data, fh)
+
+    :param path: Path to the file to write.
+    :param mode: Mode to open the file with, ``"w"`` or ``"wb"``.
+    :param permissions: Optional permissions to set on the file.
+    :return: file handle.
+    """
+    tmp_path = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+    try:
+        with open(tmp_path, mode) as fh:
+            yield fh
+        if permissions is not None:
+            os.chmod(tmp_path, permissions)
+        _replace_file(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            safe_delete_file(tmp_path)
+
+
+def _replace_file(src, dst):
+    """
+    Renames a file, replacing the destination if it exists.
+
+    :param src: Path to the file to rename.
+    :param dst: Path to rename the file to.
+    """
+    if six.PY3:
+        os.replace(src, dst)
+        return
+
+    if is_windows() and os.path.exists(dst):
+        # os.rename won't overwrite files on Windows, so the destination
+        # is briefly missing there.
+        safe_delete_file(dst)
+    os.rename(src, dst)
+
+
+def get_cache_ttl(env_var):
+    """
+    Returns how long data cached on disk is valid for, as set by an
+    environment variable.
+
+    :param env_var: Name of the environment variable holding a number of
+        seconds.
+    :returns: Number of seconds or None if the data shouldn't be cached.
+    """
+    value = os.environ.get(env_var)
+    if not value:
+        return None
+    try:
+        ttl = float(value)
+    except ValueError:
+        log.warning(
+            "Invalid value '%s' for %s, expected a number of seconds.", value, env_var,
+        )
+        return None
+    return ttl if ttl > 0 else None
+
+
+def write_json_cache(path, data):
+    """
+    Writes data to a json file atomically, along with the current time so
+    it can expire. Missing folders are created.
+
+    :param path: Path to the file to write.
+    :param data: Data serializable to json.
+    """
+    ensure_folder_exists(os.path.dirname(path))
+    with atomic_write(path) as fh:
+        json.dump({"time": time.time(), "data": data}, fh)
+
+
+def read_json_cache(path, ttl=None):
+    """
+    Reads data written by :meth:`write_json_cache`.
+
+    :param path: Path to the file to read.
+    :param ttl: Number of seconds the data is valid for. If None, the data
+        is returned however old it is.
+    :returns: The data, or None if the file is missing or invalid, or if the
+        data expired.
+    """
+    try:
+        with open(path, "r") as fh:
+            entry = json.load(fh)
+        age = time.time() - entry["time"]
+        data = entry["data"]
+    except (IOError, OSError, ValueError, TypeError, KeyError):
+        return None
+
+    # ignore files written in the future, e.g. by a machine whose clock
+    # is off.
+    if ttl is not None and (age < 0 or age > ttl):
+        return None
+    return data
+
+
+@contextmanager
+def lock_file(path, timeout=60):
+    """
+    A context manager locking a file exclusively across processes.
+
+    The lock file is created if needed and is left on disk afterwards.
+    Failing to lock, or waiting for more than ``timeout`` seconds for
+    another process to release the lock, is logged and the code is then
+    executed without the lock.
+
+    Usage example::
+
+        with filesystem.lock_file("/path/to/data.lock"):
+            update_data()
+
+    :param path: Path to the lock file.
+    :param timeout: Number of seconds to wait for the lock.
+    """
+    fh = None
+    try:
+        ensure_folder_exists(os.path.dirname(path))
+        fh = open(path, "a")
+        try:
+            os.chmod(path, 0o666)
+        except OSError:
+            # the lock file was created by another user.
+            pass
+
+        deadline = time.time() + timeout
+        while not _try_lock_file(fh):
+            if time.time() > deadline:
+                raise IOError("Timed out after %ss." % timeout)
+            time.sleep(0.1)
+    except Exception as e:
+        log.debug("Failed to lock %s. Proceeding without lock. Error: %s" % (path, e))
+        if fh:
+            fh.close()
+        fh = None
+
+    try:
+        yield
+    finally:
+        if fh:
+            _unlock_file(fh)
+            fh.close()
+
+
+def _try_lock_file(fh):
+    """
+    Tries to lock a file exclusively, without waiting.
+
+    :param fh: Handle to the file.
+    :returns: True if the file was locked.
+    """
+    if is_windows():
+        import msvcrt
+
+        fh.seek(0)
+        try:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except (IOError, OSError):
+            return False
+    else:
+        import fcntl
+
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return False
+    return True
+
+
+def _unlock_file(fh):
+    """
+    Unlocks a file locked with _try_lock_file.
+
+    :param fh: Handle to the file.
+    """
+    if is_windows():
+        import msvcrt
+
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
 def open_file_browser(path):
     """
     Opens the given path in the operating system file browser such as
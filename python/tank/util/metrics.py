@@ -21,8 +21,14 @@ are not part of the public Sgtk API.
 
 from collections import deque
 from threading import Event, Thread, Lock
+import glob
+import os
 import platform
-from tank_vendor.six.moves import urllib
+import socket
+import time
+import uuid
+from tank_vendor import six
+from tank_vendor.six.moves import urllib, http_client
 from copy import deepcopy
 
 from . import constants, sgre as re
@@ -185,6 +191,15 @@ class MetricsQueueSingleton(object):
     This is to prevent memory leak in case the engine isn't started.
     """
 
+    MAXIMUM_SPILL_FILES = 200
+    """
+    Maximum number of spill files which can be pending in the spill folder, each
+    file holding at most half the maximum queue size. Metrics which can't be
+    spilled once this limit is reached are dropped.
+    """
+
+    SPILL_FILE_EXTENSION = ".metrics"
+
     # keeps track of the single instance of the class
     __instance = None
 
@@ -208,6 +223,12 @@ class MetricsQueueSingleton(object):
             # The underlying collections.deque instance
             metrics_queue._queue = deque(maxlen=cls.MAXIMUM_QUEUE_SIZE)
 
+            # Number of metrics dropped because the queue was full
+            metrics_queue._dropped_count = 0
+
+            # Folder where overflowing metrics are spilled, if any
+            metrics_queue._spill_folder = None
+
             cls.__instance = metrics_queue
 
         return cls.__instance
@@ -234,8 +255,19 @@ class MetricsQueueSingleton(object):
             # the metric is already logged! nothing to do.
             return
 
+        overflow = None
         self._lock.acquire()
         try:
+            if len(self._queue) == self._queue.maxlen:
+                if self._spill_folder:
+                    # make room by moving the oldest half of the queue to disk.
+                    overflow = [
+                        self._queue.popleft() for i in range(0, self._queue.maxlen // 2)
+                    ]
+                else:
+                    # the oldest metric is about to be pushed out of the queue.
+                    self._dropped_count += 1
+
             self._queue.append(metric)
 
             # remember that we've logged this one already
@@ -245,6 +277,11 @@ class MetricsQueueSingleton(object):
         finally:
             self._lock.release()
 
+        # Metrics are often logged from the main thread, don't block other
+        # threads logging metrics while writing to disk.
+        if overflow:
+            self.spill(overflow)
+
     def get_metrics(self, count=None):
         """Return `count` metrics.
 
@@ -279,6 +316,212 @@ class MetricsQueueSingleton(object):
 
         return metrics
 
+    @property
+    def dropped_count(self):
+        """
+        The number of metrics which were dropped since the queue was created,
+        either because the queue was full and they couldn't be spilled to disk
+        or because they couldn't be dispatched.
+        """
+        return self._dropped_count
+
+    @property
+    def spill_folder(self):
+        """
+        The folder where metrics are spilled when they can't be queued or
+        dispatched, or ``None`` if spilling is disabled.
+        """
+        return self._spill_folder
+
+    def set_spill_folder(self, folder):
+        """
+        Sets the folder where metrics are spilled when the queue is full or
+        when they can't be dispatched, e.g. on hosts without network access.
+
+        Spilled metrics are restored with :meth:`restore_spilled` and are shared
+        by all processes using the same folder.
+
+        :param str folder: Path to a folder, or ``None`` to disable spilling.
+        """
+        if folder:
+            from . import filesystem
+
+            filesystem.ensure_folder_exists(folder)
+        self._spill_folder = folder
+
+    def spill(self, metrics, hook_executed=False):
+        """
+        Stores the given metrics on disk so they can be dispatched later.
+
+        If spilling is disabled, or the spill folder is full, the metrics are
+        dropped and accounted for in :attr:`dropped_count`.
+
+        Should never raise an exception.
+
+        :param metrics: A list of :class:`EventMetric` instances.
+        :param bool hook_executed: ``True`` if the ``log_metrics`` hook has
+            already been executed for these metrics, so it isn't executed
+            again once they are restored.
+        """
+        try:
+            spilled = self._spill(metrics, hook_executed)
+        except:
+            spilled = False
+
+        if not spilled:
+            self.discard(metrics)
+
+    def discard(self, metrics):
+        """
+        Accounts for metrics which were dropped because they couldn't be
+        dispatched.
+
+        :param metrics: A list of :class:`EventMetric` instances.
+        """
+        self._lock.acquire()
+        try:
+            self._dropped_count += len(metrics)
+        finally:
+            self._lock.release()
+
+    def requeue(self, metrics):
+        """
+        Puts metrics which could not be dispatched back at the front of the
+        queue, so they are dispatched before any metric logged since.
+
+        Metrics which don't fit in the queue anymore are spilled to disk, or
+        dropped if spilling is disabled.
+
+        Should never raise an exception.
+
+        :param metrics: A list of :class:`EventMetric` instances, oldest first.
+        """
+        overflow = None
+        self._lock.acquire()
+        try:
+            room = self._queue.maxlen - len(self._queue)
+            overflow = metrics[room:]
+            self._queue.extendleft(reversed(metrics[:room]))
+        except:
+            pass
+        finally:
+            self._lock.release()
+
+        if overflow:
+            self.spill(overflow)
+
+    def restore_spilled(self):
+        """
+        Moves metrics previously spilled to disk back into the queue, as long
+        as the queue has room for them.
+
+        Spill files are claimed by renaming them before being read, so only a
+        single process ever restores a given spill file. The queue is only
+        locked while the metrics are added to it, so that logging metrics
+        isn't blocked by disk access.
+
+        Should never raise an exception.
+
+        :returns: The number of restored metrics.
+        """
+        if not self._spill_folder:
+            return 0
+
+        restored = 0
+        overflow = None
+        try:
+            for spill_file in sorted(self._get_spill_files()):
+                # spill files hold at most half a queue, only restore
+                # one if it is likely to fit.
+                if len(self._queue) > self._queue.maxlen // 2:
+                    break
+                claimed_file = "%s.%d.claimed" % (spill_file, os.getpid())
+                try:
+                    os.rename(spill_file, claimed_file)
+                except OSError:
+                    # already claimed by someone else.
+                    continue
+                with open(claimed_file, "r") as fh:
+                    lines = fh.readlines()
+                os.remove(claimed_file)
+
+                metrics = []
+                for line in lines:
+                    data = json.loads(line)
+                    metric = EventMetric(
+                        data["event_group"],
+                        data["event_name"],
+                        data["event_properties"],
+                    )
+                    metric._hook_executed = data.get("hook_executed", False)
+                    metrics.append(metric)
+
+                self._lock.acquire()
+                try:
+                    # metrics may have been logged since the room was
+                    # checked.
+                    room = self._queue.maxlen - len(self._queue)
+                    overflow = metrics[room:]
+                    self._queue.extend(metrics[:room])
+                    restored += len(metrics[:room])
+                finally:
+                    self._lock.release()
+                if overflow:
+                    break
+        except:
+            pass
+
+        if overflow:
+            self.spill(overflow)
+
+        return restored
+
+    def _get_spill_files(self):
+        """
+        :returns: A list of spill file paths currently in the spill folder.
+        """
+        return glob.glob(
+            os.path.join(self._spill_folder, "*%s" % self.SPILL_FILE_EXTENSION)
+        )
+
+    def _spill(self, metrics, hook_executed):
+        """
+        Writes the given metrics to a new file in the spill folder.
+
+        Files are uniquely named, so this doesn't need the queue lock.
+
+        :param metrics: A list of :class:`EventMetric` instances.
+        :param bool hook_executed: ``True`` if the ``log_metrics`` hook has
+            already been executed for these metrics.
+        :returns: ``True`` if the metrics were spilled, ``False`` otherwise.
+        """
+        if not self._spill_folder:
+            return False
+
+        if len(self._get_spill_files()) >= self.MAXIMUM_SPILL_FILES:
+            return False
+
+        spill_file = os.path.join(
+            self._spill_folder,
+            "%d_%d_%s%s"
+            % (
+                int(time.time() * 1000),
+                os.getpid(),
+                uuid.uuid4().hex,
+                self.SPILL_FILE_EXTENSION,
+            ),
+        )
+        # write to a temporary name first so partially written files
+        # are never restored.
+        tmp_file = "%s.tmp" % spill_file
+        with open(tmp_file, "w") as fh:
+            for metric in metrics:
+                data = metric.data
+                data["hook_executed"] = hook_executed or metric._hook_executed
+                fh.write("%s\n" % json.dumps(data))
+        os.rename(tmp_file, spill_file)
+        return True
+
 
 class MetricsDispatcher(object):
     """This class manages 1 or more worker threads dispatching toolkit metrics.
@@ -287,19 +530,54 @@ class MetricsDispatcher(object):
     spin up worker threads for dispatching logged metrics. The `stop()` method
     is later called to stop the worker threads.
 
+    The number of workers, whether workers reuse a keep-alive connection to
+    the metrics endpoint and the folder where metrics are spilled when they
+    can't be queued or dispatched can be passed to the constructor. If not
+    specified, they are read from the ``SGTK_METRICS_DISPATCH_WORKERS``,
+    ``SGTK_METRICS_DISPATCH_KEEP_ALIVE`` and ``SGTK_METRICS_SPILL_FOLDER``
+    environment variables.
+
+    The ``log_metrics`` core hook is executed by a dedicated thread so that a
+    slow hook never delays the dispatch of metrics to the endpoint.
     """
 
-    def __init__(self, engine, num_workers=1):
+    def __init__(self, engine, num_workers=None, keep_alive=None, spill_folder=None):
         """Initialize the dispatcher object.
 
         :param engine: An engine instance for logging, and api access
-        :param workers: The number of worker threads to start.
-
+        :param int num_workers: The number of worker threads to start.
+            Defaults to 1.
+        :param bool keep_alive: ``True`` if workers should reuse a keep-alive
+            connection to the metrics endpoint. Defaults to ``False``.
+        :param str spill_folder: Folder where metrics are spilled when they
+            can't be queued or dispatched. Defaults to ``None``, which
+            disables spilling.
         """
 
+        if num_workers is None:
+            num_workers = os.environ.get(constants.METRICS_DISPATCH_WORKERS_ENV_VAR)
+            try:
+                num_workers = int(num_workers or 1)
+            except ValueError:
+                engine.log_warning(
+                    "Invalid value '%s' for %s, expected a number of threads. "
+                    "A single thread will dispatch metrics."
+                    % (num_workers, constants.METRICS_DISPATCH_WORKERS_ENV_VAR)
+                )
+                num_workers = 1
+        if keep_alive is None:
+            keep_alive = (
+                os.environ.get(constants.METRICS_DISPATCH_KEEP_ALIVE_ENV_VAR) == "1"
+            )
+        if spill_folder is None:
+            spill_folder = os.environ.get(constants.METRICS_SPILL_FOLDER_ENV_VAR)
+
         self._engine = engine
-        self._num_workers = num_workers
+        self._num_workers = max(1, num_workers)
+        self._keep_alive = keep_alive
+        self._spill_folder = spill_folder
         self._workers = []
+        self._hook_worker = None
         self._dispatching = False
 
     def start(self):
@@ -324,9 +602,19 @@ class MetricsDispatcher(object):
         if not get_authenticated_user():
             return
 
+        if self._spill_folder:
+            self._engine.log_debug("Spilling metrics to %s" % self._spill_folder)
+            MetricsQueueSingleton().set_spill_folder(self._spill_folder)
+
+        # start the thread running the log_metrics hook
+        self._hook_worker = MetricsHookWorkerThread(self._engine)
+        self._hook_worker.start()
+
         # start the dispatch workers to use this queue
         for i in range(self._num_workers):
-            worker = MetricsDispatchWorkerThread(self._engine)
+            worker = MetricsDispatchWorkerThread(
+                self._engine, keep_alive=self._keep_alive, hook_worker=self._hook_worker
+            )
             worker.start()
             self._engine.log_debug("Added worker thread: %s" % (worker,))
             self._workers.append(worker)
@@ -338,6 +626,10 @@ class MetricsDispatcher(object):
         for worker in self.workers:
             worker.halt()
 
+        if self._hook_worker:
+            self._hook_worker.halt()
+            self._hook_worker = None
+
         self._dispatching = False
         self._workers = []
 
@@ -352,15 +644,121 @@ class MetricsDispatcher(object):
         return self._workers
 
 
+class MetricsHookWorkerThread(Thread):
+    """
+    Worker thread executing the `log_metrics` core hook.
+
+    Dispatch workers hand over the metrics they have dispatched with
+    :meth:`add_metrics`, which never blocks. Batches are kept in a bounded
+    queue and the oldest ones are dropped if the hook can't keep up.
+    """
+
+    MAXIMUM_QUEUE_SIZE = 100
+    """Maximum number of metric batches waiting for the hook."""
+
+    def __init__(self, engine):
+        """
+        Initialize the worker thread.
+
+        :params engine: Engine instance
+        """
+        super(MetricsHookWorkerThread, self).__init__()
+
+        self._engine = engine
+        self._lock = Lock()
+        self._queue = deque(maxlen=self.MAXIMUM_QUEUE_SIZE)
+        self._dropped_count = 0
+        # See MetricsDispatchWorkerThread for the reason we use a daemon.
+        self.daemon = True
+
+        # set whenever there are batches to process, or to halt the thread
+        self._wake_event = Event()
+        self._halt_event = Event()
+
+    @property
+    def dropped_count(self):
+        """The number of metric batches dropped because the queue was full."""
+        return self._dropped_count
+
+    def add_metrics(self, metrics_data):
+        """
+        Queue a batch of metrics for the `log_metrics` hook.
+
+        :param metrics_data: A list of metric dictionaries.
+        """
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped_count += 1
+            self._queue.append(metrics_data)
+        self._wake_event.set()
+
+    def run(self):
+        """Runs a loop executing the hook for each queued batch of metrics."""
+        reported_drops = 0
+        while not self._halt_event.isSet():
+            self._wake_event.wait()
+            self._wake_event.clear()
+            while not self._halt_event.isSet():
+                with self._lock:
+                    if not self._queue:
+                        break
+                    metrics_data = self._queue.popleft()
+                execute_log_metrics_hook(self._engine, metrics_data)
+
+            if self._dropped_count != reported_drops:
+                self._engine.log_debug(
+                    "%d metric batches were not passed to the %s hook because "
+                    "it could not keep up."
+                    % (
+                        self._dropped_count - reported_drops,
+                        constants.TANK_LOG_METRICS_HOOK_NAME,
+                    )
+                )
+                reported_drops = self._dropped_count
+
+    def halt(self):
+        """
+        Ask the worker thread to halt as soon as possible.
+        """
+        self._halt_event.set()
+        self._wake_event.set()
+
+
+def execute_log_metrics_hook(engine, metrics_data):
+    """
+    Executes the `log_metrics` core hook, logging any error.
+
+    :param engine: Engine instance
+    :param metrics_data: A list of metric dictionaries.
+    """
+    try:
+        engine.tank.execute_core_hook_method(
+            constants.TANK_LOG_METRICS_HOOK_NAME, "log_metrics", metrics=metrics_data
+        )
+    except Exception as e:
+        # Catch errors to not kill our thread, log them for debug purpose.
+        engine.log_debug(
+            "%s hook failed with %s" % (constants.TANK_LOG_METRICS_HOOK_NAME, e)
+        )
+
+
 class MetricsDispatchWorkerThread(Thread):
     """
     Worker thread for dispatching metrics to sg logging endpoint.
 
     Once started this worker will dispatch logged metrics to the shotgun api
     endpoint, if available. The worker retrieves any pending metrics after the
-    `DISPATCH_INTERVAL` and sends them all in a single request to sg.
+    `DISPATCH_INTERVAL` and sends them in batches of at most
+    `DISPATCH_BATCH_SIZE` metrics. The batch size is halved every time the
+    server rejects a batch, whose metrics are then retried in smaller batches,
+    and grows back after every successful request.
 
-    This worker will also fire the `log_metrics` hooks.
+    Metrics which can't be dispatched because the server can't be reached are
+    spilled to disk if a spill folder has been set on the queue, and restored
+    into the queue at the beginning of each cycle.
+
+    This worker will also fire the `log_metrics` hooks, either directly or
+    through a :class:`MetricsHookWorkerThread`.
     """
 
     API_ENDPOINT = "api3/track_metrics/"
@@ -380,17 +778,29 @@ class MetricsDispatchWorkerThread(Thread):
     NOTE: that current SG server code reject batches larger than 10.
     """
 
-    def __init__(self, engine):
+    CONNECTION_TIMEOUT = 30
+    """Timeout in seconds for keep-alive connections to the endpoint."""
+
+    def __init__(self, engine, keep_alive=False, hook_worker=None):
         """
         Initialize the worker thread.
 
         :params engine: Engine instance
+        :param bool keep_alive: ``True`` if a single keep-alive connection to
+            the endpoint should be reused across batches.
+        :param hook_worker: Optional :class:`MetricsHookWorkerThread` running
+            the `log_metrics` hook. If not set, the hook is executed by this
+            worker.
         """
 
         super(MetricsDispatchWorkerThread, self).__init__()
 
         self._engine = engine
         self._endpoint_available = False
+        self._keep_alive = keep_alive
+        self._hook_worker = hook_worker
+        self._connection = None
+        self._batch_size = self.DISPATCH_BATCH_SIZE
         # Make this thread a daemon. This means the process won't wait for this
         # thread to complete before exiting. In most cases, proper engine
         # shutdown should halt the worker correctly. In cases where an engine
@@ -400,6 +810,11 @@ class MetricsDispatchWorkerThread(Thread):
         # makes possible to halt the thread
         self._halt_event = Event()
 
+    @property
+    def batch_size(self):
+        """The number of metrics this worker currently sends per request."""
+        return self._batch_size
+
     def run(self):
         """Runs a loop to dispatch metrics that have been logged."""
 
@@ -412,31 +827,49 @@ class MetricsDispatchWorkerThread(Thread):
             and sg_connection.server_caps.version >= (7, 4, 0)
         )
 
+        metrics_queue = MetricsQueueSingleton()
+        reported_drops = metrics_queue.dropped_count
+
         # Run until halted
         while not self._halt_event.isSet():
 
             # get the next available metric and dispatch it
             try:
+                # Give metrics spilled to disk another chance.
+                restored = metrics_queue.restore_spilled()
+                if restored:
+                    self._engine.log_debug(
+                        "Restored %d metrics spilled to disk." % restored
+                    )
+
                 # For each dispatch cycle, we empty the queue to prevent
                 # metric events from accumulating in the queue.
                 # Because the server has a limit, we dispatch
                 # 'DISPATCH_BATCH_SIZE' items at a time.
                 while True:
-                    metrics = MetricsQueueSingleton().get_metrics(
-                        self.DISPATCH_BATCH_SIZE
-                    )
+                    metrics = metrics_queue.get_metrics(self._batch_size)
                     if metrics:
                         self._dispatch(metrics)
                         self._halt_event.wait(self.DISPATCH_SHORT_INTERVAL)
                     else:
                         break
 
+                if metrics_queue.dropped_count != reported_drops:
+                    self._engine.log_debug(
+                        "%d metrics were dropped because they could not be "
+                        "queued or dispatched."
+                        % (metrics_queue.dropped_count - reported_drops)
+                    )
+                    reported_drops = metrics_queue.dropped_count
+
             except Exception as e:
                 pass
             finally:
                 # wait, checking for halt event before more processing
                 self._halt_event.wait(self.DISPATCH_INTERVAL)
 
+        self._close_connection()
+
     def halt(self):
         """
         Ask the worker thread to halt as soon as possible.
@@ -451,26 +884,30 @@ class MetricsDispatchWorkerThread(Thread):
         :param metrics: A list of :class:`EventMetric` instances.
         """
 
-        if self._endpoint_available:
-            self._dispatch_to_endpoint(metrics)
-        # Execute the log_metrics core hook
-        try:
-            self._engine.tank.execute_core_hook_method(
-                constants.TANK_LOG_METRICS_HOOK_NAME,
-                "log_metrics",
-                metrics=[m.data for m in metrics],
-            )
-        except Exception as e:
-            # Catch errors to not kill our thread, log them for debug purpose.
-            self._engine.log_debug(
-                "%s hook failed with %s" % (constants.TANK_LOG_METRICS_HOOK_NAME, e)
-            )
+        if self._endpoint_available and not self._dispatch_to_endpoint(metrics):
+            # the metrics were put back in the queue, the hook will be
+            # executed when they are dispatched again.
+            return
+        # Execute the log_metrics core hook, unless it was already executed
+        # before the metrics were spilled to disk.
+        metrics_data = [m.data for m in metrics if not m._hook_executed]
+        if not metrics_data:
+            return
+        if self._hook_worker:
+            self._hook_worker.add_metrics(metrics_data)
+        else:
+            execute_log_metrics_hook(self._engine, metrics_data)
 
     def _dispatch_to_endpoint(self, metrics):
         """
         Dispatch the supplied metric to the sg api registration endpoint.
 
+        Batches of metrics rejected by the server are put back in the queue
+        to be retried in smaller batches.
+
         :param metrics: A list of :class:`EventMetric` instances.
+        :returns: ``False`` if the metrics were put back in the queue,
+            ``True`` otherwise.
         """
 
         # Filter out metrics we don't want to send to the endpoint.
@@ -519,7 +956,7 @@ class MetricsDispatchWorkerThread(Thread):
 
         # Bail out if there is nothing to do
         if not filtered_metrics_data:
-            return
+            return True
 
         # get this thread's sg connection via tk api
         sg_connection = self._engine.tank.shotgun
@@ -542,11 +979,84 @@ class MetricsDispatchWorkerThread(Thread):
 
         header = {"Content-Type": "application/json"}
         try:
-            request = urllib.request.Request(url, payload_json, header)
-            urllib.request.urlopen(request)
+            if self._keep_alive and not sg_connection.config.proxy_handler:
+                self._post_with_connection(url, payload_json, header)
+            else:
+                request = urllib.request.Request(url, payload_json, header)
+                urllib.request.urlopen(request)
         except urllib.error.HTTPError:
-            # fire and forget, so if there's an error, ignore it.
-            pass
+            if len(metrics) > 1:
+                # the server may have rejected the batch size, retry the
+                # metrics in smaller batches.
+                self._batch_size = max(1, min(len(metrics), self._batch_size) // 2)
+                MetricsQueueSingleton().requeue(metrics)
+                return False
+            # the metric itself was rejected, fire and forget.
+            MetricsQueueSingleton().discard(metrics)
+        except (urllib.error.URLError, http_client.HTTPException, socket.error) as e:
+            # the server can't be reached, keep the metrics for later.
+            self._engine.log_debug("Unable to dispatch metrics: %s" % e)
+            # the log_metrics hook is executed right after this.
+            MetricsQueueSingleton().spill(metrics, hook_executed=True)
+        else:
+            self._batch_size = min(self.DISPATCH_BATCH_SIZE, self._batch_size * 2)
+        return True
+
+    def _post_with_connection(self, url, payload_json, header):
+        """
+        Posts the given payload over this worker's keep-alive connection,
+        opening a new connection if needed.
+
+        :param str url: Full endpoint url.
+        :param str payload_json: Json payload to post.
+        :param dict header: Request headers.
+        :raises: :class:`urllib.error.HTTPError` if the server rejected the
+            request. Connection errors are raised as is.
+        """
+        parsed_url = urllib.parse.urlparse(url)
+        body = six.ensure_binary(payload_json)
+
+        # a connection kept alive by the server may have been closed since
+        # the last request, in which case we retry once with a new connection.
+        for attempt in range(2):
+            if self._connection is None:
+                if parsed_url.scheme == "https":
+                    connection_class = http_client.HTTPSConnection
+                else:
+                    connection_class = http_client.HTTPConnection
+                self._connection = connection_class(
+                    parsed_url.netloc, timeout=self.CONNECTION_TIMEOUT
+                )
+            try:
+                self._connection.request("POST", parsed_url.path, body, header)
+                response = self._connection.getresponse()
+                # the response needs to be read before the connection can be
+                # reused.
+                response.read()
+                break
+            except (http_client.HTTPException, socket.error):
+                self._close_connection()
+                if attempt:
+                    raise
+
+        if response.getheader("connection", "").lower() == "close":
+            self._close_connection()
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                url, response.status, response.reason, response.msg, None
+            )
+
+    def _close_connection(self):
+        """
+        Closes this worker's keep-alive connection, if any.
+        """
+        if self._connection:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
 
 
 ###############################################################################
@@ -634,6 +1144,10 @@ class EventMetric(object):
     KEY_PUBLISH_TYPE = "Publish Type"
     KEY_CORE_VERSION = "Core Version"
 
+    # Set on metrics restored from disk for which the log_metrics hook was
+    # already executed.
+    _hook_executed = False
+
     def __init__(self, group, name, properties=None):
         """
         Initialize a metric event with the given name for the given group.
@@ -26,7 +26,7 @@ from .publish_util import (
 )
 
 from .publish_creation import register_publish
-from .publish_resolve import resolve_publish_path
+from .publish_resolve import resolve_publish_path, resolve_publish_paths
 from .download import (
     download_url,
     download_and_unpack_attachment,
@@ -16,7 +16,9 @@ from __future__ import with_statement
 import os
 import sys
 import uuid
+import hashlib
 from tank_vendor.six.moves import urllib
+from tank_vendor.six.moves import http_client
 import time
 import tempfile
 import zipfile
@@ -26,17 +28,27 @@ from ...errors import TankError
 from ...log import LogManager
 from ..zip import unzip_file
 from .. import filesystem
+from .. import sgre as re
 
 log = LogManager.get_logger(__name__)
 
+# Size of the chunks downloads are streamed to disk with.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Number of times an interrupted download is resumed before giving up.
+DOWNLOAD_RESUME_ATTEMPTS = 5
+
 
 @LogManager.log_timing
-def download_url(sg, url, location, use_url_extension=False):
+def download_url(sg, url, location, use_url_extension=False, checksum=None):
     """
     Convenience method that downloads a file from a given url.
     This method will take into account any proxy settings which have
     been defined in the Shotgun connection parameters.
 
+    The content is streamed to disk and the download is resumed if the
+    connection drops, provided the server supports range requests.
+
     In some cases, the target content of the url is not known beforehand.
     For example, the url ``https://my-site.shotgunstudio.com/thumbnail/full/Asset/1227``
     may redirect into ``https://some-site/path/to/a/thumbnail.png``. In
@@ -58,17 +70,24 @@ def download_url(sg, url, location, use_url_extension=False):
                                    to construct the full path name to the downloaded
                                    contents. The newly constructed full path name
                                    will be returned.
+    :param str checksum: Optional checksum the downloaded content is verified
+                         against, on the form ``<algorithm>:<hex digest>``,
+                         e.g. ``sha256:9f86d08...``. Any algorithm supported
+                         by :mod:`hashlib` can be used.
 
     :returns: Full filepath to the downloaded file. This may have been altered from
               the input ``location`` if ``use_url_extension`` is True and a file extension
               could be determined from the resolved url.
     :raises: :class:`TankError` on failure.
     """
+    # The opener is only used for this download rather than installed
+    # globally, so that concurrent downloads don't use each other's.
+    opener = None
     # We only need to set the auth cookie for downloads from Shotgun server,
     # input URLs like: https://my-site.shotgunstudio.com/thumbnail/full/Asset/1227
     if sg.config.server in url:
         # this method also handles proxy server settings from the shotgun API
-        __setup_sg_auth_and_proxy(sg)
+        opener = __build_sg_auth_and_proxy_opener(sg)
     elif sg.config.proxy_handler:
         # These input URLs have generally already been authenticated and are
         # in the form: https://sg-media-staging-usor-01.s3.amazonaws.com/9d93f...
@@ -76,20 +95,12 @@ def download_url(sg, url, location, use_url_extension=False):
         # Grab proxy server settings from the shotgun API
         opener = urllib.request.build_opener(sg.config.proxy_handler)
 
-        urllib.request.install_opener(opener)
-
     # inherit the timeout value from the sg API
     timeout = sg.config.timeout_secs
 
     # download the given url
     try:
-        request = urllib.request.Request(url)
-        if timeout and sys.version_info >= (2, 6):
-            # timeout parameter only available in python 2.6+
-            response = urllib.request.urlopen(request, timeout=timeout)
-        else:
-            # use system default
-            response = urllib.request.urlopen(request)
+        response = _open_url(url, timeout, opener=opener)
 
         if use_url_extension:
             # Make sure the disk location has the same extension as the url path.
@@ -101,11 +112,7 @@ def download_url(sg, url, location, use_url_extension=False):
             if url_ext:
                 location = "%s%s" % (location, url_ext)
 
-        f = open(location, "wb")
-        try:
-            f.write(response.read())
-        finally:
-            f.close()
+        _write_response(response, url, location, timeout, checksum, opener)
     except Exception as e:
         raise TankError(
             "Could not download contents of url '%s'. Error reported: %s" % (url, e)
@@ -114,15 +121,151 @@ def download_url(sg, url, location, use_url_extension=False):
     return location
 
 
-def __setup_sg_auth_and_proxy(sg):
+def _open_url(url, timeout, offset=0, opener=None):
+    """
+    Opens a url for reading.
+
+    :param str url: url to open
+    :param timeout: Timeout in seconds, or None to use the system default.
+    :param int offset: If set, only request the content from this byte on.
+    :param opener: Opener to open the url with, or None to use the one
+        installed globally.
+    :returns: The response.
+    """
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", "bytes=%d-" % offset)
+    open_url = opener.open if opener else urllib.request.urlopen
+    if timeout and sys.version_info >= (2, 6):
+        # timeout parameter only available in python 2.6+
+        return open_url(request, timeout=timeout)
+    # use system default
+    return open_url(request)
+
+
+def _get_content_length(response):
+    """
+    Returns the size of the content of a response.
+
+    :param response: Response returned by urlopen.
+    :returns: Size in bytes or None if unknown.
+    """
+    try:
+        return int(response.info().get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_resume_offset(response):
+    """
+    Returns the offset a response to a Range request starts at.
+
+    :param response: Response returned by urlopen.
+    :returns: Offset in bytes or None if the server sent the full content.
+    """
+    if response.getcode() != 206:
+        return None
+    # Content-Range: bytes 1000-4999/5000
+    match = re.match(r"bytes (\d+)-", response.info().get("Content-Range", ""))
+    if not match:
+        return None
+    return int(match.group(1))
+
+
+def _write_response(response, url, location, timeout, checksum=None, opener=None):
+    """
+    Streams the content of a response to disk, one chunk at a time.
+
+    If the connection drops, the download is resumed where it stopped with a
+    Range request, up to :data:`DOWNLOAD_RESUME_ATTEMPTS` times. Servers
+    which do not support ranges send the full content again.
+
+    :param response: Response returned by urlopen.
+    :param str url: url the response was returned for.
+    :param str location: Path to write the content to.
+    :param timeout: Timeout in seconds, or None to use the system default.
+    :param str checksum: Expected checksum of the content, on the form
+        ``<algorithm>:<hex digest>``, e.g. ``sha256:9f86d08...``.
+    :param opener: Opener to resume the download with, or None to use the
+        one installed globally.
+    :raises: :class:`TankError` if the content is incomplete or doesn't
+        match the checksum.
+    """
+    algorithm = None
+    if checksum:
+        (algorithm, expected_digest) = checksum.split(":", 1)
+
+    content_hash = hashlib.new(algorithm) if algorithm else None
+    expected_size = _get_content_length(response)
+    size = 0
+    resume_attempt = 0
+
+    with open(location, "wb") as fh:
+        while True:
+            try:
+                while True:
+                    chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fh.write(chunk)
+                    if content_hash:
+                        content_hash.update(chunk)
+                    size += len(chunk)
+            except (IOError, http_client.HTTPException) as e:
+                # socket errors derive from IOError
+                error = e
+            else:
+                if expected_size is None or size >= expected_size:
+                    break
+                error = "connection closed after %d of %d bytes" % (
+                    size,
+                    expected_size,
+                )
+            finally:
+                response.close()
+
+            if resume_attempt >= DOWNLOAD_RESUME_ATTEMPTS:
+                raise TankError(
+                    "Download interrupted after %d bytes: %s" % (size, error)
+                )
+            resume_attempt += 1
+            log.debug(
+                "Attempt %s: Resuming download of %s at byte %d: %s"
+                % (resume_attempt, url, size, error)
+            )
+
+            response = _open_url(url, timeout, size, opener)
+            if _get_resume_offset(response) != size:
+                # the server sent the full content, start over.
+                log.debug("Server doesn't support resuming, downloading again.")
+                fh.seek(0)
+                fh.truncate()
+                size = 0
+                content_hash = hashlib.new(algorithm) if algorithm else None
+                expected_size = _get_content_length(response)
+
+    if expected_size is not None and size != expected_size:
+        raise TankError(
+            "Downloaded %d bytes but expected %d bytes." % (size, expected_size)
+        )
+
+    if content_hash and content_hash.hexdigest() != expected_digest.lower():
+        raise TankError(
+            "Checksum mismatch, expected %s but got %s:%s."
+            % (checksum, algorithm, content_hash.hexdigest())
+        )
+
+
+def __build_sg_auth_and_proxy_opener(sg):
     """
-    Borrowed from the Shotgun Python API, setup urllib2 with a cookie for authentication on
-    Shotgun instance.
+    Borrowed from the Shotgun Python API, builds a urllib2 opener with a cookie for
+    authentication on Shotgun instance.
 
     Looks up session token and sets that in a cookie in the :mod:`urllib2` handler. This is
     used internally for downloading attachments from the Shotgun server.
 
     :param sg: Shotgun API instance
+    :returns: The opener.
     """
     # Importing this module locally to reduce clutter and facilitate clean up when/if this
     # functionality gets ported back into the Shotgun API.
@@ -154,11 +297,11 @@ def __setup_sg_auth_and_proxy(sg):
         opener = urllib.request.build_opener(sg.config.proxy_handler, cookie_handler)
     else:
         opener = urllib.request.build_opener(cookie_handler)
-    urllib.request.install_opener(opener)
+    return opener
 
 
 def download_and_unpack_attachment(
-    sg, attachment_id, target, retries=5, auto_detect_bundle=False
+    sg, attachment_id, target, retries=5, auto_detect_bundle=False, checksum=None
 ):
     """
     Downloads the given attachment from Shotgun, assumes it is a zip file
@@ -173,14 +316,23 @@ def download_and_unpack_attachment(
         (config, app, engine, framework) and that this should be attempted to be
         detected and unpacked intelligently. For example, if the zip file contains
         the bundle in a subfolder, this should be correctly unfolded.
+    :param str checksum: Optional checksum of the zip file, on the form
+        ``<algorithm>:<hex digest>``, e.g. ``sha256:9f86d08...``.
     :raises: ShotgunAttachmentDownloadError on failure
     """
     return _download_and_unpack(
-        sg, target, retries, auto_detect_bundle, attachment_id=attachment_id
+        sg,
+        target,
+        retries,
+        auto_detect_bundle,
+        attachment_id=attachment_id,
+        checksum=checksum,
     )
 
 
-def download_and_unpack_url(sg, url, target, retries=5, auto_detect_bundle=False):
+def download_and_unpack_url(
+    sg, url, target, retries=5, auto_detect_bundle=False, checksum=None
+):
     """
     Downloads the content from the provided url, assumes it is a zip file
     and attempts to unpack it into the given location.
@@ -194,14 +346,18 @@ def download_and_unpack_url(sg, url, target, retries=5, auto_detect_bundle=False
         (config, app, engine, framework) and that this should be attempted to be
         detected and unpacked intelligently. For example, if the zip file contains
         the bundle in a subfolder, this should be correctly unfolded.
+    :param str checksum: Optional checksum of the zip file, on the form
+        ``<algorithm>:<hex digest>``, e.g. ``sha256:9f86d08...``.
     :raises: ShotgunAttachmentDownloadError on failure
     """
-    return _download_and_unpack(sg, target, retries, auto_detect_bundle, url=url)
+    return _download_and_unpack(
+        sg, target, retries, auto_detect_bundle, url=url, checksum=checksum
+    )
 
 
 @LogManager.log_timing
 def _download_and_unpack(
-    sg, target, retries, auto_detect_bundle, attachment_id=None, url=None
+    sg, target, retries, auto_detect_bundle, attachment_id=None, url=None, checksum=None
 ):
     """
     Downloads the given attachment from Shotgun if an attachment ID is provided,
@@ -218,6 +374,8 @@ def _download_and_unpack(
         the bundle in a subfolder, this should be correctly unfolded.
     :param attachment_id: Attachment to download
     :param url: The url to download from
+    :param str checksum: Optional checksum of the zip file, on the form
+        ``<algorithm>:<hex digest>``, e.g. ``sha256:9f86d08...``.
     :raises: ShotgunAttachmentDownloadError on failure
     """
     # @todo: progress feedback here - when the SG api supports it!
@@ -235,13 +393,16 @@ def _download_and_unpack(
             time_before = time.time()
             if attachment_id:
                 log.debug("Downloading attachment id %s..." % attachment_id)
-                bundle_content = sg.download_attachment(attachment_id)
-                log.debug("Download complete. Saving into %s" % zip_tmp)
-                with open(zip_tmp, "wb") as fh:
-                    fh.write(bundle_content)
+                # stream the attachment to disk rather than holding it in memory
+                download_url(
+                    sg,
+                    sg.get_attachment_download_url(attachment_id),
+                    zip_tmp,
+                    checksum=checksum,
+                )
             elif url:
                 log.debug("Downloading content of url %s..." % url)
-                download_url(sg, url, zip_tmp)
+                download_url(sg, url, zip_tmp, checksum=checksum)
             else:
                 raise ValueError(
                     "A value is required for one of kwargs `url` or `attachment_id`"
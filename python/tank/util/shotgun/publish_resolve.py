@@ -60,378 +60,559 @@ def resolve_publish_path(tk, sg_publish_data):
     :raises: :class:`~sgtk.util.PublishPathNotDefinedError` if the path isn't defined.
     :raises: :class:`~sgtk.util.PublishPathNotSupported` if the path cannot be resolved.
     """
+    return _PublishPathResolver(tk).resolve(sg_publish_data)
 
-    path_field = sg_publish_data.get("path")
-
-    log.debug(
-        "Publish id %s: Attempting to resolve publish path "
-        "to local file on disk: '%s'"
-        % (sg_publish_data["id"], pprint.pformat(path_field))
-    )
-
-    # first offer the resolve to the core hook
-    #
-    # note that we run this before the built-in logic because we want to be able to add support
-    # for handling uploaded files (or something else) in the future, yet at the same time,
-    # by doing that we don't want to break any client integration. By putting the hook first,
-    # this is possible. If we put the hook last, we could affect the conditions under which
-    # the hook is being executed by introducing new features.
-    custom_path = tk.execute_core_hook_method(
-        "resolve_publish", "resolve_path", sg_publish_data=sg_publish_data
-    )
-    if custom_path:
-        log.debug("Publish resolve core hook returned path '%s'" % custom_path)
-        return custom_path
-
-    # core hook did not pick it up - apply default logic
-    if path_field is None:
-        # no path defined for publish
-        raise PublishPathNotDefinedError(
-            "Publish %s (id %s) does not have a path set"
-            % (sg_publish_data["code"], sg_publish_data["id"])
-        )
 
-    elif path_field["link_type"] == "local":
-        # local file link
-        path = __resolve_local_file_link(tk, path_field)
-        if path is None:
+def resolve_publish_paths(tk, sg_publish_data_list):
+    """
+    Returns local paths on disk given a list of dictionaries of Shotgun publish data.
 
-            raise PublishPathNotDefinedError(
-                "Publish %s (id %s) has a local file link that could not be resolved "
-                "on this os platform."
-                % (sg_publish_data["code"], sg_publish_data["id"])
-            )
-        return path
-
-    elif path_field["link_type"] == "web":
-        # url link
-        return __resolve_url_link(tk, path_field)
-
-    else:
-        # unknown attachment type
-        raise PublishPathNotSupported(
-            "Publish %s (id %s): Local file link type '%s' "
-            "not supported."
-            % (sg_publish_data["code"], sg_publish_data["id"], path_field["link_type"])
-        )
+    This is a bulk version of :meth:`resolve_publish_path`, suitable for
+    resolving large lists of publishes in one go, for example when populating
+    a loader. The local storages, the environment variable overrides and the
+    cross-platform root lookup tables are computed once per call rather than
+    once per publish, and the ``resolve_publish`` core hook is only executed if
+    it has been overridden in the pipeline configuration.
+
+    .. note:: This method is also called by :meth:`sgtk.Hook.get_publish_paths`.
 
+    :param tk: :class:`~sgtk.Sgtk` instance
+    :param sg_publish_data_list: List of dictionaries containing Shotgun publish
+        data. Each dictionary needs to at least contain a code, type, id and
+        a path key.
 
-def __resolve_local_file_link(tk, attachment_data):
+    :returns: List of local paths to files or file sequences, in the same
+        order as the input list.
+
+    :raises: :class:`~sgtk.util.PublishPathNotDefinedError` if any of the paths isn't defined.
+    :raises: :class:`~sgtk.util.PublishPathNotSupported` if any of the paths cannot be resolved.
     """
-    Resolves the given local path attachment into a local path.
-    For details, see :meth:`resolve_publish_path`.
+    resolver = _PublishPathResolver(tk, verbose=False)
+    log.debug("Resolving %d publish paths..." % len(sg_publish_data_list))
+    paths = [resolver.resolve(sg_data) for sg_data in sg_publish_data_list]
+    log.debug("...resolved %d publish paths." % len(paths))
+    return paths
 
-    :param tk: :class:`~sgtk.Sgtk` instance
-    :param attachment_data: Shotgun Attachment dictionary.
 
-    :returns: A local path to file or file sequence or None if it cannot be resolved.
+class _PublishPathResolver(object):
     """
-    # local file link data looks like this:
-    #
-    # {'content_type': 'image/png',
-    #  'id': 25826,
-    #  'link_type': 'local',
-    #  'local_path': '/Users/foo.png',
-    #  'local_path_linux': None,
-    #  'local_path_mac': '/Users/foo.png',
-    #  'local_path_windows': None,
-    #  'local_storage': {'id': 39,
-    #                    'name': 'home',
-    #                    'type': 'LocalStorage'},
-    #  'name': 'foo.png',
-    #  'type': 'Attachment',
-    #  'url': 'file:///Users/foo.png'}
-
-    log.debug(
-        "Attempting to resolve local file link attachment data "
-        "into a local path: %s" % pprint.pformat(attachment_data)
-    )
-
-    # see if we have a path for this storage
-    local_path = attachment_data.get("local_path")
-
-    # Check override env vars:
-    #
-    # For local storages, it is possible to amend an existing
-    # storage using environment variables. For example, if a
-    # primary storage exists, but only has paths defined on
-    # windows and linux, a mac storage path defined by setting
-    # a SHOTGUN_PATH_MAC_PRIMARY.
-    #
-    # Similarly, if a SHOTGUN_PATH_WINDOWS_PRIMARY path is defined
-    # for this storage, it will be ignored and a warning is logged.
-    #
-
-    # look for override env var for our local os
-    storage_name = attachment_data["local_storage"]["name"].upper()
-    storage_id = attachment_data["local_storage"]["id"]
-    os_name = {"win32": "WINDOWS", "linux2": "LINUX", "darwin": "MAC"}[sgsix.platform]
-    env_var_name = "SHOTGUN_PATH_%s_%s" % (os_name, storage_name)
-    log.debug("Looking for override env var '%s'" % env_var_name)
-
-    if env_var_name in os.environ:
+    Resolves Shotgun publish data into local paths.
 
-        log.debug(
-            "Detected override %s='%s'" % (env_var_name, os.environ[env_var_name])
-        )
-        # if we already have this set in the local storage,
-        # issue a warning
-        if local_path:
-            log.warning(
-                "Discovered environment variable %s, however the operating system root is "
-                "already defined in Shotgun and the environment variable will "
-                "be ignored." % env_var_name
+    All lookup tables needed for resolution (local storages, environment
+    variable overrides and cross-platform root mappings) are computed lazily
+    the first time they are needed and then reused for every subsequent
+    publish passed to :meth:`resolve`.
+    """
+
+    # maps the current platform to the suffix used by path override env vars.
+    _OS_ENV_NAMES = {"win32": "WINDOWS", "linux2": "LINUX", "darwin": "MAC"}
+
+    # storage fields and the matching attachment fields, in resolution order.
+    _STORAGE_FIELD_MAP = {
+        "windows_path": "local_path_windows",
+        "linux_path": "local_path_linux",
+        "mac_path": "local_path_mac",
+    }
+
+    def __init__(self, tk, verbose=True):
+        """
+        :param tk: :class:`~sgtk.Sgtk` instance
+        :param bool verbose: If ``True``, the resolution of each publish is
+            logged in detail and the ``resolve_publish`` core hook is always
+            executed. If ``False``, per-publish debug logging is skipped and
+            the core hook is only executed when the pipeline configuration
+            overrides it.
+        """
+        self._tk = tk
+        self._verbose = verbose
+        self._os_name = self._OS_ENV_NAMES[sgsix.platform]
+
+        if verbose:
+            self._run_core_hook = True
+        else:
+            # the default resolve_publish hook shipped with core always
+            # returns None, so only a hook in the config can affect the result.
+            hook_path = os.path.join(
+                tk.pipeline_configuration.get_core_hooks_location(),
+                "resolve_publish.py",
+            )
+            self._run_core_hook = os.path.exists(hook_path)
+            log.debug(
+                "Custom resolve_publish core hook detected: %s" % self._run_core_hook
+            )
+
+        # lookup tables, populated on demand.
+        self._storages_by_id = None
+        self._local_overrides = None
+        self._url_storage_lookup = None
+        # storage names for which an override warning has been issued.
+        self._warned_overrides = set()
+
+    def resolve(self, sg_publish_data):
+        """
+        Resolves a single publish into a local path.
+        For details, see :meth:`resolve_publish_path`.
+
+        :param sg_publish_data: Dictionary containing Shotgun publish data.
+            Needs to at least contain a code, type, id and a path key.
+
+        :returns: A local path to file or file sequence.
+
+        :raises: :class:`~sgtk.util.PublishPathNotDefinedError` if the path isn't defined.
+        :raises: :class:`~sgtk.util.PublishPathNotSupported` if the path cannot be resolved.
+        """
+        path_field = sg_publish_data.get("path")
+
+        if self._verbose:
+            log.debug(
+                "Publish id %s: Attempting to resolve publish path "
+                "to local file on disk: '%s'"
+                % (sg_publish_data["id"], pprint.pformat(path_field))
+            )
+
+        # first offer the resolve to the core hook
+        #
+        # note that we run this before the built-in logic because we want to be able to add support
+        # for handling uploaded files (or something else) in the future, yet at the same time,
+        # by doing that we don't want to break any client integration. By putting the hook first,
+        # this is possible. If we put the hook last, we could affect the conditions under which
+        # the hook is being executed by introducing new features.
+        if self._run_core_hook:
+            custom_path = self._tk.execute_core_hook_method(
+                "resolve_publish", "resolve_path", sg_publish_data=sg_publish_data
             )
+            if custom_path:
+                log.debug("Publish resolve core hook returned path '%s'" % custom_path)
+                return custom_path
+
+        # core hook did not pick it up - apply default logic
+        if path_field is None:
+            # no path defined for publish
+            raise PublishPathNotDefinedError(
+                "Publish %s (id %s) does not have a path set"
+                % (sg_publish_data["code"], sg_publish_data["id"])
+            )
+
+        elif path_field["link_type"] == "local":
+            # local file link
+            path = self._resolve_local_file_link(path_field)
+            if path is None:
+
+                raise PublishPathNotDefinedError(
+                    "Publish %s (id %s) has a local file link that could not be resolved "
+                    "on this os platform."
+                    % (sg_publish_data["code"], sg_publish_data["id"])
+                )
+            return path
+
+        elif path_field["link_type"] == "web":
+            # url link
+            return self._resolve_url_link(path_field)
 
         else:
+            # unknown attachment type
+            raise PublishPathNotSupported(
+                "Publish %s (id %s): Local file link type '%s' "
+                "not supported."
+                % (
+                    sg_publish_data["code"],
+                    sg_publish_data["id"],
+                    path_field["link_type"],
+                )
+            )
 
-            # we have an override
-            override_root = os.environ[env_var_name]
+    def _get_storages_by_id(self):
+        """
+        Returns the Shotgun local storages, keyed by id.
 
-            # normalize path
-            override_root = ShotgunPath.normalize(override_root)
+        :returns: Dictionary of Shotgun local storage dictionaries.
+        """
+        if self._storages_by_id is None:
+            self._storages_by_id = dict(
+                (s["id"], s) for s in get_cached_local_storages(self._tk)
+            )
+        return self._storages_by_id
+
+    def _get_local_overrides(self):
+        """
+        Returns the local storage root overrides defined for the current
+        operating system through ``SHOTGUN_PATH_<OS>_<STORAGE>`` environment
+        variables.
+
+        :returns: Dictionary of normalized override roots, keyed by
+            upper case storage name.
+        """
+        if self._local_overrides is None:
+            prefix = "SHOTGUN_PATH_%s_" % self._os_name
+            self._local_overrides = {}
+            for env_var, value in os.environ.items():
+                if env_var.startswith(prefix):
+                    self._local_overrides[env_var[len(prefix) :]] = value
+        return self._local_overrides
+
+    def _resolve_local_file_link(self, attachment_data):
+        """
+        Resolves the given local path attachment into a local path.
+        For details, see :meth:`resolve_publish_path`.
+
+        :param attachment_data: Shotgun Attachment dictionary.
+
+        :returns: A local path to file or file sequence or None if it cannot be resolved.
+        """
+        # local file link data looks like this:
+        #
+        # {'content_type': 'image/png',
+        #  'id': 25826,
+        #  'link_type': 'local',
+        #  'local_path': '/Users/foo.png',
+        #  'local_path_linux': None,
+        #  'local_path_mac': '/Users/foo.png',
+        #  'local_path_windows': None,
+        #  'local_storage': {'id': 39,
+        #                    'name': 'home',
+        #                    'type': 'LocalStorage'},
+        #  'name': 'foo.png',
+        #  'type': 'Attachment',
+        #  'url': 'file:///Users/foo.png'}
+
+        if self._verbose:
             log.debug(
-                "Applying override '%s' to path '%s' "
-                "(storage %s)" % (override_root, local_path, storage_name)
+                "Attempting to resolve local file link attachment data "
+                "into a local path: %s" % pprint.pformat(attachment_data)
             )
 
-            # get the local storage that we are augmenting
-            storage = [
-                s for s in get_cached_local_storages(tk) if s["id"] == storage_id
-            ][0]
-
-            # find a storage where the path is defined
-            # we know that it must be defined for at least one os :)
-            storage_field_map = {
-                "windows_path": "local_path_windows",
-                "linux_path": "local_path_linux",
-                "mac_path": "local_path_mac",
-            }
-
-            for (storage_field, path_field) in storage_field_map.items():
-                this_os_storage_root = storage[storage_field]
-                this_os_full_path = attachment_data[path_field]
-
-                if this_os_storage_root:
-                    # the path is defined on this os. Normalize it by
-                    # chopping off the root
-
-                    # chop off the root from the path and append override root
-                    local_path = (
-                        override_root
-                        + os.path.sep
-                        + this_os_full_path[len(this_os_storage_root) :]
-                    )
-                    log.debug(
-                        "Transforming '%s' and root '%s' via env var '%s' into '%s'"
-                        % (
-                            this_os_full_path,
-                            this_os_storage_root,
-                            override_root,
-                            local_path,
-                        )
+        # see if we have a path for this storage
+        local_path = attachment_data.get("local_path")
+
+        # Check override env vars:
+        #
+        # For local storages, it is possible to amend an existing
+        # storage using environment variables. For example, if a
+        # primary storage exists, but only has paths defined on
+        # windows and linux, a mac storage path defined by setting
+        # a SHOTGUN_PATH_MAC_PRIMARY.
+        #
+        # Similarly, if a SHOTGUN_PATH_WINDOWS_PRIMARY path is defined
+        # for this storage, it will be ignored and a warning is logged.
+        #
+
+        # look for override env var for our local os
+        storage_name = attachment_data["local_storage"]["name"].upper()
+        storage_id = attachment_data["local_storage"]["id"]
+        env_var_name = "SHOTGUN_PATH_%s_%s" % (self._os_name, storage_name)
+        if self._verbose:
+            log.debug("Looking for override env var '%s'" % env_var_name)
+
+        override_root = self._get_local_overrides().get(storage_name)
+
+        if override_root is not None:
+
+            if self._verbose:
+                log.debug("Detected override %s='%s'" % (env_var_name, override_root))
+            # if we already have this set in the local storage,
+            # issue a warning
+            if local_path:
+                if storage_name not in self._warned_overrides:
+                    self._warned_overrides.add(storage_name)
+                    log.warning(
+                        "Discovered environment variable %s, however the operating system root is "
+                        "already defined in Shotgun and the environment variable will "
+                        "be ignored." % env_var_name
                     )
-                    break
 
-    # normalize
-    local_path = ShotgunPath.normalize(local_path)
-    log.debug("Resolved local file link: '%s'" % local_path)
-    return local_path
+            else:
 
+                # normalize path
+                override_root = ShotgunPath.normalize(override_root)
+                if self._verbose:
+                    log.debug(
+                        "Applying override '%s' to path '%s' "
+                        "(storage %s)" % (override_root, local_path, storage_name)
+                    )
 
-def __resolve_url_link(tk, attachment_data):
-    """
-    Resolves the given url attachment into a local path.
-    For details, see :meth:`resolve_publish_path`.
+                # get the local storage that we are augmenting
+                storage = self._get_storages_by_id()[storage_id]
 
-    :param tk: :class:`~sgtk.Sgtk` instance
-    :param attachment_data: Dictionary containing Shotgun publish data.
-        Needs to at least contain a code, type, id and a path key.
+                # find a storage where the path is defined
+                # we know that it must be defined for at least one os :)
+                for (storage_field, path_field) in self._STORAGE_FIELD_MAP.items():
+                    this_os_storage_root = storage[storage_field]
+                    this_os_full_path = attachment_data[path_field]
 
-    :returns: A local path to file or file sequence.
+                    if this_os_storage_root:
+                        # the path is defined on this os. Normalize it by
+                        # chopping off the root
 
-    :raises: :class:`~sgtk.util.PublishPathNotSupported` if the path cannot be resolved.
-    """
-    log.debug(
-        "Attempting to resolve url attachment data "
-        "into a local path: %s" % pprint.pformat(attachment_data)
-    )
-
-    # url data looks like this:
-    #
-    # {'content_type': None,
-    #  'id': 25828,
-    #  'link_type': 'web',
-    #  'name': 'toolkitty.jpg',
-    #  'type': 'Attachment',
-    #  'url': 'file:///C:/Users/Manne%20Ohrstrom/Downloads/toolkitty.jpg'},
-
-    parsed_url = urllib.parse.urlparse(attachment_data["url"])
-
-    # url = "file:///path/to/some/file.txt"
-    # ParseResult(
-    #   scheme='file',
-    #   netloc='',
-    #   path='/path/to/some/file.txt',
-    #   params='',
-    #   query='',
-    #   fragment=''
-    # )
-
-    if parsed_url.scheme != "file":
-        # we currently only support file:// style urls
-        raise PublishPathNotSupported(
-            "Cannot resolve unsupported url '%s' into a local path."
-            % attachment_data["url"]
-        )
+                        # chop off the root from the path and append override root
+                        local_path = (
+                            override_root
+                            + os.path.sep
+                            + this_os_full_path[len(this_os_storage_root) :]
+                        )
+                        if self._verbose:
+                            log.debug(
+                                "Transforming '%s' and root '%s' via env var '%s' into '%s'"
+                                % (
+                                    this_os_full_path,
+                                    this_os_storage_root,
+                                    override_root,
+                                    local_path,
+                                )
+                            )
+                        break
+
+        # normalize
+        local_path = ShotgunPath.normalize(local_path)
+        if self._verbose:
+            log.debug("Resolved local file link: '%s'" % local_path)
+        return local_path
+
+    def _get_url_storage_lookup(self):
+        """
+        Returns the cross-platform root lookup table used to
+        resolve file urls into local paths.
+
+        Each entry is a tuple with the storage name, its :class:`ShotgunPath`
+        and the lower case windows, linux and mac prefixes to compare
+        url paths against.
+
+        :returns: List of tuples.
+        """
+        if self._url_storage_lookup is not None:
+            return self._url_storage_lookup
+
+        # create a lookup table of shotgun paths,
+        # keyed by upper case storage name
+        log.debug("Building cross-platform path resolution lookup table:")
+        storage_lookup = {}
+        for storage in get_cached_local_storages(self._tk):
+            storage_key = storage["code"].upper()
+            storage_lookup[storage_key] = ShotgunPath.from_shotgun_dict(storage)
+            log.debug(
+                "Added Shotgun Storage %s: %s"
+                % (storage_key, storage_lookup[storage_key])
+            )
 
-    # file urls can be on the following standard form:
-    #
-    # Std unix path
-    # /path/to/some/file.txt -> file:///path/to/some/file.txt
-    #
-    # >>> urlparse.urlparse("file:///path/to/some/file.txt")
-    # ParseResult(scheme='file', netloc='', path='/path/to/some/file.txt', params='', query='', fragment='')
-    #
-    # Windows UNC path
-    # \\laptop\My Documents\FileSchemeURIs.doc -> file://laptop/My%20Documents/FileSchemeURIs.doc
-    #
-    # >>> urlparse.urlparse("file://laptop/My%20Documents/FileSchemeURIs.doc")
-    # ParseResult(scheme='file', netloc='laptop', path='/My%20Documents/FileSchemeURIs.doc', params='', query='', fragment='')
-    #
-    # Windows path with drive letter
-    # C:\Documents and Settings\davris\FileSchemeURIs.doc -> file:///C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc
-    #
-    # >>> urlparse.urlparse("file:///C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc")
-    # ParseResult(scheme='file', netloc='', path='/C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc', params='', query='', fragment='')
-    #
-    # for information about Windows, see
-    # https://blogs.msdn.microsoft.com/ie/2006/12/06/file-uris-in-windows/
-
-    if parsed_url.netloc:
-        # unc path
-        resolved_path = urllib.parse.unquote(
-            "//%s%s" % (parsed_url.netloc, parsed_url.path)
+        # get default environment variable set
+        # note that this may generate a None/None/None entry
+        storage_lookup["_DEFAULT_ENV_VAR_OVERRIDE"] = ShotgunPath(
+            os.environ.get("SHOTGUN_PATH_WINDOWS"),
+            os.environ.get("SHOTGUN_PATH_LINUX"),
+            os.environ.get("SHOTGUN_PATH_MAC"),
         )
-    else:
-        resolved_path = urllib.parse.unquote(parsed_url.path)
-
-    # python returns drive letter paths incorrectly and need adjusting.
-    if re.match("^/[A-Za-z]:/", resolved_path):
-        resolved_path = resolved_path[1:]
-
-    # we now have one of the following three forms (with slashes):
-    # /path/to/file.ext
-    # d:/path/to/file.ext
-    # //share/path/to/file.ext
-    log.debug("Path extracted from url: '%s'" % resolved_path)
-
-    # create a lookup table of shotgun paths,
-    # keyed by upper case storage name
-    log.debug("Building cross-platform path resolution lookup table:")
-    storage_lookup = {}
-    for storage in get_cached_local_storages(tk):
-        storage_key = storage["code"].upper()
-        storage_lookup[storage_key] = ShotgunPath.from_shotgun_dict(storage)
         log.debug(
-            "Added Shotgun Storage %s: %s" % (storage_key, storage_lookup[storage_key])
+            "Added default env override: %s"
+            % storage_lookup["_DEFAULT_ENV_VAR_OVERRIDE"]
         )
 
-    # get default environment variable set
-    # note that this may generate a None/None/None entry
-    storage_lookup["_DEFAULT_ENV_VAR_OVERRIDE"] = ShotgunPath(
-        os.environ.get("SHOTGUN_PATH_WINDOWS"),
-        os.environ.get("SHOTGUN_PATH_LINUX"),
-        os.environ.get("SHOTGUN_PATH_MAC"),
-    )
-    log.debug(
-        "Added default env override: %s" % storage_lookup["_DEFAULT_ENV_VAR_OVERRIDE"]
-    )
-
-    # look for storage overrides
-    for env_var in os.environ.keys():
-        expr = re.match("^SHOTGUN_PATH_(WINDOWS|MAC|LINUX)_(.*)$", env_var)
-        if expr:
-            platform = expr.group(1)
-            storage_name = expr.group(2).upper()
-            log.debug(
-                "Added %s environment override for %s: %s"
-                % (platform, storage_name, os.environ[env_var])
+        # look for storage overrides
+        for env_var in os.environ.keys():
+            expr = re.match("^SHOTGUN_PATH_(WINDOWS|MAC|LINUX)_(.*)$", env_var)
+            if expr:
+                platform = expr.group(1)
+                storage_name = expr.group(2).upper()
+                log.debug(
+                    "Added %s environment override for %s: %s"
+                    % (platform, storage_name, os.environ[env_var])
+                )
+
+                if storage_name not in storage_lookup:
+                    # not in the lookup yet. Add it
+                    storage_lookup[storage_name] = ShotgunPath()
+
+                if platform == "WINDOWS":
+                    if storage_lookup[storage_name].windows:
+                        # this path was already defined by a sg local storage
+                        log.warning(
+                            "Discovered env var %s, however a Shotgun local storage already "
+                            "defines '%s' to be '%s'. Your environment override "
+                            "will be ignored."
+                            % (
+                                env_var,
+                                storage_name,
+                                storage_lookup[storage_name].windows,
+                            )
+                        )
+                    else:
+                        storage_lookup[storage_name].windows = os.environ[env_var]
+
+                elif platform == "MAC":
+                    if storage_lookup[storage_name].macosx:
+                        # this path was already defined by a sg local storage
+                        log.warning(
+                            "Discovered env var %s, however a Shotgun local storage already "
+                            "defines '%s' to be '%s'. Your environment override "
+                            "will be ignored."
+                            % (
+                                env_var,
+                                storage_name,
+                                storage_lookup[storage_name].macosx,
+                            )
+                        )
+                    else:
+                        storage_lookup[storage_name].macosx = os.environ[env_var]
+
+                else:
+                    if storage_lookup[storage_name].linux:
+                        # this path was already defined by a sg local storage
+                        log.warning(
+                            "Discovered env var %s, however a Shotgun local storage already "
+                            "defines '%s' to be '%s'. Your environment override "
+                            "will be ignored."
+                            % (
+                                env_var,
+                                storage_name,
+                                storage_lookup[storage_name].linux,
+                            )
+                        )
+                    else:
+                        storage_lookup[storage_name].linux = os.environ[env_var]
+
+        # precompute the lower case prefixes so that matching a url
+        # is only a matter of string comparisons.
+        self._url_storage_lookup = []
+        for storage, sg_path in storage_lookup.items():
+            self._url_storage_lookup.append(
+                (
+                    storage,
+                    sg_path,
+                    sg_path.windows.replace("\\", "/").lower()
+                    if sg_path.windows
+                    else None,
+                    sg_path.linux.lower() if sg_path.linux else None,
+                    sg_path.macosx.lower() if sg_path.macosx else None,
+                )
             )
+        return self._url_storage_lookup
 
-            if storage_name not in storage_lookup:
-                # not in the lookup yet. Add it
-                storage_lookup[storage_name] = ShotgunPath()
+    def _resolve_url_link(self, attachment_data):
+        """
+        Resolves the given url attachment into a local path.
+        For details, see :meth:`resolve_publish_path`.
 
-            if platform == "WINDOWS":
-                if storage_lookup[storage_name].windows:
-                    # this path was already defined by a sg local storage
-                    log.warning(
-                        "Discovered env var %s, however a Shotgun local storage already "
-                        "defines '%s' to be '%s'. Your environment override "
-                        "will be ignored."
-                        % (env_var, storage_name, storage_lookup[storage_name].windows)
-                    )
-                else:
-                    storage_lookup[storage_name].windows = os.environ[env_var]
+        :param attachment_data: Dictionary containing Shotgun publish data.
+            Needs to at least contain a code, type, id and a path key.
 
-            elif platform == "MAC":
-                if storage_lookup[storage_name].macosx:
-                    # this path was already defined by a sg local storage
-                    log.warning(
-                        "Discovered env var %s, however a Shotgun local storage already "
-                        "defines '%s' to be '%s'. Your environment override "
-                        "will be ignored."
-                        % (env_var, storage_name, storage_lookup[storage_name].macosx)
-                    )
-                else:
-                    storage_lookup[storage_name].macosx = os.environ[env_var]
+        :returns: A local path to file or file sequence.
 
-            else:
-                if storage_lookup[storage_name].linux:
-                    # this path was already defined by a sg local storage
-                    log.warning(
-                        "Discovered env var %s, however a Shotgun local storage already "
-                        "defines '%s' to be '%s'. Your environment override "
-                        "will be ignored."
-                        % (env_var, storage_name, storage_lookup[storage_name].linux)
-                    )
-                else:
-                    storage_lookup[storage_name].linux = os.environ[env_var]
-
-    # now see if the given url starts with any storage def in our setup
-    for storage, sg_path in storage_lookup.items():
-
-        # go through each storage, see if any of the os
-        # path defs for the storage matches the beginning of the
-        # url path. Compare lower case (most file systems are case preserving).
-        adjusted_path = None
-        if sg_path.windows and resolved_path.lower().startswith(
-            sg_path.windows.replace("\\", "/").lower()
-        ):
-            adjusted_path = sg_path.join(
-                resolved_path[len(sg_path.windows) :]
-            ).current_os
-
-        elif sg_path.linux and resolved_path.lower().startswith(sg_path.linux.lower()):
-            adjusted_path = sg_path.join(resolved_path[len(sg_path.linux) :]).current_os
-
-        elif sg_path.macosx and resolved_path.lower().startswith(
-            sg_path.macosx.lower()
-        ):
-            adjusted_path = sg_path.join(
-                resolved_path[len(sg_path.macosx) :]
-            ).current_os
-
-        if adjusted_path:
+        :raises: :class:`~sgtk.util.PublishPathNotSupported` if the path cannot be resolved.
+        """
+        if self._verbose:
             log.debug(
-                "Adjusted path '%s' -> '%s' based on override '%s' (%s)"
-                % (resolved_path, adjusted_path, storage, sg_path)
+                "Attempting to resolve url attachment data "
+                "into a local path: %s" % pprint.pformat(attachment_data)
+            )
+
+        # url data looks like this:
+        #
+        # {'content_type': None,
+        #  'id': 25828,
+        #  'link_type': 'web',
+        #  'name': 'toolkitty.jpg',
+        #  'type': 'Attachment',
+        #  'url': 'file:///C:/Users/Manne%20Ohrstrom/Downloads/toolkitty.jpg'},
+
+        parsed_url = urllib.parse.urlparse(attachment_data["url"])
+
+        # url = "file:///path/to/some/file.txt"
+        # ParseResult(
+        #   scheme='file',
+        #   netloc='',
+        #   path='/path/to/some/file.txt',
+        #   params='',
+        #   query='',
+        #   fragment=''
+        # )
+
+        if parsed_url.scheme != "file":
+            # we currently only support file:// style urls
+            raise PublishPathNotSupported(
+                "Cannot resolve unsupported url '%s' into a local path."
+                % attachment_data["url"]
             )
-            resolved_path = adjusted_path
-            break
 
-    # adjust native platform slashes
-    resolved_path = resolved_path.replace("/", os.path.sep)
-    log.debug("Converted %s -> %s" % (attachment_data["url"], resolved_path))
-    return resolved_path
+        # file urls can be on the following standard form:
+        #
+        # Std unix path
+        # /path/to/some/file.txt -> file:///path/to/some/file.txt
+        #
+        # >>> urlparse.urlparse("file:///path/to/some/file.txt")
+        # ParseResult(scheme='file', netloc='', path='/path/to/some/file.txt', params='', query='', fragment='')
+        #
+        # Windows UNC path
+        # \\laptop\My Documents\FileSchemeURIs.doc -> file://laptop/My%20Documents/FileSchemeURIs.doc
+        #
+        # >>> urlparse.urlparse("file://laptop/My%20Documents/FileSchemeURIs.doc")
+        # ParseResult(scheme='file', netloc='laptop', path='/My%20Documents/FileSchemeURIs.doc', params='', query='', fragment='')
+        #
+        # Windows path with drive letter
+        # C:\Documents and Settings\davris\FileSchemeURIs.doc -> file:///C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc
+        #
+        # >>> urlparse.urlparse("file:///C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc")
+        # ParseResult(scheme='file', netloc='', path='/C:/Documents%20and%20Settings/davris/FileSchemeURIs.doc', params='', query='', fragment='')
+        #
+        # for information about Windows, see
+        # https://blogs.msdn.microsoft.com/ie/2006/12/06/file-uris-in-windows/
+
+        if parsed_url.netloc:
+            # unc path
+            resolved_path = urllib.parse.unquote(
+                "//%s%s" % (parsed_url.netloc, parsed_url.path)
+            )
+        else:
+            resolved_path = urllib.parse.unquote(parsed_url.path)
+
+        # python returns drive letter paths incorrectly and need adjusting.
+        if re.match("^/[A-Za-z]:/", resolved_path):
+            resolved_path = resolved_path[1:]
+
+        # we now have one of the following three forms (with slashes):
+        # /path/to/file.ext
+        # d:/path/to/file.ext
+        # //share/path/to/file.ext
+        if self._verbose:
+            log.debug("Path extracted from url: '%s'" % resolved_path)
+
+        # now see if the given url starts with any storage def in our setup
+        lower_path = resolved_path.lower()
+        for (
+            storage,
+            sg_path,
+            windows_prefix,
+            linux_prefix,
+            mac_prefix,
+        ) in self._get_url_storage_lookup():
+
+            # go through each storage, see if any of the os
+            # path defs for the storage matches the beginning of the
+            # url path. Compare lower case (most file systems are case preserving).
+            adjusted_path = None
+            if windows_prefix and lower_path.startswith(windows_prefix):
+                adjusted_path = sg_path.join(
+                    resolved_path[len(sg_path.windows) :]
+                ).current_os
+
+            elif linux_prefix and lower_path.startswith(linux_prefix):
+                adjusted_path = sg_path.join(
+                    resolved_path[len(sg_path.linux) :]
+                ).current_os
+
+            elif mac_prefix and lower_path.startswith(mac_prefix):
+                adjusted_path = sg_path.join(
+                    resolved_path[len(sg_path.macosx) :]
+                ).current_os
+
+            if adjusted_path:
+                if self._verbose:
+                    log.debug(
+                        "Adjusted path '%s' -> '%s' based on override '%s' (%s)"
+                        % (resolved_path, adjusted_path, storage, sg_path)
+                    )
+                resolved_path = adjusted_path
+                break
+
+        # adjust native platform slashes
+        resolved_path = resolved_path.replace("/", os.path.sep)
+        if self._verbose:
+            log.debug("Converted %s -> %s" % (attachment_data["url"], resolved_path))
+        return resolved_path
@@ -9,10 +9,13 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 from __future__ import with_statement
+import json
 import os
+import shutil
 
 import sgtk
 from mock import patch, Mock
+from tank.util import pickle
 
 from sgtk.bootstrap import ToolkitManager
 
@@ -137,7 +140,13 @@ class TestFunctionality(ShotgunTestBase):
         class_attrs = set(dir(ToolkitManager))
         instance_attrs = set(dir(ToolkitManager()))
         unserializable_attrs = set(
-            ["_sg_connection", "_sg_user", "_pre_engine_start_callback", "_progress_cb"]
+            [
+                "_sg_connection",
+                "_sg_user",
+                "_pre_engine_start_callback",
+                "_progress_cb",
+                "_resolution_to_refresh",
+            ]
         )
         # Through this operation, we're taking all the symbols that are defined from an instance,
         # we then remove everything that is defined also in the class, which means we're left
@@ -235,6 +244,154 @@ class TestPrepareEngine(ShotgunTestBase):
         self.assertEqual(progress_cb.nb_exists_locally, 3)
 
 
+class TestPrefetch(ShotgunTestBase):
+    def setUp(self):
+        super(TestPrefetch, self).setUp({"primary_root_name": "primary"})
+        self.mgr = ToolkitManager(_MockedShotgunUser(self.mockgun, "larry"))
+        self.mgr.do_shotgun_config_lookup = False
+        self.mgr.plugin_id = "basic.farm"
+        self.mgr.base_configuration = {
+            "type": "path",
+            "path": os.path.join(self.fixtures_root, "bootstrap_tests", "config"),
+        }
+        self.fallback_root = os.path.join(self.tank_temp, "prefetch_fallback")
+
+    def test_prefetch(self):
+        """
+        Makes sure that prefetch caches the configuration and writes a marker.
+        """
+        self.mgr.bundle_cache_fallback_paths = [self.fallback_root]
+        marker_path = self.mgr.prefetch(self.project, engines=["test_engine"])
+
+        self.assertEqual(
+            marker_path,
+            os.path.join(
+                self.fallback_root,
+                "prefetch",
+                "basic.farm_Project_%d.json" % self.project["id"],
+            ),
+        )
+        with open(marker_path) as fh:
+            marker = json.load(fh)
+        self.assertEqual(marker["engines"], ["test_engine"])
+        self.assertEqual(marker["entity"]["id"], self.project["id"])
+        self.assertTrue(marker["configuration"].startswith("sgtk:descriptor:path?"))
+        # the engine, the app, the framework and the core.
+        self.assertEqual(len(marker["bundles"]), 4)
+
+        # the YAML cache is written next to the marker, for the files found
+        # in the fallback path.
+        yaml_cache_path = os.path.join(
+            self.fallback_root,
+            "prefetch",
+            "basic.farm_Project_%d.pickle" % self.project["id"],
+        )
+        self.assertEqual(marker["yaml_cache"], os.path.basename(yaml_cache_path))
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(marker_path))),
+            sorted([os.path.basename(marker_path), marker["yaml_cache"]]),
+        )
+        with open(yaml_cache_path, "rb") as fh:
+            cached_paths = [item.path for item in pickle.load(fh)]
+        manifest_paths = [path for path in cached_paths if path.endswith("info.yml")]
+        # the engine, the app, the framework and the core.
+        self.assertEqual(len(manifest_paths), 4)
+        # path descriptors aren't copied to the fallback path.
+        self.assertTrue(
+            any(
+                path.endswith(os.path.join("test_app", "info.yml"))
+                for path in cached_paths
+            )
+        )
+        self.assertIn(
+            os.path.join(self.mgr.base_configuration["path"], "env", "entity.yml"),
+            cached_paths,
+        )
+
+        # the local YAML cache of the configuration isn't written.
+        config_path = os.path.join(
+            self.tank_temp, "unit_test_mock_sg", "p1.basic.farm", "cfg"
+        )
+        self.assertFalse(os.path.exists(os.path.join(config_path, "yaml_cache.pickle")))
+
+        # configurations using the fallback path load the YAML cache.
+        with patch.object(
+            sgtk.util.yaml_cache.g_yaml_cache, "merge_cache_items"
+        ) as merge_mock:
+            sgtk.pipelineconfig.PipelineConfiguration(config_path)
+        self.assertEqual(
+            sorted(item.path for item in merge_mock.call_args[0][0]),
+            sorted(cached_paths),
+        )
+
+        # caches prefetched for other configurations are ignored.
+        other_yaml_cache_path = os.path.join(
+            self.fallback_root, "prefetch", "other.pickle"
+        )
+        shutil.copy(yaml_cache_path, other_yaml_cache_path)
+        marker["configuration"] = "sgtk:descriptor:path?path=/other/config"
+        marker["yaml_cache"] = os.path.basename(other_yaml_cache_path)
+        with open(
+            os.path.join(self.fallback_root, "prefetch", "other.json"), "w"
+        ) as fh:
+            json.dump(marker, fh)
+        with patch.object(
+            sgtk.pipelineconfig.PipelineConfiguration, "_merge_yaml_cache"
+        ) as merge_mock:
+            sgtk.pipelineconfig.PipelineConfiguration(config_path)
+        self.assertEqual(
+            [c[0][0] for c in merge_mock.call_args_list],
+            [os.path.join(config_path, "yaml_cache.pickle"), yaml_cache_path],
+        )
+
+    def test_prefetch_yaml_cache_paths(self):
+        """
+        Makes sure that the YAML cache of a prefetched configuration is keyed
+        to the copies of the files in the fallback path.
+        """
+        config_path = os.path.join(self.fallback_root, "git", "tk-config", "v1")
+        bundle_path = os.path.join(self.fallback_root, "app_store", "tk-app", "v1")
+        expected_paths = [
+            os.path.join(config_path, "env", "project.yml"),
+            os.path.join(bundle_path, "info.yml"),
+        ]
+        for path in expected_paths + [os.path.join(config_path, "README.md")]:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(path))
+            with open(path, "w") as fh:
+                fh.write("key: value\n")
+
+        def create_desc(path):
+            desc = Mock()
+            desc._io_descriptor._get_bundle_cache_path.return_value = path
+            return desc
+
+        yaml_cache_path = os.path.join(self.tank_temp, "prefetch_yaml_cache.pickle")
+        self.mgr._write_yaml_cache(
+            yaml_cache_path,
+            self.fallback_root,
+            create_desc(config_path),
+            [
+                create_desc(bundle_path),
+                # bundles which couldn't be downloaded are skipped.
+                create_desc(os.path.join(self.fallback_root, "missing")),
+            ],
+        )
+        with open(yaml_cache_path, "rb") as fh:
+            cached_paths = [item.path for item in pickle.load(fh)]
+        self.assertEqual(sorted(cached_paths), sorted(expected_paths))
+
+    def test_prefetch_without_fallback(self):
+        """
+        Makes sure that prefetch needs a fallback path to write to.
+        """
+        with temp_env_var(SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS=""):
+            self.mgr.bundle_cache_fallback_paths = []
+            with self.assertRaisesRegex(
+                sgtk.bootstrap.TankBootstrapError, "fallback path is needed"
+            ):
+                self.mgr.prefetch(self.project)
+
+
 class TestGetPipelineConfigs(TankTestBase):
     def setUp(self):
         super(TestGetPipelineConfigs, self).setUp()
@@ -13,13 +13,14 @@ from __future__ import with_statement
 import itertools
 import os
 import sys
+import time
 from mock import patch
 import sgtk
 from sgtk.util import ShotgunPath
 from tank_vendor.shotgun_api3.lib import sgsix
 
 from tank_test.tank_test_base import setUpModule  # noqa
-from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import TankTestBase, temp_env_var
 
 
 class TestResolverBase(TankTestBase):
@@ -1172,3 +1173,104 @@ class TestErrorHandling(TestResolverBase):
             self.resolver.resolve_shotgun_configuration(
                 pc_id, [], self.mockgun, "john.smith"
             )
+
+
+class TestResolutionCache(TestResolverBase):
+    """
+    Tests the cache of the configurations resolved from Shotgun.
+    """
+
+    def setUp(self):
+        super(TestResolutionCache, self).setUp()
+        self._pc = self._create_pc(
+            "Primary",
+            self._project,
+            plugin_ids="foo.*",
+            descriptor="sgtk:descriptor:app_store?version=v3.1.2&name=tk-config-test",
+        )
+
+    def _resolve(self):
+        """
+        Resolves the configuration from Shotgun.
+        """
+        return self.resolver.resolve_shotgun_configuration(
+            pipeline_config_identifier=None,
+            fallback_config_descriptor=self.config_1,
+            sg_connection=self.mockgun,
+            current_login="john.smith",
+        )
+
+    def test_cache_disabled(self):
+        """
+        Ensures Shotgun is queried every time when the cache is disabled.
+        """
+        self._resolve()
+        self.assertFalse(self.resolver.resolved_from_cache)
+        self._resolve()
+        self.assertFalse(self.resolver.resolved_from_cache)
+
+    def test_cached_resolution(self):
+        """
+        Ensures Shotgun isn't queried while the resolution is cached and
+        changes are picked up when refreshing.
+        """
+        with temp_env_var(SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL="3600"):
+            self._resolve()
+            self.assertFalse(self.resolver.resolved_from_cache)
+
+            with patch.object(
+                self.mockgun, "find", side_effect=Exception("Shotgun was queried.")
+            ):
+                config = self._resolve()
+            self.assertTrue(self.resolver.resolved_from_cache)
+            self.assertEqual(config._pipeline_config_id, self._pc["id"])
+            self.assertEqual(
+                config._descriptor.get_dict(),
+                {"name": "tk-config-test", "type": "app_store", "version": "v3.1.2"},
+            )
+
+            # nothing changed in Shotgun.
+            self.assertFalse(
+                self.resolver.refresh_shotgun_configuration(
+                    None, self.mockgun, "john.smith"
+                )
+            )
+
+            self.mockgun.update(
+                "PipelineConfiguration",
+                self._pc["id"],
+                {
+                    "descriptor": "sgtk:descriptor:app_store?version=v0.1.2&name=tk-config-test"
+                },
+            )
+            # the cached resolution is still used until refreshed.
+            self.assertEqual(self._resolve()._descriptor.get_version(), "v3.1.2")
+            self.assertTrue(
+                self.resolver.refresh_shotgun_configuration(
+                    None, self.mockgun, "john.smith"
+                )
+            )
+            self.assertEqual(self._resolve()._descriptor.get_version(), "v0.1.2")
+
+    def test_expired_resolution(self):
+        """
+        Ensures expired resolutions are not used.
+        """
+        with temp_env_var(SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL="3600"):
+            self._resolve()
+
+        with temp_env_var(SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL="3600"):
+            with patch("time.time", return_value=time.time() + 7200):
+                self._resolve()
+            self.assertFalse(self.resolver.resolved_from_cache)
+
+    def test_fallback_resolution(self):
+        """
+        Ensures falling back to the base configuration is cached.
+        """
+        self.mockgun.delete("PipelineConfiguration", self._pc["id"])
+        with temp_env_var(SHOTGUN_CONFIG_RESOLUTION_CACHE_TTL="3600"):
+            self._resolve()
+            config = self._resolve()
+            self.assertTrue(self.resolver.resolved_from_cache)
+            self.assertEqual(config._descriptor.get_dict(), self.config_1)
@@ -15,6 +15,7 @@ import copy
 import datetime
 from sgtk.util import pickle
 import json
+import sqlite3
 
 from tank_test.tank_test_base import TankTestBase, setUpModule  # noqa
 
@@ -1168,6 +1169,100 @@ class TestAsTemplateFields(TestContext):
         template = TemplatePath(template_def, self.keys, self.project_root, self.shot)
         ctx.as_template_fields(template, validate=False)
 
+    def test_fields_are_memoised(self):
+        """
+        Ensures fields are only computed once per template and validate flag
+        and that callers can't alter the memoised values.
+        """
+        with patch.object(
+            context.Context,
+            "_template_fields_from_context",
+            autospec=True,
+            side_effect=context.Context._template_fields_from_context,
+        ) as compute_mock:
+            fields = self.ctx.as_template_fields(self.template)
+            fields["Shot"] = "modified"
+            self.assertEqual(
+                self.ctx.as_template_fields(self.template),
+                {"Sequence": "Seq", "Shot": "shot_code", "Step": "step_short_name"},
+            )
+            self.assertEqual(compute_mock.call_count, 1)
+
+            # The validate flag is part of the key.
+            self.ctx.as_template_fields(self.template, validate=True)
+            self.assertEqual(compute_mock.call_count, 2)
+
+            # So is the template.
+            other_template = TemplatePath(
+                "/sequence/{Sequence}/{Shot}/{Step}/work", self.keys, self.project_root
+            )
+            self.ctx.as_template_fields(other_template)
+            self.assertEqual(compute_mock.call_count, 3)
+
+            # A copy of the context doesn't share the memo.
+            copy.deepcopy(self.ctx).as_template_fields(self.template)
+            self.assertEqual(compute_mock.call_count, 4)
+
+    def test_memo_invalidated_by_path_cache(self):
+        """
+        Ensures memoised fields are recomputed when the path cache changes.
+        """
+        other_shot = {
+            "type": "Shot",
+            "code": "shot_other",
+            "id": 16,
+            "sg_sequence": self.seq,
+            "project": self.project,
+        }
+        test_ctx = context.Context(
+            self.tk, project=self.project, entity=other_shot, step=self.step
+        )
+        other_shot_path = os.path.join(self.seq_path, "shot_other")
+        self.add_production_path(other_shot_path, other_shot)
+        self.assertEqual(
+            test_ctx.as_template_fields(self.template),
+            {"Sequence": "Seq", "Shot": "shot_other"},
+        )
+
+        # Create the step folder for the shot, the memo should be discarded.
+        path_cache_location = tank.path_cache.PathCache.get_location(self.tk)
+        generation = tank.path_cache.PathCache.get_generation(path_cache_location)
+        self.add_production_path(
+            os.path.join(other_shot_path, "step_short_name"), self.step
+        )
+        self.assertNotEqual(
+            tank.path_cache.PathCache.get_generation(path_cache_location), generation
+        )
+        self.assertEqual(
+            test_ctx.as_template_fields(self.template),
+            {"Sequence": "Seq", "Shot": "shot_other", "Step": "step_short_name"},
+        )
+
+    def test_memo_invalidated_by_other_connection(self):
+        """
+        Ensures memoised fields are recomputed when the path cache database is
+        modified outside of the PathCache API, e.g. by another process.
+        """
+        path_cache_location = tank.path_cache.PathCache.get_location(self.tk)
+        with patch.object(
+            self.ctx,
+            "_template_fields_from_context",
+            wraps=self.ctx._template_fields_from_context,
+        ) as compute_mock:
+            self.ctx.as_template_fields(self.template)
+            self.ctx.as_template_fields(self.template)
+            self.assertEqual(compute_mock.call_count, 1)
+
+            connection = sqlite3.connect(path_cache_location)
+            try:
+                connection.execute("INSERT INTO event_log_sync(last_id) VALUES(42)")
+                connection.commit()
+            finally:
+                connection.close()
+
+            self.ctx.as_template_fields(self.template)
+            self.assertEqual(compute_mock.call_count, 2)
+
 
 class TestSerialize(TestContext):
     def setUp(self):
@@ -11,6 +11,8 @@
 
 import os
 import copy
+import logging
+import threading
 
 import sgtk
 from mock import patch
@@ -70,3 +72,137 @@ class TestLogManager(ShotgunTestBase):
             manager.base_file_handler.flush()
 
         assert handle_error_mock.call_count == 0
+
+
+class TestAsyncFileLogging(ShotgunTestBase):
+    """Tests the asynchronous mode of the base file handler."""
+
+    def setUp(self):
+        super(TestAsyncFileLogging, self).setUp()
+        self.manager = sgtk.log.LogManager()
+        self.log_file = os.path.join(self.tank_temp, "async_logging.log")
+
+        # restore the handler the test suite is logging to once done, if any.
+        previous_log_file = self.manager.log_file
+        if previous_log_file is not None:
+            self.addCleanup(
+                self.manager.initialize_base_file_handler_from_path, previous_log_file
+            )
+        else:
+            self.addCleanup(self.manager.uninitialize_base_file_handler)
+        self.addCleanup(setattr, self.manager, "async_file_logging", False)
+
+        self.manager.async_file_logging = True
+        self.manager.initialize_base_file_handler_from_path(self.log_file)
+        self.logger = sgtk.LogManager.get_logger("async_logging_test")
+
+    def _read_log(self):
+        """
+        :returns: The content of the log file, once all records are written.
+        """
+        self.manager.base_file_handler.flush()
+        with open(self.log_file, "rb") as fh:
+            return fh.read().decode("utf-8")
+
+    def test_records_written(self):
+        """
+        Ensures records emitted from several threads all make it to disk,
+        with their arguments and exceptions.
+        """
+        self.assertIsInstance(
+            self.manager.base_file_handler, sgtk.log.LogManager._AsyncFileHandler
+        )
+
+        def log_messages(thread_id):
+            for i in range(100):
+                self.logger.warning("thread %d message %d", thread_id, i)
+
+        threads = [threading.Thread(target=log_messages, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        try:
+            raise ValueError("async exception")
+        except ValueError:
+            self.logger.exception("caught it")
+
+        content = self._read_log()
+        for thread_id in range(4):
+            for i in range(100):
+                self.assertIn("thread %d message %d" % (thread_id, i), content)
+        self.assertIn("caught it", content)
+        self.assertIn("ValueError: async exception", content)
+
+    def test_mutable_arguments(self):
+        """
+        Ensures records capture their arguments at the time they are emitted.
+        """
+        data = ["before"]
+        self.logger.warning("data is %s", data)
+        data[0] = "after"
+        self.assertIn("data is ['before']", self._read_log())
+
+    def test_emit_does_not_block(self):
+        """
+        Ensures emitting records doesn't wait on the file being written
+        and that records are dropped when the queue is full.
+        """
+        target = sgtk.log.LogManager._SafeRotatingFileHandler(
+            os.path.join(self.tank_temp, "blocked_logging.log")
+        )
+        write_event = threading.Event()
+        original_emit_batch = target.emit_batch
+
+        def blocked_emit_batch(records):
+            write_event.wait()
+            original_emit_batch(records)
+
+        target.emit_batch = blocked_emit_batch
+
+        with patch.object(
+            sgtk.log.LogManager._AsyncFileHandler, "MAXIMUM_QUEUE_SIZE", 10
+        ):
+            handler = sgtk.log.LogManager._AsyncFileHandler(target)
+        self.addCleanup(handler.close)
+
+        logger = logging.getLogger("async_logging_test_blocked")
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        for i in range(50):
+            logger.warning("message %d", i)
+        self.assertTrue(handler._dropped_count > 0)
+
+        write_event.set()
+        handler.flush()
+        with open(target.baseFilename) as fh:
+            self.assertIn("message 0", fh.read())
+
+    def test_rotation(self):
+        """
+        Ensures the log file is still rotated.
+        """
+        self.manager.base_file_handler.target.maxBytes = 1024
+        for i in range(200):
+            self.logger.warning("rotating message %d", i)
+        self._read_log()
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+        self.assertIn("rotating message 199", self._read_log())
+
+    def test_toggle(self):
+        """
+        Ensures toggling the mode switches the handler type on the fly.
+        """
+        self.manager.async_file_logging = False
+        self.assertIsInstance(
+            self.manager.base_file_handler,
+            sgtk.log.LogManager._SafeRotatingFileHandler,
+        )
+        self.assertEqual(self.manager.log_file, self.log_file)
+        self.manager.async_file_logging = True
+        self.assertIsInstance(
+            self.manager.base_file_handler, sgtk.log.LogManager._AsyncFileHandler
+        )
@@ -118,6 +118,25 @@ class TestInit(TestPathCache):
         column_names = [x[1] for x in ret.fetchall()]
         self.assertEqual(expected, column_names)
 
+    def test_nocase_index_upgrade(self):
+        """
+        Test that the index used for subtree lookups is added to existing
+        databases.
+        """
+        self.path_cache._connection.execute("DROP INDEX path_cache_path_nocase")
+        self.path_cache._connection.commit()
+        pc = path_cache.PathCache(self.tk)
+        try:
+            index_names = [
+                x[0]
+                for x in pc._connection.execute(
+                    "SELECT name FROM main.sqlite_master WHERE type='index'"
+                )
+            ]
+        finally:
+            pc.close()
+        self.assertIn("path_cache_path_nocase", index_names)
+
     def test_db_location(self):
         """
         Ensure the path cache
@@ -393,6 +412,86 @@ class TestAddMapping(TestPathCache):
         self.assertEqual(entity_name, entry[0])
 
 
+class TestFolderTree(TestPathCache):
+    """
+    Tests subtree lookups in the path cache.
+    """
+
+    def setUp(self):
+        super(TestFolderTree, self).setUp()
+        self.seq_path = os.path.join(self.project_root, "seq_1")
+        self.items = [
+            ({"type": "Sequence", "id": 1, "name": "seq_1"}, self.seq_path),
+            (
+                {"type": "Shot", "id": 1, "name": "shot_a"},
+                os.path.join(self.seq_path, "shot_a"),
+            ),
+            (
+                {"type": "Shot", "id": 2, "name": "shot_b"},
+                os.path.join(self.seq_path, "shot_b", "deep"),
+            ),
+            # siblings sharing the prefix, matched by a LIKE "seq_1/%" pattern
+            # for "seq%1" and sorting next to the subtree.
+            ({"type": "Sequence", "id": 2, "name": "seq_10"}, self.seq_path + "0"),
+            (
+                {"type": "Sequence", "id": 3, "name": "seq%1"},
+                os.path.join(self.project_root, "seq%1"),
+            ),
+            (
+                {"type": "Shot", "id": 3, "name": "shot_c"},
+                os.path.join(self.project_root, "seq%1", "shot_c"),
+            ),
+            ({"type": "Sequence", "id": 4, "name": "seq_1-b"}, self.seq_path + "-b"),
+        ]
+        for (entity, path) in self.items:
+            add_item_to_cache(self.path_cache, entity, path)
+
+    def test_get_folder_tree_from_path(self):
+        """
+        Tests that only the path and the paths below it are returned.
+        """
+        tree = self.path_cache.get_folder_tree_from_path(self.seq_path)
+        self.assertEqual(
+            [(x["entity"], x["path"]) for x in tree], self.items[:3],
+        )
+        self.assertTrue(all(x["primary"] for x in tree))
+
+        tree = self.path_cache.get_folder_tree_from_path(
+            os.path.join(self.project_root, "seq%1")
+        )
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(self.path_cache.get_folder_tree_from_path("/not/here"), [])
+
+    def test_get_folder_tree_ignores_case(self):
+        """
+        Tests that paths differing only by case are part of the tree, like
+        they were when matched with LIKE.
+        """
+        entity = {"type": "Shot", "id": 4, "name": "shot_d"}
+        path = os.path.join(self.project_root, "SEQ_1", "shot_d")
+        add_item_to_cache(self.path_cache, entity, path)
+
+        tree = self.path_cache.get_folder_tree_from_path(self.seq_path)
+        self.assertIn((entity, path), [(x["entity"], x["path"]) for x in tree])
+        self.assertEqual(len(tree), 4)
+
+    def test_subtree_query_uses_index(self):
+        """
+        Tests that the subtree query doesn't scan the whole table.
+        """
+        (lower_bound, upper_bound) = self.path_cache._get_subtree_bounds("/seq_1")
+        cursor = self.path_cache._connection.cursor()
+        plan = " ".join(
+            str(x)
+            for x in cursor.execute(
+                "EXPLAIN QUERY PLAN SELECT path FROM path_cache "
+                "WHERE root = ? AND path >= ? COLLATE NOCASE AND path < ? COLLATE NOCASE",
+                ("primary", lower_bound, upper_bound),
+            )
+        )
+        self.assertIn("path_cache_path_nocase", plan)
+
+
 class TestGetEntity(TestPathCache):
     """
     Tests for get_entity.
@@ -683,6 +782,88 @@ class TestShotgunSync(TankTestBase):
         )
         self.assertEqual(len(folder_events), 2)
 
+    def _count_event_log_queries(self, find_mock):
+        return len([c for c in find_mock.call_args_list if c[0][0] == "EventLogEntry"])
+
+    def test_sync_max_age(self):
+        """
+        Tests that recent syncs are not carried out again when a maximum age
+        is specified.
+        """
+        pc = tank.path_cache.PathCache(self.tk)
+        try:
+            pc.synchronize()
+            last_sync_time = pc.get_last_sync_time()
+            self.assertIsNotNone(last_sync_time)
+
+            with patch.object(
+                self.tk.shotgun, "find", wraps=self.tk.shotgun.find
+            ) as find_mock:
+                # recent enough, nothing is queried
+                self.assertEqual(pc.synchronize(max_age=3600), [])
+                self.assertEqual(self._count_event_log_queries(find_mock), 0)
+                self.assertEqual(pc.get_last_sync_time(), last_sync_time)
+
+                # too old, the sync happens. Nothing changed in Shotgun so
+                # the database is left untouched.
+                generation = tank.path_cache.PathCache.get_generation(
+                    pc._get_path_cache_location()
+                )
+                pc.synchronize(max_age=0)
+                self.assertEqual(self._count_event_log_queries(find_mock), 1)
+                self.assertGreaterEqual(pc.get_last_sync_time(), last_sync_time)
+                self.assertEqual(
+                    tank.path_cache.PathCache.get_generation(
+                        pc._get_path_cache_location()
+                    ),
+                    generation,
+                )
+        finally:
+            pc.close()
+
+        # folder creation skips the sync when the env var allows it
+        with temp_env_var(**{constants.PATH_CACHE_SYNC_MAX_AGE_ENV_VAR: "3600"}):
+            self.assertEqual(tank.path_cache.PathCache.get_sync_max_age(), 3600)
+            with patch.object(
+                self.tk.shotgun, "find", wraps=self.tk.shotgun.find
+            ) as find_mock:
+                folder.process_filesystem_structure(
+                    self.tk,
+                    self.seq["type"],
+                    self.seq["id"],
+                    preview=False,
+                    engine=None,
+                )
+                self.assertEqual(self._count_event_log_queries(find_mock), 0)
+
+        with temp_env_var(**{constants.PATH_CACHE_SYNC_MAX_AGE_ENV_VAR: "foo"}):
+            self.assertIsNone(tank.path_cache.PathCache.get_sync_max_age())
+
+    def test_sync_service(self):
+        """
+        Tests that the sync service synchronizes in the background.
+        """
+        service = folder.PathCacheSyncService(self.tk, interval=0.01)
+        with patch.object(
+            folder.folder_io.FolderIOReceiver, "sync_path_cache", return_value=[]
+        ) as sync_mock:
+            service.start()
+            try:
+                for i in range(500):
+                    if service.sync_count >= 2:
+                        break
+                    time.sleep(0.01)
+                self.assertTrue(service.is_running)
+            finally:
+                service.stop()
+            self.assertFalse(service.is_running)
+            self.assertGreaterEqual(service.sync_count, 2)
+            sync_mock.assert_called_with(self.tk, False)
+
+            # errors don't stop the service
+            sync_mock.side_effect = Exception("Failing on purpose.")
+            self.assertIsNone(service.synchronize())
+
     def test_incremental_sync(self):
         """Tests that the incremental sync kicks in when possible."""
 
@@ -1432,6 +1613,164 @@ class TestPathCacheBatchOperation(TankTestBase):
         record_count = list(cursor.execute("select count(*) from shotgun_status"))[0][0]
         self.assertEqual(record_count, 3)
 
+    def _make_mappings(self, count):
+        """
+        Creates mappings for shots, each with a secondary sequence entity.
+        """
+        data = []
+        for idx in range(count):
+            path = os.path.join(self.project_root, "shots", "shot_%s" % idx)
+            shot = {"type": "Shot", "id": idx, "name": "shot_%s" % idx}
+            seq = {"type": "Sequence", "id": idx % 3, "name": "seq_%s" % (idx % 3)}
+            data.append({"entity": shot, "path": path, "primary": True, "metadata": {}})
+            data.append({"entity": seq, "path": path, "primary": False, "metadata": {}})
+        return data
+
+    def test_batched_add_mappings(self):
+        """
+        Tests that mappings are validated and added in bulk and uploaded to
+        Shotgun in chunks.
+        """
+        self._pc.SHOTGUN_ENTITY_CREATE_BATCH_SIZE = 11
+        data = self._make_mappings(25)
+        # duplicates within the data are only added once
+        data.extend(self._make_mappings(2))
+
+        with patch.object(
+            self.tk.shotgun, "batch", wraps=self.tk.shotgun.batch
+        ) as batch_mock:
+            self._pc.validate_mappings(data)
+            self._pc.add_mappings(data, "Shot", list(range(25)))
+            # 50 new entries in chunks of 11
+            self.assertEqual(batch_mock.call_count, 5)
+
+            cursor = self._pc._connection.cursor()
+            self.assertEqual(
+                list(
+                    cursor.execute(
+                        "select count(*) from path_cache "
+                        "where entity_type in ('Shot', 'Sequence')"
+                    )
+                )[0][0],
+                50,
+            )
+            self.assertEqual(
+                list(
+                    cursor.execute(
+                        "select count(*) from shotgun_status s "
+                        "join path_cache p on p.rowid = s.path_cache_id "
+                        "where p.entity_type in ('Shot', 'Sequence')"
+                    )
+                )[0][0],
+                50,
+            )
+
+            # nothing new to add the second time around
+            self._pc.validate_mappings(data)
+            self._pc.add_mappings(data, "Shot", list(range(25)))
+            self.assertEqual(batch_mock.call_count, 5)
+
+        self.assertEqual(
+            self._pc.get_entity(data[2]["path"]),
+            {"type": "Shot", "id": 1, "name": "shot_1"},
+        )
+        self.assertEqual(
+            self._pc.get_secondary_entities(data[2]["path"]),
+            [{"type": "Sequence", "id": 1, "name": "seq_1"}],
+        )
+
+    def test_batched_add_mappings_conflicts(self):
+        """
+        Tests that conflicting mappings are detected by validation and that
+        nothing is added when they are detected while adding.
+        """
+        self._pc.add_mappings(self._make_mappings(3), "Shot", [0, 1, 2])
+
+        # the path of shot_0 is already associated with another shot
+        data = self._make_mappings(5)
+        data[0]["entity"] = {"type": "Shot", "id": 10, "name": "shot_10"}
+        self.assertRaisesRegex(
+            tank.TankError,
+            "already associated with Shot 'shot_0'",
+            self._pc.validate_mappings,
+            data,
+        )
+
+        # shot_1 already has a folder next to the one being registered
+        data = self._make_mappings(5)
+        data[2]["path"] = os.path.join(self.project_root, "shots", "renamed")
+        self.assertRaisesRegex(
+            tank.TankError,
+            "cannot be created because another path",
+            self._pc.validate_mappings,
+            data,
+        )
+
+        # two entities for the same path in the data itself
+        data = self._make_mappings(5)
+        data[8]["path"] = data[6]["path"]
+        self.assertRaisesRegex(
+            tank.TankError,
+            "Database concurrency problems",
+            self._pc.add_mappings,
+            data,
+            "Shot",
+            list(range(5)),
+        )
+        cursor = self._pc._connection.cursor()
+        self.assertEqual(
+            list(
+                cursor.execute(
+                    "select count(*) from path_cache "
+                    "where entity_type in ('Shot', 'Sequence')"
+                )
+            )[0][0],
+            6,
+        )
+
+    def test_batched_add_mappings_concurrent_insert(self):
+        """
+        Tests that mappings inserted by another process after the existing
+        mappings were retrieved are not reported as added.
+        """
+
+        class CursorWithConcurrentInsert(object):
+            """
+            Cursor inserting the first path cache row twice, as if another
+            process had inserted it right before.
+            """
+
+            def __init__(self, cursor):
+                self._cursor = cursor
+                self._inserted = False
+
+            def __getattr__(self, name):
+                return getattr(self._cursor, name)
+
+            def execute(self, sql, *args):
+                if not self._inserted and "INSERT OR IGNORE INTO path_cache" in sql:
+                    self._inserted = True
+                    self._cursor.execute(sql, *args)
+                return self._cursor.execute(sql, *args)
+
+        data = self._make_mappings(2)
+        cursor = CursorWithConcurrentInsert(self._pc._connection.cursor())
+        try:
+            added = self._pc._add_db_mappings(cursor, data)
+        finally:
+            self._pc._drop_mappings_table(cursor)
+        self.assertEqual(added, data[1:])
+        for mapping in added:
+            self.assertEqual(
+                list(
+                    cursor.execute(
+                        "select entity_type, entity_id from path_cache where rowid = ?",
+                        (mapping["path_cache_row_id"],),
+                    )
+                ),
+                [(mapping["entity"]["type"], mapping["entity"]["id"])],
+            )
+
     @patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find")
     def test_full_shotgun_retrieval(self, find_mock):
         """
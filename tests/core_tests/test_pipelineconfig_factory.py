@@ -18,7 +18,6 @@ from tank.errors import TankInitError
 from sgtk.util import ShotgunPath
 from tank_test.tank_test_base import TankTestBase, ShotgunTestBase, setUpModule  # noqa
 from mock import patch
-import tank_vendor.six.moves.cPickle as pickle
 from tank_vendor.shotgun_api3.lib import sgsix
 
 
@@ -461,6 +460,36 @@ class TestPipelineConfigurationEnumeration(ShotgunTestBase):
         # Only site-wide should match. project specific should not since they are for another project.
         self.assertEqual(pcs, [self.site_wide_path, self.site_wide_desc])
 
+    def test_project_path_index(self):
+        """
+        Makes sure project roots are indexed once per cache load and that only
+        the project root and its children match.
+        """
+        project_root = os.path.join(
+            self.primary_storage["windows_path"], "with_tank_name"
+        )
+        data = sgtk.pipelineconfig_factory._get_pipeline_configs(False)
+        # the cache isn't loaded again from disk unless it changes.
+        self.assertIs(sgtk.pipelineconfig_factory._get_pipeline_configs(False), data)
+
+        with patch(
+            "tank.pipelineconfig_factory._build_project_path_index",
+            wraps=sgtk.pipelineconfig_factory._build_project_path_index,
+        ) as build_mock:
+            for path, num_pcs in [
+                (project_root, 4),
+                (os.path.join(project_root, "sequences", "seq_1"), 4),
+                (project_root.upper(), 4),
+                (project_root + "_other", 0),
+                (self.primary_storage["windows_path"], 0),
+            ]:
+                pcs = sgtk.pipelineconfig_factory._get_pipeline_configs_for_path(
+                    path, data
+                )
+                self.assertEqual(len(pcs), num_pcs)
+
+        self.assertEqual(build_mock.call_count, 1)
+
     def test_get_pipeline_configs_for_project(self):
         """
         Makes sure _get_pipeline_configs_for_project can match a path to the right list of possible pipelines.
@@ -515,15 +544,13 @@ class TestLookupCache(ShotgunTestBase):
             sgtk.pipelineconfig_factory._get_pipeline_configs(False)
             self.assertFalse(mock.called)
 
-            cache_data = sgtk.pipelineconfig_factory._load_lookup_cache()
             # The new paths_v2 sections should be in there.
-            self.assertIn("paths_v2", cache_data)
+            self.assertIsNotNone(
+                sgtk.pipelineconfig_factory._load_lookup_cache("paths_v2")
+            )
 
             # Remove the paths
-            cache_data.pop("paths_v2")
-
-            with open(sgtk.pipelineconfig_factory._get_cache_location(), "wb") as fh:
-                pickle.dump(cache_data, fh)
+            os.remove(sgtk.pipelineconfig_factory._get_cache_location("paths_v2"))
 
             # Do not force read from Shotgun, but since the cache is not present
             # it should be loaded from Shotgun.
@@ -531,6 +558,74 @@ class TestLookupCache(ShotgunTestBase):
             sgtk.pipelineconfig_factory._get_pipeline_configs(False)
             self.assertTrue(mock.called)
 
+    def test_corrupt_cache(self):
+        """
+        Ensures a corrupt cache is read again from Shotgun and that keys are
+        cached independently.
+        """
+        sgtk.pipelineconfig_factory._add_to_lookup_cache("Shot_1", 123)
+        sgtk.pipelineconfig_factory._get_pipeline_configs(True)
+
+        with open(
+            sgtk.pipelineconfig_factory._get_cache_location("paths_v2"), "wb"
+        ) as fh:
+            fh.write(b"corrupt")
+        self.assertIsNone(sgtk.pipelineconfig_factory._load_lookup_cache("paths_v2"))
+        self.assertEqual(sgtk.pipelineconfig_factory._load_lookup_cache("Shot_1"), 123)
+
+        data = sgtk.pipelineconfig_factory._get_pipeline_configs(False)
+        self.assertEqual(
+            [pc["id"] for pc in data["pipeline_configurations"]],
+            [self.sg_pc_entity["id"]],
+        )
+        # no temporary files are left behind.
+        self.assertEqual(
+            sorted(os.listdir(sgtk.pipelineconfig_factory._get_cache_location())),
+            ["Shot_1.cache", "paths_v2.cache", "paths_v2.cache.lock"],
+        )
+
+    def test_incremental_refresh(self):
+        """
+        Ensures refreshing the cache only reads what was updated from Shotgun.
+        """
+        data = sgtk.pipelineconfig_factory._get_pipeline_configs(True)
+        self.assertIsNotNone(data["updated_at"])
+
+        new_pc = self.mockgun.create(
+            "PipelineConfiguration",
+            {"code": "New", "project": self.project, "linux_path": "/new"},
+        )
+        self.mockgun.update(
+            "Project", self.project["id"], {"tank_name": "renamed_project"}
+        )
+
+        with patch.object(self.mockgun, "find", wraps=self.mockgun.find) as find_mock:
+            data = sgtk.pipelineconfig_factory._get_pipeline_configs(True)
+
+        # entities are only read in full if they were updated.
+        for args, _ in find_mock.call_args_list:
+            entity_type, filters = args[:2]
+            fields = args[2] if len(args) > 2 else ["id"]
+            if entity_type != "LocalStorage" and fields != ["id"]:
+                self.assertEqual(filters[-1][:2], ["updated_at", "greater_than"])
+
+        self.assertEqual(
+            [pc["id"] for pc in data["pipeline_configurations"]],
+            [self.sg_pc_entity["id"], new_pc["id"]],
+        )
+        self.assertEqual(
+            data["projects"][self.project["id"]]["tank_name"], "renamed_project"
+        )
+
+        # deleted entities are dropped.
+        self.mockgun.delete("PipelineConfiguration", new_pc["id"])
+        data = sgtk.pipelineconfig_factory._get_pipeline_configs(True)
+        self.assertEqual(
+            [pc["id"] for pc in data["pipeline_configurations"]],
+            [self.sg_pc_entity["id"]],
+        )
+        self.assertEqual(sgtk.pipelineconfig_factory._get_pipeline_configs(False), data)
+
 
 class TestTankFromWithSiteConfig(TankTestBase):
     """
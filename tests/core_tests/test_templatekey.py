@@ -39,6 +39,36 @@ class TestTemplateKey(ShotgunTestBase):
         sk.default = "%03d"
         self.assertEqual(sk.default, "%03d")
 
+    def test_case_insensitive_constraints(self):
+        """
+        Makes sure choices and exclusions are compared without case, whatever
+        their type.
+        """
+        key = StringKey("field_name", choices=["Ma", "mb"])
+        self.assertTrue(key.validate("MA"))
+        self.assertTrue(key.validate("Mb"))
+        self.assertFalse(key.validate("obj"))
+        self.assertIn("not in choices", key._last_error)
+
+        key = StringKey("field_name", exclusions=["Seq", "shot"])
+        self.assertFalse(key.validate("SHOT"))
+        self.assertIn("is forbidden", key._last_error)
+
+        key = IntegerKey("field_name", exclusions=[3])
+        self.assertTrue(key.validate("2"))
+        self.assertFalse(key.validate(3))
+        self.assertFalse(key.validate("3"))
+
+    def test_copied_key_validation(self):
+        """
+        Makes sure a copy of a key reports validation errors on itself.
+        """
+        key = StringKey("field_name", choices=["a", "b"], length=1)
+        key_copy = copy.deepcopy(key)
+        self.assertFalse(key_copy.validate("c"))
+        self.assertEqual(key._last_error, "")
+        self.assertIn("not in choices", key_copy._last_error)
+
 
 class TestStringKey(ShotgunTestBase):
     def setUp(self):
@@ -1284,3 +1314,39 @@ class TestTimestampKey(ShotgunTestBase):
         key = TimestampKey("datetime", default=self._datetime_string)
         # Convert to a string and compare the result.
         self.assertEqual(key.str_from_value(None), self._datetime_string)
+
+
+class TestKeyValidationPrecomputation(ShotgunTestBase):
+    """
+    Tests that the work which doesn't depend on the value validated is done
+    once, when keys are created.
+    """
+
+    VALID_VALUES = [
+        (StringKey("name"), "main"),
+        (StringKey("name", filter_by="alphanumeric"), "main"),
+        (StringKey("name", choices=["ma", "mb", "nk", "hip"]), "hip"),
+        (StringKey("name", exclusions=["Seq", "Shot"]), "shot_010"),
+        (StringKey("name", subset="([A-Z])[a-z]* ([A-Z])[a-z]*"), "John Smith"),
+        (IntegerKey("version", format_spec="03"), "012"),
+        (IntegerKey("version"), "12"),
+        (SequenceKey("frame", format_spec="04"), "0101"),
+        (SequenceKey("frame", format_spec="04"), "%04d"),
+        (SequenceKey("frame", format_spec="04"), "FORMAT: $F"),
+        (SequenceKey("frame", format_spec="04"), "[1001-1100]"),
+        (TimestampKey("time"), "2015-06-24-21-20-30"),
+    ]
+
+    def test_no_error_message_for_valid_values(self):
+        """
+        Makes sure no error message is built when validating valid values.
+        """
+        for key, value in self.VALID_VALUES:
+            key._last_error = ""
+            with patch.object(
+                SequenceKey,
+                "_get_error_message",
+                side_effect=AssertionError("Error message built for %r" % value),
+            ):
+                self.assertTrue(key.validate(value))
+            self.assertEqual(key._last_error, "")
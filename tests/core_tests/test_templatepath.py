@@ -626,6 +626,38 @@ class TestApplyFields(TestTemplatePath):
         fields["frame"] = "FORMAT:#"
         self.assertEqual(expected, template.apply_fields(fields))
 
+    def test_repeated_key(self):
+        """
+        Test that a key used several times in a definition gets the same value
+        everywhere, even when its default changes every time it is evaluated.
+        """
+        names = []
+
+        def get_name():
+            names.append("name_%d" % len(names))
+            return names[-1]
+
+        keys = {"Shot": self.keys["Shot"], "name": StringKey("name", default=get_name)}
+        template = TemplatePath("{Shot}/{name}/{Shot}_{name}.ma", keys, "")
+
+        result = template.apply_fields({"Shot": "s2"})
+        expected = os.path.join("s2", names[-1], "s2_%s.ma" % names[-1])
+        self.assertEqual(expected, result)
+
+    def test_frames(self):
+        """
+        Test applying fields repeatedly, changing a single field each time.
+        """
+        definition = "shots/{Shot}[.{branch}]/{Shot}.{frame}.exr"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        fields = {"Shot": "s1"}
+        for frame in range(1, 1001):
+            fields["frame"] = frame
+            expected = os.path.join(
+                self.project_root, "shots", "s1", "s1.%04d.exr" % frame
+            )
+            self.assertEqual(expected, template.apply_fields(fields))
+
 
 class Test_ApplyFields(TestTemplatePath):
     """Tests for private TemplatePath._apply_fields"""
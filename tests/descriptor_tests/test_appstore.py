@@ -16,10 +16,13 @@ from __future__ import with_statement
 
 import os
 import json
+import threading
+import time
 
 from mock import patch
 
 from tank_test.tank_test_base import ShotgunTestBase, setUpModule  # noqa
+from tank_test.tank_test_base import temp_env_var
 
 import sgtk
 from sgtk.descriptor import Descriptor
@@ -288,6 +291,159 @@ class TestAppStoreLabels(ShotgunTestBase):
         )
 
 
+class TestAppStoreVersionCache(ShotgunTestBase):
+    """
+    Tests the caching of the versions listed in the app store.
+    """
+
+    def setUp(self):
+        super(TestAppStoreVersionCache, self).setUp()
+
+        # use the std mockgun instance to mock the app store
+        patcher = patch(
+            "tank.descriptor.io_descriptor.appstore.IODescriptorAppStore._IODescriptorAppStore__create_sg_app_store_connection",
+            return_value=(self.mockgun, None),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.bundle_cache = os.path.join(self.project_root, "bundle_cache")
+        self.desc = create_descriptor(
+            self.mockgun,
+            Descriptor.FRAMEWORK,
+            {"name": "tk-framework-main", "version": "v1.0.0", "type": "app_store"},
+            bundle_cache_root_override=self.bundle_cache,
+        )
+
+    @patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find_one")
+    @patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find")
+    def test_cached_versions(self, find_mock, find_one_mock):
+        """
+        Ensures versions are listed once while the listing hasn't expired and
+        that constraints are resolved against the cached listing.
+        """
+        find_one_mock.return_value = {
+            "type": "CustomNonProjectEntity13",
+            "id": 1234,
+            "sg_system_name": "tk-framework-main",
+            "sg_status_list": "prod",
+            "sg_deprecation_message": None,
+        }
+        find_mock.return_value = [
+            {
+                "type": "CustomNonProjectEntity09",
+                "id": version_id,
+                "code": code,
+                "tags": [],
+                "sg_status_list": "prod",
+                "description": "dummy",
+                "sg_detailed_release_notes": "dummy",
+                "sg_documentation": "dummy",
+                "sg_payload": {},
+            }
+            for (version_id, code) in [(3, "v2.0.0"), (2, "v1.2.0"), (1, "v1.0.0")]
+        ]
+
+        # not cached by default
+        self.assertEqual(self.desc.find_latest_version().version, "v2.0.0")
+        self.assertEqual(self.desc.find_latest_version().version, "v2.0.0")
+        self.assertEqual(find_mock.call_count, 2)
+
+        find_mock.reset_mock()
+        with temp_env_var(SHOTGUN_REMOTE_VERSION_CACHE_TTL="3600"):
+            self.assertEqual(self.desc.find_latest_version().version, "v2.0.0")
+            self.assertEqual(self.desc.find_latest_version("v1.x.x").version, "v1.2.0")
+            self.assertEqual(self.desc.find_latest_version().version, "v2.0.0")
+        self.assertEqual(find_mock.call_count, 1)
+        self.assertEqual(find_one_mock.call_count, 3)
+        # the whole listing is cached
+        self.assertEqual(find_mock.call_args[1]["limit"], 0)
+
+        # expired listings are refreshed
+        with temp_env_var(SHOTGUN_REMOTE_VERSION_CACHE_TTL="3600"):
+            with patch("time.time", return_value=time.time() + 7200):
+                self.assertEqual(self.desc.find_latest_version().version, "v2.0.0")
+        self.assertEqual(find_mock.call_count, 2)
+
+
+class TestAppStoreParallelDownloads(ShotgunTestBase):
+    """
+    Tests app store descriptors downloaded on several threads.
+    """
+
+    def setUp(self):
+        super(TestAppStoreParallelDownloads, self).setUp()
+
+        # use the std mockgun instance to mock the app store
+        patcher = patch(
+            "tank.descriptor.io_descriptor.appstore.IODescriptorAppStore._IODescriptorAppStore__create_sg_app_store_connection",
+            return_value=(self.mockgun, None),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.bundle_cache = os.path.join(self.project_root, "bundle_cache")
+
+    def test_shotgun_calls_serialized(self):
+        """
+        Ensures Shotgun isn't called concurrently when downloading in parallel.
+        """
+        lock = threading.Lock()
+        calls = []
+        overlaps = []
+
+        def shotgun_call(*args, **kwargs):
+            with lock:
+                calls.append(args)
+                overlaps.append(len(calls) > 1)
+            # give the other threads a chance to call Shotgun at the same time.
+            time.sleep(0.05)
+            with lock:
+                calls.remove(args)
+            return {
+                "type": "CustomNonProjectEntity09",
+                "id": 1,
+                "sg_payload": {"type": "Attachment", "id": 1},
+            }
+
+        def download_and_unpack_attachment(sg, attachment_id, target):
+            os.makedirs(target)
+            with open(os.path.join(target, "info.yml"), "w") as fh:
+                fh.write("display_name: test")
+
+        descs = [
+            create_descriptor(
+                self.mockgun,
+                Descriptor.FRAMEWORK,
+                {"name": "tk-framework-main", "version": version, "type": "app_store"},
+                bundle_cache_root_override=self.bundle_cache,
+            )
+            for version in ["v1.0.0", "v1.1.0", "v1.2.0", "v1.3.0"]
+        ]
+        with patch(
+            "tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find_one",
+            side_effect=shotgun_call,
+        ), patch(
+            "tank_vendor.shotgun_api3.lib.mockgun.Shotgun.create",
+            side_effect=shotgun_call,
+        ), patch(
+            "tank.util.shotgun.download_and_unpack_attachment",
+            side_effect=download_and_unpack_attachment,
+        ):
+            threads = [threading.Thread(target=desc.download_local) for desc in descs]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        for desc in descs:
+            self.assertTrue(desc.exists_local())
+        # the bundle and the version are looked up before and after the
+        # download, which is then recorded, for each descriptor.
+        self.assertEqual(len(overlaps), 20)
+        self.assertFalse(any(overlaps))
+
+
 class TestAppStoreConnectivity(ShotgunTestBase):
     """
     Tests the app store io descriptor
@@ -0,0 +1,216 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import tempfile
+import time
+
+from tank_test.tank_test_base import ShotgunTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+from tank.descriptor.io_descriptor.bundle_cache_gc import BundleCacheGarbageCollector
+from tank.descriptor.io_descriptor.downloadable import IODescriptorDownloadable
+
+DAY = 24 * 3600
+
+
+class TestBundleCacheGarbageCollector(ShotgunTestBase):
+    """
+    Tests the eviction of unused bundles from the bundle cache.
+    """
+
+    def setUp(self):
+        super(TestBundleCacheGarbageCollector, self).setUp()
+        self.bundle_cache = tempfile.mkdtemp(dir=self.tank_temp)
+        self.now = time.time()
+
+    def _make_bundle(self, name, version, age=None, complete=True, legacy=False):
+        """
+        Writes a bundle to the bundle cache.
+
+        :param age: Number of days since the bundle was last used.
+        :param complete: False if the bundle is still being downloaded.
+        :param legacy: True if the bundle was downloaded by an older core.
+        """
+        path = os.path.join(self.bundle_cache, "app_store", name, version)
+        metadata_folder = os.path.join(path, "tk-metadata")
+        os.makedirs(path)
+        with open(os.path.join(path, "info.yml"), "w") as fh:
+            fh.write("display_name: %s" % name)
+        if legacy:
+            return path
+
+        os.makedirs(metadata_folder)
+        if complete:
+            marker = os.path.join(metadata_folder, "install_complete")
+            open(marker, "w").close()
+            # downloaded a long time ago, the usage file tells when it was used.
+            os.utime(marker, (self.now - 1000 * DAY, self.now - 1000 * DAY))
+        if age is not None:
+            usage_file = os.path.join(metadata_folder, "last_used")
+            open(usage_file, "w").close()
+            os.utime(usage_file, (self.now - age * DAY, self.now - age * DAY))
+        return path
+
+    def test_collect(self):
+        """
+        Ensures only old versions are evicted and recent versions are kept.
+        """
+        recent = self._make_bundle("tk-a", "v3.0.0", age=1)
+        old = self._make_bundle("tk-a", "v2.0.0", age=100)
+        older = self._make_bundle("tk-a", "v1.0.0", age=200)
+        # the only version of a bundle is always kept.
+        only = self._make_bundle("tk-b", "v1.0.0", age=200)
+
+        collector = BundleCacheGarbageCollector(self.bundle_cache)
+        self.assertEqual(collector.collect(dry_run=True), [older, old])
+        self.assertTrue(os.path.exists(old))
+
+        self.assertEqual(collector.collect(), [older, old])
+        self.assertFalse(os.path.exists(old))
+        self.assertFalse(os.path.exists(older))
+        self.assertTrue(os.path.exists(recent))
+        self.assertTrue(os.path.exists(only))
+        self.assertEqual(collector.collect(), [])
+
+    def test_policy(self):
+        """
+        Ensures the age and number of versions kept can be changed.
+        """
+        recent = self._make_bundle("tk-a", "v3.0.0", age=1)
+        old = self._make_bundle("tk-a", "v2.0.0", age=10)
+
+        self.assertEqual(BundleCacheGarbageCollector(self.bundle_cache).collect(), [])
+        self.assertEqual(
+            BundleCacheGarbageCollector(self.bundle_cache, max_age=5 * DAY).collect(),
+            [old],
+        )
+        self.assertEqual(
+            BundleCacheGarbageCollector(self.bundle_cache, max_age=0, keep=0).collect(),
+            [recent],
+        )
+
+    def test_unsafe_bundles(self):
+        """
+        Ensures downloads in progress and bundles downloaded by older cores
+        are never evicted.
+        """
+        self._make_bundle("tk-a", "v3.0.0", age=1)
+        in_progress = self._make_bundle("tk-a", "v2.0.0", complete=False)
+        legacy = self._make_bundle("tk-a", "v1.0.0", legacy=True)
+
+        collector = BundleCacheGarbageCollector(self.bundle_cache, max_age=0, keep=0)
+        self.assertEqual(len(collector.collect()), 1)
+        self.assertTrue(os.path.exists(in_progress))
+        self.assertTrue(os.path.exists(legacy))
+
+    def test_minimum_ages(self):
+        """
+        Ensures bundles which may still be in use and downloads which may
+        still be in progress are kept, whatever the maximum age.
+        """
+        self._make_bundle("tk-a", "v2.0.0", age=1)
+        in_use = self._make_bundle("tk-a", "v1.0.0", age=0)
+        tmp_folder = os.path.join(self.bundle_cache, "tmp")
+        downloading = os.path.join(tmp_folder, "downloading")
+        stale = os.path.join(tmp_folder, "stale")
+        os.makedirs(downloading)
+        os.makedirs(stale)
+        stale_time = self.now - BundleCacheGarbageCollector.STALE_DOWNLOAD_MIN_AGE - 1
+        os.utime(stale, (stale_time, stale_time))
+
+        collector = BundleCacheGarbageCollector(self.bundle_cache, max_age=0, keep=0)
+        self.assertEqual(len(collector.collect()), 1)
+        self.assertTrue(os.path.exists(in_use))
+        self.assertTrue(os.path.exists(downloading))
+        self.assertFalse(os.path.exists(stale))
+
+    def test_usage(self):
+        """
+        Ensures finding a bundle in the cache records its use.
+        """
+        path = self._make_bundle("tk-a", "v1.0.0", age=200)
+        self._make_bundle("tk-a", "v2.0.0", age=1)
+
+        desc = sgtk.descriptor.create_descriptor(
+            None,
+            sgtk.descriptor.Descriptor.APP,
+            "sgtk:descriptor:app_store?name=tk-a&version=v1.0.0",
+            bundle_cache_root_override=self.bundle_cache,
+        )
+        self.assertEqual(desc.get_path(), path)
+
+        usage_file = os.path.join(path, "tk-metadata", "last_used")
+        self.assertGreaterEqual(os.path.getmtime(usage_file), self.now - 1)
+        self.assertEqual(
+            BundleCacheGarbageCollector(self.bundle_cache, keep=0).collect(), []
+        )
+
+    def test_usage_refreshed(self):
+        """
+        Ensures a process which keeps using a bundle records its use again.
+        """
+        path = self._make_bundle("tk-a", "v1.0.0", age=200)
+        desc = sgtk.descriptor.create_descriptor(
+            None,
+            sgtk.descriptor.Descriptor.APP,
+            "sgtk:descriptor:app_store?name=tk-a&version=v1.0.0",
+            bundle_cache_root_override=self.bundle_cache,
+        )
+        usage_file = os.path.join(path, "tk-metadata", "last_used")
+        desc.get_path()
+
+        # pretend the use was recorded a long time ago.
+        os.utime(usage_file, (self.now - 200 * DAY,) * 2)
+        desc.get_path()
+        self.assertLess(os.path.getmtime(usage_file), self.now - 1)
+
+        IODescriptorDownloadable._recorded_usages[path] = (
+            self.now - IODescriptorDownloadable.USAGE_REFRESH_INTERVAL - 1
+        )
+        desc.get_path()
+        self.assertGreaterEqual(os.path.getmtime(usage_file), self.now - 1)
+
+    def test_evicted_bundle_not_found(self):
+        """
+        Ensures a descriptor which found a bundle before it was evicted
+        doesn't report it as local anymore.
+        """
+        self._make_bundle("tk-a", "v2.0.0", age=1)
+        path = self._make_bundle("tk-a", "v1.0.0", age=200)
+        desc = sgtk.descriptor.create_descriptor(
+            None,
+            sgtk.descriptor.Descriptor.APP,
+            "sgtk:descriptor:app_store?name=tk-a&version=v1.0.0",
+            bundle_cache_root_override=self.bundle_cache,
+        )
+        self.assertTrue(desc.exists_local())
+
+        # evict it as if the usage recorded above was a long time ago.
+        usage_file = os.path.join(path, "tk-metadata", "last_used")
+        os.utime(usage_file, (self.now - 200 * DAY,) * 2)
+        self.assertEqual(
+            BundleCacheGarbageCollector(self.bundle_cache, keep=1).collect(), [path]
+        )
+        self.assertFalse(desc.exists_local())
+        self.assertIsNone(desc.get_path())
+
+    def test_command(self):
+        """
+        Ensures the eviction can be run as a tank command.
+        """
+        self._make_bundle("tk-a", "v2.0.0", age=1)
+        old = self._make_bundle("tk-a", "v1.0.0", age=100)
+        command = sgtk.get_command("cache_gc")
+        self.assertEqual(
+            command.execute({"bundle_cache_root": self.bundle_cache, "max_age": 30}),
+            [old],
+        )
@@ -0,0 +1,207 @@
+# Copyright (c) 2016 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import tempfile
+import unittest
+
+from mock import patch
+
+from tank_test.tank_test_base import ShotgunTestBase, skip_if_git_missing, temp_env_var
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+from tank.descriptor.io_descriptor.content_store import ContentStore
+from tank.util import is_windows
+
+
+@unittest.skipIf(is_windows(), "Hard links are not tested on Windows.")
+class TestContentStore(ShotgunTestBase):
+    """
+    Tests the content addressed store of the bundle cache.
+    """
+
+    def setUp(self):
+        super(TestContentStore, self).setUp()
+        self.bundle_cache = tempfile.mkdtemp(dir=self.tank_temp)
+        self.v1 = self._make_bundle("v1.0.0", "first")
+        self.v2 = self._make_bundle("v2.0.0", "second")
+
+    def _make_bundle(self, version, content):
+        """
+        Writes a bundle sharing some of its files with the other versions.
+        """
+        path = os.path.join(self.bundle_cache, "app_store", "tk-test", version)
+        files = {
+            "info.yml": "shared manifest",
+            os.path.join("python", "shared.py"): "shared code",
+            os.path.join("python", "changed.py"): content,
+            os.path.join("tk-metadata", "install_complete"): "",
+        }
+        for name, data in files.items():
+            file_path = os.path.join(path, name)
+            if not os.path.exists(os.path.dirname(file_path)):
+                os.makedirs(os.path.dirname(file_path))
+            with open(file_path, "w") as fh:
+                fh.write(data)
+        return path
+
+    def _read(self, path):
+        with open(path, "r") as fh:
+            return fh.read()
+
+    def _num_links(self, path):
+        return os.stat(path).st_nlink
+
+    def test_mode(self):
+        """
+        Ensures the store is only enabled by a valid mode.
+        """
+        with temp_env_var(SHOTGUN_BUNDLE_CACHE_CONTENT_STORE=""):
+            self.assertFalse(ContentStore(self.bundle_cache).enabled)
+        with temp_env_var(SHOTGUN_BUNDLE_CACHE_CONTENT_STORE="bogus"):
+            self.assertFalse(ContentStore(self.bundle_cache).enabled)
+        with temp_env_var(SHOTGUN_BUNDLE_CACHE_CONTENT_STORE="HardLink"):
+            self.assertTrue(ContentStore(self.bundle_cache).enabled)
+        self.assertTrue(ContentStore(self.bundle_cache, ContentStore.REFLINK).enabled)
+
+    def test_add_in_place(self):
+        """
+        Ensures files shared by bundles are stored once.
+        """
+        store = ContentStore(self.bundle_cache, ContentStore.HARDLINK)
+        store.add_folder(self.v1)
+        store.add_folder(self.v2)
+
+        shared_v1 = os.path.join(self.v1, "python", "shared.py")
+        shared_v2 = os.path.join(self.v2, "python", "shared.py")
+        self.assertTrue(os.path.samefile(shared_v1, shared_v2))
+        # both bundles and the store.
+        self.assertEqual(self._num_links(shared_v1), 3)
+        self.assertEqual(self._read(shared_v2), "shared code")
+
+        self.assertEqual(
+            self._read(os.path.join(self.v1, "python", "changed.py")), "first"
+        )
+        self.assertEqual(
+            self._read(os.path.join(self.v2, "python", "changed.py")), "second"
+        )
+        self.assertEqual(
+            self._num_links(os.path.join(self.v2, "python", "changed.py")), 2
+        )
+
+        # metadata is left alone
+        self.assertEqual(
+            self._num_links(os.path.join(self.v2, "tk-metadata", "install_complete")),
+            1,
+        )
+
+    def test_materialize(self):
+        """
+        Ensures bundles can be materialized from another bundle cache.
+        """
+        other_cache = tempfile.mkdtemp(dir=self.tank_temp)
+        store = ContentStore(other_cache, ContentStore.HARDLINK)
+        target_v1 = os.path.join(other_cache, "app_store", "tk-test", "v1.0.0")
+        target_v2 = os.path.join(other_cache, "app_store", "tk-test", "v2.0.0")
+        store.add_folder(target_v1, source_path=self.v1)
+        store.add_folder(target_v2, source_path=self.v2)
+
+        for source, target in [(self.v1, target_v1), (self.v2, target_v2)]:
+            for name in ["info.yml", os.path.join("python", "changed.py")]:
+                self.assertEqual(
+                    self._read(os.path.join(source, name)),
+                    self._read(os.path.join(target, name)),
+                )
+            self.assertTrue(
+                os.path.exists(os.path.join(target, "tk-metadata", "install_complete"))
+            )
+            # the metadata is copied
+            self.assertEqual(
+                self._num_links(
+                    os.path.join(target, "tk-metadata", "install_complete")
+                ),
+                1,
+            )
+
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(target_v1, "info.yml"), os.path.join(target_v2, "info.yml")
+            )
+        )
+
+    def test_copy_fallback(self):
+        """
+        Ensures files are copied when they can't be linked.
+        """
+        store = ContentStore(self.bundle_cache, ContentStore.HARDLINK)
+        with patch("os.link", side_effect=OSError("Failing on purpose.")):
+            store.add_folder(self.v1)
+            store.add_folder(self.v2)
+
+        shared_v2 = os.path.join(self.v2, "python", "shared.py")
+        self.assertEqual(self._num_links(shared_v2), 1)
+        self.assertEqual(self._read(shared_v2), "shared code")
+
+    def test_collect_garbage(self):
+        """
+        Ensures only objects no longer used by any bundle are collected.
+        """
+        store = ContentStore(self.bundle_cache, ContentStore.HARDLINK)
+        store.add_folder(self.v1)
+        store.add_folder(self.v2)
+        sgtk.util.filesystem.safe_delete_folder(self.v2)
+
+        # recent objects are kept
+        self.assertEqual(store.collect_garbage(), (0, 0))
+        # changed.py of v2 is gone
+        self.assertEqual(store.collect_garbage(min_age=-1), (1, len("second")))
+        self.assertEqual(store.collect_garbage(min_age=-1), (0, 0))
+
+        self.assertEqual(
+            self._read(os.path.join(self.v1, "python", "changed.py")), "first"
+        )
+        self.assertEqual(self._num_links(os.path.join(self.v1, "info.yml")), 2)
+
+    @skip_if_git_missing
+    def test_descriptor(self):
+        """
+        Ensures downloaded and cloned bundles use the store.
+        """
+        git_repo_uri = os.path.join(self.fixtures_root, "misc", "tk-config-default.git")
+        other_cache = tempfile.mkdtemp(dir=self.tank_temp)
+
+        with temp_env_var(SHOTGUN_BUNDLE_CACHE_CONTENT_STORE="hardlink"):
+            desc = sgtk.descriptor.create_descriptor(
+                None,
+                sgtk.descriptor.Descriptor.CONFIG,
+                {"type": "git", "path": git_repo_uri, "version": "v0.15.0"},
+                bundle_cache_root_override=self.bundle_cache,
+            )
+            desc.download_local()
+            self.assertTrue(desc.clone_cache(other_cache))
+
+        info_yml = os.path.join(desc.get_path(), "info.yml")
+        self.assertTrue(desc.exists_local())
+
+        cloned_info_yml = os.path.join(
+            desc._io_descriptor._get_bundle_cache_path(other_cache), "info.yml"
+        )
+        self.assertEqual(self._read(info_yml), self._read(cloned_info_yml))
+        # both caches are on the same device, so they share files.
+        self.assertTrue(os.path.samefile(info_yml, cloned_info_yml))
+
+    def test_command(self):
+        """
+        Ensures the garbage collection can be run as a tank command.
+        """
+        ContentStore(self.bundle_cache, ContentStore.HARDLINK).add_folder(self.v1)
+        command = sgtk.get_command("content_store_gc")
+        self.assertEqual(command.execute({"bundle_cache_root": self.bundle_cache}), 0)
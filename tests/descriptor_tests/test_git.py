@@ -9,11 +9,21 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from mock import patch
 
 import sgtk
 from sgtk.descriptor import Descriptor
+from tank.descriptor.io_descriptor.git import IODescriptorGit
+from tank.util.process import subprocess_check_output, SubprocessCalledProcessError
+from tank_vendor import six
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_test.tank_test_base import ShotgunTestBase, skip_if_git_missing
+from tank_test.tank_test_base import temp_env_var
 
 
 class TestGitIODescriptor(ShotgunTestBase):
@@ -69,6 +79,37 @@ class TestGitIODescriptor(ShotgunTestBase):
         desc = self._create_desc(location_dict, True)
         self.assertEqual(desc.version, "v0.16.1")
 
+    @skip_if_git_missing
+    def test_cached_tags(self):
+        """
+        Ensures the tags of the repository are listed once when they are
+        cached.
+        """
+        location_dict = {"type": "git", "path": self.git_repo_uri, "version": "v0.15.0"}
+        desc = self._create_desc(location_dict)
+        io_desc = desc._io_descriptor
+
+        with temp_env_var(SHOTGUN_REMOTE_VERSION_CACHE_TTL="3600"):
+            with patch.object(
+                io_desc,
+                "_execute_mirror_git_commands",
+                wraps=io_desc._execute_mirror_git_commands,
+            ) as mirror_mock:
+                with patch.object(
+                    io_desc, "_get_remote_refs", wraps=io_desc._get_remote_refs
+                ) as refs_mock:
+                    self.assertEqual(desc.find_latest_version().version, "v0.16.1")
+                    self.assertEqual(desc.find_latest_version().version, "v0.16.1")
+                    self.assertEqual(
+                        desc.find_latest_version("v0.15.x").version, "v0.15.11"
+                    )
+                    self.assertEqual(
+                        desc.find_latest_version("v0.16.x").version, "v0.16.1"
+                    )
+                    # one listing of the latest tag, one listing of all tags.
+                    self.assertEqual(mirror_mock.call_count, 1)
+                    self.assertEqual(refs_mock.call_count, 1)
+
     @skip_if_git_missing
     def test_tag(self):
 
@@ -229,3 +270,200 @@ class TestGitIODescriptor(ShotgunTestBase):
         copy_target = os.path.join(self.project_root, "test_copy_target")
         latest_desc.copy(copy_target)
         self.assertTrue(os.path.exists(os.path.join(copy_target, ".git")))
+
+
+class TestGitMirror(ShotgunTestBase):
+    """
+    Tests the mirrors of the repositories of git descriptors.
+    """
+
+    def setUp(self):
+        """
+        Creates a repository with a few tags.
+        """
+        ShotgunTestBase.setUp(self)
+        temp_dir = tempfile.mkdtemp(dir=self.tank_temp)
+        self.bundle_cache = os.path.join(temp_dir, "bundle_cache")
+        self.repo_path = os.path.join(temp_dir, "tk-test-repo")
+        self.repo_uri = "file:///%s" % self.repo_path.replace(os.sep, "/").lstrip("/")
+        self._timestamp = 1500000000
+
+        self._git("init", "-q", self.repo_path)
+        self._commit_and_tag("v1.0.0")
+        self._commit_and_tag("v1.1.0", annotated=True)
+
+    def _git(self, *args):
+        """
+        Executes a git command in the test repository.
+        """
+        # commits and tags are a second apart, so that they can be sorted
+        # chronologically.
+        self._timestamp += 1
+        env = dict(os.environ)
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = (
+            "%d +0000" % self._timestamp
+        )
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@test.com"]
+            + list(args),
+            cwd=self.repo_path if os.path.exists(self.repo_path) else None,
+            env=env,
+        )
+
+    def _commit_and_tag(self, tag, annotated=False):
+        """
+        Commits a new file in the test repository and tags the commit.
+        """
+        with open(os.path.join(self.repo_path, "%s.txt" % tag), "w") as fh:
+            fh.write(tag)
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", tag)
+        if annotated:
+            self._git("tag", "-a", "-m", tag, tag)
+        else:
+            self._git("tag", tag)
+
+    def _create_desc(self, version, desc_type=Descriptor.APP):
+        """
+        Creates a git descriptor for the test repository.
+        """
+        return sgtk.descriptor.create_descriptor(
+            self.mockgun,
+            desc_type,
+            {"type": "git", "path": self.repo_uri, "version": version},
+            bundle_cache_root_override=self.bundle_cache,
+        )
+
+    @skip_if_git_missing
+    def test_remote_refs(self):
+        """
+        Ensures tags and branches are listed without cloning the repository.
+        """
+        io_desc = self._create_desc("v1.0.0")._io_descriptor
+        with patch.object(io_desc, "_update_mirror") as mirror_mock:
+            tags = io_desc._get_remote_refs("tags")
+            heads = io_desc._get_remote_refs("heads")
+        mirror_mock.assert_not_called()
+
+        self.assertEqual(sorted(tags), ["v1.0.0", "v1.1.0"])
+        # annotated tags resolve to the commit they point at
+        head_hash = list(heads.values())[0]
+        self.assertEqual(tags["v1.1.0"], head_hash)
+        self.assertNotEqual(tags["v1.0.0"], head_hash)
+
+        # refs are listed from the mirror if ls-remote fails.
+        with patch(
+            "tank.descriptor.io_descriptor.git._check_output",
+            side_effect=_fail_ls_remote,
+        ):
+            self.assertEqual(io_desc._get_remote_refs("tags"), tags)
+            self.assertEqual(io_desc._get_remote_refs("heads"), heads)
+        self.assertTrue(os.path.isdir(io_desc._get_mirror_path()))
+
+    @skip_if_git_missing
+    def test_download_from_mirror(self):
+        """
+        Ensures versions are cloned from a shared mirror, which is only
+        updated when a version is missing from it.
+        """
+        desc = self._create_desc("v1.0.0")
+        io_desc = desc._io_descriptor
+        mirror_path = io_desc._get_mirror_path()
+        self.assertTrue(
+            mirror_path.startswith(os.path.join(self.bundle_cache, "git_mirrors"))
+        )
+
+        with patch(
+            "tank.descriptor.io_descriptor.git.IODescriptorGit._execute_remote_git_command",
+            autospec=True,
+            side_effect=IODescriptorGit._execute_remote_git_command,
+        ) as remote_mock:
+            desc.ensure_local()
+            # the mirror was created
+            self.assertEqual(remote_mock.call_count, 1)
+            self.assertTrue(os.path.isdir(mirror_path))
+
+            # v1.1.0 is in the mirror already
+            desc2 = self._create_desc("v1.1.0")
+            desc2.ensure_local()
+            self.assertEqual(remote_mock.call_count, 1)
+
+            # a new tag is fetched into the mirror
+            self._commit_and_tag("v1.2.0")
+            desc3 = desc.find_latest_version("v1.x.x")
+            self.assertEqual(desc3.version, "v1.2.0")
+            desc3.ensure_local()
+            self.assertEqual(remote_mock.call_count, 2)
+
+        for (version, d) in [("v1.0.0", desc), ("v1.1.0", desc2), ("v1.2.0", desc3)]:
+            path = d.get_path()
+            self.assertTrue(os.path.exists(os.path.join(path, "%s.txt" % version)))
+            # the clone points at the remote repository, not at the mirror
+            origin = subprocess.check_output(
+                ["git", "-C", path, "config", "remote.origin.url"]
+            )
+            self.assertEqual(six.ensure_str(origin).strip(), self.repo_uri)
+
+        self.assertFalse(os.path.exists(os.path.join(desc.get_path(), "v1.1.0.txt")))
+        # latest tag chronologically is resolved from the mirror
+        self.assertEqual(desc.find_latest_version().version, "v1.2.0")
+
+    @skip_if_git_missing
+    def test_concurrent_mirror_updates(self):
+        """
+        Ensures git commands updating a mirror are never executed concurrently.
+        """
+        execute = IODescriptorGit._execute_remote_git_command
+        lock = threading.Lock()
+        running = []
+        overlaps = []
+
+        def execute_remote_git_command(io_desc, cmd):
+            with lock:
+                running.append(cmd)
+                overlaps.append(len(running) > 1)
+            # give the other threads a chance to run git at the same time.
+            time.sleep(0.2)
+            try:
+                return execute(io_desc, cmd)
+            finally:
+                with lock:
+                    running.remove(cmd)
+
+        io_descs = [
+            self._create_desc(version)._io_descriptor
+            for version in ["v1.0.0", "v1.1.0", "v1.1.0"]
+        ]
+        mirror_paths = []
+        with patch(
+            "tank.descriptor.io_descriptor.git.IODescriptorGit._execute_remote_git_command",
+            autospec=True,
+            side_effect=execute_remote_git_command,
+        ):
+            threads = [
+                threading.Thread(
+                    target=lambda io_desc=io_desc: mirror_paths.append(
+                        io_desc._update_mirror()
+                    )
+                )
+                for io_desc in io_descs
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # the mirror is created once, then fetched into by descriptors which
+        # don't need a specific revision.
+        self.assertEqual(len(overlaps), 3)
+        self.assertFalse(any(overlaps))
+        self.assertEqual(mirror_paths, [io_descs[0]._get_mirror_path()] * 3)
+
+
+def _fail_ls_remote(*args, **kwargs):
+    """
+    Fails ls-remote calls and executes any other git command.
+    """
+    if "ls-remote" in args[0]:
+        raise SubprocessCalledProcessError(128, args[0], "Authentication failed")
+    return subprocess_check_output(*args, **kwargs)
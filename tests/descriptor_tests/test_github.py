@@ -18,6 +18,7 @@ import sgtk
 from sgtk.descriptor import Descriptor
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_test.tank_test_base import ShotgunTestBase
+from tank_test.tank_test_base import temp_env_var
 
 _TESTED_MODULE = "tank.descriptor.io_descriptor.github_release"
 _TESTED_CLASS = _TESTED_MODULE + ".IODescriptorGithubRelease"
@@ -252,6 +253,31 @@ class TestGithubIODescriptorWithRemoteAccess(GithubIODescriptorTestBase):
             self.assertEqual(urlopen_mock.call_count, 2)
             self.assertEqual(desc2.get_version(), "v1.1.1")
 
+    def test_cached_releases(self):
+        """
+        Test that the releases are requested once when the listing is cached,
+        and that constraints are resolved against the cached releases.
+        """
+        desc = self._create_desc()
+        with temp_env_var(SHOTGUN_REMOTE_VERSION_CACHE_TTL="3600"):
+            with patch(_TESTED_MODULE + ".urllib.request.urlopen") as urlopen_mock:
+                urlopen_mock.side_effect = [
+                    MockResponse("releases"),
+                    MockResponse("releases_page_2"),
+                ]
+                desc2 = desc.find_latest_version(constraint_pattern="v1.2.x")
+                self.assertEqual(desc2.get_version(), "v1.2.30")
+                desc2 = desc.find_latest_version(constraint_pattern="v1.1.x")
+                self.assertEqual(desc2.get_version(), "v1.1.1")
+                # all pages are requested once
+                self.assertEqual(urlopen_mock.call_count, 2)
+
+            with patch(_TESTED_MODULE + ".urllib.request.urlopen") as urlopen_mock:
+                urlopen_mock.return_value = MockResponse("releases_latest")
+                self.assertEqual(desc.find_latest_version().get_version(), "v1.2.3")
+                self.assertEqual(desc.find_latest_version().get_version(), "v1.2.3")
+                self.assertEqual(urlopen_mock.call_count, 1)
+
     def test_bundle_cache_path(self):
         """
         Test that the bund_cache_path is built as expected.
@@ -10,11 +10,18 @@
 
 from __future__ import with_statement
 import os
+import shutil
 
 from tank_test.tank_test_base import ShotgunTestBase, temp_env_var
 from tank_test.tank_test_base import setUpModule  # noqa
 
+from mock import patch
+
 import sgtk
+from tank.descriptor.io_descriptor.factory import (
+    IODescriptorCache,
+    g_io_descriptor_cache,
+)
 
 
 class TestIODescriptors(ShotgunTestBase):
@@ -243,3 +250,104 @@ class TestIODescriptors(ShotgunTestBase):
 
         self.assertEqual(d.get_path(), bundle_path)
         self.assertEqual(d.find_latest_cached_version(), d)
+
+
+class TestIODescriptorCache(ShotgunTestBase):
+    """
+    Tests the process wide cache of io descriptors.
+    """
+
+    def _create(self, location, root=None, descriptor_type=None):
+        """
+        Creates a descriptor and returns its io descriptor.
+        """
+        return sgtk.descriptor.create_descriptor(
+            self.mockgun,
+            descriptor_type or sgtk.descriptor.Descriptor.APP,
+            location,
+            bundle_cache_root_override=root
+            or os.path.join(self.project_root, "cache_root"),
+        )._io_descriptor
+
+    def test_shared_instances(self):
+        """
+        Ensures immutable descriptors are shared, whether they are created from
+        a uri or a dictionary.
+        """
+        location = {"type": "app_store", "version": "v1.1.1", "name": "tk-bundle"}
+        io_descriptor = self._create(location)
+        self.assertIs(self._create(dict(location)), io_descriptor)
+        self.assertIs(
+            self._create("sgtk:descriptor:app_store?name=tk-bundle&version=v1.1.1"),
+            io_descriptor,
+        )
+        self.assertEqual(g_io_descriptor_cache.hits, 2)
+        self.assertEqual(g_io_descriptor_cache.misses, 1)
+
+        # other versions, cache roots and bundle types get their own descriptor.
+        self.assertIsNot(self._create(dict(location, version="v1.1.2")), io_descriptor)
+        self.assertIsNot(
+            self._create(location, os.path.join(self.project_root, "other_root")),
+            io_descriptor,
+        )
+        self.assertIsNot(
+            self._create(location, descriptor_type=sgtk.descriptor.Descriptor.ENGINE),
+            io_descriptor,
+        )
+
+    def test_uncached_descriptors(self):
+        """
+        Ensures mutable and configuration descriptors and descriptors
+        resolving the latest version are not cached.
+        """
+        location = {"type": "path", "path": self.project_root}
+        self.assertIsNot(self._create(location), self._create(location))
+
+        location = {"type": "app_store", "version": "v1.1.1", "name": "tk-config"}
+        self.assertIsNot(
+            self._create(location, descriptor_type=sgtk.descriptor.Descriptor.CONFIG),
+            self._create(location, descriptor_type=sgtk.descriptor.Descriptor.CONFIG),
+        )
+        self.assertEqual(len(g_io_descriptor_cache), 0)
+
+    def test_eviction(self):
+        """
+        Ensures the least recently used descriptors are evicted.
+        """
+        cache = IODescriptorCache(2)
+        cache.add("a", "descriptor_a")
+        cache.add("b", "descriptor_b")
+        self.assertEqual(cache.get("a"), "descriptor_a")
+        cache.add("c", "descriptor_c")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "descriptor_a")
+        # first added descriptor wins
+        self.assertEqual(cache.add("a", "other_descriptor_a"), "descriptor_a")
+
+    def test_local_path_memoized(self):
+        """
+        Ensures the local path of an immutable descriptor is only looked up
+        until it has been found, and then only checked for existence.
+        """
+        root = os.path.join(self.project_root, "memo_root")
+        io_descriptor = self._create(
+            {"type": "app_store", "version": "v1.1.1", "name": "tk-bundle"}, root
+        )
+        self.assertFalse(io_descriptor.exists_local())
+
+        bundle_path = os.path.join(root, "app_store", "tk-bundle", "v1.1.1")
+        os.makedirs(bundle_path)
+        self.assertEqual(io_descriptor.get_path(), bundle_path)
+
+        with patch.object(
+            io_descriptor, "_exists_local", wraps=io_descriptor._exists_local
+        ) as exists_local_mock:
+            self.assertEqual(io_descriptor.get_path(), bundle_path)
+            self.assertTrue(io_descriptor.exists_local())
+            self.assertFalse(exists_local_mock.called)
+
+        # the bundle is looked up again once removed from the bundle cache.
+        shutil.rmtree(bundle_path)
+        self.assertFalse(io_descriptor.exists_local())
+        self.assertIsNone(io_descriptor.get_path())
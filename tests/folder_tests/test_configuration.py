@@ -11,7 +11,7 @@
 import os
 import unittest
 import shutil
-from mock import Mock
+from mock import Mock, patch
 import tank
 from tank_vendor import yaml
 from tank import TankError
@@ -82,3 +82,147 @@ class TestFolderConfiguration(TankTestBase):
             self.tk,
             self.schema_location,
         )
+
+
+class TestFolderSchemaCache(TankTestBase):
+    """
+    Tests caching of the folder schema on the pipeline configuration.
+    """
+
+    def setUp(self):
+        super(TestFolderSchemaCache, self).setUp()
+        # the schema files are modified, so work on a copy of the fixtures.
+        self.setup_fixtures(parameters={"installed_config": True})
+        self.pipeline_configuration = self.tk.pipeline_configuration
+        self.schema_location = self.pipeline_configuration.get_schema_config_location()
+
+    def _touch(self, path):
+        """
+        Moves the modification time of a path forward.
+        """
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + 10))
+
+    def test_schema_reused(self):
+        """
+        Ensures the schema is only scanned once when unchanged.
+        """
+        schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        self.assertTrue(schema.is_up_to_date())
+        self.assertIs(
+            folder.configuration.get_folder_schema(self.pipeline_configuration), schema,
+        )
+
+    def test_schema_reloaded_when_modified(self):
+        """
+        Ensures the schema is scanned again when a file is modified or a
+        folder is added.
+        """
+        schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+
+        self._touch(
+            os.path.join(self.schema_location, "project", "sequences", "sequence.yml")
+        )
+        self.assertFalse(schema.is_up_to_date())
+        reloaded_schema = folder.configuration.get_folder_schema(
+            self.pipeline_configuration
+        )
+        self.assertIsNot(reloaded_schema, schema)
+        self.assertTrue(reloaded_schema.is_up_to_date())
+
+        new_folder = os.path.join(self.schema_location, "project", "new_static_folder")
+        os.mkdir(new_folder)
+        self._touch(os.path.dirname(new_folder))
+        self.assertFalse(reloaded_schema.is_up_to_date())
+
+        schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        project_folder = [f for f in schema.project_folders if f.name == "project"][0]
+        self.assertIn(
+            "new_static_folder", [child.name for child in project_folder.children]
+        )
+
+    def test_configuration_from_schema(self):
+        """
+        Ensures a configuration built from a cached schema matches one built
+        from disk.
+        """
+        schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        cached_config = folder.configuration.FolderConfiguration(
+            self.tk, self.schema_location, schema
+        )
+        config = folder.configuration.FolderConfiguration(self.tk, self.schema_location)
+
+        def describe(nodes):
+            return sorted(repr(node) for node in nodes)
+
+        for entity_type in ["Project", "Shot", "Sequence", "Asset"]:
+            self.assertEqual(
+                describe(cached_config.get_folder_objs_for_entity_type(entity_type)),
+                describe(config.get_folder_objs_for_entity_type(entity_type)),
+            )
+        self.assertEqual(
+            describe(cached_config.get_task_step_nodes()),
+            describe(config.get_task_step_nodes()),
+        )
+
+    def test_precompiled_schema(self):
+        """
+        Ensures a precompiled schema is used when up to date.
+        """
+        precompiled_path = os.path.join(
+            os.path.dirname(self.schema_location),
+            folder.constants.PRECOMPILED_SCHEMA_FILE,
+        )
+        folder.configuration.FolderSchema(self.schema_location).save(precompiled_path)
+
+        with patch.object(
+            folder.configuration.FolderSchema,
+            "__init__",
+            side_effect=Exception("The schema should not be scanned."),
+        ):
+            schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        self.assertTrue(schema.is_up_to_date())
+        self.assertEqual(schema.schema_config_path, self.schema_location)
+
+        # Copying the configuration changes modification times, but not the
+        # content of the schema.
+        self.pipeline_configuration.set_cached_folder_schema(None)
+        sequence_yml = os.path.join(
+            self.schema_location, "project", "sequences", "sequence.yml"
+        )
+        self._touch(sequence_yml)
+        self._touch(os.path.dirname(sequence_yml))
+        with patch.object(
+            folder.configuration.FolderSchema,
+            "__init__",
+            side_effect=Exception("The schema should not be scanned."),
+        ):
+            schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        self.assertTrue(schema.is_up_to_date())
+
+        # Once the schema is modified, the precompiled schema is ignored.
+        self.pipeline_configuration.set_cached_folder_schema(None)
+        with open(sequence_yml, "a") as fh:
+            fh.write("\n# modified\n")
+        self.assertIsNone(
+            folder.configuration.FolderSchema.load_precompiled(
+                self.schema_location, precompiled_path
+            )
+        )
+        schema = folder.configuration.get_folder_schema(self.pipeline_configuration)
+        self.assertTrue(schema.is_up_to_date())
+
+    def test_cache_yaml_precompiles_schema(self):
+        """
+        Ensures the cache_yaml command writes a precompiled schema.
+        """
+        precompiled_path = os.path.join(
+            os.path.dirname(self.schema_location),
+            folder.constants.PRECOMPILED_SCHEMA_FILE,
+        )
+        self.tk.get_command("cache_yaml").execute({})
+        self.assertIsNotNone(
+            folder.configuration.FolderSchema.load_precompiled(
+                self.schema_location, precompiled_path
+            )
+        )
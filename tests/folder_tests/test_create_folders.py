@@ -12,7 +12,7 @@ import copy
 import os
 import unittest
 import shutil
-from mock import Mock
+from mock import Mock, patch
 import tank
 from tank_vendor import yaml
 from tank import TankError
@@ -610,6 +610,58 @@ class TestCreateFilesystemStructure(TankTestBase):
         )
         self.assertTrue(os.path.exists(expected))
 
+    def test_plan(self):
+        """
+        Ensures planning yields the previewed items without accessing the disk.
+        """
+        preview = folder.process_filesystem_structure(
+            self.tk, self.shot["type"], self.shot["id"], preview=True, engine=None
+        )
+        # read the schema once so the next plan doesn't need to.
+        self.tk.plan_filesystem_structure(self.shot["type"], self.shot["id"])
+
+        # record all the paths checked while planning.
+        checked_paths = []
+
+        def record(func):
+            def wrapper(path, *args, **kwargs):
+                checked_paths.append(os.path.normpath(str(path)))
+                return func(path, *args, **kwargs)
+
+            return wrapper
+
+        with patch("os.path.exists", record(os.path.exists)), patch(
+            "os.path.lexists", record(os.path.lexists)
+        ), patch("os.stat", record(os.stat)), patch("os.listdir", record(os.listdir)):
+            plan = self.tk.plan_filesystem_structure(self.shot["type"], self.shot["id"])
+
+        # neither the planned paths nor the schema were checked.
+        schema_location = os.path.normpath(
+            self.tk.pipeline_configuration.get_schema_config_location()
+        )
+        for path in checked_paths:
+            self.assertFalse(path.startswith(self.project_root), path)
+            self.assertFalse(path.startswith(schema_location), path)
+
+        plan_paths = [item.get("target_path") or item["path"] for item in plan]
+        self.assertEqual(sorted(plan_paths), sorted(preview))
+        shot_items = [
+            item
+            for item in plan
+            if item["action"] == "entity_folder" and item["entity"]["type"] == "Shot"
+        ]
+        self.assertEqual(len(shot_items), 1)
+        self.assertEqual(shot_items[0]["entity"]["id"], self.shot["id"])
+
+        # paths known to exist are left out of the plan.
+        existing = set(plan_paths[:2])
+        plan = self.tk.plan_filesystem_structure(
+            self.shot["type"], self.shot["id"], existing_paths=existing
+        )
+        self.assertEqual(
+            [item.get("target_path") or item["path"] for item in plan], plan_paths[2:],
+        )
+
     def test_wrong_type_entity_ids(self):
         """Test passing in type other than list, int or tuple as value for entity_ids parameter.
         """
@@ -625,6 +677,108 @@ class TestCreateFilesystemStructure(TankTestBase):
             )
 
 
+class TestBulkFolderCreation(TankTestBase):
+    """
+    Tests that Shotgun data is prefetched when creating folders for several
+    entities at once.
+    """
+
+    def setUp(self):
+        super(TestBulkFolderCreation, self).setUp()
+        self.setup_fixtures()
+
+        entities = [self.project]
+        self.shot_ids = []
+        for seq_index in range(3):
+            seq = {
+                "type": "Sequence",
+                "id": 100 + seq_index,
+                "code": "seq_%d" % seq_index,
+                "project": self.project,
+            }
+            entities.append(seq)
+            for shot_index in range(4):
+                shot = {
+                    "type": "Shot",
+                    "id": 1000 + seq_index * 10 + shot_index,
+                    "code": "shot_%d_%d" % (seq_index, shot_index),
+                    "sg_sequence": seq,
+                    "project": self.project,
+                }
+                entities.append(shot)
+                self.shot_ids.append(shot["id"])
+        self.add_to_sg_mock_db(entities)
+
+    def _preview_paths(self, entity_ids):
+        """
+        Runs a folder creation preview and counts the Shotgun queries.
+
+        :returns: Tuple of the sorted preview paths and the number of queries.
+        """
+        with patch.object(
+            self.tk.shotgun, "find", wraps=self.tk.shotgun.find
+        ) as find_mock:
+            paths = folder.process_filesystem_structure(
+                self.tk, "Shot", entity_ids, preview=True, engine=None
+            )
+        return sorted(paths), find_mock.call_count
+
+    def test_same_paths_fewer_queries(self):
+        """
+        Ensures batched folder creation yields the same paths as creating
+        folders one entity at a time, with fewer queries.
+        """
+        individual_paths = []
+        individual_queries = 0
+        for shot_id in self.shot_ids:
+            paths, queries = self._preview_paths(shot_id)
+            individual_paths.extend(paths)
+            individual_queries += queries
+
+        bulk_paths, bulk_queries = self._preview_paths(self.shot_ids)
+
+        self.assertEqual(sorted(set(bulk_paths)), sorted(set(individual_paths)))
+        self.assertLess(bulk_queries, individual_queries)
+
+    def test_prefetcher(self):
+        """
+        Ensures the prefetcher answers id constrained queries from a single
+        batched query and discovers linked entities.
+        """
+        sg = folder.prefetch.ShotgunPrefetcher(self.tk.shotgun, batch_size=5)
+        sg.add_candidates("Shot", self.shot_ids)
+
+        with patch.object(
+            self.tk.shotgun, "find", wraps=self.tk.shotgun.find
+        ) as find_mock:
+            for shot_id in self.shot_ids:
+                shot = sg.find_one(
+                    "Shot", [["id", "is", shot_id]], ["code", "sg_sequence"]
+                )
+                self.assertEqual(shot["id"], shot_id)
+            # 12 shots in batches of 5
+            self.assertEqual(find_mock.call_count, 3)
+
+            # filtered out entities, a new query prefetches all the candidates
+            self.assertIsNone(
+                sg.find_one(
+                    "Shot",
+                    [["id", "is", self.shot_ids[0]], ["code", "is", "foo"]],
+                    ["code"],
+                )
+            )
+            self.assertEqual(find_mock.call_count, 6)
+            # unknown entities are queried directly
+            self.assertIsNone(sg.find_one("Shot", [["id", "is", 1]], ["code"]))
+            self.assertEqual(find_mock.call_count, 7)
+
+            # sequences linked from the shots are candidates as well
+            sg.find_one("Sequence", [["id", "is", 100]], ["code"])
+            sg.find_one("Sequence", [["id", "is", 101]], ["code"])
+            self.assertEqual(find_mock.call_count, 8)
+            self.assertEqual(sg.query_count, 7)
+
+
 class TestSchemaCreateFoldersWorkspaces(TankTestBase):
     """
     This test
@@ -0,0 +1,137 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import tempfile
+import unittest
+
+from mock import patch
+
+from tank.folder import FolderIOExecutor
+from tank.util import is_windows
+from tank_test.tank_test_base import ShotgunTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestFolderIOExecutor(ShotgunTestBase):
+    """
+    Tests the parallel processing of folder creation items.
+    """
+
+    def setUp(self):
+        super(TestFolderIOExecutor, self).setUp()
+        temp_dir = tempfile.mkdtemp(dir=self.tank_temp)
+        self.root = os.path.join(temp_dir, "executor")
+        self.source_file = os.path.join(temp_dir, "source.txt")
+        with open(self.source_file, "w") as fh:
+            fh.write("source")
+
+    def _make_items(self):
+        """
+        Builds the items of a folder creation with several nested subtrees.
+        """
+        items = [{"action": "folder", "path": self.root}]
+        for seq_index in range(4):
+            seq_path = os.path.join(self.root, "seq_%d" % seq_index)
+            items.append({"action": "entity_folder", "path": seq_path})
+            for shot_index in range(5):
+                shot_path = os.path.join(seq_path, "shot_%d" % shot_index)
+                items.append({"action": "entity_folder", "path": shot_path})
+                items.append(
+                    {
+                        "action": "create_file",
+                        "path": os.path.join(shot_path, "info.txt"),
+                        "content": "shot",
+                    }
+                )
+                items.append(
+                    {
+                        "action": "copy",
+                        "source_path": self.source_file,
+                        "target_path": os.path.join(shot_path, "copy.txt"),
+                    }
+                )
+                items.append(
+                    {
+                        "action": "folder",
+                        "path": os.path.join(shot_path, "work", "maya"),
+                    }
+                )
+                items.append({"action": "remote_entity_folder", "path": shot_path})
+        return items
+
+    def _expected_paths(self, items):
+        """
+        Returns the paths created by the given items, in order.
+        """
+        paths = []
+        for item in items:
+            if item["action"] == "copy":
+                paths.append(item["target_path"])
+            elif item["action"] != "remote_entity_folder":
+                paths.append(item["path"])
+        return paths
+
+    def test_preview(self):
+        """
+        Ensures nothing is written to disk in preview mode and all paths are
+        returned in the order of the items.
+        """
+        items = self._make_items()
+        paths = FolderIOExecutor(True).execute(items)
+        self.assertEqual(paths, self._expected_paths(items))
+        self.assertEqual(paths, FolderIOExecutor(True, num_workers=1).execute(items))
+        self.assertFalse(os.path.exists(self.root))
+
+    def test_create(self):
+        """
+        Ensures everything is created and that existing paths are not
+        reported.
+        """
+        items = self._make_items()
+        paths = FolderIOExecutor(False).execute(items)
+        self.assertEqual(paths, self._expected_paths(items))
+        for path in paths:
+            self.assertTrue(os.path.exists(path))
+        with open(os.path.join(self.root, "seq_0", "shot_0", "copy.txt")) as fh:
+            self.assertEqual(fh.read(), "source")
+
+        self.assertEqual(FolderIOExecutor(False).execute(items), [])
+
+    def test_duplicate_paths(self):
+        """
+        Ensures items targeting the same path are processed in order, like
+        the hook used to do.
+        """
+        path = os.path.join(self.root, "duplicate")
+        items = [{"action": "folder", "path": path}] * 2
+        self.assertEqual(FolderIOExecutor(True).execute(items), [path, path])
+        self.assertEqual(FolderIOExecutor(False).execute(items), [path])
+
+    @unittest.skipIf(is_windows(), "Symlinks are not supported on Windows.")
+    def test_symlink(self):
+        """
+        Ensures symlinks are created after their parent folder.
+        """
+        path = os.path.join(self.root, "link")
+        items = [
+            {"action": "symlink", "path": path, "target": "target"},
+            {"action": "folder", "path": self.root},
+        ]
+        self.assertEqual(FolderIOExecutor(False).execute(items), [path, self.root])
+        self.assertEqual(os.readlink(path), "target")
+
+    def test_error(self):
+        """
+        Ensures errors raised on worker threads are raised by execute.
+        """
+        items = self._make_items()
+        with patch("shutil.copy", side_effect=IOError("Failing on purpose.")):
+            self.assertRaises(IOError, FolderIOExecutor(False).execute, items)
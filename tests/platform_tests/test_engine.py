@@ -25,6 +25,7 @@ from tank_test.tank_test_base import setUpModule  # noqa
 
 import contextlib
 import tank
+from tank_vendor import six
 import sgtk
 from sgtk.platform import engine
 from tank.errors import TankError
@@ -169,6 +170,95 @@ class TestStartEngine(TestEngineBase):
         self.assertEqual(engine.context, self.context)
 
 
+class TestParallelAppValidation(TestEngineBase):
+    """
+    Tests validating apps on worker threads when an engine starts.
+    """
+
+    def setUp(self):
+        super(TestParallelAppValidation, self).setUp()
+        patcher = mock.patch.dict(
+            os.environ, {sgtk.platform.constants.PARALLEL_APP_VALIDATION_ENV_VAR: "4"},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_apps_validated_in_workers(self):
+        """
+        Makes sure apps are validated on worker threads but initialized on
+        the calling thread.
+        """
+        validation_threads = []
+        load_threads = []
+        validate_app = engine.Engine._Engine__validate_app
+
+        def record_validation_thread(*args, **kwargs):
+            validation_threads.append(threading.current_thread())
+            return validate_app(*args, **kwargs)
+
+        get_application = engine.application.get_application
+
+        def record_load_thread(*args, **kwargs):
+            load_threads.append(threading.current_thread())
+            return get_application(*args, **kwargs)
+
+        with mock.patch.object(
+            engine.Engine,
+            "_Engine__validate_app",
+            autospec=True,
+            side_effect=record_validation_thread,
+        ):
+            with mock.patch(
+                "tank.platform.application.get_application",
+                side_effect=record_load_thread,
+            ):
+                cur_engine = tank.platform.start_engine(
+                    "test_engine", self.tk, self.context
+                )
+
+        self.assertEqual(list(cur_engine.apps.keys()), ["test_app"])
+        self.assertEqual(len(validation_threads), 1)
+        self.assertNotEqual(validation_threads[0], threading.current_thread())
+        self.assertEqual(load_threads, [threading.current_thread()])
+
+    def test_validation_error_isolated(self):
+        """
+        Makes sure a validation error raised on a worker thread is reported
+        and only prevents the faulty app from loading.
+        """
+        with mock.patch.object(
+            engine.Engine,
+            "_Engine__validate_app",
+            side_effect=TankError("Unsupported platform."),
+        ):
+            # The test engine prints its errors to stdout.
+            with mock.patch("sys.stdout", new_callable=six.StringIO) as stdout:
+                cur_engine = tank.platform.start_engine(
+                    "test_engine", self.tk, self.context
+                )
+
+        self.assertEqual(cur_engine.apps, {})
+        self.assertIn("Unsupported platform.", stdout.getvalue())
+
+    def test_unexpected_error_isolated(self):
+        """
+        Makes sure an unexpected exception raised on a worker thread is
+        reported with its call stack.
+        """
+        with mock.patch.object(
+            engine.Engine,
+            "_Engine__validate_app",
+            side_effect=ValueError("Unexpected."),
+        ):
+            with mock.patch.object(engine.Engine, "log_exception") as log_exception:
+                cur_engine = tank.platform.start_engine(
+                    "test_engine", self.tk, self.context
+                )
+
+        self.assertEqual(cur_engine.apps, {})
+        self.assertEqual(log_exception.call_count, 1)
+
+
 class TestLegacyStartShotgunEngine(TestEngineBase):
     """
     Tests how the tk-shotgun engine is started via the start_shotgun_engine routine.
@@ -0,0 +1,264 @@
+# Copyright (c) 2020 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests for the coalescing main thread invoker.
+"""
+
+from __future__ import with_statement
+
+import logging
+import sys
+import threading
+
+from tank_test.tank_test_base import ShotgunTestBase, skip_if_pyside_missing
+from tank_test.tank_test_base import setUpModule  # noqa
+
+from sgtk.platform.invoker import CoalescingCallQueue, create_coalescing_invoker
+from sgtk.platform.engine_logging import ToolkitEngineHandler
+import mock
+
+
+def _make_record(msg, level=logging.DEBUG, name="sgtk.test"):
+    """
+    Creates a log record.
+    """
+    return logging.LogRecord(name, level, __file__, 0, msg, None, None)
+
+
+class TestCoalescingCallQueue(ShotgunTestBase):
+    """
+    Tests the batching, drop and merge policies of the call queue.
+    """
+
+    def test_batches_calls(self):
+        """
+        Ensures only the first call of a batch requests a drain and that calls
+        are executed in order.
+        """
+        call_queue = CoalescingCallQueue()
+        results = []
+        self.assertTrue(call_queue.put(lambda: results.append(1)))
+        self.assertFalse(call_queue.put(lambda: results.append(2)))
+        self.assertFalse(call_queue.put(lambda: results.append(3)))
+        self.assertEqual(call_queue.pending_count, 3)
+
+        call_queue.drain()
+        self.assertEqual(results, [1, 2, 3])
+        self.assertEqual(call_queue.pending_count, 0)
+        self.assertEqual(call_queue.batch_count, 1)
+
+        # Once drained, the next call needs a new drain.
+        self.assertTrue(call_queue.put(lambda: results.append(4)))
+
+    def test_calls_queued_during_drain(self):
+        """
+        Ensures calls queued while a batch executes go in the next batch.
+        """
+        call_queue = CoalescingCallQueue()
+        results = []
+        scheduled = []
+
+        def requeue():
+            results.append("first")
+            scheduled.append(call_queue.put(lambda: results.append("second")))
+
+        call_queue.put(requeue)
+        call_queue.drain()
+        self.assertEqual(results, ["first"])
+        self.assertEqual(scheduled, [True])
+
+        call_queue.drain()
+        self.assertEqual(results, ["first", "second"])
+
+    def test_exception_does_not_abort_batch(self):
+        """
+        Ensures a failing call doesn't prevent the rest of the batch from running.
+        """
+        call_queue = CoalescingCallQueue()
+        results = []
+
+        def fail():
+            raise Exception("Failing on purpose.")
+
+        call_queue.put(fail)
+        call_queue.put(lambda: results.append(1))
+        call_queue.drain()
+        self.assertEqual(results, [1])
+
+    def test_drop_policy(self):
+        """
+        Ensures droppable calls make room for calls that can't be dropped.
+        """
+        call_queue = CoalescingCallQueue(maximum_size=2)
+        results = []
+        call_queue.put(lambda: results.append("droppable"), droppable=True)
+        call_queue.put(lambda: results.append("kept"))
+        # Queue is full, this one is discarded.
+        call_queue.put(lambda: results.append("dropped"), droppable=True)
+        # This one evicts the oldest droppable call.
+        call_queue.put(lambda: results.append("important"))
+        # No more droppable calls to evict, but the call is still queued.
+        call_queue.put(lambda: results.append("also important"))
+
+        self.assertEqual(call_queue.dropped_count, 2)
+        call_queue.drain()
+        self.assertEqual(results, ["kept", "important", "also important"])
+
+    def test_log_record_policies(self):
+        """
+        Ensures identical consecutive log records are merged and debug
+        records are dropped when the queue is full.
+        """
+        call_queue = CoalescingCallQueue(maximum_size=3)
+        delivered = []
+
+        for i in range(5):
+            call_queue.put_log_record(delivered.append, _make_record("same"))
+        call_queue.put_log_record(delivered.append, _make_record("other"))
+        call_queue.put_log_record(
+            delivered.append, _make_record("warning", logging.WARNING)
+        )
+        # Full, debug records are dropped, warnings evict debug records.
+        call_queue.put_log_record(delivered.append, _make_record("dropped"))
+        call_queue.put_log_record(
+            delivered.append, _make_record("error", logging.ERROR)
+        )
+
+        self.assertEqual(call_queue.merged_count, 4)
+        self.assertEqual(call_queue.dropped_count, 2)
+        call_queue.drain()
+        self.assertEqual(
+            [record.getMessage() for record in delivered],
+            ["other", "warning", "error"],
+        )
+
+    def test_log_record_merged_message(self):
+        """
+        Ensures a merged record has its repeat count appended to the
+        formatted message.
+        """
+        call_queue = CoalescingCallQueue()
+        delivered = []
+        for i in range(3):
+            record = logging.LogRecord(
+                "sgtk.test", logging.INFO, __file__, 0, "value %d", (42,), None
+            )
+            call_queue.put_log_record(delivered.append, record)
+        call_queue.drain()
+        self.assertEqual(len(delivered), 1)
+        self.assertEqual(delivered[0].getMessage(), "value 42 (repeated 3 times)")
+
+    def test_threaded_producers(self):
+        """
+        Ensures no calls are lost when queued from multiple threads.
+        """
+        call_queue = CoalescingCallQueue()
+        results = []
+        drains_requested = []
+
+        def produce(thread_index):
+            for i in range(1000):
+                if call_queue.put(lambda: results.append(None)):
+                    drains_requested.append(thread_index)
+
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(drains_requested), 1)
+        call_queue.drain()
+        self.assertEqual(len(results), 4000)
+
+
+class TestLogHandlerMainThreadEmission(ShotgunTestBase):
+    """
+    Tests how the engine log handler emits log messages.
+    """
+
+    def test_emit_in_calling_thread(self):
+        """
+        Ensures records are emitted directly by default.
+        """
+        engine = mock.Mock(emit_log_messages_in_main_thread=False)
+        handler = ToolkitEngineHandler(engine)
+        record = _make_record("test")
+        handler.emit(record)
+        engine._emit_log_message.assert_called_once_with(handler, record)
+        self.assertFalse(engine._emit_log_message_in_main_thread.called)
+
+    def test_emit_in_main_thread(self):
+        """
+        Ensures records are routed through the main thread when the engine
+        requests it.
+        """
+        engine = mock.Mock(emit_log_messages_in_main_thread=True)
+        handler = ToolkitEngineHandler(engine)
+        record = _make_record("test")
+        handler.emit(record)
+        engine._emit_log_message_in_main_thread.assert_called_once_with(handler, record)
+        self.assertFalse(engine._emit_log_message.called)
+
+
+@skip_if_pyside_missing
+class TestCoalescingInvoker(ShotgunTestBase):
+    """
+    Tests the coalescing invoker with a headless QCoreApplication.
+
+    See developer/benchmark_invoker.py to measure its throughput.
+    """
+
+    NUM_CALLS = 2000
+
+    # number of milliseconds after which the event loop is stopped, in case
+    # some calls are never executed.
+    TIMEOUT = 10000
+
+    def setUp(self):
+        super(TestCoalescingInvoker, self).setUp()
+        from tank.authentication.ui.qt_abstraction import QtCore
+
+        self._QtCore = QtCore
+        self._app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(
+            sys.argv
+        )
+
+    def test_calls_coalesced(self):
+        """
+        Ensures calls invoked while the main thread is busy are all executed
+        in a single batch.
+        """
+        call_queue = CoalescingCallQueue(maximum_size=self.NUM_CALLS)
+        invoker = create_coalescing_invoker(self._QtCore, call_queue)
+        main_thread = threading.current_thread()
+        calls = []
+
+        def call():
+            calls.append(threading.current_thread())
+            if len(calls) == self.NUM_CALLS:
+                self._app.quit()
+
+        def produce():
+            for i in range(self.NUM_CALLS):
+                invoker.invoke(call)
+
+        # all the calls are invoked before the event loop runs.
+        worker = threading.Thread(target=produce)
+        worker.start()
+        worker.join()
+
+        self._QtCore.QTimer.singleShot(self.TIMEOUT, self._app.quit)
+        self._app.exec_()
+
+        self.assertEqual(calls, [main_thread] * self.NUM_CALLS)
+        self.assertEqual(call_queue.batch_count, 1)
+        self.assertEqual(call_queue.dropped_count, 0)
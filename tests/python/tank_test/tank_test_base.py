@@ -40,6 +40,7 @@ from tank import path_cache, pipelineconfig_factory
 from tank_vendor import yaml
 from tank.util import is_windows
 from tank.util.user_settings import UserSettings
+from tank.descriptor.io_descriptor.factory import g_io_descriptor_cache
 
 TANK_TEMP = None
 
@@ -367,6 +368,9 @@ class TankTestBase(unittest.TestCase):
         # leak into the next one.
         UserSettings.clear_singleton()
 
+        # Make sure descriptors cached by a previous test are not reused.
+        g_io_descriptor_cache.clear()
+
         parameters = parameters or {}
 
         self._do_io = parameters.get("do_io", True)
@@ -544,9 +548,7 @@ class TankTestBase(unittest.TestCase):
             self.tk = tank.Tank(self.pipeline_configuration)
 
         # set up mockgun and make sure shotgun connection calls route via mockgun
-        self.mockgun = mockgun.Shotgun(
-            "http://unit_test_mock_sg", "mock_user", "mock_key"
-        )
+        self.mockgun = Shotgun("http://unit_test_mock_sg", "mock_user", "mock_key")
         # fake a version response from the server
         self.mockgun.server_info = {"version": (7, 0, 0)}
 
@@ -632,7 +634,7 @@ class TankTestBase(unittest.TestCase):
 
                 # get rid of init cache
                 if os.path.exists(pipelineconfig_factory._get_cache_location()):
-                    os.remove(pipelineconfig_factory._get_cache_location())
+                    shutil.rmtree(pipelineconfig_factory._get_cache_location())
 
                 # move project scaffold out of the way
                 self._move_project_data()
@@ -1142,6 +1144,32 @@ class SealedMock(mock.Mock):
         super(SealedMock, self).__init__(spec_set=list(kwargs.keys()), **kwargs)
 
 
+class Shotgun(mockgun.Shotgun):
+    """
+    Mockgun which, like Shotgun, sets the updated_at field of the entities
+    created or updated, unless it is set explicitly. Named after the class
+    it mocks, like the mockgun class.
+    """
+
+    def create(self, entity_type, data, *args, **kwargs):
+        result = super(Shotgun, self).create(entity_type, data, *args, **kwargs)
+        self._touch(entity_type, result["id"], data)
+        return result
+
+    def update(self, entity_type, entity_id, data, *args, **kwargs):
+        result = super(Shotgun, self).update(
+            entity_type, entity_id, data, *args, **kwargs
+        )
+        self._touch(entity_type, entity_id, data)
+        return result
+
+    def _touch(self, entity_type, entity_id, data):
+        # the row is missing if tests mocked the methods above.
+        row = self._db[entity_type].get(entity_id)
+        if row and "updated_at" in row and "updated_at" not in data:
+            row["updated_at"] = datetime.datetime.now()
+
+
 def _move_data(path):
     """
     Rename directory to backup name, if backup currently exists replace it.
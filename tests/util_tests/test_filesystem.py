@@ -20,6 +20,7 @@ from mock import patch
 import subprocess  # noqa
 import shutil
 import stat
+import time
 
 
 class TestFileSystem(TankTestBase):
@@ -135,6 +136,49 @@ class TestFileSystem(TankTestBase):
         # Clean up
         fs.safe_delete_folder(test_folder)
 
+    def test_atomic_write(self):
+        """
+        Test that atomic_write replaces files and leaves them untouched on errors.
+        """
+        test_folder = os.path.join(self.tank_temp, "atomic_write_tests")
+        fs.ensure_folder_exists(test_folder)
+        path = os.path.join(test_folder, "data.txt")
+
+        with fs.atomic_write(path) as fh:
+            fh.write("first")
+        with fs.atomic_write(path) as fh:
+            fh.write("second")
+        with open(path) as fh:
+            self.assertEqual(fh.read(), "second")
+
+        with self.assertRaises(ValueError):
+            with fs.atomic_write(path) as fh:
+                fh.write("third")
+                raise ValueError()
+        with open(path) as fh:
+            self.assertEqual(fh.read(), "second")
+        # the temporary file is removed.
+        self.assertEqual(os.listdir(test_folder), ["data.txt"])
+
+    def test_json_cache(self):
+        """
+        Test that data written with write_json_cache expires.
+        """
+        path = os.path.join(self.tank_temp, "json_cache_tests", "data.json")
+        self.assertIsNone(fs.read_json_cache(path))
+
+        fs.write_json_cache(path, {"foo": [1, 2]})
+        self.assertEqual(fs.read_json_cache(path), {"foo": [1, 2]})
+        self.assertEqual(fs.read_json_cache(path, 60), {"foo": [1, 2]})
+        with patch("time.time", return_value=time.time() + 120):
+            self.assertIsNone(fs.read_json_cache(path, 60))
+            self.assertEqual(fs.read_json_cache(path), {"foo": [1, 2]})
+
+        with patch.dict(os.environ, {"TK_TEST_CACHE_TTL": "60"}):
+            self.assertEqual(fs.get_cache_ttl("TK_TEST_CACHE_TTL"), 60)
+        with patch.dict(os.environ, {"TK_TEST_CACHE_TTL": "soon"}):
+            self.assertIsNone(fs.get_cache_ttl("TK_TEST_CACHE_TTL"))
+
 
 class TestOpenInFileBrowser(TankTestBase):
     """
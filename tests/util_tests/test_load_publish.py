@@ -915,3 +915,165 @@ class TestUrlWithStoragesAndOverrides2(TankTestBase):
 
         evaluated_path = sgtk.util.resolve_publish_path(self.tk, sg_dict)
         self.assertEqual(evaluated_path, expected_path)
+
+
+class TestResolvePublishPaths(TankTestBase):
+    """
+    Tests bulk resolution of publishes via resolve_publish_paths
+    """
+
+    def setUp(self):
+        super(TestResolvePublishPaths, self).setUp()
+        self.setup_fixtures()
+
+        self.storage = {
+            "type": "LocalStorage",
+            "id": 1,
+            "code": "storage_1",
+            "mac_path": "/storage_mac",
+            "windows_path": "x:\\storage_win\\",
+            "linux_path": "/storage_linux/",
+        }
+
+        self.add_to_sg_mock_db([self.storage])
+
+    def _make_publishes(self, count):
+        """
+        Creates a list of alternating url and local file link publishes.
+
+        :param count: Number of publishes to generate.
+        :returns: List of (publish dictionary, expected path) tuples.
+        """
+        root = {
+            "win32": "x:\\storage_win",
+            "linux2": "/storage_linux",
+            "darwin": "/storage_mac",
+        }[sgsix.platform]
+
+        publishes = []
+        for idx in range(count):
+            expected_path = os.path.join(root, "path", "file.%04d.ext" % idx)
+            if idx % 2:
+                path_field = {
+                    "url": "file:///x:/storage_win/path/file.%04d.ext" % idx,
+                    "type": "Attachment",
+                    "name": "file.ext",
+                    "link_type": "web",
+                    "content_type": None,
+                }
+            else:
+                path_field = {
+                    "content_type": None,
+                    "link_type": "local",
+                    "local_path": expected_path,
+                    "local_path_linux": "/storage_linux/path/file.%04d.ext" % idx,
+                    "local_path_mac": "/storage_mac/path/file.%04d.ext" % idx,
+                    "local_path_windows": "x:\\storage_win\\path\\file.%04d.ext" % idx,
+                    "local_storage": {
+                        "id": 1,
+                        "name": "storage_1",
+                        "type": "LocalStorage",
+                    },
+                    "name": "file.ext",
+                    "type": "Attachment",
+                }
+            sg_dict = {
+                "id": idx,
+                "type": "PublishedFile",
+                "code": "foo",
+                "path": path_field,
+            }
+            publishes.append((sg_dict, expected_path))
+        return publishes
+
+    def test_matches_single_resolve(self):
+        """
+        Ensures bulk resolution returns the same paths as resolving
+        each publish individually, in order.
+        """
+        publishes = self._make_publishes(20)
+        sg_data = [sg_dict for (sg_dict, _) in publishes]
+
+        paths = sgtk.util.resolve_publish_paths(self.tk, sg_data)
+
+        self.assertEqual(paths, [expected for (_, expected) in publishes])
+        self.assertEqual(
+            paths, [sgtk.util.resolve_publish_path(self.tk, d) for d in sg_data]
+        )
+
+    def test_storages_fetched_once(self):
+        """
+        Ensures the storage tables and core hook lookups are not
+        recomputed for every publish.
+        """
+        publishes = self._make_publishes(50)
+        sg_data = [sg_dict for (sg_dict, _) in publishes]
+
+        with patch(
+            "tank.util.shotgun.publish_resolve.get_cached_local_storages",
+            return_value=[self.storage],
+        ) as storages_mock:
+            with patch.object(self.tk, "execute_core_hook_method") as hook_mock:
+                sgtk.util.resolve_publish_paths(self.tk, sg_data)
+
+        # once for the url lookup table.
+        self.assertEqual(storages_mock.call_count, 1)
+        # no custom hook in the config, so the default one is skipped.
+        self.assertEqual(hook_mock.call_count, 0)
+
+    def test_empty_list(self):
+        """
+        Ensures an empty list resolves to an empty list.
+        """
+        self.assertEqual(sgtk.util.resolve_publish_paths(self.tk, []), [])
+
+    def test_raises(self):
+        """
+        Ensures errors for individual publishes are raised.
+        """
+        publishes = self._make_publishes(2)
+        sg_data = [sg_dict for (sg_dict, _) in publishes]
+        sg_data.append(
+            {"id": 123, "type": "PublishedFile", "code": "foo", "path": None}
+        )
+
+        self.assertRaises(
+            sgtk.util.PublishPathNotDefinedError,
+            sgtk.util.resolve_publish_paths,
+            self.tk,
+            sg_data,
+        )
+
+
+class TestResolvePublishPathsCoreHook(TankTestBase):
+    """
+    Tests that bulk resolution honours a resolve_publish core hook
+    """
+
+    def setUp(self):
+        super(TestResolvePublishPathsCoreHook, self).setUp()
+        self.setup_fixtures(name="publish_resolve")
+
+    def test_core_hook(self):
+        """
+        Ensures the core hook in the config is executed for every publish.
+        """
+        sg_data = []
+        for url in ["supported://www.url.com", "file://www.url.com"]:
+            sg_data.append(
+                {
+                    "id": 123,
+                    "type": "PublishedFile",
+                    "code": "foo",
+                    "path": {
+                        "url": url,
+                        "type": "Attachment",
+                        "name": "url.com",
+                        "link_type": "web",
+                        "content_type": None,
+                    },
+                }
+            )
+
+        paths = sgtk.util.resolve_publish_paths(self.tk, sg_data)
+        self.assertEqual(paths, ["/supported/from/core/hook", "/file/from/core/hook"])
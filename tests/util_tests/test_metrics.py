@@ -11,17 +11,22 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 
-from mock import patch
+from mock import patch, Mock
 
 from tank.util.metrics import (
     MetricsQueueSingleton,
+    MetricsDispatcher,
     MetricsDispatchWorkerThread,
+    MetricsHookWorkerThread,
     EventMetric,
     log_metric,
     log_user_activity_metric,
     log_user_attribute_metric,
 )
-from tank.util.constants import TANK_LOG_METRICS_HOOK_NAME
+from tank.util.constants import (
+    TANK_LOG_METRICS_HOOK_NAME,
+    METRICS_DISPATCH_WORKERS_ENV_VAR,
+)
 
 import tank
 from tank_test.tank_test_base import setUpModule  # noqa
@@ -30,11 +35,13 @@ from tank.authentication import ShotgunAuthenticator
 
 import os
 import json
+import shutil
+import tempfile
 import time
 import threading
 import unittest2
 from tank_vendor import six
-from tank_vendor.six.moves import urllib
+from tank_vendor.six.moves import urllib, BaseHTTPServer
 
 
 class TestEventMetric(ShotgunTestBase):
@@ -891,6 +898,243 @@ class TestMetricsQueueSingleton(unittest2.TestCase):
         self.assertTrue(obj1 == obj2 == obj3)
 
 
+class _MetricsEndpointStandIn(object):
+    """
+    Local HTTP server standing in for the Shotgun metrics endpoint.
+
+    Records the metrics posted to it and the number of connections opened.
+    """
+
+    def __init__(self, status=200):
+        """
+        :param int status: HTTP status code returned for every request.
+        """
+        stand_in = self
+        self.status = status
+        self.metrics = []
+        self.batch_sizes = []
+        self.connection_count = 0
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections alive by default.
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                stand_in.connection_count += 1
+                BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                payload = json.loads(self.rfile.read(length))
+                stand_in.batch_sizes.append(len(payload["metrics"]))
+                stand_in.metrics.extend(payload["metrics"])
+                self.send_response(stand_in.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = six.moves.socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), Handler
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def base_url(self):
+        """Url of the stand-in server."""
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def shutdown(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TestMetricsDispatchWithStandIn(unittest2.TestCase):
+    """
+    Cases testing dispatch of metrics by the worker thread against a local
+    stand-in for the metrics endpoint.
+    """
+
+    def setUp(self):
+        self._stand_in = _MetricsEndpointStandIn()
+        self.addCleanup(self._stand_in.shutdown)
+
+        self._engine = Mock()
+        self._engine.sgtk.version = "v1.2.3"
+        self._engine.tank.shotgun.base_url = self._stand_in.base_url
+        self._engine.tank.shotgun.config.proxy_handler = None
+        self._engine.tank.shotgun.get_session_token.return_value = "token"
+
+        self._queue = MetricsQueueSingleton()
+        # Start from an empty queue.
+        self._queue.get_metrics()
+        self._spill_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._spill_folder)
+
+    def _dispatch(self, worker, count):
+        """
+        Dispatches ``count`` metrics with the given worker, the same way the
+        worker's dispatch loop does.
+        """
+        for i in range(count):
+            self._queue.log(
+                EventMetric(EventMetric.GROUP_TOOLKIT, "Stand-in %d" % i, {"id": i})
+            )
+        while True:
+            metrics = self._queue.get_metrics(worker.batch_size)
+            if not metrics:
+                break
+            worker._dispatch(metrics)
+
+    def test_keep_alive(self):
+        """
+        Ensures a keep-alive worker reuses a single connection for all batches.
+        """
+        worker = MetricsDispatchWorkerThread(self._engine, keep_alive=True)
+        worker._endpoint_available = True
+        self._dispatch(worker, 35)
+        worker._close_connection()
+
+        self.assertEqual(len(self._stand_in.metrics), 35)
+        self.assertEqual(self._stand_in.batch_sizes, [10, 10, 10, 5])
+        self.assertEqual(self._stand_in.connection_count, 1)
+
+    def test_adaptive_batch_size(self):
+        """
+        Ensures the batch size shrinks when the server rejects batches and
+        grows back when it accepts them again.
+        """
+        self._stand_in.status = 400
+        dropped_count = self._queue.dropped_count
+        worker = MetricsDispatchWorkerThread(self._engine, keep_alive=True)
+        worker._endpoint_available = True
+        self._dispatch(worker, 12)
+        # Rejected batches are retried in smaller batches until metrics are
+        # sent one at a time, and only then dropped.
+        self.assertEqual(self._stand_in.batch_sizes, [10, 5, 2] + [1] * 12)
+        self.assertEqual(
+            sorted(
+                m["event_properties"]["Event Data"]["id"]
+                for m in self._stand_in.metrics[-12:]
+            ),
+            list(range(12)),
+        )
+        self.assertEqual(self._queue.dropped_count, dropped_count + 12)
+        self.assertEqual(worker.batch_size, 1)
+
+        self._stand_in.status = 200
+        self._dispatch(worker, 1)
+        self.assertEqual(worker.batch_size, 2)
+        worker._close_connection()
+
+    def test_offline_spill(self):
+        """
+        Ensures metrics which can't reach the server are spilled to disk and
+        restored into the queue later.
+        """
+        self._queue.set_spill_folder(self._spill_folder)
+        self.addCleanup(self._queue.set_spill_folder, None)
+
+        # point the worker at a server which is not running anymore.
+        self._stand_in.shutdown()
+        worker = MetricsDispatchWorkerThread(self._engine, keep_alive=True)
+        worker._endpoint_available = True
+        self._dispatch(worker, 3)
+        self.assertEqual(len(os.listdir(self._spill_folder)), 1)
+
+        self.assertEqual(self._queue.restore_spilled(), 3)
+        self.assertEqual(os.listdir(self._spill_folder), [])
+        metrics = self._queue.get_metrics()
+        self.assertEqual(
+            [m.data["event_name"] for m in metrics],
+            ["Stand-in 0", "Stand-in 1", "Stand-in 2"],
+        )
+
+        # The log_metrics hook was executed when the metrics were spilled, it
+        # isn't executed again for the restored metrics.
+        hook_mock = self._engine.tank.execute_core_hook_method
+        self.assertEqual(hook_mock.call_count, 1)
+        worker._dispatch(metrics)
+        self.assertEqual(hook_mock.call_count, 1)
+        self.assertEqual(self._queue.restore_spilled(), 3)
+        self.assertEqual(len(self._queue.get_metrics()), 3)
+
+    def test_queue_overflow(self):
+        """
+        Ensures dropped metrics are accounted for and that overflowing metrics
+        are spilled instead when a spill folder is set.
+        """
+        dropped_count = self._queue.dropped_count
+        for i in range(MetricsQueueSingleton.MAXIMUM_QUEUE_SIZE + 5):
+            self._queue.log(EventMetric(EventMetric.GROUP_TOOLKIT, "Overflow"))
+        self.assertEqual(self._queue.dropped_count, dropped_count + 5)
+        self._queue.get_metrics()
+
+        self._queue.set_spill_folder(self._spill_folder)
+        self.addCleanup(self._queue.set_spill_folder, None)
+        for i in range(MetricsQueueSingleton.MAXIMUM_QUEUE_SIZE + 5):
+            self._queue.log(
+                EventMetric(EventMetric.GROUP_TOOLKIT, "Overflow", {"id": i})
+            )
+        self.assertEqual(self._queue.dropped_count, dropped_count + 5)
+        self.assertEqual(len(os.listdir(self._spill_folder)), 1)
+
+        # Nothing is restored until the queue has room.
+        self.assertEqual(self._queue.restore_spilled(), 0)
+        metrics = self._queue.get_metrics()
+        self.assertEqual(
+            self._queue.restore_spilled(), MetricsQueueSingleton.MAXIMUM_QUEUE_SIZE // 2
+        )
+        metrics = self._queue.get_metrics() + metrics
+        self.assertEqual(
+            sorted(m.data["event_properties"]["id"] for m in metrics),
+            list(range(MetricsQueueSingleton.MAXIMUM_QUEUE_SIZE + 5)),
+        )
+
+    def test_hook_fan_out(self):
+        """
+        Ensures the log_metrics hook is executed by the hook worker thread.
+        """
+        hook_worker = MetricsHookWorkerThread(self._engine)
+        hook_worker.start()
+        self.addCleanup(hook_worker.halt)
+
+        worker = MetricsDispatchWorkerThread(
+            self._engine, keep_alive=True, hook_worker=hook_worker
+        )
+        worker._endpoint_available = True
+        self._dispatch(worker, 15)
+        worker._close_connection()
+
+        timeout = time.time() + 5
+        hook_mock = self._engine.tank.execute_core_hook_method
+        while hook_mock.call_count < 2 and time.time() < timeout:
+            time.sleep(0.05)
+        self.assertEqual(hook_mock.call_count, 2)
+        self.assertEqual(
+            sum(len(c[1]["metrics"]) for c in hook_mock.call_args_list), 15
+        )
+
+    def test_invalid_worker_count(self):
+        """
+        Ensures an invalid number of workers in the environment falls back to
+        a single worker.
+        """
+        with patch.dict(os.environ, {METRICS_DISPATCH_WORKERS_ENV_VAR: "two"}):
+            dispatcher = MetricsDispatcher(self._engine)
+        self.assertEqual(dispatcher._num_workers, 1)
+        self.assertEqual(self._engine.log_warning.call_count, 1)
+
+        with patch.dict(os.environ, {METRICS_DISPATCH_WORKERS_ENV_VAR: "3"}):
+            dispatcher = MetricsDispatcher(self._engine)
+        self.assertEqual(dispatcher._num_workers, 3)
+
+
 class TestMetricsDeprecatedFunctions(ShotgunTestBase):
     """ Cases testing tank.util.metrics of deprecated functions
 
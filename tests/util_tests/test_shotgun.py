@@ -11,8 +11,12 @@
 from __future__ import with_statement
 import os
 import shutil
+import hashlib
 import datetime
+import tempfile
+import threading
 from tank_vendor.six.moves import urllib
+from tank_vendor.six.moves import BaseHTTPServer
 
 from mock import patch, MagicMock
 
@@ -363,6 +367,114 @@ class TestShotgunDownloadUrl(ShotgunTestBase):
         self.assertEqual(self.download_destination, full_path)
 
 
+class _RangeRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Serves the payload of the test server, optionally dropping the connection
+    half way through and supporting Range requests.
+    """
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("Range"))
+        payload = server.payload
+
+        offset = 0
+        range_header = self.headers.get("Range")
+        if range_header and server.supports_ranges:
+            offset = int(range_header[len("bytes=") : -1])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                "bytes %d-%d/%d" % (offset, len(payload) - 1, len(payload)),
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(payload) - offset))
+        self.end_headers()
+
+        content = payload[offset:]
+        if server.drops_left > 0:
+            # drop the connection after sending part of the content
+            server.drops_left -= 1
+            content = content[: len(content) // 2]
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestShotgunDownloadStreaming(ShotgunTestBase):
+    """
+    Tests streaming downloads from a local http server.
+    """
+
+    def setUp(self):
+        super(TestShotgunDownloadStreaming, self).setUp()
+
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _RangeRequestHandler)
+        self.server.payload = os.urandom(3 * 1024 * 1024 + 17)
+        self.server.requests = []
+        self.server.drops_left = 0
+        self.server.supports_ranges = True
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.url = "http://127.0.0.1:%d/bundle.zip" % self.server.server_address[1]
+        self.location = os.path.join(tempfile.mkdtemp(dir=self.tank_temp), "bundle.zip")
+
+    def _read_download(self):
+        with open(self.location, "rb") as fh:
+            return fh.read()
+
+    def test_resume(self):
+        """
+        Ensures interrupted downloads are resumed where they stopped.
+        """
+        self.server.drops_left = 2
+        tank.util.download_url(self.mockgun, self.url, self.location)
+        self.assertEqual(self._read_download(), self.server.payload)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertIsNone(self.server.requests[0])
+        self.assertTrue(self.server.requests[1].startswith("bytes="))
+
+    def test_restart_without_range_support(self):
+        """
+        Ensures downloads start over when the server doesn't support ranges.
+        """
+        self.server.drops_left = 1
+        self.server.supports_ranges = False
+        tank.util.download_url(self.mockgun, self.url, self.location)
+        self.assertEqual(self._read_download(), self.server.payload)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_give_up(self):
+        """
+        Ensures downloads which keep failing raise an error.
+        """
+        self.server.drops_left = 100
+        with patch("tank.util.shotgun.download.DOWNLOAD_RESUME_ATTEMPTS", 2):
+            with self.assertRaises(tank.TankError):
+                tank.util.download_url(self.mockgun, self.url, self.location)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_checksum(self):
+        """
+        Ensures the content is verified against the checksum.
+        """
+        self.server.drops_left = 1
+        checksum = "sha256:%s" % hashlib.sha256(self.server.payload).hexdigest()
+        tank.util.download_url(self.mockgun, self.url, self.location, checksum=checksum)
+        self.assertEqual(self._read_download(), self.server.payload)
+
+        with self.assertRaisesRegex(tank.TankError, "Checksum mismatch"):
+            tank.util.download_url(
+                self.mockgun, self.url, self.location, checksum="md5:1234"
+            )
+
+
 class TestShotgunDownloadAndUnpack(ShotgunTestBase):
     """
     Test the two exposed functions that use the _download_and_unpack() work function.
@@ -404,37 +516,38 @@ class TestShotgunDownloadAndUnpack(ShotgunTestBase):
     def test_download_and_unpack_attachment(self):
         """
         Ensure download_and_unpack_attachment() retries after a failure,
-        raises the appropriate Exception after repeated failures, calls
-        download_attachment() as exepcted, and unpacks the
-        returned zip file as expected.
+        raises the appropriate Exception after repeated failures, streams
+        the attachment from its download url as expected, and unpacks the
+        downloaded zip file as expected.
         """
-        download_result = open(self.download_source, "rb").read()
         target_dir = os.path.join(self.download_destination, "attachment")
         attachment_id = 764876347
-        self.mockgun.download_attachment = MagicMock()
+        self.mockgun.get_attachment_download_url = MagicMock()
         try:
             # fail forever, and ensure exception is raised.
-            self.mockgun.download_attachment.side_effect = Exception("Test Exception")
+            self.mockgun.get_attachment_download_url.side_effect = Exception(
+                "Test Exception"
+            )
             with self.assertRaises(tank.util.ShotgunAttachmentDownloadError):
                 tank.util.shotgun.download_and_unpack_attachment(
                     self.mockgun, attachment_id, target_dir
                 )
 
             # fail once, then succeed, ensuring retries work.
-            self.mockgun.download_attachment.side_effect = (
+            self.mockgun.get_attachment_download_url.side_effect = (
                 Exception("Test Exception"),
-                download_result,
+                self.good_zip_url,
             )
             tank.util.shotgun.download_and_unpack_attachment(
                 self.mockgun, attachment_id, target_dir
             )
-            self.mockgun.download_attachment.assert_called_with(attachment_id)
+            self.mockgun.get_attachment_download_url.assert_called_with(attachment_id)
             self.assertEqual(
                 set(get_file_list(target_dir, target_dir)), set(self.expected_output)
             )
         finally:
             shutil.rmtree(target_dir)
-            del self.mockgun.download_attachment
+            del self.mockgun.get_attachment_download_url
 
     def test_download_and_unpack_url(self):
         """
@@ -9,8 +9,15 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import stat
+import tempfile
+import zipfile
+
+from mock import patch
+
 from tank_test.tank_test_base import ShotgunTestBase, setUpModule  # noqa
 import tank
+from tank.util import is_windows
 
 
 def get_file_list(folder, prefix):
@@ -118,3 +125,56 @@ class TestUnzipping(ShotgunTestBase):
         self.assertEqual(
             set(get_file_list(output_path_2, output_path_2)), set(["/info.yml"])
         )
+
+    def test_parallel_unzip(self):
+        """
+        Ensures extracting items concurrently gives the same result as
+        extracting them one by one, and preserves execution bits.
+        """
+        temp_dir = tempfile.mkdtemp(dir=self.tank_temp)
+        zip = os.path.join(temp_dir, "parallel.zip")
+        zf = zipfile.ZipFile(zip, "w", zipfile.ZIP_DEFLATED)
+        for index in range(50):
+            zf.writestr(
+                "bundle/folder_%d/file_%d.txt" % (index % 5, index), "x" * index
+            )
+        info = zipfile.ZipInfo("bundle/launch.sh")
+        info.external_attr = 0o755 << 16
+        zf.writestr(info, "#!/bin/sh")
+        zf.close()
+
+        output_path_1 = os.path.join(temp_dir, "parallel_zip_test_1")
+        tank.util.zip.unzip_file(zip, output_path_1, auto_detect_bundle=True)
+
+        output_path_2 = os.path.join(temp_dir, "parallel_zip_test_2")
+        with patch("tank.util.zip.UNZIP_NUM_WORKERS", 1):
+            tank.util.zip.unzip_file(zip, output_path_2, auto_detect_bundle=True)
+
+        files = get_file_list(output_path_1, output_path_1)
+        self.assertEqual(len(files), 56)
+        self.assertEqual(set(files), set(get_file_list(output_path_2, output_path_2)))
+        with open(os.path.join(output_path_1, "folder_4", "file_49.txt")) as fh:
+            self.assertEqual(fh.read(), "x" * 49)
+        if not is_windows():
+            mode = os.stat(os.path.join(output_path_1, "launch.sh")).st_mode
+            self.assertTrue(mode & stat.S_IXUSR)
+
+    def test_corrupted_zip(self):
+        """
+        Ensures errors raised while extracting items concurrently are raised.
+        """
+        temp_dir = tempfile.mkdtemp(dir=self.tank_temp)
+        zip = os.path.join(temp_dir, "corrupted.zip")
+        zf = zipfile.ZipFile(zip, "w", zipfile.ZIP_STORED)
+        for index in range(10):
+            zf.writestr("file_%d.txt" % index, "content of file %d" % index)
+        zf.close()
+        # corrupt the content of the files, leaving the directory intact
+        with open(zip, "rb") as fh:
+            data = fh.read()
+        with open(zip, "wb") as fh:
+            fh.write(data.replace(b"content", b"CONTENT"))
+
+        output_path = os.path.join(temp_dir, "corrupted_zip_test")
+        with self.assertRaises(zipfile.BadZipfile):
+            tank.util.zip.unzip_file(zip, output_path)